@@ -12,7 +12,7 @@ from sqlmodel import SQLModel
 from mindweaver.service.project.model import Project
 from mindweaver.service.k8s_cluster.model import K8sClusterStatus
 from mindweaver.datasource_service import DatabaseSource, WebSource, APISource, StreamingSource
-from mindweaver.service.s3_storage.model import S3Storage
+from mindweaver.service.s3_storage.model import S3Storage, S3ObjectIndex, S3IndexedObject
 from mindweaver.platform_service.pgsql.model import PgSqlPlatform, PgSqlPlatformState
 from mindweaver.platform_service.hive_metastore.model import HiveMetastorePlatform, HiveMetastorePlatformState
 from mindweaver.platform_service.trino.model import TrinoPlatform, TrinoPlatformState
@@ -20,6 +20,15 @@ from mindweaver.platform_service.superset.model import SupersetPlatform, Superse
 from mindweaver.platform_service.ranger.model import RangerPlatform, RangerPlatformState
 from mindweaver.service.ldap_config.model import LdapConfig
 from mindweaver.fw.auth import User
+from mindweaver.fw.job import Job
+from mindweaver.datasource_service.health import DataSourceHealth
+from mindweaver.datasource_service.database_source.model import DatabaseCatalogTable
+from mindweaver.ingestion.model import (
+    CrawlPage,
+    ExtractionCheckpoint,
+    IngestionState,
+    StreamOffset,
+)
 
 # from mindweaver.auth.model import User # If exists
 
@@ -12,6 +12,7 @@ from .datasource_service import (
     web_router,
     api_router,
     streaming_router,
+    health_router as data_source_health_router,
 )
 from .fw.auth import (
     router as auth_router,
@@ -35,6 +36,8 @@ from fastapi import Depends
 from fastapi.security import HTTPBearer
 from .fw.service import Error, ValidationErrorDetail
 from .fw.exc import MindWeaverError
+from .fw.events import router as events_router, broker as event_broker
+from .datasource_service.database_source.preview import preview_engines
 
 from contextlib import asynccontextmanager
 
@@ -60,7 +63,15 @@ async def lifespan(app: fastapi.FastAPI):
                 await session.refresh(user)
                 logger.info(f"Created default admin user: {user.name}")
             break
+    # Listen for state changes from other replicas and workers for the whole
+    # lifetime of the app, so in-process caches are invalidated promptly
+    try:
+        await event_broker.start()
+    except Exception as e:
+        logger.warning(f"Failed to start event listener: {e}")
     yield
+    await event_broker.stop()
+    await preview_engines.dispose_all()
 
 
 app = fastapi.FastAPI(
@@ -190,9 +201,11 @@ app.include_router(superset_router, prefix="/api/v1")
 app.include_router(ranger_router, prefix="/api/v1")
 app.include_router(s3_router, prefix="/api/v1")
 app.include_router(ldap_config_router, prefix="/api/v1")
+app.include_router(events_router, prefix="/api/v1")
 
 if settings.experimental_data_source:
     app.include_router(db_router, prefix="/api/v1/database-sources")
     app.include_router(web_router, prefix="/api/v1/web-sources")
     app.include_router(api_router, prefix="/api/v1/api-sources")
     app.include_router(streaming_router, prefix="/api/v1/streaming-sources")
+    app.include_router(data_source_health_router, prefix="/api/v1")
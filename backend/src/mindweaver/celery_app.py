@@ -8,7 +8,14 @@ app = Celery(
     "mindweaver",
     broker=settings.celery_broker_url,
     backend=settings.celery_result_backend,
-    include=["mindweaver.tasks.platform_status", "mindweaver.tasks.k8s_cluster_status"],
+    include=[
+        "mindweaver.tasks.platform_status",
+        "mindweaver.tasks.k8s_cluster_status",
+        "mindweaver.tasks.data_source_health",
+        "mindweaver.tasks.database_catalog",
+        "mindweaver.tasks.ingestion",
+        "mindweaver.tasks.s3_storage",
+    ],
 )
 
 app.conf.update(
@@ -26,6 +33,10 @@ app.conf.update(
             "task": "mindweaver.tasks.k8s_cluster_status.poll_all_k8s_clusters",
             "schedule": 15.0,
         },
+        "sweep-data-source-health-60s": {
+            "task": "mindweaver.tasks.data_source_health.sweep_data_source_health",
+            "schedule": 60.0,
+        },
     },
 )
 
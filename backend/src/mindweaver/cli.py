@@ -304,7 +304,8 @@ def handle_scheduler(args: argparse.Namespace):
             "mindweaver.celery_app",
             "worker",
             "--loglevel=info",
-            "--pool=solo",
+            "--pool=threads",
+            f"--concurrency={settings.worker_concurrency}",
         ]
         if args.reload:
             # If reloading, we might want to start the worker with its own reloader too?
@@ -336,7 +337,8 @@ def handle_worker(args: argparse.Namespace):
         "mindweaver.celery_app",
         "worker",
         "--loglevel=info",
-        "--pool=solo",
+        "--pool=threads",
+        f"--concurrency={settings.worker_concurrency}",
     ]
     if args.reload:
         run_with_reloader(cmd)
@@ -30,6 +30,25 @@ class Settings(BaseSettings):
     celery_broker_url: str = "redis://localhost:6379/0"
     celery_result_backend: str = "redis://localhost:6379/0"
     embedded_worker: bool = True
+    # Number of tasks a worker process runs concurrently on its event loop
+    worker_concurrency: int = 8
+    # Content-addressed store of pulled Helm chart archives
+    helm_chart_cache_dir: str = "~/.cache/mindweaver/helm"
+    # Chart versions of the cluster add-ons
+    argocd_chart_version: str = "7.7.11"
+    cert_manager_chart_version: str = "v1.16.2"
+    cnpg_chart_version: str = "0.22.1"
+    # Connection pool size of the cached S3 client of each storage
+    s3_max_pool_connections: int = 32
+    # Default part size and parallel parts of multipart uploads to S3
+    s3_upload_part_size: int = 16 * 1024 * 1024
+    s3_upload_concurrency: int = 4
+    # Largest part size of uploads and copies that hold parts in memory
+    s3_stream_max_part_size: int = 64 * 1024 * 1024
+    # Bytes the parts of the objects of one copy job may hold in memory
+    s3_copy_max_buffer_size: int = 256 * 1024 * 1024
+    # Bytes read from S3 per chunk of a proxied download
+    s3_proxy_chunk_size: int = 1024 * 1024
 
     oidc_issuer: str | None = None
     oidc_client_id: str | None = None
@@ -5,6 +5,7 @@ from .database_source import DatabaseSource, DatabaseSourceService
 from .web_source import WebSource, WebSourceService
 from .api_source import APISource, APISourceService
 from .streaming_source import StreamingSource, StreamingSourceService
+from .health import DataSourceHealth, router as health_router
 
 db_router = DatabaseSourceService.router()
 web_router = WebSourceService.router()
@@ -20,8 +21,10 @@ __all__ = [
     "WebSourceService",
     "APISourceService",
     "StreamingSourceService",
+    "DataSourceHealth",
     "db_router",
     "web_router",
     "api_router",
     "streaming_router",
+    "health_router",
 ]
@@ -4,5 +4,6 @@
 from .model import APISource
 from .service import APISourceService
 import mindweaver.datasource_service.api_source.views  # noqa: F401
+import mindweaver.datasource_service.api_source.actions  # noqa: F401
 
 __all__ = ["APISource", "APISourceService"]
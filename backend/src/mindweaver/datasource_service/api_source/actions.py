@@ -0,0 +1,22 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+from ..base import S3IngestionAction
+from .service import APISourceService
+
+
+@APISourceService.register_action("extract_to_s3")
+class ExtractToS3Action(S3IngestionAction):
+
+    async def __call__(self, **kwargs):
+        # Imported here, the ingestion package depends on this module's package
+        from mindweaver.ingestion import ApiExtractionSpec
+        from mindweaver.tasks.ingestion import extract_api_source_task
+
+        spec = await self.parse_spec(ApiExtractionSpec, kwargs)
+        return await self.trigger(
+            extract_api_source_task,
+            f"Extraction of {spec.name} triggered.",
+            spec.model_dump(),
+            pass_parameters=True,
+        )
@@ -1,14 +1,30 @@
 # SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
-from typing import Any
+from typing import Any, Optional
 import httpx
 from fastapi import HTTPException
 from mindweaver.service.base import ProjectScopedService
-from ..base import DataSourceServiceBase
+from ..base import DataSourceServiceBase, url_target
 from .model import APISource
 
 
+def request_auth(config: dict[str, Any]) -> tuple[dict[str, str], Optional[tuple[str, str]]]:
+    """Returns the headers and basic auth credentials for the `auth_type` of a source."""
+    headers = {}
+    auth = None
+    auth_type = config.get("auth_type", "none")
+
+    if auth_type == "basic" and config.get("login") and config.get("password"):
+        auth = (config["login"], config["password"])
+    elif auth_type == "bearer" and config.get("password"):
+        headers["Authorization"] = f"Bearer {config['password']}"
+    elif auth_type == "api_key" and config.get("password"):
+        header_name = config.get("parameters", {}).get("api_key_header", "X-API-Key")
+        headers[header_name] = config["password"]
+    return headers, auth
+
+
 class APISourceService(DataSourceServiceBase, ProjectScopedService[APISource]):
     @classmethod
     def model_class(cls) -> type[APISource]:
@@ -22,6 +38,10 @@ class APISourceService(DataSourceServiceBase, ProjectScopedService[APISource]):
     def model_path(cls) -> str:
         return "/{id}"
 
+    @classmethod
+    def probe_targets(cls, model: APISource) -> list[tuple[str, int]]:
+        return url_target(model.base_url)
+
     @classmethod
     def widgets(cls) -> dict[str, Any]:
         widgets = super().widgets()
@@ -62,18 +82,7 @@ class APISourceService(DataSourceServiceBase, ProjectScopedService[APISource]):
                 verify=config.get("verify_ssl", False),
                 timeout=10.0,
             ) as client:
-                headers = {}
-                auth = None
-                auth_type = config.get("auth_type", "none")
-                
-                if auth_type == "basic" and config.get("login") and config.get("password"):
-                    auth = (config["login"], config["password"])
-                elif auth_type == "bearer" and config.get("password"):
-                    headers["Authorization"] = f"Bearer {config['password']}"
-                elif auth_type == "api_key" and config.get("password"):
-                    header_name = config.get("parameters", {}).get("api_key_header", "X-API-Key")
-                    headers[header_name] = config["password"]
-
+                headers, auth = request_auth(config)
                 resp = await client.get(url, auth=auth, headers=headers, follow_redirects=True)
                 return {
                     "status": "success",
@@ -2,13 +2,17 @@
 # SPDX-License-Identifier: AGPLv3+
 
 from typing import Any, Optional, Annotated, Union
+from urllib.parse import urlsplit
 from pydantic import BaseModel
-from sqlalchemy import String, Text, Boolean
+from sqlalchemy import String, Text, Boolean, delete
 from sqlalchemy_utils import JSONType
 from sqlmodel import Field
 from fastapi import Depends
 from mindweaver.service.base import ProjectScopedNamedBase, ProjectScopedService
 from mindweaver.crypto import decrypt_password, EncryptionError
+from mindweaver.fw.action import BaseAction, parse_parameters
+from mindweaver.fw.exc import FieldValidationError
+from mindweaver.fw.service import before_delete
 
 
 class DataSourceBase(ProjectScopedNamedBase):
@@ -49,6 +53,42 @@ class DataSourceServiceBase:
             "parameters": {"order": 100, "type": "key-value"},
         }
 
+    @classmethod
+    def probe_targets(cls, model: DataSourceBase) -> list[tuple[str, int]]:
+        """
+        Returns the (host, port) endpoints the health sweep probes for a
+        source. The source is reachable when any of them accepts a TCP
+        connection.
+        """
+        return []
+
+    @before_delete()
+    async def _delete_health_history(self, model: DataSourceBase):
+        """Drops the health history of the source being deleted"""
+        # Imported here, the health sweep imports this module
+        from .health import DataSourceHealth
+
+        await self.session.exec(
+            delete(DataSourceHealth).where(
+                DataSourceHealth.source_type == self.entity_type(),
+                DataSourceHealth.source_id == model.id,
+            )
+        )
+
+
+def url_target(url: Optional[str]) -> list[tuple[str, int]]:
+    """Returns the endpoint of an http(s) URL as a probe target."""
+    if not url:
+        return []
+    parts = urlsplit(url if "://" in url else f"http://{url}")
+    if not parts.hostname:
+        return []
+    try:
+        port = parts.port
+    except ValueError:
+        return []
+    return [(parts.hostname, port or (443 if parts.scheme == "https" else 80))]
+
 
 class TestConnectionRequest(BaseModel):
     """Generic request for connection testing with optional overrides."""
@@ -72,10 +112,15 @@ class TestConnectionRequest(BaseModel):
     bootstrap_servers: Optional[str] = None
 
 
-async def handle_test_connection(svc, model, data: Optional[TestConnectionRequest]):
-    """Helper to merge model with overrides and test connection."""
+def connection_config(
+    model: DataSourceBase, data: Optional[TestConnectionRequest] = None
+) -> dict[str, Any]:
+    """
+    Returns the connection settings of a stored source with the request
+    overrides applied and the stored password decrypted.
+    """
     config = model.model_dump(exclude={"id", "uuid", "created", "modified", "project_id"})
-    
+
     if data:
         overrides = data.model_dump(exclude_unset=True)
         for k, v in overrides.items():
@@ -90,9 +135,31 @@ async def handle_test_connection(svc, model, data: Optional[TestConnectionReques
         except EncryptionError:
             pass
 
-    return await svc.perform_test_connection(config)
+    return config
+
+
+async def handle_test_connection(svc, model, data: Optional[TestConnectionRequest]):
+    """Helper to merge model with overrides and test connection."""
+    return await svc.perform_test_connection(connection_config(model, data))
 
 
 async def handle_test_connection_no_id(svc, data: TestConnectionRequest):
     """Helper for connection test without a saved record."""
     return await svc.perform_test_connection(data.model_dump(exclude_unset=True))
+
+
+class S3IngestionAction(BaseAction):
+    """Base of actions ingesting a source into an S3 storage of its project."""
+
+    async def parse_spec(self, spec_class: type[BaseModel], parameters: dict[str, Any]):
+        """Validates the action parameters, reporting errors per parameter."""
+        spec = parse_parameters(spec_class, parameters)
+        from mindweaver.service.s3_storage.model import S3Storage
+
+        storage = await self.session.get(S3Storage, spec.storage_id)
+        if storage is None or storage.project_id != self.model.project_id:
+            raise FieldValidationError(
+                field_location=["parameters", "storage_id"],
+                message="S3 storage not found in the project of this source",
+            )
+        return spec
@@ -1,8 +1,9 @@
 # SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
-from .model import DatabaseSource
+from .model import DatabaseCatalogTable, DatabaseSource
 from .service import DatabaseSourceService
 import mindweaver.datasource_service.database_source.views  # noqa: F401
+import mindweaver.datasource_service.database_source.actions  # noqa: F401
 
-__all__ = ["DatabaseSource", "DatabaseSourceService"]
+__all__ = ["DatabaseCatalogTable", "DatabaseSource", "DatabaseSourceService"]
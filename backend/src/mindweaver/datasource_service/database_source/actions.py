@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+from mindweaver.fw.action import BaseAction
+from ..base import S3IngestionAction
+from .service import DatabaseSourceService
+
+
+@DatabaseSourceService.register_action("refresh_catalog")
+class RefreshCatalogAction(BaseAction):
+
+    async def __call__(self, **kwargs):
+        from mindweaver.tasks.database_catalog import refresh_database_catalog_task
+
+        return await self.trigger(
+            refresh_database_catalog_task,
+            "Catalog refresh triggered.",
+            kwargs,
+        )
+
+
+@DatabaseSourceService.register_action("extract_to_s3")
+class ExtractToS3Action(S3IngestionAction):
+
+    async def __call__(self, **kwargs):
+        # Imported here, the ingestion package depends on this module's package
+        from mindweaver.ingestion import ExtractionSpec
+        from mindweaver.tasks.ingestion import extract_database_table_task
+
+        spec = await self.parse_spec(ExtractionSpec, kwargs)
+        return await self.trigger(
+            extract_database_table_task,
+            f"Extraction of {spec.table} triggered.",
+            spec.model_dump(),
+            pass_parameters=True,
+        )
+
+
+@DatabaseSourceService.register_action("ingest_incremental")
+class IngestIncrementalAction(S3IngestionAction):
+
+    async def __call__(self, **kwargs):
+        from mindweaver.ingestion import IncrementalSpec
+        from mindweaver.tasks.ingestion import ingest_database_table_task
+
+        spec = await self.parse_spec(IncrementalSpec, kwargs)
+        return await self.trigger(
+            ingest_database_table_task,
+            f"Incremental ingestion of {spec.table} triggered.",
+            spec.model_dump(),
+            pass_parameters=True,
+        )
@@ -0,0 +1,253 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Local catalog of the schemas, tables and columns of database sources.
+
+A refresh reflects the source with SQLAlchemy's batched inspection (one
+query per schema and object kind rather than per table), fingerprints each
+table definition and only writes tables that were added, changed or
+dropped since the last refresh. Browsing is served from the catalog
+without touching the source database.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Optional
+
+from sqlalchemy import create_engine, delete, func, inspect, or_, update
+from sqlalchemy.engine import URL
+from sqlalchemy.engine.reflection import ObjectKind
+from sqlalchemy.pool import NullPool
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.fw.model import ts_now
+from ..base import connection_config
+from .model import DatabaseCatalogTable, DatabaseSource
+from .service import connection_url, timeout_connect_args
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_SCHEMAS = {
+    "information_schema",
+    "pg_catalog",
+    "pg_toast",
+    "mysql",
+    "performance_schema",
+    "sys",
+}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _type_name(column_type: Any) -> str:
+    try:
+        return str(column_type)
+    except Exception:
+        # Types that cannot compile without a dialect, e.g. NullType
+        return type(column_type).__name__
+
+
+def _optional(inspector_fn, **kwargs) -> dict:
+    try:
+        return inspector_fn(**kwargs)
+    except NotImplementedError:
+        return {}
+
+
+def table_fingerprint(entry: dict[str, Any]) -> str:
+    """Hashes the parts of a table definition kept in the catalog."""
+    definition = {
+        "table_type": entry["table_type"],
+        "comment": entry["comment"],
+        "columns": entry["columns"],
+    }
+    encoded = json.dumps(definition, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def introspect(
+    url: URL, connect_args: dict[str, Any], schemas: Optional[list[str]] = None
+) -> dict[tuple[str, str], dict[str, Any]]:
+    """
+    Reflects the tables and views of a database, keyed by (schema, table).
+    Blocking, meant to run in a worker thread.
+    """
+    engine = create_engine(url, poolclass=NullPool, connect_args=connect_args)
+    try:
+        with engine.connect() as conn:
+            inspector = inspect(conn)
+            if not schemas:
+                schemas = [
+                    s
+                    for s in inspector.get_schema_names()
+                    if s not in SYSTEM_SCHEMAS and not s.startswith("pg_temp")
+                ]
+            tables = {}
+            for schema in schemas:
+                columns = inspector.get_multi_columns(schema=schema, kind=ObjectKind.ANY)
+                primary_keys = _optional(
+                    inspector.get_multi_pk_constraint, schema=schema, kind=ObjectKind.ANY
+                )
+                comments = _optional(
+                    inspector.get_multi_table_comment, schema=schema, kind=ObjectKind.ANY
+                )
+                views = set(
+                    _optional(
+                        inspector.get_multi_columns,
+                        schema=schema,
+                        kind=ObjectKind.VIEW | ObjectKind.MATERIALIZED_VIEW,
+                    )
+                )
+                for key, reflected in columns.items():
+                    pk_columns = set(
+                        (primary_keys.get(key) or {}).get("constrained_columns") or []
+                    )
+                    entry_columns = []
+                    for col in reflected:
+                        column = {
+                            "name": col["name"],
+                            "type": _type_name(col["type"]),
+                            "nullable": bool(col.get("nullable", True)),
+                            "primary_key": col["name"] in pk_columns,
+                        }
+                        if col.get("comment"):
+                            column["comment"] = col["comment"]
+                        entry_columns.append(column)
+                    entry = {
+                        "schema_name": schema,
+                        "table_name": key[1],
+                        "table_type": "view" if key in views else "table",
+                        "comment": (comments.get(key) or {}).get("text"),
+                        "columns": entry_columns,
+                    }
+                    entry["fingerprint"] = table_fingerprint(entry)
+                    tables[(schema, key[1])] = entry
+            return tables
+    finally:
+        engine.dispose()
+
+
+async def refresh_catalog(
+    session: AsyncSession, source: DatabaseSource
+) -> dict[str, int]:
+    """
+    Reflects a database source and applies the differences to its catalog.
+    Returns counts of added, updated, removed and unchanged tables. The
+    caller commits.
+    """
+    config = connection_config(source)
+    schemas = [source.schema_name] if source.schema_name else None
+    tables = await asyncio.to_thread(
+        introspect,
+        connection_url(config),
+        timeout_connect_args(config.get("engine", "")),
+        schemas,
+    )
+
+    result = await session.exec(
+        select(
+            DatabaseCatalogTable.id,
+            DatabaseCatalogTable.schema_name,
+            DatabaseCatalogTable.table_name,
+            DatabaseCatalogTable.fingerprint,
+        ).where(DatabaseCatalogTable.source_id == source.id)
+    )
+    existing = {(schema, table): (id_, fp) for id_, schema, table, fp in result.all()}
+
+    now = ts_now()
+    stats = {"tables": len(tables), "added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+    unchanged: list[int] = []
+    for key, entry in tables.items():
+        values = {
+            **entry,
+            "column_names": " ".join(c["name"].lower() for c in entry["columns"]),
+            "refreshed": now,
+        }
+        if key not in existing:
+            session.add(DatabaseCatalogTable(source_id=source.id, **values))
+            stats["added"] += 1
+        elif existing[key][1] != entry["fingerprint"]:
+            await session.exec(
+                update(DatabaseCatalogTable)
+                .where(DatabaseCatalogTable.id == existing[key][0])
+                .values(modified=now, **values)
+            )
+            stats["updated"] += 1
+        else:
+            unchanged.append(existing[key][0])
+    stats["unchanged"] = len(unchanged)
+    if unchanged:
+        # Unchanged tables were still seen, so the catalog reads as fresh
+        await session.exec(
+            update(DatabaseCatalogTable)
+            .where(DatabaseCatalogTable.id.in_(unchanged))
+            .values(refreshed=now)
+        )
+
+    removed = [id_ for key, (id_, _) in existing.items() if key not in tables]
+    if removed:
+        await session.exec(
+            delete(DatabaseCatalogTable).where(DatabaseCatalogTable.id.in_(removed))
+        )
+        stats["removed"] = len(removed)
+    await session.flush()
+    logger.info(f"Refreshed catalog of database source {source.id}: {stats}")
+    return stats
+
+
+async def search_catalog(
+    session: AsyncSession,
+    source_id: int,
+    q: Optional[str] = None,
+    schema_name: Optional[str] = None,
+    page_num: int = 1,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> tuple[list[DatabaseCatalogTable], int]:
+    """
+    Returns a page of catalog tables matching `q` against schema, table
+    and column names, ordered by schema and table, with the total count.
+    """
+    filters = [DatabaseCatalogTable.source_id == source_id]
+    if schema_name:
+        filters.append(DatabaseCatalogTable.schema_name == schema_name)
+    if q:
+        # `q` is matched literally, `_` is common in table names
+        escaped = (
+            q.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        )
+        pattern = f"%{escaped}%"
+        filters.append(
+            or_(
+                func.lower(DatabaseCatalogTable.table_name).like(pattern, escape="\\"),
+                func.lower(DatabaseCatalogTable.schema_name).like(pattern, escape="\\"),
+                DatabaseCatalogTable.column_names.like(pattern, escape="\\"),
+            )
+        )
+
+    total = (
+        await session.exec(select(func.count(DatabaseCatalogTable.id)).where(*filters))
+    ).one()
+    result = await session.exec(
+        select(DatabaseCatalogTable)
+        .where(*filters)
+        .order_by(DatabaseCatalogTable.schema_name, DatabaseCatalogTable.table_name)
+        .offset((page_num - 1) * page_size)
+        .limit(page_size)
+    )
+    return list(result.all()), total
+
+
+def serialize_table(table: DatabaseCatalogTable) -> dict[str, Any]:
+    return {
+        "schema_name": table.schema_name,
+        "table_name": table.table_name,
+        "table_type": table.table_type,
+        "comment": table.comment,
+        "columns": table.columns,
+        "fingerprint": table.fingerprint,
+        "refreshed": table.refreshed,
+    }
@@ -1,9 +1,12 @@
 # SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
-from typing import Optional
-from sqlalchemy import String
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import DateTime, String, Text, UniqueConstraint
+from sqlalchemy_utils import JSONType
 from sqlmodel import Field
+from mindweaver.fw.model import Base, ts_now
 from ..base import DataSourceBase
 
 
@@ -26,3 +29,25 @@ class DatabaseSource(DataSourceBase, table=True):
         sa_type=String(length=255),
         description="Default schema"
     )
+
+
+class DatabaseCatalogTable(Base, table=True):
+    """Cached metadata of a table or view of a database source."""
+
+    __tablename__ = "mw_database_catalog_table"
+    __table_args__ = (UniqueConstraint("source_id", "schema_name", "table_name"),)
+
+    source_id: int = Field(index=True)
+    schema_name: str = Field(sa_type=String(length=255))
+    table_name: str = Field(sa_type=String(length=255))
+    table_type: str = Field(default="table", sa_type=String(length=20))
+    comment: Optional[str] = Field(default=None, sa_type=Text)
+    # [{"name", "type", "nullable", "primary_key"[, "comment"]}, ...]
+    columns: list[dict[str, Any]] = Field(default_factory=list, sa_type=JSONType())
+    # Lowercased column names, space separated, for search
+    column_names: str = Field(default="", sa_type=Text)
+    # Hash of the table definition, unchanged tables are not rewritten
+    fingerprint: str = Field(sa_type=String(length=64))
+    refreshed: datetime = Field(
+        default_factory=ts_now, sa_type=DateTime(timezone=True)
+    )
@@ -0,0 +1,334 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Streaming previews of the rows of a database source table.
+
+Rows are read through a server-side cursor in batches of
+`PREVIEW_BATCH_ROWS` and written out as they arrive, so a preview never
+holds more than one batch in memory. Every preview is bounded by a row
+limit, a byte budget and a statement timeout. Async engines are pooled per
+source and disposed once idle for `PREVIEW_ENGINE_IDLE` seconds.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, AsyncIterator, Optional
+
+from sqlalchemy import event, literal_column, select, table
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from mindweaver.config import logger
+from mindweaver.fw.exc import FieldValidationError
+from .service import CONNECT_TIMEOUT, connection_url
+
+# Engines with an installed async driver, others are rejected as unsupported
+ASYNC_DRIVER_MAP = {
+    "postgresql": "postgresql+asyncpg",
+}
+
+PREVIEW_DEFAULT_ROWS = 100
+PREVIEW_MAX_ROWS = 10_000
+PREVIEW_MAX_BYTES = 8 * 1024 * 1024
+PREVIEW_BATCH_ROWS = 500
+# Seconds a single statement or fetch may run on the source
+PREVIEW_STATEMENT_TIMEOUT = 30
+PREVIEW_ENGINE_IDLE = 300
+PREVIEW_POOL_SIZE = 2
+PREVIEW_MAX_OVERFLOW = 3
+
+PREVIEW_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def preview_connect_args(engine_name: str) -> dict[str, Any]:
+    """Driver specific connect arguments bounding preview statements."""
+    if engine_name == "postgresql":
+        return {
+            "timeout": CONNECT_TIMEOUT,
+            "server_settings": {
+                "statement_timeout": str(int(PREVIEW_STATEMENT_TIMEOUT * 1000)),
+                "default_transaction_read_only": "on",
+            },
+        }
+    return {}
+
+
+class PreviewEnginePool:
+    """
+    Async engines keyed by source id. An engine is replaced when the source
+    configuration changes or when used from another event loop than the one
+    its connections belong to, and disposed when it was not used for
+    `idle_timeout` seconds.
+    """
+
+    def __init__(self, idle_timeout: float = PREVIEW_ENGINE_IDLE):
+        self.idle_timeout = idle_timeout
+        self._engines: dict[int, tuple[str, AsyncEngine, float, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+    async def acquire(self, source_id: int, config: dict[str, Any]) -> AsyncEngine:
+        await self.evict_idle()
+        engine_name = config.get("engine", "").lower()
+        if engine_name not in ASYNC_DRIVER_MAP:
+            raise FieldValidationError(
+                field_location=["engine"],
+                message=f"Preview is not supported for {engine_name or 'this engine'}",
+            )
+        url = connection_url(config).set(drivername=ASYNC_DRIVER_MAP[engine_name])
+        digest = hashlib.sha256(
+            url.render_as_string(hide_password=False).encode()
+        ).hexdigest()
+
+        loop = asyncio.get_running_loop()
+        entry = self._engines.get(source_id)
+        if entry is not None and entry[0] == digest and entry[3] is loop:
+            engine = entry[1]
+        else:
+            if entry is not None:
+                await self._dispose(entry)
+            engine = create_async_engine(
+                url,
+                pool_size=PREVIEW_POOL_SIZE,
+                max_overflow=PREVIEW_MAX_OVERFLOW,
+                pool_pre_ping=True,
+                pool_recycle=PREVIEW_ENGINE_IDLE,
+                connect_args=preview_connect_args(engine_name),
+            )
+        self._engines[source_id] = (digest, engine, time.monotonic(), loop)
+        return engine
+
+    @staticmethod
+    async def _dispose(entry: tuple):
+        _, engine, _, loop = entry
+        # Connections of another loop cannot be closed from this one, they
+        # are only dereferenced
+        await engine.dispose(close=loop is asyncio.get_running_loop())
+
+    async def discard(self, source_id: int):
+        entry = self._engines.pop(source_id, None)
+        if entry is not None:
+            await self._dispose(entry)
+
+    async def evict_idle(self):
+        deadline = time.monotonic() - self.idle_timeout
+        for source_id, (_, _, last_used, _) in list(self._engines.items()):
+            if last_used < deadline:
+                logger.info(f"Disposing idle preview engine of source {source_id}")
+                await self.discard(source_id)
+
+    async def dispose_all(self):
+        for source_id in list(self._engines):
+            await self.discard(source_id)
+
+
+preview_engines = PreviewEnginePool()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    return str(value)
+
+
+class NdjsonEncoder:
+    """Encodes rows as newline delimited JSON, one line per row."""
+
+    def start(self, description: list[tuple]) -> bytes:
+        return b""
+
+    def encode(self, rows: list[dict[str, Any]], budget: int) -> tuple[bytes, bool]:
+        """
+        Returns the lines of the rows fitting in `budget` bytes and whether
+        the budget was exhausted.
+        """
+        lines = []
+        size = 0
+        for row in rows:
+            line = (json.dumps(row, default=_json_default) + "\n").encode()
+            if size + len(line) > budget:
+                return b"".join(lines), True
+            lines.append(line)
+            size += len(line)
+        return b"".join(lines), False
+
+    def close(self) -> bytes:
+        return b""
+
+
+class _ChunkSink:
+    """Write-only file object collecting what was written since the last drain."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_types(pa) -> dict[int, Any]:
+    """Arrow types of Postgres type OIDs, other types are sent as text."""
+    return {
+        16: pa.bool_(),
+        17: pa.binary(),
+        20: pa.int64(),
+        21: pa.int16(),
+        23: pa.int32(),
+        26: pa.int64(),
+        700: pa.float32(),
+        701: pa.float64(),
+        1082: pa.date32(),
+        1083: pa.time64("us"),
+        1114: pa.timestamp("us"),
+        1184: pa.timestamp("us", tz="UTC"),
+    }
+
+
+def _text(value: Any) -> Any:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=_json_default)
+    return _json_default(value)
+
+
+class ArrowEncoder:
+    """
+    Encodes rows as an Arrow IPC stream, one record batch per fetched batch.
+    The schema is built from the cursor description, so it is sent before
+    the first row and holds for every batch.
+    """
+
+    def __init__(self):
+        try:
+            import pyarrow
+        except ImportError:
+            raise FieldValidationError(
+                field_location=["query", "format"],
+                message="Arrow previews require pyarrow to be installed",
+            )
+        self._pa = pyarrow
+        self._sink = _ChunkSink()
+        self._schema = None
+        self._writer = None
+        self._text_columns: list[str] = []
+
+    def start(self, description: list[tuple]) -> bytes:
+        """Returns the schema message of the columns in `description`."""
+        pa = self._pa
+        types = _arrow_types(pa)
+        fields = []
+        for column in description:
+            name, type_code = column[0], column[1]
+            arrow_type = types.get(type_code)
+            if arrow_type is None:
+                arrow_type = pa.string()
+                self._text_columns.append(name)
+            fields.append(pa.field(name, arrow_type))
+        self._schema = pa.schema(fields)
+        self._writer = pa.ipc.new_stream(self._sink, self._schema)
+        return self._sink.drain()
+
+    def encode(self, rows: list[dict[str, Any]], budget: int) -> tuple[bytes, bool]:
+        """
+        Returns the record batch of the rows and whether it used up `budget`
+        bytes; batches are not split, so the last one may overshoot.
+        """
+        for row in rows:
+            for name in self._text_columns:
+                row[name] = _text(row[name])
+        batch = self._pa.RecordBatch.from_pylist(rows, schema=self._schema)
+        self._writer.write_batch(batch)
+        data = self._sink.drain()
+        return data, len(data) >= budget
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+def preview_encoder(format: str):
+    if format == "arrow":
+        return ArrowEncoder()
+    return NdjsonEncoder()
+
+
+def preview_statement(table_name: str, schema_name: Optional[str], limit: int):
+    """`SELECT * FROM schema.table LIMIT n` with the identifiers quoted."""
+    return (
+        select(literal_column("*"))
+        .select_from(table(table_name, schema=schema_name))
+        .limit(limit)
+    )
+
+
+# Key of the connection info holding the description of the last cursor
+_DESCRIPTION = "mw_preview_description"
+
+
+def _record_description(conn, cursor, statement, parameters, context, executemany):
+    # The DBAPI cursor describes the columns, with their type codes, before
+    # any row is read
+    conn.info[_DESCRIPTION] = cursor.description
+
+
+async def stream_preview(
+    engine: AsyncEngine,
+    statement,
+    encoder,
+    max_bytes: Optional[int] = None,
+    batch_rows: Optional[int] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Runs `statement` on a server-side cursor and yields the encoded rows
+    batch by batch, stopping early once `max_bytes` (by default
+    `PREVIEW_MAX_BYTES`) were written.
+
+    The first item is yielded once the query is running, so that callers
+    can await it to surface connection and query errors before responding.
+    """
+    max_bytes = max_bytes or PREVIEW_MAX_BYTES
+    batch_rows = batch_rows or PREVIEW_BATCH_ROWS
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "after_cursor_execute", _record_description):
+        event.listen(sync_engine, "after_cursor_execute", _record_description)
+    async with engine.connect() as conn:
+        result = await conn.stream(statement.execution_options(yield_per=batch_rows))
+        yield b""
+        try:
+            head = encoder.start(conn.info.pop(_DESCRIPTION))
+            remaining = max_bytes - len(head)
+            if head:
+                yield head
+            async for partition in result.mappings().partitions():
+                chunk, exhausted = encoder.encode(
+                    [dict(row) for row in partition], remaining
+                )
+                remaining -= len(chunk)
+                if chunk:
+                    yield chunk
+                if exhausted:
+                    logger.info(f"Preview stopped at byte budget of {max_bytes}")
+                    break
+        finally:
+            await result.close()
+    tail = encoder.close()
+    if tail:
+        yield tail
@@ -1,13 +1,166 @@
 # SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
-from typing import Any
+import asyncio
+import concurrent.futures
+import time
+import weakref
+from typing import Any, Optional
 from fastapi import HTTPException
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, delete, text
 from sqlalchemy.engine import URL
+from sqlalchemy.pool import NullPool
+from sqlmodel import select
+from mindweaver.fw.service import after_delete, before_delete
 from mindweaver.service.base import ProjectScopedService
-from ..base import DataSourceServiceBase
-from .model import DatabaseSource
+from ..base import DataSourceServiceBase, connection_config
+from .model import DatabaseCatalogTable, DatabaseSource
+
+# Seconds allowed for the connect handshake and for the test query
+CONNECT_TIMEOUT = 10
+STATEMENT_TIMEOUT = 10
+# Connection tests run on their own bounded pool so that slow or unreachable
+# databases can neither block the event loop nor starve the default executor
+MAX_CONCURRENT_TESTS = 8
+
+DB_DRIVER_MAP = {
+    "postgresql": "postgresql+psycopg",
+    "mysql": "mysql+pymysql",
+    "mariadb": "mysql+pymysql",
+    "mssql": "mssql+pyodbc",
+    "oracle": "oracle+cx_oracle",
+    "trino": "trino",
+    "mongodb": "mongodb",
+}
+
+DEFAULT_PORTS = {
+    "postgresql": 5432,
+    "mysql": 3306,
+    "mariadb": 3306,
+    "mssql": 1433,
+    "oracle": 1521,
+    "trino": 8080,
+    "mongodb": 27017,
+}
+
+# Executor of each event loop with a semaphore of its free threads, so
+# tests only start their timeout once they run instead of while queued
+# behind other tests. Threads left running by timed out tests of another
+# loop then never count as free here.
+_TestPool = tuple[concurrent.futures.ThreadPoolExecutor, asyncio.Semaphore]
+_test_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _TestPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_test_pool() -> _TestPool:
+    loop = asyncio.get_running_loop()
+    pool = _test_pools.get(loop)
+    if pool is None:
+        pool = _test_pools[loop] = (
+            concurrent.futures.ThreadPoolExecutor(
+                max_workers=MAX_CONCURRENT_TESTS, thread_name_prefix="mw-db-test"
+            ),
+            asyncio.Semaphore(MAX_CONCURRENT_TESTS),
+        )
+    return pool
+
+
+def connection_url(config: dict[str, Any]) -> URL:
+    """Builds the SQLAlchemy URL of a database source configuration."""
+    engine_name = config.get("engine", "").lower()
+    url_kwargs = {
+        "username": config.get("login"),
+        "password": config.get("password"),
+        "host": config.get("host"),
+        "port": config.get("port"),
+        "database": config.get("database"),
+    }
+    url_kwargs = {k: v for k, v in url_kwargs.items() if v is not None}
+    url = URL.create(
+        drivername=DB_DRIVER_MAP.get(engine_name, engine_name), **url_kwargs
+    )
+    if config.get("parameters"):
+        url = url.update_query_dict(config["parameters"])
+    return url
+
+
+def timeout_connect_args(engine_name: str) -> dict[str, Any]:
+    """Driver specific connect arguments bounding the connection test."""
+    engine_name = engine_name.lower()
+    if engine_name == "postgresql":
+        return {
+            "connect_timeout": CONNECT_TIMEOUT,
+            "options": f"-c statement_timeout={STATEMENT_TIMEOUT * 1000}",
+        }
+    if engine_name in ("mysql", "mariadb"):
+        return {
+            "connect_timeout": CONNECT_TIMEOUT,
+            "read_timeout": STATEMENT_TIMEOUT,
+            "write_timeout": STATEMENT_TIMEOUT,
+        }
+    if engine_name == "mssql":
+        return {"timeout": CONNECT_TIMEOUT}
+    if engine_name == "trino":
+        return {"request_timeout": CONNECT_TIMEOUT + STATEMENT_TIMEOUT}
+    return {}
+
+
+def _run_test_query(url: URL, connect_args: dict[str, Any]):
+    # NullPool and dispose() close the connection instead of keeping a pool
+    # around for an engine that is never used again
+    engine = create_engine(url, poolclass=NullPool, connect_args=connect_args)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    finally:
+        engine.dispose()
+
+
+async def check_connection(config: dict[str, Any]) -> dict[str, Any]:
+    """
+    Connects to a database source and runs `SELECT 1` on the bounded test
+    executor, waiting for a free thread before the timeout starts. Returns
+    the status, a message and the latency in milliseconds; errors and
+    timeouts are reported rather than raised.
+    """
+    engine_name = config.get("engine", "").lower()
+    try:
+        url = connection_url(config)
+    except Exception as e:
+        return {"status": "error", "message": str(e), "latency_ms": None}
+
+    executor, slots = _get_test_pool()
+    await slots.acquire()
+    started = time.perf_counter()
+    try:
+        future = asyncio.get_running_loop().run_in_executor(
+            executor, _run_test_query, url, timeout_connect_args(engine_name)
+        )
+    except BaseException:
+        slots.release()
+        raise
+    # The slot is held until the thread is free again, also after a timeout
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        # Drivers without timeout support are cut off here, their thread
+        # is released once the driver gives up
+        await asyncio.wait_for(
+            asyncio.shield(future), timeout=CONNECT_TIMEOUT + STATEMENT_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        return {
+            "status": "error",
+            "message": f"Timed out connecting to {engine_name}",
+            "latency_ms": None,
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e), "latency_ms": None}
+    return {
+        "status": "success",
+        "message": f"Successfully connected to {engine_name}",
+        "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
 
 
 class DatabaseSourceService(DataSourceServiceBase, ProjectScopedService[DatabaseSource]):
@@ -23,6 +176,13 @@ class DatabaseSourceService(DataSourceServiceBase, ProjectScopedService[Database
     def model_path(cls) -> str:
         return "/{id}"
 
+    @classmethod
+    def probe_targets(cls, model: DatabaseSource) -> list[tuple[str, int]]:
+        port = model.port or DEFAULT_PORTS.get(model.engine.lower())
+        if not model.host or not port:
+            return []
+        return [(model.host, port)]
+
     @classmethod
     def widgets(cls) -> dict[str, Any]:
         widgets = super().widgets()
@@ -53,40 +213,48 @@ class DatabaseSourceService(DataSourceServiceBase, ProjectScopedService[Database
         if not engine_name:
             raise HTTPException(status_code=422, detail="Engine is required")
 
-        db_driver_map = {
-            "postgresql": "postgresql+psycopg",
-            "mysql": "mysql+pymysql",
-            "mariadb": "mysql+pymysql",
-            "mssql": "mssql+pyodbc",
-            "oracle": "oracle+cx_oracle",
-            "trino": "trino",
-            "mongodb": "mongodb",
-        }
-
-        sa_driver = db_driver_map.get(engine_name, engine_name)
-        url_kwargs = {
-            "username": config.get("login"),
-            "password": config.get("password"),
-            "host": config.get("host"),
-            "port": config.get("port"),
-            "database": config.get("database"),
-        }
-        url_kwargs = {k: v for k, v in url_kwargs.items() if v is not None}
-        
-        try:
-            url = URL.create(drivername=sa_driver, **url_kwargs)
-            if config.get("parameters"):
-                url = url.update_query_dict(config["parameters"])
-
-            engine = create_engine(url)
-            with engine.connect() as conn:
-                conn.execute(text("SELECT 1"))
-
-            return {
-                "status": "success",
-                "message": f"Successfully connected to {engine_name}",
-            }
-        except Exception as e:
+        result = await check_connection(config)
+        if result["status"] != "success":
             raise HTTPException(
-                status_code=422, detail=f"Connection failed: {str(e)}"
+                status_code=422, detail=f"Connection failed: {result['message']}"
             )
+        return result
+
+    async def test_connections(self, ids: Optional[list[int]] = None) -> dict[int, Any]:
+        """
+        Tests the connections of the given sources, or of every source in
+        the current project when `ids` is None, concurrently. Failures are
+        reported per source instead of raised.
+        """
+        stmt = select(DatabaseSource).order_by(DatabaseSource.id.asc())
+        if ids is not None:
+            stmt = stmt.where(DatabaseSource.id.in_(ids))
+        result = await self.session.exec(self.apply_project_scope(stmt))
+        configs = {model.id: connection_config(model) for model in result.all()}
+
+        results = await asyncio.gather(*(check_connection(c) for c in configs.values()))
+        return dict(zip(configs, results))
+
+    @before_delete()
+    async def _delete_catalog(self, model: DatabaseSource):
+        """Drops the cached catalog of the source being deleted"""
+        await self.session.exec(
+            delete(DatabaseCatalogTable).where(DatabaseCatalogTable.source_id == model.id)
+        )
+
+    @before_delete()
+    async def _delete_ingestion_state(self, model: DatabaseSource):
+        """Drops the extraction checkpoints and ingestion watermarks of the source"""
+        from mindweaver.ingestion.model import ExtractionCheckpoint, IngestionState
+
+        for state_model in (ExtractionCheckpoint, IngestionState):
+            await self.session.exec(
+                delete(state_model).where(state_model.source_id == model.id)
+            )
+
+    @after_delete()
+    async def _discard_preview_engine(self, model: DatabaseSource):
+        """Closes the pooled preview connections of the deleted source"""
+        from .preview import preview_engines
+
+        await preview_engines.discard(model.id)
@@ -1,18 +1,48 @@
 # SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
-from typing import Annotated, Optional
-from fastapi import Depends
-from ..base import TestConnectionRequest, handle_test_connection, handle_test_connection_no_id
+from typing import Annotated, Literal, Optional
+from fastapi import Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlmodel import func, select
+from mindweaver.fw.exc import FieldValidationError
+from mindweaver.fw.mixins.servicestate import parse_state_ids
+from ..base import (
+    TestConnectionRequest,
+    connection_config,
+    handle_test_connection,
+    handle_test_connection_no_id,
+)
+from .catalog import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, search_catalog, serialize_table
+from .preview import (
+    PREVIEW_DEFAULT_ROWS,
+    PREVIEW_FORMATS,
+    PREVIEW_MAX_ROWS,
+    preview_encoder,
+    preview_engines,
+    preview_statement,
+    stream_preview,
+)
 from .service import DatabaseSourceService
-from .model import DatabaseSource
+from .model import DatabaseCatalogTable, DatabaseSource
 
 
 @DatabaseSourceService.service_view(method="POST", path="/_test-connection")
 async def test_db_connection_no_id(
-    data: TestConnectionRequest,
+    data: Optional[TestConnectionRequest] = None,
+    ids: Optional[str] = None,
     svc: DatabaseSourceService = Depends(DatabaseSourceService.get_service),
 ):
+    """
+    Tests an unsaved configuration, or in bulk mode, when `ids` is given as
+    `all` or a comma separated list, the stored sources concurrently.
+    """
+    if ids is not None:
+        return {"data": await svc.test_connections(parse_state_ids(ids))}
+    if data is None:
+        raise FieldValidationError(
+            field_location=["body"], message="Connection settings are required"
+        )
     return await handle_test_connection_no_id(svc, data)
 
 
@@ -23,3 +53,91 @@ async def test_db_connection(
     data: TestConnectionRequest = None,
 ):
     return await handle_test_connection(svc, model, data)
+
+
+@DatabaseSourceService.model_view(method="GET", path="/_catalog")
+async def get_db_catalog(
+    svc: Annotated[DatabaseSourceService, Depends(DatabaseSourceService.get_service)],
+    model: Annotated[DatabaseSource, Depends(DatabaseSourceService.get_model)],
+    q: Optional[str] = None,
+    schema_name: Optional[str] = None,
+    page_num: int = Query(default=1, ge=1),
+    page_size: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """
+    Lists the cached tables of the source, optionally filtered by schema and
+    by `q` matched against schema, table and column names. The cache is
+    filled by the `refresh_catalog` action.
+    """
+    tables, total = await search_catalog(
+        svc.session, model.id, q, schema_name, page_num, page_size
+    )
+    refreshed = (
+        await svc.session.exec(
+            select(func.max(DatabaseCatalogTable.refreshed)).where(
+                DatabaseCatalogTable.source_id == model.id
+            )
+        )
+    ).one()
+    return {
+        "data": [serialize_table(t) for t in tables],
+        "meta": {
+            "page_num": page_num,
+            "page_size": page_size,
+            "total": total,
+            "refreshed": refreshed,
+        },
+    }
+
+
+@DatabaseSourceService.model_view(method="GET", path="/_ingestions")
+async def get_db_ingestions(
+    svc: Annotated[DatabaseSourceService, Depends(DatabaseSourceService.get_service)],
+    model: Annotated[DatabaseSource, Depends(DatabaseSourceService.get_model)],
+):
+    """
+    Lists the incremental ingestions of the source with their watermark and
+    the throughput of their last run.
+    """
+    from mindweaver.ingestion.model import IngestionState
+
+    result = await svc.session.exec(
+        select(IngestionState)
+        .where(IngestionState.source_id == model.id)
+        .order_by(IngestionState.table_name, IngestionState.id)
+    )
+    return {
+        "data": [
+            state.model_dump(exclude={"id", "uuid", "source_id", "key_digests"})
+            for state in result.all()
+        ]
+    }
+
+
+@DatabaseSourceService.model_view(method="GET", path="/_preview")
+async def preview_db_table(
+    svc: Annotated[DatabaseSourceService, Depends(DatabaseSourceService.get_service)],
+    model: Annotated[DatabaseSource, Depends(DatabaseSourceService.get_model)],
+    table: str,
+    schema_name: Optional[str] = None,
+    limit: int = Query(default=PREVIEW_DEFAULT_ROWS, ge=1, le=PREVIEW_MAX_ROWS),
+    format: Literal["ndjson", "arrow"] = "ndjson",
+):
+    """
+    Streams the first `limit` rows of a table of the source, as NDJSON or
+    an Arrow IPC stream, within the preview byte budget.
+    """
+    encoder = preview_encoder(format)
+    engine = await preview_engines.acquire(model.id, connection_config(model))
+    stream = stream_preview(
+        engine,
+        preview_statement(table, schema_name or model.schema_name, limit),
+        encoder,
+    )
+    # Start the query before responding so that failures get a proper status
+    try:
+        await anext(stream)
+    except Exception as e:
+        await stream.aclose()
+        raise HTTPException(status_code=422, detail=f"Preview failed: {e}")
+    return StreamingResponse(stream, media_type=PREVIEW_FORMATS[format])
@@ -0,0 +1,202 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Reachability sweep over every configured data source of a project.
+
+Each source type declares its endpoints through `probe_targets`; the sweep
+probes all sources concurrently, capped by `HEALTH_SWEEP_CONCURRENCY`, with
+non-blocking TCP connects and appends the outcome to the per-source history
+in `mw_data_source_health`.
+"""
+
+import asyncio
+from datetime import timedelta
+from typing import Any, Optional
+
+import fastapi
+from sqlalchemy import String, delete, union
+from sqlmodel import Field, select
+from sqlmodel.ext.asyncio.session import AsyncSession as SQLModelAsyncSession
+
+from mindweaver.ext.data_source.base import tcp_probe
+from mindweaver.fw.exc import FieldValidationError
+from mindweaver.fw.model import AsyncSession, Base, ts_now
+from mindweaver.fw.registry import SERVICE_REGISTRY
+from .base import DataSourceServiceBase
+
+HEALTH_SWEEP_CONCURRENCY = 16
+PROBE_TIMEOUT = 3.0
+HEALTH_HISTORY_RETENTION = timedelta(days=7)
+
+
+class DataSourceHealth(Base, table=True):
+    __tablename__ = "mw_data_source_health"
+
+    source_type: str = Field(sa_type=String(length=100), index=True)
+    source_id: int = Field(index=True)
+    project_id: int = Field(index=True)
+    reachable: bool = Field(default=False)
+    latency_ms: Optional[float] = Field(default=None)
+    error: Optional[str] = Field(default=None)
+
+
+def data_source_services() -> list[type]:
+    """Returns every registered data source service."""
+    return [
+        service_class
+        for service_class in SERVICE_REGISTRY.values()
+        if issubclass(service_class, DataSourceServiceBase)
+    ]
+
+
+async def probe_endpoints(
+    targets: list[tuple[str, int]], timeout: float = PROBE_TIMEOUT
+) -> dict[str, Any]:
+    """
+    Probes the endpoints of a source concurrently. The source is reachable
+    when any endpoint accepts a connection, with the fastest one's latency.
+    """
+    if not targets:
+        return {"reachable": False, "latency_ms": None, "error": "No endpoint configured"}
+    results = await asyncio.gather(
+        *(tcp_probe(host, port, timeout=timeout) for host, port in targets),
+        return_exceptions=True,
+    )
+    latencies = [r for r in results if isinstance(r, float)]
+    if latencies:
+        return {
+            "reachable": True,
+            "latency_ms": round(min(latencies) * 1000, 1),
+            "error": None,
+        }
+    errors = [
+        f"{host}:{port} {'timed out' if isinstance(e, TimeoutError) else e}"
+        for (host, port), e in zip(targets, results)
+    ]
+    return {"reachable": False, "latency_ms": None, "error": "; ".join(errors)}
+
+
+async def sweep_project(
+    session: SQLModelAsyncSession,
+    project_id: int,
+    concurrency: int = HEALTH_SWEEP_CONCURRENCY,
+) -> list[dict[str, Any]]:
+    """
+    Probes every data source of a project and records the results, pruning
+    history older than `HEALTH_HISTORY_RETENTION`. The caller commits.
+    """
+    sources = []
+    for service_class in data_source_services():
+        model_class = service_class.model_class()
+        result = await session.exec(
+            select(model_class)
+            .where(model_class.project_id == project_id)
+            .order_by(model_class.id.asc())
+        )
+        for model in result.all():
+            sources.append(
+                (
+                    service_class.entity_type(),
+                    model.id,
+                    service_class.probe_targets(model),
+                )
+            )
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(targets: list[tuple[str, int]]) -> dict[str, Any]:
+        async with semaphore:
+            return await probe_endpoints(targets)
+
+    results = await asyncio.gather(*(probe(targets) for _, _, targets in sources))
+
+    now = ts_now()
+    rows = []
+    for (source_type, source_id, _), result in zip(sources, results):
+        session.add(
+            DataSourceHealth(
+                source_type=source_type,
+                source_id=source_id,
+                project_id=project_id,
+                created=now,
+                modified=now,
+                **result,
+            )
+        )
+        rows.append(
+            {"source_type": source_type, "source_id": source_id, "checked": now, **result}
+        )
+    await session.exec(
+        delete(DataSourceHealth).where(
+            DataSourceHealth.project_id == project_id,
+            DataSourceHealth.created < now - HEALTH_HISTORY_RETENTION,
+        )
+    )
+    await session.flush()
+    return rows
+
+
+async def projects_with_sources(session: SQLModelAsyncSession) -> list[int]:
+    """Returns the ids of projects having at least one data source."""
+    queries = [
+        select(service_class.model_class().project_id)
+        for service_class in data_source_services()
+    ]
+    if not queries:
+        return []
+    result = await session.exec(union(*queries))
+    return sorted(row[0] for row in result.all())
+
+
+def _require_project_id(request: fastapi.Request) -> int:
+    try:
+        return int(request.headers.get("X-Project-ID", ""))
+    except ValueError:
+        raise FieldValidationError(
+            field_location=["header", "X-Project-ID"],
+            message="X-Project-ID header is required",
+        )
+
+
+router = fastapi.APIRouter(tags=["data-sources"])
+
+
+@router.post("/data-sources/_health")
+async def sweep_health(request: fastapi.Request, session: AsyncSession):
+    """Probes every data source of the current project now."""
+    project_id = _require_project_id(request)
+    return {"data": await sweep_project(session, project_id)}
+
+
+@router.get("/data-sources/_health")
+async def health_history(
+    request: fastapi.Request,
+    session: AsyncSession,
+    source_type: Optional[str] = None,
+    source_id: Optional[int] = None,
+    limit: int = fastapi.Query(default=100, ge=1, le=1000),
+):
+    """Returns recorded probe results of the current project, newest first."""
+    project_id = _require_project_id(request)
+    stmt = select(DataSourceHealth).where(DataSourceHealth.project_id == project_id)
+    if source_type is not None:
+        stmt = stmt.where(DataSourceHealth.source_type == source_type)
+    if source_id is not None:
+        stmt = stmt.where(DataSourceHealth.source_id == source_id)
+    result = await session.exec(
+        stmt.order_by(DataSourceHealth.id.desc()).limit(limit)
+    )
+    return {
+        "data": [
+            {
+                "source_type": row.source_type,
+                "source_id": row.source_id,
+                "reachable": row.reachable,
+                "latency_ms": row.latency_ms,
+                "error": row.error,
+                "checked": row.created,
+            }
+            for row in result.all()
+        ]
+    }
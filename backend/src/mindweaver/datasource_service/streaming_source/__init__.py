@@ -4,5 +4,6 @@
 from .model import StreamingSource
 from .service import StreamingSourceService
 import mindweaver.datasource_service.streaming_source.views  # noqa: F401
+import mindweaver.datasource_service.streaming_source.actions  # noqa: F401
 
 __all__ = ["StreamingSource", "StreamingSourceService"]
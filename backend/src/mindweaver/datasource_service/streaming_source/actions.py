@@ -0,0 +1,22 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+from ..base import S3IngestionAction
+from .service import StreamingSourceService
+
+
+@StreamingSourceService.register_action("consume_to_s3")
+class ConsumeToS3Action(S3IngestionAction):
+
+    async def __call__(self, **kwargs):
+        # Imported here, the ingestion package depends on this module's package
+        from mindweaver.ingestion import StreamSpec
+        from mindweaver.tasks.ingestion import consume_streaming_source_task
+
+        spec = await self.parse_spec(StreamSpec, kwargs)
+        return await self.trigger(
+            consume_streaming_source_task,
+            "Streaming ingestion triggered.",
+            spec.model_dump(),
+            pass_parameters=True,
+        )
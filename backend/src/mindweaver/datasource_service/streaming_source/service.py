@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: AGPLv3+
 
 from typing import Any
+from sqlalchemy import delete
+from mindweaver.fw.service import before_delete
 from mindweaver.service.base import ProjectScopedService
 from ..base import DataSourceServiceBase
 from .model import StreamingSource
@@ -22,6 +24,16 @@ class StreamingSourceService(
     def model_path(cls) -> str:
         return "/{id}"
 
+    @classmethod
+    def probe_targets(cls, model: StreamingSource) -> list[tuple[str, int]]:
+        # Bootstrap servers are alternatives, any reachable one will do
+        targets = []
+        for server in (model.bootstrap_servers or "").split(","):
+            host, _, port = server.strip().rpartition(":")
+            if host and port.isdigit():
+                targets.append((host.strip("[]"), int(port)))
+        return targets
+
     @classmethod
     def widgets(cls) -> dict[str, Any]:
         widgets = super().widgets()
@@ -51,3 +63,10 @@ class StreamingSourceService(
             "status": "success",
             "message": "Streaming source configuration saved. Connection test not fully implemented.",
         }
+
+    @before_delete()
+    async def _delete_offsets(self, model: StreamingSource):
+        """Drops the consumer offsets recorded for the source being deleted"""
+        from mindweaver.ingestion.model import StreamOffset
+
+        await self.session.exec(delete(StreamOffset).where(StreamOffset.source_id == model.id))
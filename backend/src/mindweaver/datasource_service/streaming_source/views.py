@@ -3,6 +3,7 @@
 
 from typing import Annotated, Optional
 from fastapi import Depends
+from sqlmodel import select
 from ..base import TestConnectionRequest, handle_test_connection, handle_test_connection_no_id
 from .service import StreamingSourceService
 from .model import StreamingSource
@@ -23,3 +24,33 @@ async def test_streaming_connection(
     data: TestConnectionRequest = None,
 ):
     return await handle_test_connection(svc, model, data)
+
+
+@StreamingSourceService.model_view(method="GET", path="/_offsets")
+async def get_streaming_offsets(
+    svc: Annotated[StreamingSourceService, Depends(StreamingSourceService.get_service)],
+    model: Annotated[StreamingSource, Depends(StreamingSourceService.get_model)],
+):
+    """
+    Lists the committed offsets and lag of every partition consumed from the
+    source, with the records and bytes ingested so far.
+    """
+    from mindweaver.ingestion.model import StreamOffset
+
+    result = await svc.session.exec(
+        select(StreamOffset)
+        .where(StreamOffset.source_id == model.id)
+        .order_by(StreamOffset.topic, StreamOffset.group_id, StreamOffset.partition)
+    )
+    offsets = [
+        row.model_dump(exclude={"id", "uuid", "source_id", "consumer_key"})
+        for row in result.all()
+    ]
+    return {
+        "data": offsets,
+        "meta": {
+            "lag": sum(row["lag"] or 0 for row in offsets),
+            "records": sum(row["records"] for row in offsets),
+            "bytes": sum(row["bytes"] for row in offsets),
+        },
+    }
@@ -4,5 +4,6 @@
 from .model import WebSource
 from .service import WebSourceService
 import mindweaver.datasource_service.web_source.views  # noqa: F401
+import mindweaver.datasource_service.web_source.actions  # noqa: F401
 
 __all__ = ["WebSource", "WebSourceService"]
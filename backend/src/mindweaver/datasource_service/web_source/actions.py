@@ -0,0 +1,22 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+from ..base import S3IngestionAction
+from .service import WebSourceService
+
+
+@WebSourceService.register_action("crawl")
+class CrawlAction(S3IngestionAction):
+
+    async def __call__(self, **kwargs):
+        # Imported here, the ingestion package depends on this module's package
+        from mindweaver.ingestion import CrawlSpec
+        from mindweaver.tasks.ingestion import crawl_web_source_task
+
+        spec = await self.parse_spec(CrawlSpec, kwargs)
+        return await self.trigger(
+            crawl_web_source_task,
+            "Crawl triggered.",
+            spec.model_dump(),
+            pass_parameters=True,
+        )
@@ -2,10 +2,12 @@
 # SPDX-License-Identifier: AGPLv3+
 
 from typing import Any
-import httpx
 from fastapi import HTTPException
+from sqlalchemy import delete
+from mindweaver.ext.data_source import get_driver
+from mindweaver.fw.service import before_delete
 from mindweaver.service.base import ProjectScopedService
-from ..base import DataSourceServiceBase
+from ..base import DataSourceServiceBase, url_target
 from .model import WebSource
 
 
@@ -21,6 +23,11 @@ class WebSourceService(DataSourceServiceBase, ProjectScopedService[WebSource]):
     @classmethod
     def model_path(cls) -> str:
         return "/{id}"
+
+    @classmethod
+    def probe_targets(cls, model: WebSource) -> list[tuple[str, int]]:
+        return url_target(model.url)
+
     @classmethod
     def widgets(cls) -> dict[str, Any]:
         widgets = super().widgets()
@@ -36,21 +43,24 @@ class WebSourceService(DataSourceServiceBase, ProjectScopedService[WebSource]):
         if not url:
             raise HTTPException(status_code=422, detail="URL is required")
 
-        try:
-            async with httpx.AsyncClient(
-                verify=config.get("verify_ssl", False),
-                timeout=10.0,
-            ) as client:
-                auth = None
-                if config.get("login") and config.get("password"):
-                    auth = (config["login"], config["password"])
-
-                resp = await client.get(url, auth=auth, follow_redirects=True)
-                return {
-                    "status": "success",
-                    "message": f"Connected to {url}. Status: {resp.status_code}",
-                }
-        except Exception as e:
-            raise HTTPException(
-                status_code=422, detail=f"Web connection failed: {str(e)}"
-            )
+        # The driver is cached per configuration, reusing its connections
+        driver = get_driver(
+            "web",
+            {
+                "host": url,
+                "verify_ssl": config.get("verify_ssl", False),
+                "login": config.get("login"),
+                "password": config.get("password"),
+            },
+        )
+        result = await driver.test_connection()
+        if result["status"] != "success":
+            raise HTTPException(status_code=422, detail=result["message"])
+        return result
+
+    @before_delete()
+    async def _delete_crawl_pages(self, model: WebSource):
+        """Drops the crawl frontier of the source being deleted"""
+        from mindweaver.ingestion.model import CrawlPage
+
+        await self.session.exec(delete(CrawlPage).where(CrawlPage.source_id == model.id))
@@ -1,16 +1,46 @@
 # SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
+import asyncio
+import collections
+import hashlib
+import importlib
+import json
+import logging
+from importlib.metadata import entry_points
 from typing import Dict, Type, Optional, Any
 from .base import DataSourceDriver
 
+logger = logging.getLogger(__name__)
+
+# Third party drivers register as `name = "package.module:DriverClass"`
+ENTRY_POINT_GROUP = "mindweaver.data_source_drivers"
+MAX_CACHED_DRIVERS = 64
+
+
+def config_digest(config: dict[str, Any]) -> str:
+    """Stable digest of a driver configuration."""
+    encoded = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
 
 class DriverRegistry:
     """
     Registry for data source drivers.
+
+    Drivers are declared by module path and only imported on first use, so
+    their dependencies do not load with the application. Driver instances
+    are reused per configuration, keeping the connection pools they hold,
+    and closed once evicted or discarded.
     """
 
     _drivers: Dict[str, Dict[str, Any]] = {}
+    _instances: "collections.OrderedDict[tuple[str, str], DataSourceDriver]" = (
+        collections.OrderedDict()
+    )
+    _entry_points_loaded = False
+    # Closes of dropped instances still running, referenced until done
+    _closing: set[asyncio.Task] = set()
 
     @classmethod
     def register(
@@ -23,29 +53,115 @@ class DriverRegistry:
         """
         Register a new driver class.
         """
+        declared = cls._drivers.get(name.lower(), {})
         cls._drivers[name.lower()] = {
+            **declared,
             "class": driver_cls,
+            "title": title or declared.get("title") or name.capitalize(),
+            "description": description or declared.get("description") or "",
+        }
+
+    @classmethod
+    def register_lazy(
+        cls,
+        name: str,
+        target: str,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+    ):
+        """
+        Declare a driver by `module:Class` path, imported by `get_driver()`.
+        """
+        if name.lower() in cls._drivers:
+            return
+        cls._drivers[name.lower()] = {
+            "target": target,
             "title": title or name.capitalize(),
             "description": description or "",
         }
 
+    @classmethod
+    def load_entry_points(cls):
+        """
+        Declare the drivers advertised by installed packages, once.
+        """
+        if cls._entry_points_loaded:
+            return
+        cls._entry_points_loaded = True
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            cls.register_lazy(entry_point.name, entry_point.value)
+
+    @classmethod
+    def driver_class(cls, name: str) -> Optional[Type[DataSourceDriver]]:
+        """
+        Get a driver class, importing its module on first use.
+        """
+        cls.load_entry_points()
+        driver_info = cls._drivers.get(name.lower())
+        if driver_info is None:
+            return None
+        if "class" not in driver_info:
+            module_name, _, attr = driver_info["target"].partition(":")
+            try:
+                driver_cls = getattr(importlib.import_module(module_name), attr)
+            except (ImportError, AttributeError) as e:
+                logger.error(f"Failed to load data source driver {name}: {e}")
+                return None
+            driver_info["class"] = driver_cls
+        return driver_info["class"]
+
     @classmethod
     def get_driver(
         cls, name: str, config: dict[str, Any]
     ) -> Optional[DataSourceDriver]:
         """
-        Get an instance of a registered driver.
+        Get an instance of a registered driver, reused for the same config.
         """
-        driver_info = cls._drivers.get(name.lower())
-        if driver_info:
-            return driver_info["class"](config)
-        return None
+        driver_cls = cls.driver_class(name)
+        if driver_cls is None:
+            return None
+        key = (name.lower(), config_digest(config))
+        driver = cls._instances.get(key)
+        if driver is None:
+            driver = cls._instances[key] = driver_cls(config)
+            while len(cls._instances) > MAX_CACHED_DRIVERS:
+                cls._close(cls._instances.popitem(last=False)[1])
+        cls._instances.move_to_end(key)
+        return driver
+
+    @classmethod
+    def discard_instances(cls, name: Optional[str] = None):
+        """
+        Forget cached driver instances, of one driver or all of them.
+        """
+        for key in list(cls._instances):
+            if name is None or key[0] == name.lower():
+                cls._close(cls._instances.pop(key))
+
+    @classmethod
+    def _close(cls, driver: DataSourceDriver):
+        """
+        Close a driver dropped from the cache, in the background when an
+        event loop is running.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                asyncio.run(driver.aclose())
+            except Exception as e:
+                logger.warning(f"Failed to close data source driver: {e}")
+            return
+        task = loop.create_task(driver.aclose())
+        cls._closing.add(task)
+        task.add_done_callback(cls._closing.discard)
 
     @classmethod
     def list_drivers(cls) -> list[str]:
         """
         List all registered driver names.
         """
+        cls.load_entry_points()
         return list(cls._drivers.keys())
 
     @classmethod
@@ -53,6 +169,7 @@ class DriverRegistry:
         """
         Get driver options for UI select widget.
         """
+        cls.load_entry_points()
         return [
             {"label": info["title"], "value": name}
             for name, info in cls._drivers.items()
@@ -87,5 +204,10 @@ def get_driver_options() -> list[dict[str, str]]:
     return DriverRegistry.get_driver_options()
 
 
-# Import drivers here to trigger registration
-from . import web  # noqa: F401
+# Built-in drivers, imported on first use
+DriverRegistry.register_lazy(
+    "web",
+    "mindweaver.ext.data_source.web:WebDriver",
+    title="Web / API",
+    description="Generic driver for HTTP/HTTPS web endpoints and APIs.",
+)
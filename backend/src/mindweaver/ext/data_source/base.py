@@ -3,7 +3,37 @@
 
 from abc import ABC, abstractmethod
 from typing import Any, Optional
-import socket
+import asyncio
+import time
+
+# Delay before racing the next resolved address (RFC 8305 recommends 250ms)
+HAPPY_EYEBALLS_DELAY = 0.25
+
+
+async def tcp_probe(host: str, port: int, timeout: float = 3.0) -> float:
+    """
+    Opens and closes a TCP connection to `host:port` without blocking the
+    event loop. Addresses resolved for the host are raced happy-eyeballs
+    style, interleaving IPv6 and IPv4. Returns the connect latency in
+    seconds, raises `TimeoutError` or `OSError` when unreachable.
+    """
+    started = time.perf_counter()
+    _, writer = await asyncio.wait_for(
+        asyncio.open_connection(
+            host,
+            port,
+            happy_eyeballs_delay=HAPPY_EYEBALLS_DELAY,
+            interleave=1,
+        ),
+        timeout=timeout,
+    )
+    latency = time.perf_counter() - started
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return latency
 
 
 class DataSourceDriver(ABC):
@@ -30,14 +60,21 @@ class DataSourceDriver(ABC):
         """
         pass
 
-    def _tcp_check(self, host: str, port: int, timeout: float = 3.0) -> bool:
+    async def aclose(self):
+        """
+        Release the connections held by the driver, once it is dropped from
+        the registry cache.
+        """
+        pass
+
+    async def _tcp_check(self, host: str, port: int, timeout: float = 3.0) -> bool:
         """
         Perform a simple TCP connection check.
         """
         try:
-            with socket.create_connection((host, port), timeout=timeout):
-                return True
-        except (socket.timeout, socket.error):
+            await tcp_probe(host, port, timeout=timeout)
+            return True
+        except (TimeoutError, OSError):
             return False
 
     async def default_test_connection(self) -> dict[str, Any]:
@@ -54,7 +91,7 @@ class DataSourceDriver(ABC):
         if not port:
             return {"status": "error", "message": "Port is required for TCP check"}
 
-        if self._tcp_check(host, int(port)):
+        if await self._tcp_check(host, int(port)):
             return {
                 "status": "success",
                 "message": f"TCP connection to {host}:{port} successful",
@@ -3,7 +3,7 @@
 
 from .base import DataSourceDriver
 from . import register_driver
-from typing import Any
+from typing import Any, Optional
 import httpx
 from urllib.parse import urlparse
 
@@ -16,9 +16,27 @@ from urllib.parse import urlparse
 class WebDriver(DataSourceDriver):
     """
     Driver for Web/API data sources.
-    Connects to HTTP or HTTPS depending on config.
+    Connects to HTTP or HTTPS depending on config, reusing one client and
+    its connection pool across tests of the same configuration.
     """
 
+    _client: Optional[httpx.AsyncClient] = None
+
+    def client(self) -> httpx.AsyncClient:
+        """
+        Return the HTTP client of the driver, created on first use.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                verify=self.config.get("verify_ssl", False)
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     def connection_uri(self) -> str:
         """
         Construct and return the connection URI for the web source.
@@ -70,29 +88,26 @@ class WebDriver(DataSourceDriver):
             }
 
         try:
-            async with httpx.AsyncClient(
-                verify=self.config.get("verify_ssl", False)
-            ) as client:
-                auth = None
-                login = self.config.get("login")
-                password = self.config.get("password")
-
-                if login and password:
-                    auth = (login, password)
-
-                # Support api_key in parameters if needed (placeholder for now)
-                # params = self.config.get("parameters", {})
-                # if params.get("api_key"):
-                #     pass
-
-                resp = await client.get(
-                    base_url, auth=auth, timeout=10.0, follow_redirects=True
-                )
-
-                return {
-                    "status": "success",
-                    "message": f"Connected to {base_url}. Status: {resp.status_code}",
-                }
+            auth = None
+            login = self.config.get("login")
+            password = self.config.get("password")
+
+            if login and password:
+                auth = (login, password)
+
+            # Support api_key in parameters if needed (placeholder for now)
+            # params = self.config.get("parameters", {})
+            # if params.get("api_key"):
+            #     pass
+
+            resp = await self.client().get(
+                base_url, auth=auth, timeout=10.0, follow_redirects=True
+            )
+
+            return {
+                "status": "success",
+                "message": f"Connected to {base_url}. Status: {resp.status_code}",
+            }
         except Exception as e:
             return {
                 "status": "error",
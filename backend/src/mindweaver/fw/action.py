@@ -2,9 +2,27 @@
 # SPDX-License-Identifier: AGPLv3+
 
 import abc
-from typing import Any
+from typing import Any, Optional
 import pydantic
 
+from .exc import FieldValidationError
+from .job import submit_job
+
+
+def parse_parameters(spec_class: type[pydantic.BaseModel], parameters: dict[str, Any]):
+    """
+    Validates action parameters as `spec_class`, reporting the first error
+    as a `FieldValidationError` of the parameter at fault.
+    """
+    try:
+        return spec_class(**parameters)
+    except pydantic.ValidationError as e:
+        error = e.errors()[0]
+        raise FieldValidationError(
+            field_location=["parameters", *map(str, error["loc"])],
+            message=error["msg"],
+        )
+
 
 class ActionRequest(pydantic.BaseModel):
     action: str
@@ -14,6 +32,9 @@ class ActionRequest(pydantic.BaseModel):
 class BaseAction(abc.ABC):
     """Base Action class for Service plugin system."""
 
+    # Set to the registered action name by `register_action`
+    name: Optional[str] = None
+
     def __init__(self, model, svc):
         self.model = model
         self.svc = svc
@@ -28,3 +49,57 @@ class BaseAction(abc.ABC):
     def __call__(self, **kwargs):
         """Execute the action."""
         pass
+
+    async def enqueue(
+        self,
+        task,
+        parameters: Optional[dict[str, Any]] = None,
+        *,
+        pass_parameters: bool = False,
+    ) -> tuple[int, bool]:
+        """
+        Records a job for this action and sends `task` with the model id and
+        `job_id`, unless an identical job is already queued or running.
+        With `pass_parameters` the task also receives the parameters as
+        `parameters`. Commits the session so the worker can see the job, and
+        returns the job id and whether it was newly enqueued.
+        """
+        job, created = await submit_job(
+            self.session,
+            entity=self.svc.entity_type(),
+            model_id=self.model.id,
+            action=self.name,
+            parameters=parameters,
+        )
+        job_id, model_id = job.id, self.model.id
+        await self.session.commit()
+        if created:
+            if pass_parameters:
+                task.delay(model_id, job_id=job_id, parameters=parameters or {})
+            else:
+                task.delay(model_id, job_id=job_id)
+        return job_id, created
+
+    async def trigger(
+        self,
+        task,
+        message: str,
+        parameters: Optional[dict[str, Any]] = None,
+        *,
+        pass_parameters: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Enqueues `task` like `enqueue` and returns the response of the
+        action, `message` for a new job or the running status of the
+        identical job already queued or running.
+        """
+        job_id, created = await self.enqueue(
+            task, parameters, pass_parameters=pass_parameters
+        )
+        if not created:
+            return {
+                "status": "running",
+                "message": f"Action '{self.name}' is already queued or running",
+                "job_id": job_id,
+            }
+        return {"status": "success", "message": message, "job_id": job_id}
@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import contextlib
+from typing import AsyncIterator, Optional, TypeVar
+
+import fastapi
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .model import get_engine
+
+S = TypeVar("S")
+
+
+def system_request(
+    *,
+    project_id: Optional[int] = None,
+    headers: Optional[dict[str, str]] = None,
+    path: str = "/",
+) -> fastapi.Request:
+    """
+    Builds a request context for service calls made outside of an HTTP
+    request, such as Celery tasks. It is a real `fastapi.Request` over a
+    synthetic ASGI scope, so services see the same headers, state and url
+    API as they do when serving the API.
+    """
+    raw_headers = {k.lower(): v for k, v in (headers or {}).items()}
+    if project_id is not None:
+        raw_headers["x-project-id"] = str(project_id)
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("mindweaver", 80),
+        "client": None,
+        "root_path": "",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "headers": [(k.encode(), v.encode()) for k, v in raw_headers.items()],
+        "state": {},
+    }
+    return fastapi.Request(scope)
+
+
+@contextlib.asynccontextmanager
+async def service_context(
+    service_class: type[S],
+    *,
+    project_id: Optional[int] = None,
+    request: Optional[fastapi.Request] = None,
+) -> AsyncIterator[S]:
+    """
+    Yields a service bound to a new session on the shared engine and a
+    system request. Callers commit explicitly, the session is closed on exit.
+    """
+    if request is None:
+        request = system_request(project_id=project_id)
+    async with AsyncSession(get_engine()) as session:
+        yield service_class(request, session)
@@ -0,0 +1,312 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+State change events pushed to clients over Server-Sent Events.
+
+Models opt in with `@event_source(ModelClass)`. Whenever an instance is
+inserted, updated or deleted, the registered builder turns it into an event
+which is published with Postgres `pg_notify` inside the writing transaction,
+so it is only delivered once the change commits. Every API replica keeps a
+single LISTEN connection and fans events out to its connected clients and
+to in-process listeners registered with `add_listener`.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+from typing import Any, AsyncIterator, Callable, Optional
+
+import fastapi
+from fastapi.responses import StreamingResponse
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from .exc import FieldValidationError
+from .model import get_engine
+
+logger = logging.getLogger(__name__)
+
+EVENT_CHANNEL = "mindweaver_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_SIZE = 7900
+HEARTBEAT_INTERVAL = 15.0
+SUBSCRIBER_QUEUE_SIZE = 256
+
+EventBuilder = Callable[[Connection, Any], Optional[dict[str, Any]]]
+
+_event_builders: dict[type, EventBuilder] = {}
+_listeners: list[Callable[[dict[str, Any]], None]] = []
+
+PENDING_EVENTS_KEY = "mw_pending_events"
+
+
+def event_source(model_class: type):
+    """
+    Registers a builder producing the event for a changed `model_class`
+    instance (subclasses included). The builder receives the flushing
+    connection and the instance, and returns a dict with `entity`, `id`,
+    `project_ids` and `data` keys, or None to skip the change.
+    """
+
+    def decorator(fn: EventBuilder) -> EventBuilder:
+        _event_builders[model_class] = fn
+        return fn
+
+    return decorator
+
+
+def _builder_for(obj: Any) -> Optional[EventBuilder]:
+    for klass in type(obj).__mro__:
+        builder = _event_builders.get(klass)
+        if builder:
+            return builder
+    return None
+
+
+def publish(connection: Connection, payload: dict[str, Any]):
+    """Publishes an event on the current transaction of `connection`."""
+    message = json.dumps(payload, default=str)
+    if len(message.encode()) > MAX_PAYLOAD_SIZE:
+        # Clients fall back to fetching `_state` when data is missing
+        message = json.dumps({**payload, "data": None}, default=str)
+    connection.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": EVENT_CHANNEL, "payload": message},
+    )
+
+
+def add_listener(fn: Callable[[dict[str, Any]], None]):
+    """
+    Registers an in-process listener called with every event once it is
+    committed, either by a session of this process or, while the broker is
+    listening, by any other process. Listeners may see an event twice and
+    must be cheap and idempotent, e.g. cache invalidation.
+    """
+    _listeners.append(fn)
+
+
+def notify_listeners(message: dict[str, Any]):
+    """Calls the in-process listeners with a committed event."""
+    for fn in _listeners:
+        try:
+            fn(message)
+        except Exception as e:
+            logger.warning(f"Event listener {fn!r} failed: {e}")
+
+
+def _publish_changes(session: Session, objects, deleted: bool = False):
+    connection = None
+    for obj in objects:
+        builder = _builder_for(obj)
+        if builder is None:
+            continue
+        if not deleted and obj not in session.new and not session.is_modified(obj):
+            continue
+        if connection is None:
+            connection = session.connection()
+            if connection.dialect.name != "postgresql":
+                return
+        try:
+            payload = builder(connection, obj)
+        except Exception as e:
+            logger.warning(f"Failed to build event for {type(obj).__name__}: {e}")
+            continue
+        if payload is None:
+            continue
+        message = {"event": "deleted" if deleted else "state", **payload}
+        publish(connection, message)
+        session.info.setdefault(PENDING_EVENTS_KEY, []).append(message)
+
+
+@event.listens_for(Session, "before_flush")
+def _publish_deletions(session: Session, flush_context, instances):
+    # Deletions are announced before the flush while the rows they refer to
+    # still exist, so builders can resolve the owning project
+    if _event_builders and session.deleted:
+        _publish_changes(session, list(session.deleted), deleted=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _publish_flushed_changes(session: Session, flush_context):
+    if _event_builders:
+        _publish_changes(session, [*session.new, *session.dirty])
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_committed(session: Session):
+    for message in session.info.pop(PENDING_EVENTS_KEY, []):
+        notify_listeners(message)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction):
+    session.info.pop(PENDING_EVENTS_KEY, None)
+
+
+class EventBroker:
+    """
+    Fans out notifications from a single LISTEN connection to in-process
+    subscribers. The connection is opened with the first subscriber and
+    closed when the last one leaves, unless the broker was pinned open with
+    `start()` for the lifetime of the application.
+    """
+
+    def __init__(self, channel: str = EVENT_CHANNEL):
+        self.channel = channel
+        self._subscribers: dict[asyncio.Queue, Optional[int]] = {}
+        self._lock = asyncio.Lock()
+        self._connection = None
+        self._raw_connection = None
+        self._pinned = False
+
+    async def start(self):
+        """Keeps listening regardless of subscribers until `stop()`."""
+        async with self._lock:
+            self._pinned = True
+            if not self.listening:
+                await self._start()
+
+    async def stop(self):
+        """Releases the pin taken by `start()`."""
+        async with self._lock:
+            self._pinned = False
+            if not self._subscribers:
+                await self._stop()
+
+    @property
+    def listening(self) -> bool:
+        return self._raw_connection is not None
+
+    async def _start(self):
+        self._connection = await get_engine().connect()
+        fairy = await self._connection.get_raw_connection()
+        self._raw_connection = fairy.driver_connection
+        await self._raw_connection.add_listener(self.channel, self._on_notify)
+        self._raw_connection.add_termination_listener(self._on_terminate)
+
+    async def _stop(self):
+        connection, self._connection = self._connection, None
+        raw_connection, self._raw_connection = self._raw_connection, None
+        if raw_connection is not None and not raw_connection.is_closed():
+            # The connection goes back to the pool, leave it without LISTEN
+            raw_connection.remove_termination_listener(self._on_terminate)
+            with contextlib.suppress(Exception):
+                await raw_connection.remove_listener(self.channel, self._on_notify)
+        if connection is not None:
+            with contextlib.suppress(Exception):
+                await connection.close()
+
+    def _on_terminate(self, raw_connection):
+        logger.warning("Event listener connection lost, reconnecting")
+        self._raw_connection = None
+        asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self):
+        delay = 1.0
+        async with self._lock:
+            await self._stop()
+            while self._subscribers or self._pinned:
+                try:
+                    await self._start()
+                    return
+                except Exception as e:
+                    logger.warning(f"Event listener reconnect failed: {e}")
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, 30.0)
+
+    def _on_notify(self, raw_connection, pid: int, channel: str, payload: str):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed event payload: {payload!r}")
+            return
+        notify_listeners(message)
+        self.dispatch(message)
+
+    def dispatch(self, message: dict[str, Any]):
+        """Delivers a message to every subscriber whose scope matches."""
+        project_ids = message.get("project_ids") or []
+        for queue, project_id in self._subscribers.items():
+            if project_id is not None and project_id not in project_ids:
+                continue
+            if queue.full():
+                # Slow consumer, state events supersede each other so the
+                # oldest one is the safest to lose
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(
+        self, project_id: Optional[int] = None
+    ) -> AsyncIterator[asyncio.Queue]:
+        """
+        Yields a queue receiving events for `project_id`, or for every
+        project when `project_id` is None.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        async with self._lock:
+            if not self.listening:
+                await self._start()
+            self._subscribers[queue] = project_id
+        try:
+            yield queue
+        finally:
+            async with self._lock:
+                self._subscribers.pop(queue, None)
+                if not self._subscribers and not self._pinned:
+                    await self._stop()
+
+
+broker = EventBroker()
+
+
+def format_sse(message: dict[str, Any]) -> str:
+    """Formats an event message as a Server-Sent Events frame."""
+    data = json.dumps(message, default=str)
+    return f"event: {message.get('event', 'message')}\ndata: {data}\n\n"
+
+
+async def event_stream(
+    request: fastapi.Request,
+    project_id: int,
+    event_broker: EventBroker = broker,
+) -> AsyncIterator[str]:
+    """Yields SSE frames until the client disconnects."""
+    async with event_broker.subscribe(project_id) as queue:
+        yield f"retry: {int(HEARTBEAT_INTERVAL * 1000)}\n\n"
+        while not await request.is_disconnected():
+            try:
+                message = await asyncio.wait_for(
+                    queue.get(), timeout=HEARTBEAT_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                # Comment frames keep proxies from closing idle streams
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(message)
+
+
+router = fastapi.APIRouter(tags=["events"])
+
+
+@router.get("/_events")
+async def events(request: fastapi.Request):
+    """
+    Streams the platform and cluster state changes of the project in the
+    required `X-Project-ID` header as Server-Sent Events.
+    """
+    try:
+        project_id = int(request.headers.get("X-Project-ID", ""))
+    except ValueError:
+        raise FieldValidationError(
+            field_location=["header", "X-Project-ID"],
+            message="X-Project-ID header is required",
+        )
+    return StreamingResponse(
+        event_stream(request, project_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
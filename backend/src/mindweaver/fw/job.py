@@ -0,0 +1,238 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Persistent record of background work triggered through actions.
+
+Each job carries an idempotency key derived from the entity, model id,
+action name and a hash of the parameters. While a job is queued or running
+its key is also held in the unique `active_key` column, so at most one
+identical job is in flight at a time; submitting it again returns the
+existing job instead of enqueuing a duplicate. Workers claim a job before
+running it, which keeps redelivered Celery messages from running it twice,
+and record the outcome, duration and error.
+"""
+
+import enum
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from sqlalchemy import DateTime, String, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy_utils.types.json import JSONType
+from sqlmodel import Field, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .model import Base, get_engine, ts_now
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+# Active jobs not updated for this long are assumed lost with their worker
+JOB_STALE_AFTER = timedelta(hours=1)
+MAX_ERROR_LENGTH = 4000
+
+
+class JobStatus(enum.StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(Base, table=True):
+    __tablename__ = "mw_job"
+
+    entity: str = Field(sa_type=String(length=100))
+    model_id: Optional[int] = Field(default=None, index=True)
+    action: str = Field(sa_type=String(length=100))
+    parameters: dict[str, Any] = Field(default_factory=dict, sa_type=JSONType())
+    idempotency_key: str = Field(sa_type=String(length=64), index=True)
+    # Equal to idempotency_key while the job is queued or running
+    active_key: Optional[str] = Field(
+        default=None, sa_type=String(length=64), unique=True
+    )
+    status: str = Field(default=JobStatus.QUEUED)
+    error: Optional[str] = Field(default=None)
+    started: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
+    finished: Optional[datetime] = Field(
+        default=None, sa_type=DateTime(timezone=True)
+    )
+    duration: Optional[float] = Field(default=None)
+    # Counters reported by the running job, see `report_progress`
+    progress: dict[str, Any] = Field(default_factory=dict, sa_type=JSONType())
+
+
+def params_digest(parameters: dict[str, Any]) -> str:
+    """Hashes action parameters independently of key order."""
+    encoded = json.dumps(parameters, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def idempotency_key(
+    entity: str, model_id: Optional[int], action: str, parameters: dict[str, Any]
+) -> str:
+    """Returns the key identifying identical jobs."""
+    identity = f"{entity}|{model_id}|{action}|{params_digest(parameters)}"
+    return hashlib.sha256(identity.encode()).hexdigest()
+
+
+async def find_active_job(
+    session: AsyncSession,
+    entity: str,
+    model_id: Optional[int],
+    action: str,
+    parameters: dict[str, Any],
+) -> Optional[Job]:
+    """
+    Returns the queued or running job identical to the given one, if any.
+    Jobs that stopped reporting for `JOB_STALE_AFTER` are marked failed and
+    not returned.
+    """
+    key = idempotency_key(entity, model_id, action, parameters)
+    result = await session.exec(select(Job).where(Job.active_key == key))
+    job = result.one_or_none()
+    if job is None:
+        return None
+    if ts_now() - job.modified > JOB_STALE_AFTER:
+        logger.warning(f"Releasing stale job {job.id} ({job.action})")
+        _finish(job, JobStatus.FAILED, "Job abandoned by its worker")
+        await session.flush()
+        return None
+    return job
+
+
+async def submit_job(
+    session: AsyncSession,
+    entity: str,
+    model_id: Optional[int],
+    action: str,
+    parameters: Optional[dict[str, Any]] = None,
+) -> tuple[Job, bool]:
+    """
+    Records a queued job unless an identical one is active. Returns the job
+    and whether it was created; callers only enqueue created jobs, after the
+    session is committed so that workers can claim them.
+    """
+    parameters = parameters or {}
+    job = await find_active_job(session, entity, model_id, action, parameters)
+    if job is not None:
+        return job, False
+
+    key = idempotency_key(entity, model_id, action, parameters)
+    job = Job(
+        entity=entity,
+        model_id=model_id,
+        action=action,
+        parameters=parameters,
+        idempotency_key=key,
+        active_key=key,
+    )
+    try:
+        async with session.begin_nested():
+            session.add(job)
+    except IntegrityError:
+        # Lost the race against a concurrent identical submission
+        result = await session.exec(select(Job).where(Job.active_key == key))
+        return result.one(), False
+    return job, True
+
+
+def _finish(job: Job, status: JobStatus, error: Optional[str] = None):
+    now = ts_now()
+    job.status = status
+    job.error = error[:MAX_ERROR_LENGTH] if error else None
+    job.active_key = None
+    job.finished = now
+    job.modified = now
+    if job.started is not None:
+        job.duration = (now - job.started).total_seconds()
+
+
+async def touch_job(job_id: Optional[int]):
+    """
+    Records that a long running job is still making progress, so that it is
+    not released as stale after `JOB_STALE_AFTER`.
+    """
+    if job_id is None:
+        return
+    async with AsyncSession(get_engine()) as session:
+        await session.exec(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+            .values(modified=ts_now())
+        )
+        await session.commit()
+
+
+async def report_progress(job_id: Optional[int], progress: dict[str, Any]):
+    """
+    Records the progress counters of a running job, which also keeps it
+    from being released as stale.
+    """
+    if job_id is None:
+        return
+    async with AsyncSession(get_engine()) as session:
+        await session.exec(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+            .values(progress=progress, modified=ts_now())
+        )
+        await session.commit()
+
+
+async def execute_job(job_id: Optional[int], fn: Callable[[], Awaitable[R]]) -> R:
+    """
+    Runs `fn` as job `job_id`, recording its status, duration and error.
+    Exceptions from `fn` are re-raised after being recorded. A job that was
+    already claimed by another worker is not run again and None is returned.
+    Without a job id `fn` simply runs.
+    """
+    if job_id is None:
+        return await fn()
+
+    async with AsyncSession(get_engine()) as session:
+        now = ts_now()
+        claimed = await session.exec(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.QUEUED)
+            .values(status=JobStatus.RUNNING, started=now, modified=now)
+            .returning(Job.id)
+        )
+        if claimed.first() is None:
+            logger.warning(f"Job {job_id} is not queued, skipping")
+            return None
+        await session.commit()
+
+        try:
+            result = await fn()
+        except Exception as e:
+            job = await session.get(Job, job_id)
+            _finish(job, JobStatus.FAILED, str(e) or type(e).__name__)
+            await session.commit()
+            raise
+
+        job = await session.get(Job, job_id)
+        _finish(job, JobStatus.SUCCEEDED)
+        await session.commit()
+        return result
+
+
+def serialize_job(job: Job) -> dict[str, Any]:
+    """Returns the API representation of a job."""
+    return {
+        "id": job.id,
+        "action": job.action,
+        "parameters": job.parameters,
+        "status": job.status,
+        "error": job.error,
+        "created": job.created,
+        "started": job.started,
+        "finished": job.finished,
+        "duration": job.duration,
+        "progress": job.progress,
+    }
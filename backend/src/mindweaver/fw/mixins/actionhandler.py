@@ -35,6 +35,8 @@ class ActionHandlerMixin:
                     f"Action '{name}' is already registered on {cls.__name__}"
                 )
             cls._actions[name] = action_cls
+            if "name" not in action_cls.__dict__:
+                action_cls.name = name
             return action_cls
 
         return decorator
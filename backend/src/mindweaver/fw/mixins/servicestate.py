@@ -1,10 +1,29 @@
 # SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
-from typing import Type, Optional
+import asyncio
+from typing import Any, Type, Optional
+from sqlmodel import select
+from ..exc import FieldValidationError
 from ..state import BaseState
 
 
+def parse_state_ids(ids: str) -> Optional[list[int]]:
+    """
+    Parses the `ids` query parameter of the bulk state view. Returns None
+    for `all`, otherwise the comma separated list of ids.
+    """
+    if ids.strip() == "all":
+        return None
+    try:
+        return [int(i) for i in ids.split(",") if i.strip()]
+    except ValueError:
+        raise FieldValidationError(
+            field_location=["query", "ids"],
+            message="ids must be 'all' or a comma separated list of integers",
+        )
+
+
 class ServiceStateMixin:
     """
     Mixin for services that handle state.
@@ -32,3 +51,33 @@ class ServiceStateMixin:
             return state_cls
 
         return decorator
+
+    async def get_states(
+        self, ids: Optional[list[int]] = None, include_secrets: bool = False
+    ) -> dict[int, Any]:
+        """
+        Returns the states of the given models keyed by id, or of every model
+        visible to the current project when `ids` is None.
+
+        This default resolves each state through the state class; services
+        with a dedicated state table override it with a single joined query.
+        `include_secrets` is only honoured by those overrides.
+        """
+        state_class = self.get_state_class()
+        if state_class is None:
+            return {}
+
+        model_class = self.model_class()
+        stmt = select(model_class).order_by(model_class.id.asc())
+        if ids is not None:
+            stmt = stmt.where(model_class.id.in_(ids))
+        result = await self.session.exec(self.apply_project_scope(stmt))
+
+        states = {}
+        for model in result.all():
+            state_instance = state_class(model, self)
+            if asyncio.iscoroutinefunction(state_instance.get):
+                states[model.id] = await state_instance.get()
+            else:
+                states[model.id] = state_instance.get()
+        return states
@@ -5,9 +5,12 @@ import fastapi
 from fastapi import Depends, Header, HTTPException
 import asyncio
 from typing import Annotated, List, Dict, Any, Type
+from sqlmodel import select
 from ..schema import ListResult, FormResult, Result, BaseResult
 from ..exc import ModelValidationError
 from ..action import ActionRequest
+from ..job import Job, find_active_job, serialize_job
+from .servicestate import parse_state_ids
 
 
 class ServiceViewMixin:
@@ -150,6 +153,22 @@ class ServiceViewMixin:
                     }
                 }
 
+        if cls.get_state_class():
+
+            @router.get(
+                f"{service_path}/_states",
+                operation_id=f"mw-list-states-{entity_type}",
+                dependencies=extra_deps,
+                tags=path_tags,
+            )
+            async def list_states(
+                svc: Annotated[cls, Depends(cls.get_service)],  # type: ignore
+                ids: str,
+                include_secrets: bool = False,
+            ):
+                states = await svc.get_states(parse_state_ids(ids), include_secrets)
+                return {"data": states}
+
         @router.post(
             service_path,
             operation_id=f"mw-create-{entity_type}",
@@ -271,6 +290,19 @@ class ServiceViewMixin:
                     status_code=400, detail=f"Action '{request.action}' not found"
                 )
 
+            params = dict(request.parameters)
+
+            # Identical background jobs are not enqueued twice
+            job = await find_active_job(
+                svc.session, cls.entity_type(), model.id, request.action, params
+            )
+            if job is not None:
+                return {
+                    "status": "running",
+                    "message": f"Action '{request.action}' is already {job.status}",
+                    "job_id": job.id,
+                }
+
             action_cls = actions[request.action]
             action_instance = action_cls(model, svc)
 
@@ -285,9 +317,27 @@ class ServiceViewMixin:
                         detail=f"Action '{request.action}' is not available",
                     )
 
-            params = dict(request.parameters)
-
             if asyncio.iscoroutinefunction(action_instance.__call__):
                 return await action_instance(**params)
             else:
                 return action_instance(**params)
+
+        @router.get(
+            f"{model_path}/_jobs",
+            operation_id=f"mw-list-jobs-{entity_type}",
+            dependencies=cls.extra_dependencies(),
+            tags=path_tags,
+        )
+        async def list_jobs(
+            svc: Annotated[cls, Depends(cls.get_service)],  # type: ignore
+            model: Annotated[model_class, Depends(cls.get_model)],  # type: ignore
+            limit: int = fastapi.Query(default=20, ge=1, le=100),
+        ):
+            """Lists the most recent action jobs of the model."""
+            result = await svc.session.exec(
+                select(Job)
+                .where(Job.entity == cls.entity_type(), Job.model_id == model.id)
+                .order_by(Job.id.desc())
+                .limit(limit)
+            )
+            return {"data": [serialize_job(job) for job in result.all()]}
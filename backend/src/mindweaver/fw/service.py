@@ -227,14 +227,20 @@ class Service(
             raise NotFoundError(message=f"{model_class.__name__}({model_id})")
         return obj
 
+    def apply_project_scope(self, stmt):
+        """Restricts a statement on the model to the current project."""
+        model_class = self.__class__.model_class()
+        project_id = self.get_project_id()
+        if project_id and hasattr(model_class, "project_id"):
+            stmt = stmt.where(model_class.project_id == project_id)
+        return stmt
+
     async def all(self) -> list[S]:
         model_class = self.__class__.model_class()
         stmt = select(model_class).order_by(model_class.id.asc())
 
         # Filter by project_id if available and model supports it
-        project_id = self.get_project_id()
-        if project_id and hasattr(model_class, "project_id"):
-            stmt = stmt.where(model_class.project_id == project_id)
+        stmt = self.apply_project_scope(stmt)
 
         models = await self.session.exec(stmt)
         return list(models.all())
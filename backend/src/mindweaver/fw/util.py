@@ -1,8 +1,9 @@
 # SPDX-FileCopyrightText: Copyright © 2025 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
+import functools
 import re
-from typing import Any
+from typing import Any, Optional, Union
 from pydantic import BaseModel, create_model
 
 
@@ -13,9 +14,6 @@ def camel_to_snake(name):
     return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
 
 
-from typing import Any, Optional, Union
-
-
 def redefine_model(
     name,
     Model: type[BaseModel],
@@ -119,6 +117,53 @@ def format_k8s_resource(value: float, unit: str = "") -> str:
     return str(value) + unit
 
 
+_K8S_QUANTITY_RE = re.compile(
+    r"^([+-]?(?:\d+\.?\d*|\.\d+))(?:([eE][+-]?\d+)|(Ki|Mi|Gi|Ti|Pi|Ei|n|u|m|k|M|G|T|P|E))?$"
+)
+_K8S_QUANTITY_MULTIPLIERS = {
+    None: 1.0,
+    "n": 1e-9,
+    "u": 1e-6,
+    "m": 1e-3,
+    "k": 1e3,
+    "M": 1e6,
+    "G": 1e9,
+    "T": 1e12,
+    "P": 1e15,
+    "E": 1e18,
+    "Ki": 2.0**10,
+    "Mi": 2.0**20,
+    "Gi": 2.0**30,
+    "Ti": 2.0**40,
+    "Pi": 2.0**50,
+    "Ei": 2.0**60,
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_k8s_quantity(value: str | int | float | None) -> float:
+    """
+    Parses a Kubernetes resource quantity into base units (cores or bytes).
+    Supports binary suffixes (Ki..Ei), decimal suffixes (n, u, m, k..E) and
+    exponent notation (e.g. "1e3"). Empty values parse to 0.0.
+    Raises ValueError for malformed quantities.
+    """
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = value.strip()
+    if not value:
+        return 0.0
+    match = _K8S_QUANTITY_RE.match(value)
+    if not match:
+        raise ValueError(f"Invalid Kubernetes quantity: {value!r}")
+    number, exponent, suffix = match.groups()
+    if exponent:
+        return float(number + exponent)
+    return float(number) * _K8S_QUANTITY_MULTIPLIERS[suffix]
+
+
 import secrets
 import string
 
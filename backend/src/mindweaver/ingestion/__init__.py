@@ -0,0 +1,41 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+from .brokers import BrokerConsumer, Message, register_broker
+from .model import (
+    ChunkStatus,
+    CrawlPage,
+    ExtractionCheckpoint,
+    IngestionState,
+    PageStatus,
+    StreamOffset,
+)
+from .api import ApiExtractionSpec, run_api_extraction
+from .crawl import CrawlSpec, run_crawl
+from .extract import ExtractionSpec, run_extraction
+from .incremental import IncrementalSpec, run_incremental
+from .s3 import S3MultipartWriter
+from .streaming import StreamSpec, run_stream_ingestion
+
+__all__ = [
+    "ApiExtractionSpec",
+    "BrokerConsumer",
+    "ChunkStatus",
+    "CrawlPage",
+    "CrawlSpec",
+    "ExtractionCheckpoint",
+    "ExtractionSpec",
+    "IncrementalSpec",
+    "IngestionState",
+    "Message",
+    "PageStatus",
+    "S3MultipartWriter",
+    "StreamOffset",
+    "StreamSpec",
+    "register_broker",
+    "run_api_extraction",
+    "run_crawl",
+    "run_extraction",
+    "run_incremental",
+    "run_stream_ingestion",
+]
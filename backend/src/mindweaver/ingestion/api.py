@@ -0,0 +1,423 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Extraction of paginated REST and GraphQL APIs to S3.
+
+Records are read page by page and written to S3 as they arrive, in objects
+of at most `batch_records` records, so memory is bounded by the pages in
+flight and one batch whatever the total number of records. Offset and
+page-number pagination fetch up to `concurrency` pages ahead, cursor,
+next-link and GraphQL pagination fetch pages one after the other since
+every page names the next. Failed requests are retried with jittered
+exponential backoff, waiting at least as long as a Retry-After header asks.
+
+Parquet objects of a run share the schema inferred from the first batch,
+so they can be read as one dataset. Columns that are only null in that
+batch are strings, and fields first seen in later batches are dropped.
+"""
+
+import asyncio
+import collections
+import io
+import json
+import logging
+import math
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Literal, Optional
+from urllib.parse import urljoin
+
+import httpx
+import pydantic
+
+from mindweaver.datasource_service.api_source.model import APISource
+from mindweaver.datasource_service.api_source.service import request_auth
+from mindweaver.datasource_service.base import connection_config
+from mindweaver.fw.model import ts_now
+from mindweaver.service.s3_storage.model import S3Storage
+from mindweaver.service.s3_storage.service import s3_client
+from .http import RETRY_STATUSES, backoff_delay, retry_after
+from .s3 import DEFAULT_PART_SIZE, MIN_PART_SIZE, S3MultipartWriter
+
+logger = logging.getLogger(__name__)
+
+
+class ApiExtractionSpec(pydantic.BaseModel):
+    """Parameters of an extraction of one API endpoint to S3."""
+
+    storage_id: int
+    bucket: str
+    prefix: str = ""
+    name: str = pydantic.Field(pattern=r"^[\w.-]+$")
+    path: str = ""
+    method: Literal["GET", "POST"] = "GET"
+    params: dict[str, Any] = pydantic.Field(default_factory=dict)
+    body: Optional[dict[str, Any]] = None
+    # Dotted path to the records in the response, or to the connection
+    # object for GraphQL; empty when the response is the list itself
+    records_path: str = ""
+    pagination: Literal["none", "offset", "page", "cursor", "next_link", "graphql"] = "none"
+    page_size: int = pydantic.Field(default=100, ge=1, le=10_000)
+    page_size_param: str = "limit"
+    offset_param: str = "offset"
+    page_param: str = "page"
+    start_page: int = 1
+    cursor_param: str = "cursor"
+    cursor_path: str = "next_cursor"
+    # Dotted path to the next page URL, the Link header is used otherwise
+    next_link_path: Optional[str] = None
+    # Dotted path to the total record count, bounds concurrent fetches
+    total_path: Optional[str] = None
+    query: Optional[str] = None
+    variables: dict[str, Any] = pydantic.Field(default_factory=dict)
+    max_pages: Optional[int] = pydantic.Field(default=None, ge=1)
+    concurrency: int = pydantic.Field(default=4, ge=1, le=32)
+    max_retries: int = pydantic.Field(default=5, ge=0, le=20)
+    backoff_base: float = pydantic.Field(default=0.5, ge=0)
+    backoff_max: float = pydantic.Field(default=30, ge=0)
+    timeout_seconds: float = pydantic.Field(default=30, gt=0)
+    format: Literal["jsonl", "parquet"] = "jsonl"
+    batch_records: int = pydantic.Field(default=50_000, ge=1)
+    part_size: int = pydantic.Field(default=DEFAULT_PART_SIZE, ge=MIN_PART_SIZE)
+
+    @pydantic.model_validator(mode="after")
+    def _check_pagination(self):
+        if self.pagination == "graphql" and not self.query:
+            raise ValueError("GraphQL pagination requires query")
+        return self
+
+    def object_key(self, run: str, index: int) -> str:
+        prefix = self.prefix.strip("/")
+        name = f"{self.name}/run={run}/part-{index:05d}.{self.format}"
+        return f"{prefix}/{name}" if prefix else name
+
+
+def lookup(data: Any, path: Optional[str]) -> Any:
+    """Resolves a dotted path in a JSON document, None when missing."""
+    if not path:
+        return data
+    for part in path.split("."):
+        if isinstance(data, dict):
+            data = data.get(part)
+        elif isinstance(data, list) and part.isdigit() and int(part) < len(data):
+            data = data[int(part)]
+        else:
+            return None
+    return data
+
+
+class RecordWriter:
+    """
+    Writes records to numbered S3 objects of at most `batch_records`
+    records each. JSON Lines objects are uploaded while they are written,
+    Parquet objects are built from one batch at a time.
+    """
+
+    def __init__(self, client, spec: ApiExtractionSpec, run: str):
+        self.client = client
+        self.spec = spec
+        self.run = run
+        self.objects: list[str] = []
+        self.records = 0
+        self.bytes = 0
+        self._count = 0
+        self._sink: Optional[S3MultipartWriter] = None
+        self._batch: list[dict[str, Any]] = []
+        self._schema = None
+        self._text_columns: list[str] = []
+        self._dropped: set[str] = set()
+
+    def _sink_for_next_object(self) -> S3MultipartWriter:
+        key = self.spec.object_key(self.run, len(self.objects))
+        self.objects.append(key)
+        return S3MultipartWriter(self.client, self.spec.bucket, key, self.spec.part_size)
+
+    def write(self, records: list[dict[str, Any]]):
+        for record in records:
+            if self.spec.format == "jsonl":
+                if self._sink is None:
+                    self._sink = self._sink_for_next_object()
+                self._sink.write(json.dumps(record, default=str).encode() + b"\n")
+            else:
+                self._batch.append(record)
+            self._count += 1
+            self.records += 1
+            if self._count >= self.spec.batch_records:
+                self.flush()
+
+    def flush(self):
+        """Completes the current object."""
+        if self._sink is not None:
+            self._sink.close()
+            self.bytes += self._sink.size
+            self._sink = None
+        if self._batch:
+            import pyarrow.parquet as pq
+
+            buffer = io.BytesIO()
+            pq.write_table(self._table(self._batch), buffer)
+            self._batch = []
+            with self._sink_for_next_object() as sink:
+                sink.write(buffer.getbuffer())
+            self.bytes += sink.size
+        self._count = 0
+
+    def _table(self, batch: list[dict[str, Any]]):
+        """Builds a batch as a table of the schema of the first batch."""
+        import pyarrow as pa
+
+        if self._schema is None:
+            inferred = pa.Table.from_pylist(batch).schema
+            self._schema = pa.schema(
+                [
+                    pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f
+                    for f in inferred
+                ]
+            )
+            self._text_columns = [
+                f.name for f in self._schema if pa.types.is_string(f.type)
+            ]
+        dropped = set().union(*batch) - set(self._schema.names) - self._dropped
+        if dropped:
+            logger.warning(
+                f"Fields not in the schema of {self.spec.name} are dropped: "
+                f"{', '.join(sorted(dropped))}"
+            )
+            self._dropped |= dropped
+        for record in batch:
+            for name in self._text_columns:
+                value = record.get(name)
+                if value is not None and not isinstance(value, str):
+                    record[name] = json.dumps(value, default=str)
+        return pa.Table.from_pylist(batch, schema=self._schema)
+
+    def abort(self):
+        if self._sink is not None:
+            self._sink.abort()
+            self._sink = None
+        self._batch = []
+
+
+class ApiExtractor:
+    """Reads the pages of one endpoint with retries."""
+
+    def __init__(self, spec: ApiExtractionSpec, config: dict[str, Any]):
+        self.spec = spec
+        headers, auth = request_auth(config)
+        self.client = httpx.AsyncClient(
+            headers={**(config.get("headers") or {}), **headers},
+            auth=auth,
+            verify=config.get("verify_ssl", False),
+            timeout=spec.timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=spec.concurrency,
+                max_keepalive_connections=spec.concurrency,
+            ),
+            follow_redirects=True,
+        )
+        self.url = urljoin(config["base_url"].rstrip("/") + "/", spec.path.lstrip("/"))
+        self.retries = 0
+        self.pages_fetched = 0
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Sends a request, retrying transport errors and retryable statuses."""
+        attempt = 0
+        while True:
+            try:
+                resp = await self.client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt >= self.spec.max_retries:
+                    raise
+                delay = backoff_delay(attempt, self.spec.backoff_base, self.spec.backoff_max)
+                logger.warning(f"Request to {url} failed ({e}), retrying in {delay:.1f}s")
+            else:
+                if resp.status_code not in RETRY_STATUSES or attempt >= self.spec.max_retries:
+                    resp.raise_for_status()
+                    return resp
+                delay = max(
+                    retry_after(resp.headers.get("Retry-After")),
+                    backoff_delay(attempt, self.spec.backoff_base, self.spec.backoff_max),
+                )
+                logger.warning(
+                    f"Request to {url} returned {resp.status_code}, retrying in {delay:.1f}s"
+                )
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    async def fetch(self, url: Optional[str] = None, params: Optional[dict] = None):
+        """Fetches one page, returns the response and its JSON body."""
+        spec = self.spec
+        if spec.pagination == "graphql" or spec.method == "POST":
+            resp = await self.request(
+                "POST",
+                url or self.url,
+                params=params if spec.pagination != "graphql" else spec.params,
+                json=spec.body if spec.pagination != "graphql" else params,
+            )
+        else:
+            resp = await self.request("GET", url or self.url, params=params)
+        self.pages_fetched += 1
+        data = resp.json()
+        if spec.pagination == "graphql" and data.get("errors"):
+            raise ValueError(f"GraphQL query failed: {data['errors'][0].get('message')}")
+        return resp, data
+
+    def records(self, data: Any) -> list[dict[str, Any]]:
+        found = lookup(data, self.spec.records_path)
+        if self.spec.pagination == "graphql":
+            found = found or {}
+            if found.get("edges") is not None:
+                return [edge.get("node") for edge in found["edges"]]
+            return list(found.get("nodes") or [])
+        if found is None:
+            return []
+        if not isinstance(found, list):
+            raise ValueError(f"Expected a list of records at '{self.spec.records_path}'")
+        return found
+
+    def _page_params(self, index: int) -> dict[str, Any]:
+        spec = self.spec
+        if spec.pagination == "offset":
+            position = {spec.offset_param: index * spec.page_size}
+        else:
+            position = {spec.page_param: spec.start_page + index}
+        return {**spec.params, spec.page_size_param: spec.page_size, **position}
+
+    async def _numbered_pages(self) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        Offset and page-number pagination, fetching pages ahead. Without a
+        total the end is the first short page, pages fetched beyond it are
+        discarded.
+        """
+        spec = self.spec
+        last = spec.max_pages - 1 if spec.max_pages else None
+        window: collections.deque[asyncio.Task] = collections.deque()
+        index = 0
+        try:
+            while True:
+                while len(window) < spec.concurrency and (last is None or index <= last):
+                    window.append(asyncio.create_task(self.fetch(params=self._page_params(index))))
+                    index += 1
+                    if index == 1:
+                        # The first page tells the total, if any
+                        break
+                if not window:
+                    return
+                _, data = await window.popleft()
+                records = self.records(data)
+                if spec.total_path and index == 1:
+                    total = lookup(data, spec.total_path)
+                    if total is not None:
+                        pages = max(math.ceil(int(total) / spec.page_size), 1)
+                        last = pages - 1 if last is None else min(last, pages - 1)
+                if records:
+                    yield records
+                if len(records) < spec.page_size:
+                    return
+        finally:
+            for task in window:
+                task.cancel()
+            # Pages beyond the end may have failed, their errors do not matter
+            await asyncio.gather(*window, return_exceptions=True)
+
+    async def _linked_pages(self) -> AsyncIterator[list[dict[str, Any]]]:
+        """Cursor, next-link and GraphQL pagination, one page after the other."""
+        spec = self.spec
+        url = None
+        cursor = None
+        fetched = 0
+        while spec.max_pages is None or fetched < spec.max_pages:
+            if spec.pagination == "graphql":
+                variables = {**spec.variables, "first": spec.page_size, "after": cursor}
+                _, data = await self.fetch(params={"query": spec.query, "variables": variables})
+            elif spec.pagination == "cursor":
+                params = {**spec.params, spec.page_size_param: spec.page_size}
+                if cursor is not None:
+                    params[spec.cursor_param] = cursor
+                _, data = await self.fetch(params=params)
+            else:
+                params = None if url else {**spec.params, spec.page_size_param: spec.page_size}
+                resp, data = await self.fetch(url, params=params)
+            fetched += 1
+            records = self.records(data)
+            if records:
+                yield records
+
+            if spec.pagination == "graphql":
+                page_info = (lookup(data, spec.records_path) or {}).get("pageInfo") or {}
+                cursor = page_info.get("endCursor")
+                if not page_info.get("hasNextPage") or not cursor:
+                    return
+            elif spec.pagination == "cursor":
+                cursor = lookup(data, spec.cursor_path)
+                if not cursor or not records:
+                    return
+            else:
+                if spec.next_link_path:
+                    url = lookup(data, spec.next_link_path)
+                else:
+                    url = resp.links.get("next", {}).get("url")
+                if not url or not records:
+                    return
+                url = urljoin(self.url, url)
+
+    async def pages(self) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yields the records of each page in order."""
+        if self.spec.pagination in ("offset", "page"):
+            async for records in self._numbered_pages():
+                yield records
+        elif self.spec.pagination == "none":
+            _, data = await self.fetch(params=self.spec.params or None)
+            yield self.records(data)
+        else:
+            async for records in self._linked_pages():
+                yield records
+
+
+async def run_api_extraction(
+    source: APISource,
+    storage: S3Storage,
+    spec: ApiExtractionSpec,
+    on_progress: Optional[Callable[[], Awaitable[None]]] = None,
+) -> dict[str, Any]:
+    """
+    Extracts the records of an endpoint of an API source to
+    `s3://bucket/prefix/name/run=<timestamp>/`, awaiting `on_progress`
+    after each page. Objects written before a failure are kept, a rerun
+    writes a new run.
+    """
+    config = connection_config(source)
+    client = s3_client(storage)
+    run = ts_now().strftime("%Y%m%dT%H%M%S")
+    extractor = ApiExtractor(spec, config)
+    writer = RecordWriter(client, spec, run)
+    started = time.perf_counter()
+    try:
+        async for records in extractor.pages():
+            await asyncio.to_thread(writer.write, records)
+            if on_progress is not None:
+                await on_progress()
+        await asyncio.to_thread(writer.flush)
+    except BaseException:
+        await asyncio.to_thread(writer.abort)
+        raise
+    finally:
+        await extractor.aclose()
+
+    duration = time.perf_counter() - started
+    summary = {
+        "run": run,
+        "pages": extractor.pages_fetched,
+        "records": writer.records,
+        "bytes": writer.bytes,
+        "retries": extractor.retries,
+        "duration": round(duration, 3),
+        "records_per_sec": round(writer.records / duration, 1) if duration else None,
+        "objects": [f"s3://{spec.bucket}/{key}" for key in writer.objects],
+    }
+    logger.info(f"Extracted {spec.name} from API source {source.id}: {summary}")
+    return summary
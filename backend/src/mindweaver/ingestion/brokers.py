@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Message broker consumers for streaming ingestion.
+
+Consumers are registered per `broker_type` of a streaming source with
+`register_broker`.
+"""
+
+import dataclasses
+from typing import Any, Callable, Optional
+
+CONSUMERS: dict[str, type["BrokerConsumer"]] = {}
+
+
+@dataclasses.dataclass
+class Message:
+    partition: int
+    offset: int
+    value: Optional[bytes]
+    key: Optional[bytes] = None
+    # Milliseconds since the epoch
+    timestamp: Optional[int] = None
+
+
+class BrokerConsumer:
+    """
+    Consumer of one topic for a consumer group. Offsets are only committed
+    explicitly, with the offset of the next message to read per partition.
+    """
+
+    def __init__(self, config: dict[str, Any], topic: str, group_id: str):
+        self.config = config
+        self.topic = topic
+        self.group_id = group_id
+
+    async def start(self):
+        pass
+
+    async def poll(self, max_records: int, timeout: float) -> list[Message]:
+        """Returns up to `max_records` messages, waiting at most `timeout` seconds."""
+        raise NotImplementedError
+
+    async def commit(self, offsets: dict[int, int]):
+        raise NotImplementedError
+
+    async def offsets(self) -> dict[int, tuple[Optional[int], Optional[int]]]:
+        """Returns the committed and end offset of every assigned partition."""
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+def register_broker(name: str) -> Callable[[type[BrokerConsumer]], type[BrokerConsumer]]:
+    def decorator(cls: type[BrokerConsumer]) -> type[BrokerConsumer]:
+        CONSUMERS[name.lower()] = cls
+        return cls
+
+    return decorator
+
+
+def open_consumer(config: dict[str, Any], topic: str, group_id: str) -> BrokerConsumer:
+    broker_type = (config.get("broker_type") or "").lower()
+    consumer_class = CONSUMERS.get(broker_type)
+    if consumer_class is None:
+        raise ValueError(f"Unsupported broker type {broker_type}")
+    return consumer_class(config, topic, group_id)
+
+
+@register_broker("kafka")
+class KafkaConsumer(BrokerConsumer):
+    """Kafka consumer on aiokafka, installed with the `kafka` extra."""
+
+    async def start(self):
+        try:
+            from aiokafka import AIOKafkaConsumer
+        except ImportError:
+            raise RuntimeError(
+                "Kafka ingestion requires aiokafka, install mindweaver[kafka]"
+            )
+
+        options: dict[str, Any] = {
+            "bootstrap_servers": self.config["bootstrap_servers"],
+            "group_id": self.group_id,
+            "enable_auto_commit": False,
+            "auto_offset_reset": "earliest",
+        }
+        if self.config.get("login"):
+            options.update(
+                security_protocol="SASL_SSL" if self.config.get("enable_ssl") else "SASL_PLAINTEXT",
+                sasl_mechanism="PLAIN",
+                sasl_plain_username=self.config["login"],
+                sasl_plain_password=self.config.get("password"),
+            )
+        elif self.config.get("enable_ssl"):
+            options["security_protocol"] = "SSL"
+        options.update(self.config.get("extra_config") or {})
+        self.consumer = AIOKafkaConsumer(self.topic, **options)
+        await self.consumer.start()
+
+    async def poll(self, max_records: int, timeout: float) -> list[Message]:
+        batches = await self.consumer.getmany(
+            timeout_ms=int(timeout * 1000), max_records=max_records
+        )
+        return [
+            Message(
+                partition=tp.partition,
+                offset=record.offset,
+                value=record.value,
+                key=record.key,
+                timestamp=record.timestamp,
+            )
+            for tp, records in batches.items()
+            for record in records
+        ]
+
+    async def commit(self, offsets: dict[int, int]):
+        from aiokafka import TopicPartition
+
+        await self.consumer.commit(
+            {TopicPartition(self.topic, p): offset for p, offset in offsets.items()}
+        )
+
+    async def offsets(self) -> dict[int, tuple[Optional[int], Optional[int]]]:
+        assignment = list(self.consumer.assignment())
+        ends = await self.consumer.end_offsets(assignment)
+        result = {}
+        for tp in assignment:
+            result[tp.partition] = (await self.consumer.committed(tp), ends.get(tp))
+        return result
+
+    async def close(self):
+        await self.consumer.stop()
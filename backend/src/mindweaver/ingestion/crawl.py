@@ -0,0 +1,564 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Incremental crawling of web sources into content-addressed storage on S3.
+
+Pages are fetched with one pooled HTTP client, at most `concurrency` at a
+time and `per_host_concurrency` per host, spaced by `delay_seconds` or the
+Crawl-delay of the host's robots.txt, whichever is longer. Bodies are
+streamed to a spooled file while hashed and stored once per SHA-256 under
+`objects/`, so identical pages share one object.
+
+The frontier lives in `mw_crawl_page`: an interrupted crawl resumes with
+the pages still queued, and once a crawl completed the next one queues all
+known pages again and revalidates them with their ETag and Last-Modified,
+so only changed pages are downloaded.
+"""
+
+import asyncio
+import collections
+import hashlib
+import json
+import logging
+import tempfile
+import threading
+from html.parser import HTMLParser
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+import pydantic
+from botocore.exceptions import ClientError
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.datasource_service.base import connection_config
+from mindweaver.datasource_service.web_source.model import WebSource
+from mindweaver.fw.model import ts_now
+from mindweaver.service.s3_storage.model import S3Storage
+from mindweaver.service.s3_storage.service import s3_client
+from .http import retry_after
+from .model import CrawlPage, PageStatus
+from .s3 import S3MultipartWriter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mindweaver-Crawler/1.0"
+FRONTIER_BATCH = 200
+# Pages inserted per statement, well below the bind parameter limit
+QUEUE_BATCH = 500
+MAX_ATTEMPTS = 3
+SPOOL_SIZE = 1024 * 1024
+MAX_ERROR_LENGTH = 4000
+
+
+class CrawlSpec(pydantic.BaseModel):
+    """Parameters of a crawl of a web source to S3."""
+
+    storage_id: int
+    bucket: str
+    prefix: str = ""
+    max_pages: int = pydantic.Field(default=1000, ge=1)
+    max_depth: int = pydantic.Field(default=3, ge=0)
+    concurrency: int = pydantic.Field(default=16, ge=1, le=128)
+    per_host_concurrency: int = pydantic.Field(default=2, ge=1, le=32)
+    delay_seconds: float = pydantic.Field(default=0.5, ge=0)
+    respect_robots: bool = True
+    timeout_seconds: float = pydantic.Field(default=30, gt=0)
+    max_page_bytes: int = pydantic.Field(default=10 * 1024 * 1024, ge=1)
+
+    def crawl_key(self, source_id: int) -> str:
+        """Identifies the frontier, shared by crawls to the same destination."""
+        identity = self.model_dump(include={"storage_id", "bucket", "prefix"})
+        encoded = json.dumps({"source_id": source_id, **identity}, sort_keys=True)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def content_key(self, content_hash: str) -> str:
+        prefix = self.prefix.strip("/")
+        name = f"objects/{content_hash[:2]}/{content_hash}"
+        return f"{prefix}/{name}" if prefix else name
+
+
+def normalize_url(url: str) -> str:
+    """Drops the fragment and lowercases scheme and host."""
+    url, _ = urldefrag(url)
+    parts = urlsplit(url)
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, "")
+    )
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+class LinkExtractor(HTMLParser):
+    """Collects the followable links of an HTML page."""
+
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.links: list[str] = []
+        self.nofollow = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "base" and attrs.get("href"):
+            self.base_url = urljoin(self.base_url, attrs["href"])
+        elif tag == "meta" and (attrs.get("name") or "").lower() == "robots":
+            if "nofollow" in (attrs.get("content") or "").lower():
+                self.nofollow = True
+        elif tag == "a" and attrs.get("href"):
+            if "nofollow" not in (attrs.get("rel") or "").lower():
+                self.links.append(urljoin(self.base_url, attrs["href"]))
+
+
+def extract_links(html: str, base_url: str, respect_robots: bool = True) -> list[str]:
+    parser = LinkExtractor(base_url)
+    parser.feed(html)
+    parser.close()
+    if parser.nofollow and respect_robots:
+        return []
+    return parser.links
+
+
+class _Host:
+    """Politeness state of one host."""
+
+    def __init__(self, concurrency: int, delay: float):
+        self.slots = asyncio.Semaphore(concurrency)
+        self.delay = delay
+        self.next_request = 0.0
+        self.robots: Optional[RobotFileParser] = None
+        self.lock = asyncio.Lock()
+
+
+class Crawler:
+    """Fetches pages politely and stores their content on S3."""
+
+    def __init__(
+        self,
+        spec: CrawlSpec,
+        s3,
+        *,
+        allowed_domains: list[str],
+        user_agent: str = DEFAULT_USER_AGENT,
+        auth: Optional[tuple[str, str]] = None,
+        auth_host: Optional[str] = None,
+        verify: bool = True,
+    ):
+        self.spec = spec
+        self.s3 = s3
+        self.allowed_domains = [d.lower() for d in allowed_domains]
+        self.user_agent = user_agent
+        self.auth = auth
+        self.auth_host = auth_host
+        self.client = httpx.AsyncClient(
+            headers={"User-Agent": user_agent},
+            limits=httpx.Limits(
+                max_connections=spec.concurrency,
+                max_keepalive_connections=spec.concurrency,
+            ),
+            timeout=spec.timeout_seconds,
+            verify=verify,
+            follow_redirects=True,
+        )
+        self.hosts: dict[str, _Host] = {}
+        self.stored: set[str] = set()
+        self._stored_lock = threading.Lock()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    def allowed(self, url: str) -> bool:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            return False
+        host = parts.hostname
+        return any(host == d or host.endswith(f".{d}") for d in self.allowed_domains)
+
+    async def _host(self, url: str) -> _Host:
+        parts = urlsplit(url)
+        host = self.hosts.get(parts.netloc)
+        if host is None:
+            host = self.hosts[parts.netloc] = _Host(
+                self.spec.per_host_concurrency, self.spec.delay_seconds
+            )
+        if self.spec.respect_robots and host.robots is None:
+            async with host.lock:
+                if host.robots is None:
+                    host.robots = await self._load_robots(f"{parts.scheme}://{parts.netloc}")
+                    crawl_delay = host.robots.crawl_delay(self.user_agent)
+                    if crawl_delay:
+                        host.delay = max(host.delay, float(crawl_delay))
+        return host
+
+    async def _load_robots(self, origin: str) -> RobotFileParser:
+        robots = RobotFileParser(f"{origin}/robots.txt")
+        try:
+            resp = await self.client.get(f"{origin}/robots.txt")
+        except httpx.HTTPError:
+            # Unreachable host, its pages fail on their own
+            robots.allow_all = True
+            return robots
+        if resp.status_code >= 500:
+            robots.disallow_all = True
+        elif resp.status_code >= 400:
+            robots.allow_all = True
+        else:
+            robots.parse(resp.text.splitlines())
+        return robots
+
+    async def _wait_turn(self, host: _Host):
+        loop = asyncio.get_running_loop()
+        async with host.lock:
+            now = loop.time()
+            wait = host.next_request - now
+            host.next_request = max(now, host.next_request) + host.delay
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def fetch(self, page: dict[str, Any]) -> dict[str, Any]:
+        """
+        Fetches one page and stores its content. Returns the outcome, the
+        values to record on the page and the discovered links. Never raises.
+        """
+        try:
+            return await self._fetch(page)
+        except Exception as e:
+            return {"outcome": "failed", "error": str(e) or type(e).__name__}
+
+    async def _fetch(self, page: dict[str, Any]) -> dict[str, Any]:
+        url = page["url"]
+        host = await self._host(url)
+        if self.spec.respect_robots and not host.robots.can_fetch(self.user_agent, url):
+            return {"outcome": "skipped", "error": "Disallowed by robots.txt"}
+
+        headers = {}
+        if page.get("etag"):
+            headers["If-None-Match"] = page["etag"]
+        if page.get("last_modified"):
+            headers["If-Modified-Since"] = page["last_modified"]
+        auth = self.auth if urlsplit(url).netloc == self.auth_host else None
+
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)
+        try:
+            async with host.slots:
+                await self._wait_turn(host)
+                async with self.client.stream("GET", url, headers=headers, auth=auth) as resp:
+                    status = resp.status_code
+                    if status == 304:
+                        return {"outcome": "not_modified", "http_status": status}
+                    if status in (429, 503):
+                        delay = retry_after(resp.headers.get("Retry-After"))
+                        host.next_request = max(
+                            host.next_request, asyncio.get_running_loop().time() + delay
+                        )
+                        return {"outcome": "retry", "http_status": status}
+                    if status >= 400:
+                        return {
+                            "outcome": "failed",
+                            "http_status": status,
+                            "error": f"HTTP {status}",
+                        }
+                    hasher = hashlib.sha256()
+                    size = 0
+                    async for chunk in resp.aiter_bytes():
+                        size += len(chunk)
+                        if size > self.spec.max_page_bytes:
+                            return {
+                                "outcome": "failed",
+                                "http_status": status,
+                                "error": f"Page exceeds {self.spec.max_page_bytes} bytes",
+                            }
+                        hasher.update(chunk)
+                        spool.write(chunk)
+                    final_url = str(resp.url)
+                    encoding = resp.encoding or "utf-8"
+                    content_type = resp.headers.get("Content-Type")
+                    values = {
+                        "http_status": status,
+                        "etag": resp.headers.get("ETag"),
+                        "last_modified": resp.headers.get("Last-Modified"),
+                        "content_type": content_type,
+                        "size": size,
+                    }
+
+            content_hash = hasher.hexdigest()
+            object_key = self.spec.content_key(content_hash)
+            values.update(content_hash=content_hash, object_key=object_key)
+            if content_hash == page.get("content_hash"):
+                # Served again without validators, nothing new to store
+                return {"outcome": "unchanged", **values}
+
+            links = []
+            if page["depth"] < self.spec.max_depth and "html" in (content_type or ""):
+                spool.seek(0)
+                html = spool.read().decode(encoding, errors="replace")
+                links = await asyncio.to_thread(
+                    extract_links, html, final_url, self.spec.respect_robots
+                )
+            outcome = await asyncio.to_thread(
+                self._store, spool, content_hash, object_key, content_type
+            )
+            return {
+                "outcome": outcome,
+                **values,
+                "links": [normalize_url(link) for link in links if self.allowed(link)],
+            }
+        finally:
+            spool.close()
+
+    def _store(self, spool, content_hash: str, key: str, content_type: Optional[str]) -> str:
+        """Uploads the content unless an object with the same hash exists."""
+        with self._stored_lock:
+            # Claimed before uploading, so concurrent duplicates upload once
+            if content_hash in self.stored:
+                return "deduplicated"
+            self.stored.add(content_hash)
+        try:
+            try:
+                self.s3.head_object(Bucket=self.spec.bucket, Key=key)
+            except ClientError as e:
+                if e.response["Error"]["Code"] not in ("404", "NoSuchKey", "NotFound"):
+                    raise
+            else:
+                return "deduplicated"
+            spool.seek(0)
+            extra = {"ContentType": content_type} if content_type else {}
+            with S3MultipartWriter(self.s3, self.spec.bucket, key, **extra) as writer:
+                while chunk := spool.read(SPOOL_SIZE):
+                    writer.write(chunk)
+            return "stored"
+        except Exception:
+            with self._stored_lock:
+                self.stored.discard(content_hash)
+            raise
+
+
+def _page_values(result: dict[str, Any]) -> dict[str, Any]:
+    outcome = result["outcome"]
+    now = ts_now()
+    if outcome == "skipped":
+        return {"status": PageStatus.SKIPPED, "error": result["error"], "modified": now}
+    if outcome == "failed":
+        return {
+            "status": PageStatus.FAILED,
+            "http_status": result.get("http_status"),
+            "error": result["error"][:MAX_ERROR_LENGTH],
+            "modified": now,
+        }
+    fields = (
+        "http_status",
+        "etag",
+        "last_modified",
+        "content_hash",
+        "content_type",
+        "size",
+        "object_key",
+    )
+    values = {k: result[k] for k in fields if k in result}
+    return {
+        **values,
+        "status": PageStatus.FETCHED,
+        "error": None,
+        "fetched": now,
+        "modified": now,
+    }
+
+
+async def _queue_pages(
+    session: AsyncSession,
+    crawl_key: str,
+    source_id: int,
+    urls: list[str],
+    depth: int,
+) -> int:
+    """Adds unknown pages to the frontier, returns how many were new."""
+    rows = [
+        {
+            "crawl_key": crawl_key,
+            "source_id": source_id,
+            "url": url,
+            "url_hash": url_hash(url),
+            "depth": depth,
+        }
+        for url in dict.fromkeys(urls)
+    ]
+    queued = 0
+    for offset in range(0, len(rows), QUEUE_BATCH):
+        result = await session.exec(
+            insert(CrawlPage)
+            .values(rows[offset : offset + QUEUE_BATCH])
+            .on_conflict_do_nothing(index_elements=["crawl_key", "url_hash"])
+            .returning(CrawlPage.id)
+        )
+        queued += len(result.all())
+    return queued
+
+
+async def _load_frontier(
+    session: AsyncSession, crawl_key: str, after_id: int
+) -> list[dict[str, Any]]:
+    result = await session.exec(
+        select(CrawlPage)
+        .where(
+            CrawlPage.crawl_key == crawl_key,
+            CrawlPage.status == PageStatus.QUEUED,
+            CrawlPage.id > after_id,
+        )
+        .order_by(CrawlPage.id)
+        .limit(FRONTIER_BATCH)
+    )
+    return [
+        {
+            "id": page.id,
+            "url": page.url,
+            "depth": page.depth,
+            "etag": page.etag,
+            "last_modified": page.last_modified,
+            "content_hash": page.content_hash,
+            "attempts": 0,
+        }
+        for page in result.all()
+    ]
+
+
+async def run_crawl(
+    session: AsyncSession,
+    source: WebSource,
+    storage: S3Storage,
+    spec: CrawlSpec,
+    on_progress: Optional[Callable[[], Awaitable[None]]] = None,
+) -> dict[str, Any]:
+    """
+    Crawls a web source from its URL, fetching at most `max_pages` pages.
+    Continues the previous crawl while it has queued pages, otherwise
+    starts a recrawl of all known pages. Page outcomes are committed as
+    they complete and `on_progress` is awaited after each batch.
+    """
+    # Read everything needed from the models before commits expire them
+    source_id = source.id
+    config = connection_config(source)
+    s3 = s3_client(storage, max_pool_connections=max(10, spec.concurrency))
+
+    crawl_key = spec.crawl_key(source_id)
+    start_url = normalize_url(config["url"])
+    start_host = urlsplit(start_url).netloc
+    allowed_domains = [
+        d.strip() for d in (config.get("allowed_domains") or "").split(",") if d.strip()
+    ] or [urlsplit(start_url).hostname]
+
+    queued = (
+        await session.exec(
+            select(func.count())
+            .select_from(CrawlPage)
+            .where(CrawlPage.crawl_key == crawl_key, CrawlPage.status == PageStatus.QUEUED)
+        )
+    ).one()
+    resumed = bool(queued)
+    if not resumed:
+        # The previous crawl completed, revalidate every known page
+        await session.exec(
+            update(CrawlPage)
+            .where(CrawlPage.crawl_key == crawl_key)
+            .values(status=PageStatus.QUEUED, modified=ts_now())
+        )
+        await _queue_pages(session, crawl_key, source_id, [start_url], 0)
+        await session.commit()
+
+    auth = None
+    if config.get("login") and config.get("password"):
+        auth = (config["login"], config["password"])
+    crawler = Crawler(
+        spec,
+        s3,
+        allowed_domains=allowed_domains,
+        user_agent=config.get("user_agent") or DEFAULT_USER_AGENT,
+        auth=auth,
+        auth_host=start_host,
+        verify=config.get("verify_ssl", False),
+    )
+
+    counts = collections.Counter()
+    frontier: collections.deque = collections.deque()
+    pending: dict[asyncio.Task, dict[str, Any]] = {}
+    last_id = 0
+    fetched = 0
+    written = 0
+    try:
+        while True:
+            while len(pending) < spec.concurrency and fetched + len(pending) < spec.max_pages:
+                if not frontier:
+                    frontier.extend(await _load_frontier(session, crawl_key, last_id))
+                    if not frontier:
+                        break
+                    last_id = frontier[-1]["id"]
+                page = frontier.popleft()
+                pending[asyncio.create_task(crawler.fetch(page))] = page
+            if not pending:
+                break
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                page = pending.pop(task)
+                result = task.result()
+                if result["outcome"] == "retry":
+                    page["attempts"] += 1
+                    if page["attempts"] < MAX_ATTEMPTS:
+                        counts["retried"] += 1
+                        frontier.appendleft(page)
+                        continue
+                    result = {
+                        "outcome": "failed",
+                        "http_status": result["http_status"],
+                        "error": f"HTTP {result['http_status']} after {MAX_ATTEMPTS} attempts",
+                    }
+                fetched += 1
+                counts[result["outcome"]] += 1
+                if result["outcome"] == "stored":
+                    written += result["size"]
+                await session.exec(
+                    update(CrawlPage)
+                    .where(CrawlPage.id == page["id"])
+                    .values(**_page_values(result))
+                )
+                counts["discovered"] += await _queue_pages(
+                    session, crawl_key, source_id, result.get("links", []), page["depth"] + 1
+                )
+            await session.commit()
+            if on_progress is not None:
+                await on_progress()
+    finally:
+        for task in pending:
+            task.cancel()
+        await crawler.aclose()
+
+    remaining = (
+        await session.exec(
+            select(func.count())
+            .select_from(CrawlPage)
+            .where(CrawlPage.crawl_key == crawl_key, CrawlPage.status == PageStatus.QUEUED)
+        )
+    ).one()
+    summary = {
+        "crawl_key": crawl_key,
+        "resumed": resumed,
+        "fetched": fetched,
+        "stored": counts["stored"],
+        "deduplicated": counts["deduplicated"],
+        "unchanged": counts["unchanged"],
+        "not_modified": counts["not_modified"],
+        "skipped": counts["skipped"],
+        "failed": counts["failed"],
+        "retried": counts["retried"],
+        "discovered": counts["discovered"],
+        "bytes": written,
+        "queued": remaining,
+    }
+    logger.info(f"Crawled web source {source_id}: {summary}")
+    return summary
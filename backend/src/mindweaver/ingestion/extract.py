@@ -0,0 +1,337 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Parallel extraction of database source tables to Parquet on S3.
+
+A table is split into chunks, either integer key ranges of `key_column` or,
+for partitioned Postgres tables, their leaf partitions. Chunks run on a
+bounded thread pool; each streams its rows through a server-side cursor in
+row group sized batches into a Parquet writer whose output is uploaded as
+it is produced, so memory stays bounded by one batch and one upload part
+per worker. The chunk plan and the outcome of every chunk are checkpointed
+in `mw_extraction_checkpoint`, so rerunning a failed extraction only
+extracts the chunks that did not complete.
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import logging
+import math
+import time
+from typing import Any, Awaitable, Callable, Literal, Optional
+
+import pydantic
+from sqlalchemy import (
+    and_,
+    column,
+    create_engine,
+    delete,
+    func,
+    inspect,
+    or_,
+    select,
+    table,
+    text,
+    update,
+)
+from sqlalchemy.engine import Engine
+from sqlmodel import select as sqlmodel_select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.datasource_service.base import connection_config
+from mindweaver.datasource_service.database_source.model import DatabaseSource
+from mindweaver.datasource_service.database_source.service import (
+    CONNECT_TIMEOUT,
+    connection_url,
+)
+from mindweaver.fw.model import ts_now
+from mindweaver.service.s3_storage.model import S3Storage
+from mindweaver.service.s3_storage.service import s3_client
+from .model import ChunkStatus, ExtractionCheckpoint
+from .parquet import ParquetObjectWriter, stream_rows
+from .s3 import DEFAULT_PART_SIZE, MIN_PART_SIZE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROW_GROUP_ROWS = 50_000
+MAX_PARALLELISM = 32
+MAX_ERROR_LENGTH = 4000
+
+
+class ExtractionSpec(pydantic.BaseModel):
+    """Parameters of an extraction of one table to S3."""
+
+    table: str
+    schema_name: Optional[str] = None
+    storage_id: int
+    bucket: str
+    prefix: str = ""
+    key_column: Optional[str] = None
+    chunks: int = pydantic.Field(default=8, ge=1, le=1024)
+    parallelism: int = pydantic.Field(default=4, ge=1, le=MAX_PARALLELISM)
+    row_group_rows: int = pydantic.Field(default=DEFAULT_ROW_GROUP_ROWS, ge=1)
+    part_size: int = pydantic.Field(default=DEFAULT_PART_SIZE, ge=MIN_PART_SIZE)
+    compression: Literal["snappy", "zstd", "gzip", "none"] = "snappy"
+
+    def run_key(self, source_id: int) -> str:
+        """
+        Identifies the chunk layout and destination of the extraction;
+        tuning parameters may change between a run and its resumption.
+        """
+        identity = self.model_dump(
+            include={
+                "table",
+                "schema_name",
+                "storage_id",
+                "bucket",
+                "prefix",
+                "key_column",
+                "chunks",
+            }
+        )
+        encoded = json.dumps({"source_id": source_id, **identity}, sort_keys=True)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def object_key(self, chunk_index: int) -> str:
+        relation = f"{self.schema_name}.{self.table}" if self.schema_name else self.table
+        prefix = self.prefix.strip("/")
+        name = f"{relation}/part-{chunk_index:05d}.parquet"
+        return f"{prefix}/{name}" if prefix else name
+
+
+def extraction_connect_args(engine_name: str) -> dict[str, Any]:
+    """Bounds the connect handshake only, extraction queries may run long."""
+    if engine_name in ("postgresql", "mysql", "mariadb"):
+        return {"connect_timeout": CONNECT_TIMEOUT}
+    return {}
+
+
+def read_columns(engine: Engine, schema_name: Optional[str], table_name: str) -> list[dict]:
+    with engine.connect() as conn:
+        columns = inspect(conn).get_columns(table_name, schema=schema_name)
+    if not columns:
+        raise ValueError(f"Table {table_name} not found or has no columns")
+    return columns
+
+
+def plan_chunks(engine: Engine, spec: ExtractionSpec) -> list[dict[str, Any]]:
+    """
+    Splits the table into key ranges of `key_column`, or into its leaf
+    partitions when no key column is given and the table is a partitioned
+    Postgres table. Otherwise the whole table is one chunk.
+    """
+    relation = [spec.schema_name, spec.table]
+    with engine.connect() as conn:
+        if spec.key_column:
+            source = table(spec.table, column(spec.key_column), schema=spec.schema_name)
+            key = source.c[spec.key_column]
+            low, high = conn.execute(select(func.min(key), func.max(key))).one()
+            if low is None:
+                return [{"relation": relation}]
+            if not isinstance(low, int):
+                raise ValueError(
+                    f"Key column {spec.key_column} must be an integer column"
+                )
+            step = math.ceil((high - low + 1) / spec.chunks)
+            chunks = []
+            lower = low
+            while lower <= high:
+                upper = min(lower + step, high + 1)
+                # Rows without a key are extracted with the first range
+                chunks.append(
+                    {"relation": relation, "lower": lower, "upper": upper, "nulls": not chunks}
+                )
+                lower = upper
+            return chunks
+
+        if conn.dialect.name == "postgresql":
+            qualified = conn.dialect.identifier_preparer.format_table(
+                table(spec.table, schema=spec.schema_name)
+            )
+            partitions = conn.execute(
+                text(
+                    "SELECT n.nspname, c.relname "
+                    "FROM pg_partition_tree(to_regclass(:relation)) p "
+                    "JOIN pg_class c ON c.oid = p.relid "
+                    "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                    "WHERE p.isleaf AND p.level > 0 ORDER BY n.nspname, c.relname"
+                ),
+                {"relation": qualified},
+            ).all()
+            if partitions:
+                return [{"relation": [schema, name]} for schema, name in partitions]
+    return [{"relation": relation}]
+
+
+def extract_chunk(
+    engine: Engine,
+    client,
+    spec: ExtractionSpec,
+    chunk: dict[str, Any],
+    columns: list[dict[str, Any]],
+    object_key: str,
+) -> dict[str, Any]:
+    """
+    Streams the rows of a chunk into a Parquet object, one row group per
+    fetched batch. Blocking, meant to run on a worker thread.
+    """
+    started = time.perf_counter()
+    schema_name, table_name = chunk["relation"]
+    source = table(table_name, *(column(c["name"]) for c in columns), schema=schema_name)
+    stmt = select(*source.c)
+    if "lower" in chunk:
+        key = source.c[spec.key_column]
+        condition = and_(key >= chunk["lower"], key < chunk["upper"])
+        if chunk.get("nulls"):
+            condition = or_(condition, key.is_(None))
+        stmt = stmt.where(condition)
+
+    with ParquetObjectWriter(
+        client,
+        spec.bucket,
+        object_key,
+        columns,
+        part_size=spec.part_size,
+        compression=spec.compression,
+        write_empty=True,
+    ) as writer:
+        for partition in stream_rows(engine, stmt, spec.row_group_rows):
+            writer.write_rows(partition)
+    return {
+        **writer.stats(),
+        "duration": round(time.perf_counter() - started, 3),
+    }
+
+
+async def _load_checkpoints(
+    session: AsyncSession, run_key: str
+) -> list[ExtractionCheckpoint]:
+    result = await session.exec(
+        sqlmodel_select(ExtractionCheckpoint)
+        .where(ExtractionCheckpoint.run_key == run_key)
+        .order_by(ExtractionCheckpoint.chunk_index)
+    )
+    return list(result.all())
+
+
+async def run_extraction(
+    session: AsyncSession,
+    source: DatabaseSource,
+    storage: S3Storage,
+    spec: ExtractionSpec,
+    on_progress: Optional[Callable[[], Awaitable[None]]] = None,
+) -> dict[str, Any]:
+    """
+    Extracts a table to `s3://bucket/prefix/` as one Parquet object per
+    chunk, resuming an earlier incomplete run with the same chunk layout.
+    Checkpoints are committed as chunks finish and `on_progress` is awaited
+    after each. Raises when any chunk failed, after all chunks were tried.
+    """
+    # Read everything needed from the models before commits expire them
+    source_id = source.id
+    config = connection_config(source)
+    client = s3_client(storage, max_pool_connections=max(10, spec.parallelism * 2))
+
+    run_key = spec.run_key(source_id)
+    checkpoints = await _load_checkpoints(session, run_key)
+    if checkpoints and all(c.status == ChunkStatus.DONE for c in checkpoints):
+        # The previous run completed, start a fresh snapshot
+        await session.exec(
+            delete(ExtractionCheckpoint).where(ExtractionCheckpoint.run_key == run_key)
+        )
+        await session.commit()
+        checkpoints = []
+
+    engine_name = config.get("engine", "").lower()
+    engine = create_engine(
+        connection_url(config),
+        pool_size=spec.parallelism,
+        max_overflow=0,
+        connect_args=extraction_connect_args(engine_name),
+    )
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=spec.parallelism, thread_name_prefix="mw-extract"
+    )
+    loop = asyncio.get_running_loop()
+    try:
+        columns = await loop.run_in_executor(
+            executor, read_columns, engine, spec.schema_name, spec.table
+        )
+        if not checkpoints:
+            chunks = await loop.run_in_executor(executor, plan_chunks, engine, spec)
+            for index, chunk in enumerate(chunks):
+                session.add(
+                    ExtractionCheckpoint(
+                        run_key=run_key,
+                        source_id=source_id,
+                        chunk_index=index,
+                        chunk=chunk,
+                        object_key=spec.object_key(index),
+                    )
+                )
+            await session.commit()
+            checkpoints = await _load_checkpoints(session, run_key)
+
+        # Plain values, the checkpoint objects expire on every commit
+        todo = [
+            (c.id, c.chunk_index, c.chunk, c.object_key)
+            for c in checkpoints
+            if c.status != ChunkStatus.DONE
+        ]
+        skipped = len(checkpoints) - len(todo)
+        if skipped:
+            logger.info(f"Resuming extraction {run_key[:12]}, {skipped} chunks already done")
+        pending = {
+            loop.run_in_executor(
+                executor, extract_chunk, engine, client, spec, chunk, columns, object_key
+            ): (checkpoint_id, chunk_index)
+            for checkpoint_id, chunk_index, chunk, object_key in todo
+        }
+
+        failed = 0
+        async for future in asyncio.as_completed(pending):
+            checkpoint_id, chunk_index = pending[future]
+            now = ts_now()
+            try:
+                stats = await future
+            except Exception as e:
+                failed += 1
+                logger.error(f"Chunk {chunk_index} of {spec.table} failed: {e}")
+                values = {
+                    "status": ChunkStatus.FAILED,
+                    "error": (str(e) or type(e).__name__)[:MAX_ERROR_LENGTH],
+                }
+            else:
+                values = {"status": ChunkStatus.DONE, "error": None, **stats}
+            await session.exec(
+                update(ExtractionCheckpoint)
+                .where(ExtractionCheckpoint.id == checkpoint_id)
+                .values(finished=now, modified=now, **values)
+            )
+            await session.commit()
+            if on_progress is not None:
+                await on_progress()
+    finally:
+        executor.shutdown(wait=True)
+        engine.dispose()
+
+    checkpoints = await _load_checkpoints(session, run_key)
+    done = [c for c in checkpoints if c.status == ChunkStatus.DONE]
+    summary = {
+        "run_key": run_key,
+        "chunks": len(checkpoints),
+        "extracted": len(todo) - failed,
+        "skipped": skipped,
+        "failed": failed,
+        "rows": sum(c.rows or 0 for c in done),
+        "bytes": sum(c.bytes or 0 for c in done),
+        "objects": [f"s3://{spec.bucket}/{c.object_key}" for c in done],
+    }
+    if failed:
+        raise RuntimeError(
+            f"{failed} of {len(checkpoints)} chunks failed, rerun the extraction to resume"
+        )
+    return summary
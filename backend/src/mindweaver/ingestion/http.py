@@ -0,0 +1,33 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""HTTP retry policy shared by the web and API ingestions."""
+
+import email.utils
+import random
+import time
+from typing import Optional
+
+MAX_RETRY_AFTER = 300
+# Statuses worth retrying, the server is overloaded or briefly unavailable
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def retry_after(value: Optional[str]) -> float:
+    """Seconds to wait from a Retry-After header, in seconds or as a date."""
+    if not value:
+        return 0.0
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return 0.0
+        seconds = when.timestamp() - time.time()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter for the given 0-based attempt."""
+    return random.uniform(0, min(cap, base * 2**attempt))
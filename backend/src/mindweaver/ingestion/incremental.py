@@ -0,0 +1,518 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Incremental ingestion of database source tables to Parquet on S3.
+
+Each run extracts the rows whose watermark column is past the watermark of
+the previous run, either a monotonic key or an `updated_at` style timestamp,
+and appends them as a changelog object (`_op` = upsert) to a partition of
+the table's dataset keyed by ingestion date. The watermark and run
+statistics are kept in `mw_ingestion_state`.
+
+With `detect_deletes`, the run also finds rows deleted at the source. The
+primary keys are hashed into `KEY_BUCKETS` buckets and the digest of every
+bucket is compared to the previous run's; only the keys of buckets whose
+digest changed are diffed against their snapshot on S3, and the missing
+keys are appended as tombstones (`_op` = delete).
+"""
+
+import asyncio
+import datetime
+import decimal
+import hashlib
+import io
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Literal, Optional
+
+import pydantic
+from sqlalchemy import column, create_engine, select, table
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.pool import NullPool
+from sqlmodel import select as sqlmodel_select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.datasource_service.base import connection_config
+from mindweaver.datasource_service.database_source.model import DatabaseSource
+from mindweaver.datasource_service.database_source.service import connection_url
+from mindweaver.fw.model import ts_now
+from mindweaver.service.s3_storage.model import S3Storage
+from mindweaver.service.s3_storage.service import s3_client
+from .extract import DEFAULT_ROW_GROUP_ROWS, extraction_connect_args, read_columns
+from .model import IngestionState
+from .parquet import ParquetObjectWriter, arrow_schema, normalize_row, stream_rows
+from .s3 import DEFAULT_PART_SIZE, MIN_PART_SIZE
+
+logger = logging.getLogger(__name__)
+
+KEY_BUCKETS = 256
+KEY_BATCH_ROWS = 10_000
+
+
+class IncrementalSpec(pydantic.BaseModel):
+    """Parameters of an incremental ingestion of one table to S3."""
+
+    table: str
+    schema_name: Optional[str] = None
+    storage_id: int
+    bucket: str
+    prefix: str = ""
+    mode: Literal["key", "updated_at"] = "key"
+    watermark_column: str
+    # Re-reads rows changed this many seconds before the watermark, for
+    # timestamps assigned before their transaction committed
+    lookback_seconds: int = pydantic.Field(default=0, ge=0)
+    primary_key: list[str] = pydantic.Field(default_factory=list)
+    detect_deletes: bool = False
+    row_group_rows: int = pydantic.Field(default=DEFAULT_ROW_GROUP_ROWS, ge=1)
+    part_size: int = pydantic.Field(default=DEFAULT_PART_SIZE, ge=MIN_PART_SIZE)
+    compression: Literal["snappy", "zstd", "gzip", "none"] = "snappy"
+
+    @pydantic.model_validator(mode="after")
+    def _check_options(self):
+        if self.detect_deletes and not self.primary_key:
+            raise ValueError("detect_deletes requires primary_key")
+        if self.lookback_seconds and self.mode != "updated_at":
+            raise ValueError("lookback_seconds only applies to the updated_at mode")
+        return self
+
+    def state_key(self, source_id: int) -> str:
+        """Identifies the ingestion whose watermark is carried between runs."""
+        identity = self.model_dump(
+            include={
+                "table",
+                "schema_name",
+                "storage_id",
+                "bucket",
+                "prefix",
+                "mode",
+                "watermark_column",
+            }
+        )
+        encoded = json.dumps({"source_id": source_id, **identity}, sort_keys=True)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    @property
+    def base_path(self) -> str:
+        relation = f"{self.schema_name}.{self.table}" if self.schema_name else self.table
+        prefix = self.prefix.strip("/")
+        return f"{prefix}/{relation}" if prefix else relation
+
+    def delta_key(self, run: int, ingested_at: datetime.datetime, suffix: str = "") -> str:
+        return (
+            f"{self.base_path}/_ingest_date={ingested_at:%Y-%m-%d}/"
+            f"run-{run:06d}{suffix}.parquet"
+        )
+
+    def snapshot_key(self, bucket: int, run: int) -> str:
+        return f"{self.base_path}/_keys/run-{run:06d}/bucket-{bucket:03d}.parquet"
+
+
+def encode_watermark(value: Any) -> Optional[dict[str, Any]]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError("Boolean columns cannot be used as watermark")
+    if isinstance(value, int):
+        return {"type": "int", "value": value}
+    if isinstance(value, float):
+        return {"type": "float", "value": value}
+    if isinstance(value, decimal.Decimal):
+        return {"type": "decimal", "value": str(value)}
+    if isinstance(value, datetime.datetime):
+        return {"type": "datetime", "value": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"type": "date", "value": value.isoformat()}
+    if isinstance(value, str):
+        return {"type": "str", "value": value}
+    raise ValueError(f"Unsupported watermark type {type(value).__name__}")
+
+
+def decode_watermark(data: Optional[dict[str, Any]]) -> Any:
+    if not data:
+        return None
+    value = data["value"]
+    match data["type"]:
+        case "decimal":
+            return decimal.Decimal(value)
+        case "datetime":
+            return datetime.datetime.fromisoformat(value)
+        case "date":
+            return datetime.date.fromisoformat(value)
+        case _:
+            return value
+
+
+def _changelog_columns(ingested_at: datetime.datetime, op: str) -> dict[str, tuple]:
+    import pyarrow as pa
+
+    return {
+        "_op": (pa.string(), op),
+        "_ingested_at": (pa.timestamp("us", tz="UTC"), ingested_at),
+    }
+
+
+def _select(spec: IncrementalSpec, columns: list[dict[str, Any]]):
+    source = table(spec.table, *(column(c["name"]) for c in columns), schema=spec.schema_name)
+    return source, select(*source.c)
+
+
+def ingest_delta(
+    engine: Engine,
+    client,
+    spec: IncrementalSpec,
+    columns: list[dict[str, Any]],
+    watermark: Any,
+    run: int,
+    ingested_at: datetime.datetime,
+    progress: Optional[Callable[[], None]] = None,
+) -> dict[str, Any]:
+    """
+    Appends the rows past `watermark` to the dataset and returns the write
+    statistics with the highest watermark value seen, calling `progress`
+    after each batch. Blocking.
+    """
+    names = [c["name"] for c in columns]
+    if spec.watermark_column not in names:
+        raise ValueError(f"Watermark column {spec.watermark_column} not found")
+    position = names.index(spec.watermark_column)
+
+    source, stmt = _select(spec, columns)
+    if watermark is not None:
+        bound = watermark
+        if spec.lookback_seconds:
+            bound = watermark - datetime.timedelta(seconds=spec.lookback_seconds)
+        stmt = stmt.where(source.c[spec.watermark_column] > bound)
+
+    high = None
+    with ParquetObjectWriter(
+        client,
+        spec.bucket,
+        spec.delta_key(run, ingested_at),
+        columns,
+        part_size=spec.part_size,
+        compression=spec.compression,
+        constants=_changelog_columns(ingested_at, "upsert"),
+    ) as writer:
+        for partition in stream_rows(engine, stmt, spec.row_group_rows):
+            writer.write_rows(partition)
+            values = [row[position] for row in partition if row[position] is not None]
+            if values:
+                batch_high = max(values)
+                if high is None or batch_high > high:
+                    high = batch_high
+            if progress is not None:
+                progress()
+    return {**writer.stats(), "watermark": high}
+
+
+def _key_hash(key: tuple) -> bytes:
+    encoded = json.dumps(key, default=str, separators=(",", ":"))
+    return hashlib.blake2b(encoded.encode(), digest_size=16).digest()
+
+
+def _iter_keys(
+    engine: Engine,
+    spec: IncrementalSpec,
+    pk_columns: list[dict[str, Any]],
+    progress: Optional[Callable[[], None]] = None,
+):
+    _, converters = arrow_schema(pk_columns)
+    _, stmt = _select(spec, pk_columns)
+    for partition in stream_rows(engine, stmt, KEY_BATCH_ROWS):
+        for row in partition:
+            key = normalize_row(row, converters)
+            yield _key_hash(key)[0] % KEY_BUCKETS, key
+        if progress is not None:
+            progress()
+
+
+def key_digests(
+    engine: Engine,
+    spec: IncrementalSpec,
+    pk_columns: list[dict[str, Any]],
+    progress: Optional[Callable[[], None]] = None,
+) -> dict[str, str]:
+    """
+    Returns per bucket the XOR of the hashes of its keys and their count,
+    which changes whenever a key of the bucket is added or removed.
+    """
+    buckets: dict[int, list[int]] = {}
+    for bucket, key in _iter_keys(engine, spec, pk_columns, progress):
+        digest = buckets.setdefault(bucket, [0, 0])
+        digest[0] ^= int.from_bytes(_key_hash(key), "big")
+        digest[1] += 1
+    return {str(b): f"{xor:032x}:{count}" for b, (xor, count) in buckets.items()}
+
+
+def read_key_snapshot(client, bucket: str, key: str) -> set[tuple]:
+    import pyarrow.parquet as pq
+
+    try:
+        body = client.get_object(Bucket=bucket, Key=key)["Body"].read()
+    except client.exceptions.NoSuchKey:
+        return set()
+    snapshot = pq.read_table(io.BytesIO(body))
+    return set(zip(*(c.to_pylist() for c in snapshot.columns)))
+
+
+def detect_deletes(
+    engine: Engine,
+    client,
+    spec: IncrementalSpec,
+    pk_columns: list[dict[str, Any]],
+    previous: dict[str, str],
+    run: int,
+    progress: Optional[Callable[[], None]] = None,
+) -> tuple[dict[str, str], list[tuple]]:
+    """
+    Finds keys deleted since the previous run, rewriting the key snapshots
+    of the buckets that changed. Returns the new bucket digests, tagged with
+    the run holding their snapshot, and the deleted keys, calling
+    `progress` after each batch of keys. Blocking.
+    """
+    digests = key_digests(engine, spec, pk_columns, progress)
+    previous_digests = {b: value.rsplit("@", 1) for b, value in previous.items()}
+    changed = {
+        int(b)
+        for b in set(digests) | set(previous_digests)
+        if digests.get(b) != previous_digests.get(b, [None])[0]
+    }
+
+    current: dict[int, set[tuple]] = {b: set() for b in changed}
+    if changed:
+        for bucket, key in _iter_keys(engine, spec, pk_columns, progress):
+            if bucket in current:
+                current[bucket].add(key)
+
+    deleted: list[tuple] = []
+    tagged = {b: previous[b] for b in digests if int(b) not in changed}
+    for bucket in sorted(changed):
+        if str(bucket) in previous_digests:
+            snapshot_run = int(previous_digests[str(bucket)][1])
+            before = read_key_snapshot(
+                client, spec.bucket, spec.snapshot_key(bucket, snapshot_run)
+            )
+            deleted.extend(before - current[bucket])
+        if current[bucket]:
+            with ParquetObjectWriter(
+                client,
+                spec.bucket,
+                spec.snapshot_key(bucket, run),
+                pk_columns,
+                part_size=spec.part_size,
+                compression=spec.compression,
+            ) as writer:
+                keys = sorted(current[bucket], key=_key_hash)
+                for offset in range(0, len(keys), KEY_BATCH_ROWS):
+                    writer.write_rows(keys[offset : offset + KEY_BATCH_ROWS])
+                    if progress is not None:
+                        progress()
+            tagged[str(bucket)] = f"{digests[str(bucket)]}@{run}"
+    return tagged, deleted
+
+
+def write_tombstones(
+    client,
+    spec: IncrementalSpec,
+    pk_columns: list[dict[str, Any]],
+    keys: list[tuple],
+    run: int,
+    ingested_at: datetime.datetime,
+    progress: Optional[Callable[[], None]] = None,
+) -> dict[str, Any]:
+    with ParquetObjectWriter(
+        client,
+        spec.bucket,
+        spec.delta_key(run, ingested_at, "-deletes"),
+        pk_columns,
+        part_size=spec.part_size,
+        compression=spec.compression,
+        constants=_changelog_columns(ingested_at, "delete"),
+    ) as writer:
+        for offset in range(0, len(keys), spec.row_group_rows):
+            writer.write_rows(keys[offset : offset + spec.row_group_rows])
+            if progress is not None:
+                progress()
+    return writer.stats()
+
+
+def _threadsafe_progress(
+    on_progress: Optional[Callable[[], Awaitable[None]]],
+) -> Optional[Callable[[], None]]:
+    """
+    Wraps `on_progress` for the blocking phases running in a thread: each
+    call schedules it on the running loop, unless the previous call is
+    still pending.
+    """
+    if on_progress is None:
+        return None
+    loop = asyncio.get_running_loop()
+    pending = None
+
+    def progress():
+        nonlocal pending
+        if pending is None or pending.done():
+            pending = asyncio.run_coroutine_threadsafe(on_progress(), loop)
+
+    return progress
+
+
+async def _lock_state(
+    session: AsyncSession, spec: IncrementalSpec, source_id: int
+) -> IngestionState:
+    state_key = spec.state_key(source_id)
+    stmt = sqlmodel_select(IngestionState).where(IngestionState.state_key == state_key)
+    if (await session.exec(stmt)).one_or_none() is None:
+        try:
+            async with session.begin_nested():
+                session.add(
+                    IngestionState(
+                        state_key=state_key, source_id=source_id, table_name=spec.table
+                    )
+                )
+        except IntegrityError:
+            # Created by a concurrent first run
+            pass
+        await session.commit()
+    try:
+        result = await session.exec(stmt.with_for_update(nowait=True))
+    except OperationalError:
+        await session.rollback()
+        raise RuntimeError(f"An ingestion of {spec.table} is already running")
+    return result.one()
+
+
+async def run_incremental(
+    session: AsyncSession,
+    source: DatabaseSource,
+    storage: S3Storage,
+    spec: IncrementalSpec,
+    on_progress: Optional[Callable[[], Awaitable[None]]] = None,
+) -> dict[str, Any]:
+    """
+    Runs one incremental ingestion and records the new watermark and the
+    run statistics. The state row stays locked during the run, so runs of
+    the same ingestion never overlap; a failed run leaves the watermark
+    unchanged and the next run extracts the same delta again.
+    `on_progress` is awaited after each batch of rows or keys.
+    """
+    source_id = source.id
+    config = connection_config(source)
+    client = s3_client(storage)
+
+    state = await _lock_state(session, spec, source_id)
+    watermark = decode_watermark(state.watermark)
+    previous_digests = dict(state.key_digests or {})
+    run = state.runs + 1
+
+    engine = create_engine(
+        connection_url(config),
+        poolclass=NullPool,
+        connect_args=extraction_connect_args(config.get("engine", "").lower()),
+    )
+    started = time.perf_counter()
+    ingested_at = datetime.datetime.now(datetime.timezone.utc)
+    deleted: list[tuple] = []
+    tombstones = {"rows": 0, "bytes": 0}
+    progress = _threadsafe_progress(on_progress)
+    try:
+        columns = await asyncio.to_thread(
+            read_columns, engine, spec.schema_name, spec.table
+        )
+        delta = await asyncio.to_thread(
+            ingest_delta,
+            engine,
+            client,
+            spec,
+            columns,
+            watermark,
+            run,
+            ingested_at,
+            progress,
+        )
+        digests = previous_digests
+        if spec.detect_deletes:
+            by_name = {c["name"]: c for c in columns}
+            missing = [name for name in spec.primary_key if name not in by_name]
+            if missing:
+                raise ValueError(f"Primary key columns not found: {', '.join(missing)}")
+            pk_columns = [by_name[name] for name in spec.primary_key]
+            digests, deleted = await asyncio.to_thread(
+                detect_deletes,
+                engine,
+                client,
+                spec,
+                pk_columns,
+                previous_digests,
+                run,
+                progress,
+            )
+            if deleted:
+                tombstones = await asyncio.to_thread(
+                    write_tombstones,
+                    client,
+                    spec,
+                    pk_columns,
+                    deleted,
+                    run,
+                    ingested_at,
+                    progress,
+                )
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        engine.dispose()
+
+    duration = time.perf_counter() - started
+    new_watermark = watermark
+    if delta["watermark"] is not None and (
+        watermark is None or delta["watermark"] > watermark
+    ):
+        new_watermark = delta["watermark"]
+    written = delta["bytes"] + tombstones["bytes"]
+    summary = {
+        "run": run,
+        "rows": delta["rows"],
+        "deleted": len(deleted),
+        "bytes": written,
+        "duration": round(duration, 3),
+        "rows_per_sec": round(delta["rows"] / duration, 1) if duration else None,
+        "bytes_per_sec": round(written / duration, 1) if duration else None,
+        "watermark": encode_watermark(new_watermark),
+    }
+
+    state.watermark = summary["watermark"]
+    state.key_digests = digests
+    state.runs = run
+    state.last_run = ts_now()
+    state.last_rows = summary["rows"]
+    state.last_deleted = summary["deleted"]
+    state.last_bytes = written
+    state.last_duration = summary["duration"]
+    state.rows_per_sec = summary["rows_per_sec"]
+    state.bytes_per_sec = summary["bytes_per_sec"]
+    state.total_rows += summary["rows"]
+    state.total_bytes += written
+    state.modified = state.last_run
+    session.add(state)
+    await session.commit()
+
+    # Snapshots of buckets rewritten by this run are no longer referenced
+    for bucket, value in previous_digests.items():
+        if digests.get(bucket) != value:
+            snapshot_run = int(value.rsplit("@", 1)[1])
+            try:
+                await asyncio.to_thread(
+                    client.delete_object,
+                    Bucket=spec.bucket,
+                    Key=spec.snapshot_key(int(bucket), snapshot_run),
+                )
+            except Exception as e:
+                logger.warning(f"Failed to remove stale key snapshot: {e}")
+    logger.info(f"Ingested {spec.table} from database source {source_id}: {summary}")
+    return summary
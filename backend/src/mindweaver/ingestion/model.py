@@ -0,0 +1,124 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import enum
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import BigInteger, DateTime, String, Text, UniqueConstraint
+from sqlalchemy_utils import JSONType
+from sqlmodel import Field
+from mindweaver.fw.model import Base
+
+
+class ChunkStatus(enum.StrEnum):
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ExtractionCheckpoint(Base, table=True):
+    """
+    Progress of one chunk of an extraction run. Runs with the same
+    `run_key` share their checkpoints, so a failed run resumes with the
+    chunks that are not done yet.
+    """
+
+    __tablename__ = "mw_extraction_checkpoint"
+    __table_args__ = (UniqueConstraint("run_key", "chunk_index"),)
+
+    run_key: str = Field(sa_type=String(length=64), index=True)
+    source_id: int = Field(index=True)
+    chunk_index: int
+    chunk: dict[str, Any] = Field(default_factory=dict, sa_type=JSONType())
+    object_key: str = Field(sa_type=Text)
+    status: str = Field(default=ChunkStatus.PENDING, sa_type=String(length=20))
+    rows: Optional[int] = Field(default=None, sa_type=BigInteger)
+    bytes: Optional[int] = Field(default=None, sa_type=BigInteger)
+    etag: Optional[str] = Field(default=None, sa_type=String(length=255))
+    duration: Optional[float] = Field(default=None)
+    error: Optional[str] = Field(default=None, sa_type=Text)
+    finished: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
+
+
+class IngestionState(Base, table=True):
+    """
+    Watermark and run statistics of an incremental ingestion, identified by
+    `state_key`. `key_digests` holds per bucket digests of the primary keys
+    seen by the last run, used to find buckets with deleted rows.
+    """
+
+    __tablename__ = "mw_ingestion_state"
+
+    state_key: str = Field(sa_type=String(length=64), unique=True)
+    source_id: int = Field(index=True)
+    table_name: str = Field(sa_type=String(length=255))
+    watermark: Optional[dict[str, Any]] = Field(default=None, sa_type=JSONType())
+    key_digests: dict[str, str] = Field(default_factory=dict, sa_type=JSONType())
+    runs: int = Field(default=0)
+    last_run: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
+    last_rows: Optional[int] = Field(default=None, sa_type=BigInteger)
+    last_deleted: Optional[int] = Field(default=None, sa_type=BigInteger)
+    last_bytes: Optional[int] = Field(default=None, sa_type=BigInteger)
+    last_duration: Optional[float] = Field(default=None)
+    rows_per_sec: Optional[float] = Field(default=None)
+    bytes_per_sec: Optional[float] = Field(default=None)
+    total_rows: int = Field(default=0, sa_type=BigInteger)
+    total_bytes: int = Field(default=0, sa_type=BigInteger)
+
+
+class PageStatus(enum.StrEnum):
+    QUEUED = "queued"
+    FETCHED = "fetched"
+    SKIPPED = "skipped"
+    FAILED = "failed"
+
+
+class CrawlPage(Base, table=True):
+    """
+    A page of a web crawl. Queued pages form the frontier, so an interrupted
+    crawl resumes with them; fetched pages keep their validators and content
+    hash for conditional requests on the next crawl.
+    """
+
+    __tablename__ = "mw_crawl_page"
+    __table_args__ = (UniqueConstraint("crawl_key", "url_hash"),)
+
+    crawl_key: str = Field(sa_type=String(length=64), index=True)
+    source_id: int = Field(index=True)
+    url: str = Field(sa_type=Text)
+    url_hash: str = Field(sa_type=String(length=64))
+    depth: int = Field(default=0)
+    status: str = Field(default=PageStatus.QUEUED, sa_type=String(length=20))
+    http_status: Optional[int] = Field(default=None)
+    etag: Optional[str] = Field(default=None, sa_type=String(length=255))
+    last_modified: Optional[str] = Field(default=None, sa_type=String(length=64))
+    content_hash: Optional[str] = Field(default=None, sa_type=String(length=64))
+    content_type: Optional[str] = Field(default=None, sa_type=String(length=255))
+    size: Optional[int] = Field(default=None, sa_type=BigInteger)
+    object_key: Optional[str] = Field(default=None, sa_type=Text)
+    fetched: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
+    error: Optional[str] = Field(default=None, sa_type=Text)
+
+
+class StreamOffset(Base, table=True):
+    """
+    Offsets of one partition consumed by a streaming ingestion, with the
+    lag behind the end of the partition when the last batch was committed.
+    """
+
+    __tablename__ = "mw_stream_offset"
+    __table_args__ = (UniqueConstraint("consumer_key", "partition"),)
+
+    consumer_key: str = Field(sa_type=String(length=64), index=True)
+    source_id: int = Field(index=True)
+    topic: str = Field(sa_type=String(length=255))
+    group_id: str = Field(sa_type=String(length=255))
+    partition: int
+    committed_offset: Optional[int] = Field(default=None, sa_type=BigInteger)
+    end_offset: Optional[int] = Field(default=None, sa_type=BigInteger)
+    lag: Optional[int] = Field(default=None, sa_type=BigInteger)
+    records: int = Field(default=0, sa_type=BigInteger)
+    batches: int = Field(default=0)
+    bytes: int = Field(default=0, sa_type=BigInteger)
+    last_object: Optional[str] = Field(default=None, sa_type=Text)
+    last_commit: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True))
@@ -0,0 +1,183 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""Streaming query results into Parquet objects on S3."""
+
+import datetime
+import decimal
+import json
+from typing import Any, Callable, Iterator, Optional
+
+from sqlalchemy.engine import Engine
+
+from .s3 import DEFAULT_PART_SIZE, S3MultipartWriter
+
+
+def _to_text(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+def arrow_schema(columns: list[dict[str, Any]]):
+    """
+    Maps reflected columns to an Arrow schema, with a converter for columns
+    whose values are stored as text (e.g. JSON, UUID or unbounded numeric).
+    """
+    import pyarrow as pa
+
+    fields = []
+    converters: dict[int, Callable[[Any], Any]] = {}
+    for index, col in enumerate(columns):
+        sa_type = col["type"]
+        try:
+            python_type = sa_type.python_type
+        except NotImplementedError:
+            python_type = None
+
+        if python_type is bool:
+            arrow_type = pa.bool_()
+        elif python_type is int:
+            arrow_type = pa.int64()
+        elif python_type is float:
+            arrow_type = pa.float64()
+        elif python_type is decimal.Decimal:
+            precision = getattr(sa_type, "precision", None)
+            scale = getattr(sa_type, "scale", None) or 0
+            if precision and precision <= 38:
+                arrow_type = pa.decimal128(precision, scale)
+            else:
+                arrow_type = pa.string()
+        elif python_type is datetime.datetime:
+            tz = "UTC" if getattr(sa_type, "timezone", False) else None
+            arrow_type = pa.timestamp("us", tz=tz)
+        elif python_type is datetime.date:
+            arrow_type = pa.date32()
+        elif python_type is datetime.time:
+            arrow_type = pa.time64("us")
+        elif python_type is datetime.timedelta:
+            arrow_type = pa.duration("us")
+        elif python_type is bytes:
+            arrow_type = pa.binary()
+        else:
+            arrow_type = pa.string()
+
+        if arrow_type == pa.string() and python_type is not str:
+            converters[index] = _to_text
+        fields.append(pa.field(col["name"], arrow_type, nullable=True))
+    return pa.schema(fields), converters
+
+
+def normalize_row(row, converters: dict[int, Callable[[Any], Any]]) -> tuple:
+    """Applies the text converters of `arrow_schema` to a row."""
+    if not converters:
+        return tuple(row)
+    return tuple(
+        converters[index](value) if index in converters else value
+        for index, value in enumerate(row)
+    )
+
+
+def stream_rows(engine: Engine, stmt, batch_rows: int) -> Iterator[list]:
+    """Yields the rows of `stmt` in batches, read through a server-side cursor."""
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_rows).execute(
+            stmt
+        )
+        for partition in result.partitions():
+            yield partition
+
+
+class ParquetObjectWriter:
+    """
+    Writes batches of rows of reflected `columns` to a Parquet object on S3,
+    one row group per batch, uploading as it goes. `constants` adds columns
+    holding the same value in every row, as name: (arrow type, value).
+
+    The object is only created once a batch is written, or on close when
+    `write_empty` is set. Leaving the context with an error aborts the
+    upload.
+    """
+
+    def __init__(
+        self,
+        client,
+        bucket: str,
+        key: str,
+        columns: list[dict[str, Any]],
+        *,
+        part_size: int = DEFAULT_PART_SIZE,
+        compression: str = "snappy",
+        constants: Optional[dict[str, tuple[Any, Any]]] = None,
+        write_empty: bool = False,
+    ):
+        import pyarrow as pa
+
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.compression = None if compression == "none" else compression
+        self.write_empty = write_empty
+        self.schema, self.converters = arrow_schema(columns)
+        self.constants = constants or {}
+        for name, (arrow_type, _) in self.constants.items():
+            self.schema = self.schema.append(pa.field(name, arrow_type, nullable=True))
+        self.rows = 0
+        self._sink: Optional[S3MultipartWriter] = None
+        self._writer = None
+
+    def _open(self):
+        import pyarrow.parquet as pq
+
+        self._sink = S3MultipartWriter(self.client, self.bucket, self.key, self.part_size)
+        self._writer = pq.ParquetWriter(self._sink, self.schema, compression=self.compression)
+
+    def write_rows(self, rows: list):
+        import pyarrow as pa
+
+        if not rows:
+            return
+        if self._writer is None:
+            self._open()
+        arrays = []
+        for index, values in enumerate(zip(*rows)):
+            convert = self.converters.get(index)
+            if convert is not None:
+                values = [convert(v) for v in values]
+            arrays.append(pa.array(values, type=self.schema.field(index).type))
+        for arrow_type, value in self.constants.values():
+            arrays.append(pa.array([value] * len(rows), type=arrow_type))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.rows += len(rows)
+
+    def close(self):
+        if self._writer is None:
+            if not self.write_empty:
+                return
+            self._open()
+        self._writer.close()
+        self._sink.close()
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.abort()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "bytes": self._sink.size if self._sink else 0,
+            "etag": self._sink.etag if self._sink else None,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""Streaming writes of large objects to S3."""
+
+import logging
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# S3 rejects multipart parts smaller than 5 MiB, except for the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+DEFAULT_PART_SIZE = 16 * 1024 * 1024
+
+
+class S3MultipartWriter:
+    """
+    Write-only file object uploading to S3 in parts of `part_size` bytes,
+    so at most one part is buffered. Objects smaller than one part are
+    uploaded with a single `put_object`. Nothing is visible in the bucket
+    until `close()` completes the upload; `abort()` discards the parts
+    uploaded so far.
+    """
+
+    def __init__(
+        self,
+        client,
+        bucket: str,
+        key: str,
+        part_size: int = DEFAULT_PART_SIZE,
+        **extra_args: Any,
+    ):
+        if part_size < MIN_PART_SIZE:
+            raise ValueError(f"part_size must be at least {MIN_PART_SIZE} bytes")
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.extra_args = extra_args
+        self.upload_id: Optional[str] = None
+        self.parts: list[dict[str, Any]] = []
+        self.etag: Optional[str] = None
+        self.size = 0
+        self.closed = False
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.size
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed writer")
+        self._buffer += data
+        self.size += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[: self.part_size]))
+            del self._buffer[: self.part_size]
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def _upload_part(self, body: bytes):
+        if self.upload_id is None:
+            response = self.client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key, **self.extra_args
+            )
+            self.upload_id = response["UploadId"]
+        part_number = len(self.parts) + 1
+        response = self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        self.parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+
+    def close(self):
+        if self.closed:
+            return
+        if self.upload_id is None:
+            response = self.client.put_object(
+                Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer), **self.extra_args
+            )
+        else:
+            if self._buffer:
+                self._upload_part(bytes(self._buffer))
+            response = self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.upload_id,
+                MultipartUpload={"Parts": self.parts},
+            )
+        self._buffer.clear()
+        self.etag = response.get("ETag")
+        self.closed = True
+
+    def abort(self):
+        """Discards the upload, leaving no partial object behind."""
+        if self.closed:
+            return
+        self.closed = True
+        self._buffer.clear()
+        if self.upload_id is not None:
+            try:
+                self.client.abort_multipart_upload(
+                    Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+                )
+            except Exception as e:
+                logger.warning(f"Failed to abort upload of s3://{self.bucket}/{self.key}: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,319 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Micro-batched ingestion of streaming source topics to S3.
+
+Messages are accumulated until a batch reaches `batch_max_records`,
+`batch_max_bytes` or is `batch_max_seconds` old, then written as one
+compressed JSON Lines or Parquet object. Offsets are committed to the
+broker only once the object is completely uploaded, so a failure between
+the two redelivers the batch: delivery is at least once. Committed offsets,
+end offsets and lag are recorded per partition in `mw_stream_offset`.
+"""
+
+import asyncio
+import base64
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Literal, Optional
+
+import pydantic
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.datasource_service.base import connection_config
+from mindweaver.datasource_service.streaming_source.model import StreamingSource
+from mindweaver.fw.model import ts_now
+from mindweaver.service.s3_storage.model import S3Storage
+from mindweaver.service.s3_storage.service import s3_client
+from .brokers import Message, open_consumer
+from .model import StreamOffset
+from .s3 import DEFAULT_PART_SIZE, S3MultipartWriter
+
+logger = logging.getLogger(__name__)
+
+# Seconds between progress reports of a running consumer
+PROGRESS_INTERVAL = 30
+
+
+class StreamSpec(pydantic.BaseModel):
+    """Parameters of a streaming ingestion of one topic to S3."""
+
+    storage_id: int
+    bucket: str
+    prefix: str = ""
+    # Defaults to the topic of the source
+    topic: Optional[str] = None
+    format: Literal["jsonl", "parquet"] = "jsonl"
+    # Defaults to gzip for JSON Lines and snappy for Parquet
+    compression: Optional[Literal["none", "gzip", "snappy", "zstd"]] = None
+    batch_max_records: int = pydantic.Field(default=10_000, ge=1)
+    batch_max_bytes: int = pydantic.Field(default=64 * 1024 * 1024, ge=1)
+    batch_max_seconds: float = pydantic.Field(default=60, gt=0)
+    poll_records: int = pydantic.Field(default=1000, ge=1)
+    poll_timeout_seconds: float = pydantic.Field(default=1.0, gt=0)
+    # Stop conditions, the consumer runs until stopped without them
+    run_seconds: Optional[float] = pydantic.Field(default=None, gt=0)
+    idle_seconds: Optional[float] = pydantic.Field(default=None, gt=0)
+    max_batches: Optional[int] = pydantic.Field(default=None, ge=1)
+
+    @pydantic.model_validator(mode="after")
+    def _check_compression(self):
+        if self.format == "jsonl" and self.compression in ("snappy", "zstd"):
+            raise ValueError("JSON Lines objects support gzip compression only")
+        return self
+
+    @property
+    def codec(self) -> str:
+        if self.compression is not None:
+            return self.compression
+        return "gzip" if self.format == "jsonl" else "snappy"
+
+    def object_key(self, topic: str, messages: list[Message]) -> str:
+        """
+        Names a batch after its first message, so a batch redelivered after
+        a failed commit usually overwrites its earlier copy.
+        """
+        first = min(messages, key=lambda m: (m.partition, m.offset))
+        when = (
+            datetime.datetime.fromtimestamp(first.timestamp / 1000, datetime.timezone.utc)
+            if first.timestamp is not None
+            else datetime.datetime.now(datetime.timezone.utc)
+        )
+        extension = "jsonl.gz" if self.format == "jsonl" and self.codec == "gzip" else self.format
+        prefix = self.prefix.strip("/")
+        name = (
+            f"{topic}/date={when:%Y-%m-%d}/"
+            f"{first.partition:05d}-{first.offset:020d}-{len(messages)}.{extension}"
+        )
+        return f"{prefix}/{name}" if prefix else name
+
+
+def _decode(data: Optional[bytes]) -> Optional[str]:
+    if data is None:
+        return None
+    try:
+        return data.decode()
+    except UnicodeDecodeError:
+        return base64.b64encode(data).decode()
+
+
+def message_record(topic: str, message: Message) -> dict[str, Any]:
+    """The JSON Lines record of a message, with its value parsed when JSON."""
+    value = _decode(message.value)
+    try:
+        value = json.loads(value) if value is not None else None
+    except ValueError:
+        pass
+    return {
+        "topic": topic,
+        "partition": message.partition,
+        "offset": message.offset,
+        "timestamp": message.timestamp,
+        "key": _decode(message.key),
+        "value": value,
+    }
+
+
+def write_batch(client, spec: StreamSpec, topic: str, key: str, messages: list[Message]) -> int:
+    """Uploads a batch as one object and returns its size. Blocking."""
+    with S3MultipartWriter(client, spec.bucket, key, DEFAULT_PART_SIZE) as sink:
+        if spec.format == "jsonl":
+            stream = gzip.GzipFile(fileobj=sink, mode="wb") if spec.codec == "gzip" else sink
+            for message in messages:
+                stream.write(json.dumps(message_record(topic, message)).encode() + b"\n")
+            if stream is not sink:
+                stream.close()
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.table(
+                {
+                    "topic": pa.array([topic] * len(messages), pa.string()),
+                    "partition": pa.array([m.partition for m in messages], pa.int32()),
+                    "offset": pa.array([m.offset for m in messages], pa.int64()),
+                    "timestamp": pa.array(
+                        [m.timestamp for m in messages], pa.timestamp("ms", tz="UTC")
+                    ),
+                    "key": pa.array([m.key for m in messages], pa.binary()),
+                    "value": pa.array([m.value for m in messages], pa.binary()),
+                }
+            )
+            buffer = io.BytesIO()
+            compression = None if spec.codec == "none" else spec.codec
+            pq.write_table(table, buffer, compression=compression)
+            sink.write(buffer.getbuffer())
+    return sink.size
+
+
+class MicroBatch:
+    def __init__(self):
+        self.messages: list[Message] = []
+        self.bytes = 0
+        self.opened: Optional[float] = None
+
+    def add(self, messages: list[Message]):
+        if self.opened is None:
+            self.opened = time.monotonic()
+        self.messages.extend(messages)
+        self.bytes += sum(len(m.value or b"") + len(m.key or b"") for m in messages)
+
+    def age(self) -> float:
+        return time.monotonic() - self.opened if self.opened is not None else 0.0
+
+    def next_offsets(self) -> dict[int, int]:
+        offsets: dict[int, int] = {}
+        for message in self.messages:
+            offsets[message.partition] = max(
+                offsets.get(message.partition, 0), message.offset + 1
+            )
+        return offsets
+
+    def partition_counts(self) -> dict[int, int]:
+        counts: dict[int, int] = {}
+        for message in self.messages:
+            counts[message.partition] = counts.get(message.partition, 0) + 1
+        return counts
+
+
+def consumer_key(source_id: int, topic: str, group_id: str) -> str:
+    encoded = json.dumps([source_id, topic, group_id])
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+async def _record_offsets(
+    session: AsyncSession,
+    key: str,
+    source_id: int,
+    topic: str,
+    group_id: str,
+    offsets: dict[int, tuple[Optional[int], Optional[int]]],
+    batch: Optional[MicroBatch] = None,
+    size: int = 0,
+    object_key: Optional[str] = None,
+):
+    result = await session.exec(select(StreamOffset).where(StreamOffset.consumer_key == key))
+    rows = {row.partition: row for row in result.all()}
+    counts = batch.partition_counts() if batch else {}
+    now = ts_now()
+    for partition, (committed, end) in offsets.items():
+        row = rows.get(partition)
+        if row is None:
+            row = StreamOffset(
+                consumer_key=key,
+                source_id=source_id,
+                topic=topic,
+                group_id=group_id,
+                partition=partition,
+            )
+        row.committed_offset = committed
+        row.end_offset = end
+        row.lag = end - (committed or 0) if end is not None else None
+        row.modified = now
+        if partition in counts:
+            row.records += counts[partition]
+            row.batches += 1
+            # The object is shared by the partitions of the batch
+            row.bytes += size * counts[partition] // len(batch.messages)
+            row.last_object = object_key
+            row.last_commit = now
+        session.add(row)
+    await session.commit()
+
+
+async def run_stream_ingestion(
+    session: AsyncSession,
+    source: StreamingSource,
+    storage: S3Storage,
+    spec: StreamSpec,
+    on_progress: Optional[Callable[[], Awaitable[None]]] = None,
+    stop: Optional[asyncio.Event] = None,
+) -> dict[str, Any]:
+    """
+    Consumes the topic of a streaming source into S3 until `stop` is set or
+    a stop condition of the spec is met, then writes the pending batch.
+    `on_progress` is awaited at most once per `PROGRESS_INTERVAL`, also
+    while no messages arrive.
+    """
+    # Read everything needed from the models before commits expire them
+    source_id = source.id
+    config = connection_config(source)
+    client = s3_client(storage)
+    topic = spec.topic or config.get("topic")
+    if not topic:
+        raise ValueError("No topic given and the source has no topic")
+    group_id = config.get("group_id") or f"mindweaver-{source_id}"
+    key = consumer_key(source_id, topic, group_id)
+
+    consumer = open_consumer(config, topic, group_id)
+    await consumer.start()
+    batch = MicroBatch()
+    started = last_message = last_report = time.monotonic()
+    summary = {"topic": topic, "group_id": group_id, "batches": 0, "records": 0, "bytes": 0}
+
+    async def flush():
+        nonlocal batch
+        object_key = spec.object_key(topic, batch.messages)
+        size = await asyncio.to_thread(
+            write_batch, client, spec, topic, object_key, batch.messages
+        )
+        # Only now that the batch is durable may the broker forget it
+        await consumer.commit(batch.next_offsets())
+        offsets = await consumer.offsets()
+        await _record_offsets(
+            session, key, source_id, topic, group_id, offsets, batch, size, object_key
+        )
+        summary["batches"] += 1
+        summary["records"] += len(batch.messages)
+        summary["bytes"] += size
+        batch = MicroBatch()
+
+    try:
+        while True:
+            now = time.monotonic()
+            if (
+                (stop is not None and stop.is_set())
+                or (spec.run_seconds and now - started >= spec.run_seconds)
+                or (spec.idle_seconds and now - last_message >= spec.idle_seconds)
+                or (spec.max_batches and summary["batches"] >= spec.max_batches)
+            ):
+                break
+            timeout = spec.poll_timeout_seconds
+            if batch.messages:
+                timeout = max(min(timeout, spec.batch_max_seconds - batch.age()), 0)
+            limit = min(spec.poll_records, spec.batch_max_records - len(batch.messages))
+            messages = await consumer.poll(limit, timeout)
+            if messages:
+                batch.add(messages)
+                last_message = time.monotonic()
+            if batch.messages and (
+                len(batch.messages) >= spec.batch_max_records
+                or batch.bytes >= spec.batch_max_bytes
+                or batch.age() >= spec.batch_max_seconds
+            ):
+                await flush()
+            if on_progress is not None and time.monotonic() - last_report >= PROGRESS_INTERVAL:
+                last_report = time.monotonic()
+                await on_progress()
+        if batch.messages:
+            await flush()
+        elif not summary["batches"]:
+            # Nothing consumed, still report the lag
+            await _record_offsets(
+                session, key, source_id, topic, group_id, await consumer.offsets()
+            )
+    finally:
+        await consumer.close()
+
+    duration = time.monotonic() - started
+    summary["duration"] = round(duration, 3)
+    summary["records_per_sec"] = round(summary["records"] / duration, 1) if duration else None
+    logger.info(f"Consumed {topic} of streaming source {source_id}: {summary}")
+    return summary
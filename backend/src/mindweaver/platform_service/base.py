@@ -12,7 +12,10 @@ import kubernetes
 from kubernetes import client, config, utils, dynamic
 import logging
 from mindweaver.fw.util import format_k8s_resource
+from mindweaver.crypto import decrypt_password
 from mindweaver.fw.model import Base
+from mindweaver.fw.events import event_source
+from mindweaver.fw.registry import SERVICE_REGISTRY
 from mindweaver.fw.exc import ModelValidationError
 from mindweaver.service.base import ProjectScopedNamedBase, ProjectScopedService
 from mindweaver.service.project import Project
@@ -22,6 +25,7 @@ from mindweaver.fw.state import BaseState
 import os
 import pydantic
 from sqlalchemy import Column, DateTime, String
+from sqlalchemy import select as sa_select
 from sqlalchemy_utils import JSONType
 from sqlmodel import Field, select
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -51,6 +55,32 @@ class PlatformStateBase(Base):
     extra_data: dict[str, Any] = Field(default_factory=dict, sa_type=JSONType())
 
 
+@event_source(PlatformStateBase)
+def _platform_state_event(connection, state: PlatformStateBase):
+    """Builds the state change event of a platform, scoped to its project."""
+    foreign_key = next(iter(type(state).__table__.c.platform_id.foreign_keys))
+    platform_table = foreign_key.column.table
+    project_id = connection.execute(
+        sa_select(platform_table.c.project_id).where(
+            platform_table.c.id == state.platform_id
+        )
+    ).scalar()
+    service_class = SERVICE_REGISTRY.get(platform_table.name)
+    return {
+        "entity": (
+            service_class.entity_type() if service_class else platform_table.name
+        ),
+        "id": state.platform_id,
+        "project_ids": [project_id] if project_id else [],
+        "data": {
+            "status": state.status,
+            "active": state.active,
+            "message": state.message,
+            "last_heartbeat": state.last_heartbeat,
+        },
+    }
+
+
 @functools.lru_cache(maxsize=32)
 def _get_jinja_env(template_directory: str) -> j2.Environment:
     env = j2.Environment(loader=j2.FileSystemLoader(template_directory))
@@ -84,6 +114,15 @@ class PlatformService(ProjectScopedService[T], abc.ABC):
             if cls.state_model is None:
                 raise TypeError(f"Class {cls.__name__} must define state_model")
 
+    @classmethod
+    def platform_type(cls) -> str:
+        """
+        Short identifier of the platform kind, derived from the last segment
+        of the service path (e.g. `/platform/hive-metastore` gives
+        `hive_metastore`).
+        """
+        return cls.service_path().rstrip("/").rsplit("/", 1)[-1].replace("-", "_")
+
     async def platform_state(self, model: T | int) -> PlatformStateBase | None:
         """
         Returns the platform state model for the given platform.
@@ -98,6 +137,33 @@ class PlatformService(ProjectScopedService[T], abc.ABC):
         )
         return result.one_or_none()
 
+    async def get_states(
+        self, ids: list[int] | None = None, include_secrets: bool = False
+    ) -> dict[int, Any]:
+        """
+        Returns platform states keyed by platform id using one query joining
+        the platforms visible to the current project with their state rows.
+        """
+        state_class = self.get_state_class()
+        if not issubclass(state_class, DefaultPlatformState):
+            return await super().get_states(ids, include_secrets)
+
+        model_class = self.model_class()
+        stmt = (
+            select(model_class.id, self.state_model)
+            .outerjoin(
+                self.state_model, self.state_model.platform_id == model_class.id
+            )
+            .order_by(model_class.id.asc())
+        )
+        if ids is not None:
+            stmt = stmt.where(model_class.id.in_(ids))
+        result = await self.session.exec(self.apply_project_scope(stmt))
+        return {
+            platform_id: state_class.serialize(state, decrypt_secrets=include_secrets)
+            for platform_id, state in result.all()
+        }
+
     async def template_vars(self, model: T) -> dict:
         """returns the variables to be used in the template"""
         return model.model_dump()
@@ -567,10 +633,33 @@ class PlatformService(ProjectScopedService[T], abc.ABC):
 
 @PlatformService.with_state()
 class DefaultPlatformState(BaseState):
-    async def get(self):
-        state = await self.svc.platform_state(self.model)
-        if hasattr(state, "model_dump"):
-            return state.model_dump()
+    # Encrypted state fields, decrypted for the single state view and
+    # redacted in bulk listings unless secrets are requested
+    secret_fields: list[str] = []
+
+    @classmethod
+    def serialize(
+        cls, state: PlatformStateBase | None, decrypt_secrets: bool = True
+    ) -> dict[str, Any]:
+        """Converts a platform state model into its API representation."""
         if not state:
             return {}
-        return state
+        if not hasattr(state, "model_dump"):
+            return state
+        state_dict = state.model_dump()
+        for field in cls.secret_fields:
+            val = state_dict.get(field)
+            if not val:
+                continue
+            if not decrypt_secrets:
+                state_dict[field] = "__REDACTED__"
+                continue
+            try:
+                state_dict[field] = decrypt_password(val)
+            except Exception:
+                pass
+        return state_dict
+
+    async def get(self):
+        state = await self.svc.platform_state(self.model)
+        return self.serialize(state)
@@ -2,14 +2,19 @@
 # SPDX-License-Identifier: AGPLv3+
 
 import asyncio
+import contextlib
 import logging
 import tempfile
 import os
+from dataclasses import dataclass
+from typing import Iterator, Optional
 
 from sqlmodel import select
+from mindweaver.config import settings
 from mindweaver.fw.action import BaseAction
 from .service import K8sClusterService
 from .model import K8sCluster, K8sClusterStatus, K8sClusterType
+from .helm import HelmChart, chart_cache, run_helm, wait_for_release
 
 logger = logging.getLogger(__name__)
 
@@ -41,81 +46,69 @@ class InstallArgoCDAction(BaseAction):
         status_model.argocd_installed = True
         await self.session.flush()
 
-        install_argocd_task.delay(self.model.id)
-        return {
-            "status": "success",
-            "message": "ArgoCD installation triggered and status being refreshed.",
-        }
+        return await self.trigger(
+            install_argocd_task,
+            "ArgoCD installation triggered and status being refreshed.",
+            kwargs,
+        )
 
     async def run(self):
         """Install ArgoCD to the cluster using Helm chart"""
         logger.info(f"Installing ArgoCD for cluster {self.model.name}")
 
-        repo_url = "https://argoproj.github.io/argo-helm"
-        release_name = "argocd"
-        namespace = "argocd"
-        chart_name = "argo/argo-cd"
-
         await self._install_helm_chart(
-            repo_name="argo",
-            repo_url=repo_url,
-            release_name=release_name,
-            chart_name=chart_name,
-            namespace=namespace,
+            chart=HelmChart(
+                repo_url="https://argoproj.github.io/argo-helm",
+                name="argo-cd",
+                version=settings.argocd_chart_version,
+            ),
+            release_name="argocd",
+            namespace="argocd",
         )
 
+    @contextlib.contextmanager
+    def _kubeconfig_file(self) -> Iterator[Optional[str]]:
+        """Yields a kubeconfig path for remote clusters, None in-cluster."""
+        if self.model.type != K8sClusterType.REMOTE:
+            yield None
+            return
+        if not self.model.kubeconfig:
+            raise ValueError(f"Cluster {self.model.name} has no kubeconfig")
+        temp_kf = tempfile.NamedTemporaryFile(mode="w", delete=False)
+        try:
+            temp_kf.write(self.model.kubeconfig)
+            temp_kf.close()
+            yield temp_kf.name
+        finally:
+            try:
+                os.unlink(temp_kf.name)
+            except Exception:
+                pass
+
     async def _install_helm_chart(
         self,
-        repo_name: str,
-        repo_url: str,
+        chart: HelmChart,
         release_name: str,
-        chart_name: str,
         namespace: str,
         set_vals: dict[str, str] = None,
         create_namespace: bool = True,
+        wait: bool = True,
     ):
-        kubeconfig_path = None
-        temp_kf = None
-
-        try:
-            if self.model.type == K8sClusterType.REMOTE:
-                if not self.model.kubeconfig:
-                    raise ValueError(f"Cluster {self.model.name} has no kubeconfig")
-                temp_kf = tempfile.NamedTemporaryFile(mode="w", delete=False)
-                temp_kf.write(self.model.kubeconfig)
-                temp_kf.flush()
-                temp_kf.close()
-                kubeconfig_path = temp_kf.name
-
-            async def run_helm(*args):
-                cmd = ["helm"]
-                if kubeconfig_path:
-                    cmd.extend(["--kubeconfig", kubeconfig_path])
-                cmd.extend(args)
-                logger.debug(f"Running Helm command: {' '.join(cmd)}")
-                proc = await asyncio.create_subprocess_exec(
-                    *cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                stdout, stderr = await proc.communicate()
-                if proc.returncode != 0:
-                    raise RuntimeError(f"Helm command failed: {stderr.decode()}")
-                return stdout.decode()
-
-            # Ensure repo is added
-            await run_helm("repo", "add", repo_name, repo_url)
-            await run_helm("repo", "update")
-
-            # Install
+        """
+        Installs `chart` from the local chart cache without `--wait`, then
+        watches the release workloads until they are ready when `wait` is
+        set.
+        """
+        chart_path = await chart_cache.fetch(chart)
+
+        with self._kubeconfig_file() as kubeconfig_path:
             args = [
                 "upgrade",
                 "--install",
                 release_name,
-                chart_name,
+                chart_path,
                 "--namespace",
                 namespace,
-                "--wait",
             ]
             if create_namespace:
                 args.append("--create-namespace")
@@ -124,14 +117,11 @@ class InstallArgoCDAction(BaseAction):
                 for k, v in set_vals.items():
                     args.extend(["--set", f"{k}={v}"])
 
-            await run_helm(*args)
+            await run_helm(*args, kubeconfig=kubeconfig_path)
 
-        finally:
-            if temp_kf:
-                try:
-                    os.unlink(temp_kf.name)
-                except Exception:
-                    pass
+        if wait:
+            api_client = await asyncio.to_thread(self.svc._api_client, self.model)
+            await wait_for_release(api_client, namespace, release_name)
 
 
 @K8sClusterService.register_action("install_cert_manager")
@@ -161,21 +151,23 @@ class InstallCertManagerAction(InstallArgoCDAction):
         status_model.cert_manager_installed = True
         await self.session.flush()
 
-        install_cert_manager_task.delay(self.model.id)
-        return {
-            "status": "success",
-            "message": "Cert Manager installation triggered and status being refreshed.",
-        }
+        return await self.trigger(
+            install_cert_manager_task,
+            "Cert Manager installation triggered and status being refreshed.",
+            kwargs,
+        )
 
     async def run(self):
         """Install Cert Manager to the cluster using Helm chart"""
         logger.info(f"Installing Cert Manager for cluster {self.model.name}")
 
         await self._install_helm_chart(
-            repo_name="jetstack",
-            repo_url="https://charts.jetstack.io",
+            chart=HelmChart(
+                repo_url="https://charts.jetstack.io",
+                name="cert-manager",
+                version=settings.cert_manager_chart_version,
+            ),
             release_name="cert-manager",
-            chart_name="jetstack/cert-manager",
             namespace="cert-manager",
             set_vals={"installCRDs": "true"},
         )
@@ -208,21 +200,23 @@ class InstallCNPGAction(InstallArgoCDAction):
         status_model.cnpg_installed = True
         await self.session.flush()
 
-        install_cnpg_operator_task.delay(self.model.id)
-        return {
-            "status": "success",
-            "message": "CNPG Operator installation triggered and status being refreshed.",
-        }
+        return await self.trigger(
+            install_cnpg_operator_task,
+            "CNPG Operator installation triggered and status being refreshed.",
+            kwargs,
+        )
 
     async def run(self):
         """Install CNPG Operator to the cluster using Helm chart"""
         logger.info(f"Installing CNPG Operator for cluster {self.model.name}")
 
         await self._install_helm_chart(
-            repo_name="cnpg",
-            repo_url="https://cloudnative-pg.github.io/charts",
+            chart=HelmChart(
+                repo_url="https://cloudnative-pg.github.io/charts",
+                name="cloudnative-pg",
+                version=settings.cnpg_chart_version,
+            ),
             release_name="cnpg",
-            chart_name="cnpg/cloudnative-pg",
             namespace="cnpg-system",
         )
 
@@ -254,11 +248,11 @@ class InstallSelfSignedIssuerAction(InstallArgoCDAction):
         status_model.cluster_issuer_installed = True
         await self.session.flush()
 
-        install_self_signed_issuer_task.delay(self.model.id)
-        return {
-            "status": "success",
-            "message": "Self-signed ClusterIssuer installation triggered.",
-        }
+        return await self.trigger(
+            install_self_signed_issuer_task,
+            "Self-signed ClusterIssuer installation triggered.",
+            kwargs,
+        )
 
     async def run(self):
         """Install self-signed ClusterIssuer to the cluster"""
@@ -275,45 +269,124 @@ spec:
         await self._apply_yaml(manifest)
 
     async def _apply_yaml(self, manifest: str):
-        kubeconfig_path = None
-        temp_kf = None
         temp_manifest = None
 
         try:
-            if self.model.type == K8sClusterType.REMOTE:
-                if not self.model.kubeconfig:
-                    raise ValueError(f"Cluster {self.model.name} has no kubeconfig")
-                temp_kf = tempfile.NamedTemporaryFile(mode="w", delete=False)
-                temp_kf.write(self.model.kubeconfig)
-                temp_kf.flush()
-                temp_kf.close()
-                kubeconfig_path = temp_kf.name
-
             temp_manifest = tempfile.NamedTemporaryFile(mode="w", delete=False)
             temp_manifest.write(manifest)
             temp_manifest.flush()
             temp_manifest.close()
 
-            cmd = ["kubectl"]
-            if kubeconfig_path:
-                cmd.extend(["--kubeconfig", kubeconfig_path])
-            cmd.extend(["apply", "-f", temp_manifest.name])
-
-            logger.debug(f"Running kubectl command: {' '.join(cmd)}")
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await proc.communicate()
+            with self._kubeconfig_file() as kubeconfig_path:
+                cmd = ["kubectl"]
+                if kubeconfig_path:
+                    cmd.extend(["--kubeconfig", kubeconfig_path])
+                cmd.extend(["apply", "-f", temp_manifest.name])
+
+                logger.debug(f"Running kubectl command: {' '.join(cmd)}")
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                stdout, stderr = await proc.communicate()
             if proc.returncode != 0:
                 raise RuntimeError(f"Kubectl command failed: {stderr.decode()}")
             return stdout.decode()
 
         finally:
-            for f in [temp_kf, temp_manifest]:
-                if f:
-                    try:
-                        os.unlink(f.name)
-                    except Exception:
-                        pass
+            if temp_manifest:
+                try:
+                    os.unlink(temp_manifest.name)
+                except Exception:
+                    pass
+
+
+@dataclass(frozen=True)
+class BootstrapStep:
+    """A cluster add-on installed by the bootstrap action."""
+
+    action_class: type[InstallArgoCDAction]
+    status_field: str
+    depends_on: tuple[str, ...] = ()
+
+
+BOOTSTRAP_STEPS: dict[str, BootstrapStep] = {
+    "cert_manager": BootstrapStep(InstallCertManagerAction, "cert_manager_installed"),
+    # The issuer is validated by the cert-manager webhook, which must be ready
+    "cluster_issuer": BootstrapStep(
+        InstallSelfSignedIssuerAction,
+        "cluster_issuer_installed",
+        depends_on=("cert_manager",),
+    ),
+    "cnpg": BootstrapStep(InstallCNPGAction, "cnpg_installed"),
+    "argocd": BootstrapStep(InstallArgoCDAction, "argocd_installed"),
+}
+
+
+@K8sClusterService.register_action("bootstrap_cluster")
+class BootstrapClusterAction(InstallArgoCDAction):
+
+    async def available(self) -> bool:
+        # Available while any of the add-ons is missing
+        stmt = select(K8sClusterStatus).where(
+            K8sClusterStatus.k8s_cluster_id == self.model.id
+        )
+        result = await self.session.exec(stmt)
+        status = result.one_or_none()
+        return not (
+            status
+            and all(getattr(status, s.status_field) for s in BOOTSTRAP_STEPS.values())
+        )
+
+    async def __call__(self, **kwargs):
+        from mindweaver.tasks.k8s_cluster_status import bootstrap_cluster_task
+
+        # Set status to installed immediately so UI reflects it
+        stmt = select(K8sClusterStatus).where(
+            K8sClusterStatus.k8s_cluster_id == self.model.id
+        )
+        result = await self.session.exec(stmt)
+        status_model = result.one_or_none()
+        if not status_model:
+            status_model = K8sClusterStatus(k8s_cluster_id=self.model.id)
+            self.session.add(status_model)
+        for step in BOOTSTRAP_STEPS.values():
+            setattr(status_model, step.status_field, True)
+        await self.session.flush()
+
+        return await self.trigger(
+            bootstrap_cluster_task,
+            "Cluster bootstrap triggered and status being refreshed.",
+            kwargs,
+        )
+
+    async def run(self):
+        """
+        Install every add-on, starting each one as soon as its dependencies
+        are ready so that independent charts roll out concurrently. A failed
+        step skips its dependents but not the other installs.
+        """
+        logger.info(f"Bootstrapping cluster {self.model.name}")
+        tasks: dict[str, asyncio.Task] = {}
+
+        async def run_step(name: str, step: BootstrapStep):
+            for dependency in step.depends_on:
+                try:
+                    await tasks[dependency]
+                except Exception:
+                    raise RuntimeError(f"skipped, {dependency} failed")
+            await step.action_class(self.model, self.svc).run()
+            logger.info(f"Installed {name} on cluster {self.model.name}")
+
+        for name, step in BOOTSTRAP_STEPS.items():
+            tasks[name] = asyncio.create_task(run_step(name, step))
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        errors = [
+            f"{name}: {result}"
+            for name, result in zip(tasks, results)
+            if isinstance(result, Exception)
+        ]
+        if errors:
+            raise RuntimeError(f"Cluster bootstrap failed: {'; '.join(errors)}")
@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+from typing import Any
+
+from kubernetes import client
+
+from mindweaver.fw.util import parse_k8s_quantity
+from .discovery import list_items
+
+POD_PAGE_SIZE = 500
+# Only pods bound to a node that can still hold resources count towards
+# allocation, the same set the scheduler accounts for.
+ACTIVE_POD_FIELD_SELECTOR = (
+    "spec.nodeName!=,status.phase!=Succeeded,status.phase!=Failed"
+)
+GIB = float(2**30)
+
+
+def _container_requests(container: dict[str, Any]) -> tuple[float, float]:
+    requests = (container.get("resources") or {}).get("requests") or {}
+    return (
+        parse_k8s_quantity(requests.get("cpu")),
+        parse_k8s_quantity(requests.get("memory")),
+    )
+
+
+def pod_requests(spec: dict[str, Any]) -> tuple[float, float]:
+    """
+    Returns the effective (cpu cores, memory bytes) request of a pod spec.
+
+    Follows the scheduler's rules: the larger of the sum of app containers
+    and the largest init container, where restartable (sidecar) init
+    containers keep running alongside everything started after them. Pod
+    overhead is added on top.
+    """
+    cpu = mem = 0.0
+    init_cpu = init_mem = 0.0
+    sidecar_cpu = sidecar_mem = 0.0
+    for container in spec.get("initContainers") or []:
+        c_cpu, c_mem = _container_requests(container)
+        if container.get("restartPolicy") == "Always":
+            sidecar_cpu += c_cpu
+            sidecar_mem += c_mem
+            init_cpu = max(init_cpu, sidecar_cpu)
+            init_mem = max(init_mem, sidecar_mem)
+        else:
+            init_cpu = max(init_cpu, sidecar_cpu + c_cpu)
+            init_mem = max(init_mem, sidecar_mem + c_mem)
+
+    for container in spec.get("containers") or []:
+        c_cpu, c_mem = _container_requests(container)
+        cpu += c_cpu
+        mem += c_mem
+    cpu = max(cpu + sidecar_cpu, init_cpu)
+    mem = max(mem + sidecar_mem, init_mem)
+
+    overhead = spec.get("overhead") or {}
+    cpu += parse_k8s_quantity(overhead.get("cpu"))
+    mem += parse_k8s_quantity(overhead.get("memory"))
+    return cpu, mem
+
+
+def _add(bucket: dict[str, dict[str, Any]], key: str, cpu: float, mem: float):
+    entry = bucket.setdefault(key, {"cpu": 0.0, "ram": 0.0, "pods": 0})
+    entry["cpu"] += cpu
+    entry["ram"] += mem
+    entry["pods"] += 1
+
+
+def compute_allocation(
+    core_v1: client.CoreV1Api, page_size: int = POD_PAGE_SIZE
+) -> dict[str, Any]:
+    """
+    Aggregates pod resource requests per node and per namespace.
+
+    Pods are streamed page by page as raw JSON so memory stays flat on
+    large clusters. CPU is reported in cores and RAM in GiB.
+    """
+    nodes: dict[str, dict[str, Any]] = {}
+    namespaces: dict[str, dict[str, Any]] = {}
+    cpu_total = ram_total = 0.0
+
+    for pod in list_items(
+        core_v1.list_pod_for_all_namespaces,
+        page_size=page_size,
+        field_selector=ACTIVE_POD_FIELD_SELECTOR,
+    ):
+        cpu, mem = pod_requests(pod.get("spec") or {})
+        mem /= GIB
+        cpu_total += cpu
+        ram_total += mem
+        _add(nodes, pod["spec"].get("nodeName") or "", cpu, mem)
+        _add(namespaces, pod["metadata"].get("namespace") or "", cpu, mem)
+
+    return {
+        "cpu_allocated": cpu_total,
+        "ram_allocated": ram_total,
+        "nodes": nodes,
+        "namespaces": namespaces,
+    }
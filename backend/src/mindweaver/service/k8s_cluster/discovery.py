@@ -0,0 +1,170 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+from kubernetes import client
+
+logger = logging.getLogger(__name__)
+
+# Ask the API server to strip everything but metadata from list responses.
+# Helm release secrets carry a gzipped release blob, so fetching them in full
+# on every poll is expensive on large clusters.
+PARTIAL_OBJECT_METADATA_LIST = (
+    "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,"
+    "application/json"
+)
+METADATA_PAGE_SIZE = 100
+
+
+@dataclass(frozen=True)
+class ComponentSpec:
+    """Describes how to detect a cluster add-on installed by Mindweaver."""
+
+    release_name: str
+    app_name: str
+
+    @property
+    def app_selector(self) -> str:
+        return f"app.kubernetes.io/name={self.app_name}"
+
+
+COMPONENTS: dict[str, ComponentSpec] = {
+    "argocd": ComponentSpec(release_name="argocd", app_name="argocd-server"),
+    "cert_manager": ComponentSpec(
+        release_name="cert-manager", app_name="cert-manager"
+    ),
+    "cnpg": ComponentSpec(release_name="cnpg", app_name="cloudnative-pg"),
+}
+
+# (k8s_cluster_id, component) -> (release revision key, version)
+_version_cache: dict[tuple[int, str], tuple[str, str]] = {}
+
+
+def clear_version_cache():
+    """Drops all cached component versions."""
+    _version_cache.clear()
+
+
+def metadata_api_client(api_client: client.ApiClient) -> client.ApiClient:
+    """
+    Returns an ApiClient sharing the configuration of `api_client` that
+    requests metadata-only (PartialObjectMetadataList) list responses.
+    """
+    meta_client = client.ApiClient(configuration=api_client.configuration)
+    meta_client.set_default_header("Accept", PARTIAL_OBJECT_METADATA_LIST)
+    return meta_client
+
+
+def list_items(
+    list_fn: Callable[..., Any], page_size: int = METADATA_PAGE_SIZE, **kwargs
+) -> Iterator[dict[str, Any]]:
+    """
+    Yields raw objects from a paginated list call, one page in memory at a
+    time, following the `continue` token until the server reports no more
+    pages. Objects are plain dicts decoded from the JSON response, skipping
+    the Kubernetes client model deserialization.
+    """
+    token = None
+    while True:
+        resp = list_fn(
+            limit=page_size, _continue=token, _preload_content=False, **kwargs
+        )
+        body = json.loads(resp.data)
+        yield from body.get("items") or []
+        token = (body.get("metadata") or {}).get("continue")
+        if not token:
+            break
+
+
+def list_metadata(
+    list_fn: Callable[..., Any], page_size: int = METADATA_PAGE_SIZE, **kwargs
+) -> Iterator[dict[str, Any]]:
+    """
+    Yields object metadata from a metadata-only list call.
+    `list_fn` must be bound to an ApiClient from `metadata_api_client`.
+    """
+    for item in list_items(list_fn, page_size, **kwargs):
+        yield item.get("metadata") or {}
+
+
+def latest_helm_release(
+    core_v1_meta: client.CoreV1Api, release_name: str
+) -> Optional[dict[str, Any]]:
+    """
+    Returns namespace, revision and status of the newest revision of a Helm
+    release, or None if the release does not exist in any namespace.
+    """
+    latest = None
+    for meta in list_metadata(
+        core_v1_meta.list_secret_for_all_namespaces,
+        label_selector=f"owner=helm,name={release_name}",
+    ):
+        labels = meta.get("labels") or {}
+        try:
+            revision = int(labels.get("version", 0))
+        except (TypeError, ValueError):
+            revision = 0
+        if latest is None or revision > latest["revision"]:
+            latest = {
+                "namespace": meta.get("namespace"),
+                "revision": revision,
+                "status": labels.get("status"),
+            }
+    return latest
+
+
+def pod_version(pod) -> Optional[str]:
+    """Extracts an application version from pod labels or its image tag."""
+    labels = pod.metadata.labels or {}
+    version = labels.get("app.kubernetes.io/version")
+    if not version and pod.spec.containers:
+        image = pod.spec.containers[0].image
+        if ":" in image:
+            version = image.split(":")[-1]
+    return version
+
+
+def check_component(
+    core_v1: client.CoreV1Api,
+    core_v1_meta: client.CoreV1Api,
+    k8s_cluster_id: int,
+    component: str,
+) -> tuple[bool, Optional[str]]:
+    """
+    Detects whether a component is installed and which version is running.
+
+    Presence is checked against Helm release metadata first, falling back to
+    the component's Service for non-Helm installs. The running version is
+    only looked up from pods when the Helm release revision changes.
+    """
+    spec = COMPONENTS[component]
+    cache_key = (k8s_cluster_id, component)
+
+    release = latest_helm_release(core_v1_meta, spec.release_name)
+    if release:
+        revision_key = f"{release['namespace']}/{release['revision']}"
+        cached = _version_cache.get(cache_key)
+        if cached and cached[0] == revision_key:
+            return True, cached[1]
+    else:
+        revision_key = None
+        _version_cache.pop(cache_key, None)
+        services = list_metadata(
+            core_v1_meta.list_service_for_all_namespaces,
+            page_size=1,
+            label_selector=spec.app_selector,
+        )
+        if next(services, None) is None:
+            return False, None
+
+    pods = core_v1.list_pod_for_all_namespaces(
+        label_selector=spec.app_selector, limit=1
+    )
+    version = pod_version(pods.items[0]) if pods.items else None
+    if revision_key and version:
+        _version_cache[cache_key] = (revision_key, version)
+    return True, version
@@ -0,0 +1,222 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import asyncio
+import glob
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from kubernetes import client
+
+from mindweaver.config import settings
+from .discovery import list_items
+
+logger = logging.getLogger(__name__)
+
+READINESS_TIMEOUT = 600.0
+READINESS_INTERVAL = 2.0
+READINESS_MAX_INTERVAL = 15.0
+
+
+@dataclass(frozen=True)
+class HelmChart:
+    """A pinned chart version in a Helm repository."""
+
+    repo_url: str
+    name: str
+    version: str
+
+    @property
+    def key(self) -> str:
+        return hashlib.sha256(
+            f"{self.repo_url}|{self.name}|{self.version}".encode()
+        ).hexdigest()
+
+
+async def run_helm(*args: str, kubeconfig: Optional[str] = None) -> str:
+    """Runs a helm command and returns its stdout."""
+    cmd = ["helm"]
+    if kubeconfig:
+        cmd.extend(["--kubeconfig", kubeconfig])
+    cmd.extend(args)
+    logger.debug(f"Running Helm command: {' '.join(cmd)}")
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"Helm command failed: {stderr.decode()}")
+    return stdout.decode()
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: str, content: str):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+class HelmChartCache:
+    """
+    Local content-addressed store of chart archives. Each pinned chart
+    version is pulled once with `helm pull --repo`, which needs no
+    `helm repo add` or index refresh, and stored as `blobs/<sha256>.tgz`.
+    `refs/<chart key>` records which blob a chart version resolved to.
+
+    Files are moved into place atomically so worker processes sharing the
+    directory never see partial archives; concurrent fetches of the same
+    chart within a process share one pull.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self._cache_dir = cache_dir
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @property
+    def cache_dir(self) -> str:
+        return os.path.expanduser(self._cache_dir or settings.helm_chart_cache_dir)
+
+    def _ref_path(self, chart: HelmChart) -> str:
+        return os.path.join(self.cache_dir, "refs", chart.key)
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, "blobs", f"{digest}.tgz")
+
+    def lookup(self, chart: HelmChart) -> Optional[str]:
+        """Returns the cached archive path of `chart`, if present."""
+        try:
+            with open(self._ref_path(chart)) as f:
+                digest = f.read().strip()
+        except FileNotFoundError:
+            return None
+        path = self._blob_path(digest)
+        return path if os.path.exists(path) else None
+
+    async def fetch(self, chart: HelmChart) -> str:
+        """Returns the local archive path of `chart`, pulling it if needed."""
+        path = self.lookup(chart)
+        if path:
+            return path
+        lock = self._locks.setdefault(chart.key, asyncio.Lock())
+        async with lock:
+            path = self.lookup(chart)
+            if path:
+                return path
+            return await self._pull(chart)
+
+    async def _pull(self, chart: HelmChart) -> str:
+        for subdir in ("blobs", "refs", "tmp"):
+            os.makedirs(os.path.join(self.cache_dir, subdir), exist_ok=True)
+        logger.info(f"Pulling Helm chart {chart.name} {chart.version}")
+        with tempfile.TemporaryDirectory(
+            dir=os.path.join(self.cache_dir, "tmp")
+        ) as workdir:
+            await run_helm(
+                "pull",
+                chart.name,
+                "--repo",
+                chart.repo_url,
+                "--version",
+                chart.version,
+                "--destination",
+                workdir,
+            )
+            archives = glob.glob(os.path.join(workdir, "*.tgz"))
+            if len(archives) != 1:
+                raise RuntimeError(
+                    f"Expected one archive pulling {chart.name} {chart.version}, "
+                    f"found {len(archives)}"
+                )
+            digest = await asyncio.to_thread(_sha256_file, archives[0])
+            path = self._blob_path(digest)
+            os.replace(archives[0], path)
+        _write_atomic(self._ref_path(chart), digest)
+        return path
+
+
+chart_cache = HelmChartCache()
+
+
+def workload_ready(kind: str, item: dict) -> bool:
+    """
+    Returns True when a raw Deployment, StatefulSet or DaemonSet has rolled
+    out its current generation and all its replicas are ready.
+    """
+    metadata = item.get("metadata") or {}
+    spec = item.get("spec") or {}
+    status = item.get("status") or {}
+    if status.get("observedGeneration", 0) < metadata.get("generation", 0):
+        return False
+    if kind == "DaemonSet":
+        desired = status.get("desiredNumberScheduled", 0)
+        return (
+            status.get("updatedNumberScheduled", 0) >= desired
+            and status.get("numberReady", 0) >= desired
+        )
+    replicas = spec.get("replicas", 1)
+    ready_field = "availableReplicas" if kind == "Deployment" else "readyReplicas"
+    return (
+        status.get("updatedReplicas", 0) >= replicas
+        and status.get(ready_field, 0) >= replicas
+    )
+
+
+def pending_workloads(
+    apps_v1: client.AppsV1Api, namespace: str, release_name: str
+) -> list[str]:
+    """Lists the workloads of a Helm release that are not ready yet."""
+    selector = f"app.kubernetes.io/instance={release_name}"
+    pending = []
+    for kind, list_fn in (
+        ("Deployment", apps_v1.list_namespaced_deployment),
+        ("StatefulSet", apps_v1.list_namespaced_stateful_set),
+        ("DaemonSet", apps_v1.list_namespaced_daemon_set),
+    ):
+        for item in list_items(list_fn, namespace=namespace, label_selector=selector):
+            if not workload_ready(kind, item):
+                pending.append(f"{kind}/{item['metadata']['name']}")
+    return pending
+
+
+async def wait_for_release(
+    api_client: client.ApiClient,
+    namespace: str,
+    release_name: str,
+    timeout: float = READINESS_TIMEOUT,
+):
+    """
+    Waits until every workload of a Helm release is ready. The API server
+    is polled from a worker thread with growing intervals, so the event
+    loop stays free for other installs while a release rolls out.
+    """
+    apps_v1 = client.AppsV1Api(api_client)
+    deadline = time.monotonic() + timeout
+    interval = READINESS_INTERVAL
+    while True:
+        pending = await asyncio.to_thread(
+            pending_workloads, apps_v1, namespace, release_name
+        )
+        if not pending:
+            return
+        if time.monotonic() >= deadline:
+            raise TimeoutError(
+                f"Release {release_name} not ready after {timeout:.0f}s: "
+                f"{', '.join(pending)}"
+            )
+        await asyncio.sleep(interval)
+        interval = min(interval * 1.5, READINESS_MAX_INTERVAL)
@@ -52,6 +52,17 @@ class K8sClusterStatus(Base, table=True):
     cpu_allocated: float = Field(default=0.0)
     ram_total: float = Field(default=0.0)
     ram_allocated: float = Field(default=0.0)
+    # Pod request totals keyed by node / namespace / project name,
+    # each entry is {"cpu": cores, "ram": GiB, "pods": count}
+    nodes_allocation: dict[str, Any] = Field(
+        default_factory=dict, sa_type=JSONType()
+    )
+    namespaces_allocation: dict[str, Any] = Field(
+        default_factory=dict, sa_type=JSONType()
+    )
+    projects_allocation: dict[str, Any] = Field(
+        default_factory=dict, sa_type=JSONType()
+    )
 
     argocd_installed: bool = Field(default=False)
     argocd_version: Optional[str] = Field(default=None)
@@ -6,9 +6,15 @@ from typing import Any
 from kubernetes import client, config
 from sqlmodel import select
 
-from mindweaver.service import Service
+from mindweaver.service import Service, after_delete
+from mindweaver.fw.events import event_source
 from mindweaver.fw.model import ts_now
+from mindweaver.fw.util import parse_k8s_quantity
+from mindweaver.service.project.model import Project
+from mindweaver.service.project.state import invalidate_cluster_state
 from .model import K8sCluster, K8sClusterStatus, K8sClusterType
+from .allocation import GIB, compute_allocation
+from .discovery import COMPONENTS, check_component, metadata_api_client
 
 logger = logging.getLogger(__name__)
 
@@ -18,33 +24,57 @@ class K8sClusterService(Service[K8sCluster]):
     def model_class(cls) -> type[K8sCluster]:
         return K8sCluster
 
+    def _api_client(self, model: K8sCluster) -> client.ApiClient:
+        """
+        Builds a Kubernetes ApiClient for the cluster without touching the
+        process-wide default configuration.
+        """
+        if model.type == K8sClusterType.IN_CLUSTER:
+            configuration = client.Configuration()
+            config.load_incluster_config(client_configuration=configuration)
+            return client.ApiClient(configuration=configuration)
+
+        if not model.kubeconfig:
+            raise ValueError(f"Cluster {model.name} has no kubeconfig")
+        with tempfile.NamedTemporaryFile(mode="w") as kf:
+            kf.write(model.kubeconfig)
+            kf.flush()
+            return config.new_client_from_config(config_file=kf.name)
+
+    async def get_states(
+        self, ids: list[int] | None = None, include_secrets: bool = False
+    ) -> dict[int, Any]:
+        """
+        Returns cluster states keyed by cluster id using one query joining
+        clusters with their status rows. Cluster states hold no secrets.
+        """
+        state_class = self.get_state_class()
+        stmt = (
+            select(K8sCluster.id, K8sClusterStatus)
+            .outerjoin(
+                K8sClusterStatus, K8sClusterStatus.k8s_cluster_id == K8sCluster.id
+            )
+            .order_by(K8sCluster.id.asc())
+        )
+        if ids is not None:
+            stmt = stmt.where(K8sCluster.id.in_(ids))
+        result = await self.session.exec(stmt)
+        return {
+            cluster_id: state_class.serialize(status_model)
+            for cluster_id, status_model in result.all()
+        }
+
     async def poll_status(self, model: K8sCluster):
         """Poll cluster status and update K8sClusterStatus"""
         logger.info(f"Polling status for k8s_cluster {model.name}")
 
         try:
-            def _get_version(pod):
-                version = pod.metadata.labels.get("app.kubernetes.io/version")
-                if not version and pod.spec.containers:
-                    # Try to extract from image tag
-                    image = pod.spec.containers[0].image
-                    if ":" in image:
-                        version = image.split(":")[-1]
-                return version
+            api_client = await asyncio.to_thread(self._api_client, model)
+            core_v1 = client.CoreV1Api(api_client)
+            core_v1_meta = client.CoreV1Api(metadata_api_client(api_client))
 
             def _get_k8s_info():
-                if model.type == K8sClusterType.IN_CLUSTER:
-                    config.load_incluster_config()
-                else:
-                    if not model.kubeconfig:
-                        raise ValueError(f"Cluster {model.name} has no kubeconfig")
-                    with tempfile.NamedTemporaryFile(mode="w") as kf:
-                        kf.write(model.kubeconfig)
-                        kf.flush()
-                        config.load_kube_config(config_file=kf.name)
-
-                core_v1 = client.CoreV1Api()
-                version_api = client.VersionApi()
+                version_api = client.VersionApi(api_client)
 
                 # Get Version
                 ver = version_api.get_code()
@@ -54,23 +84,10 @@ class K8sClusterService(Service[K8sCluster]):
                 nodes = core_v1.list_node()
                 node_count = len(nodes.items)
                 nodes_status = {}
+                nodes_allocatable = {}
                 cpu_total = 0.0
                 ram_total = 0.0
 
-                def _parse_res(res):
-                    if res.endswith("Ki"):
-                        return float(res[:-2]) / 1024 / 1024
-                    if res.endswith("Mi"):
-                        return float(res[:-2]) / 1024
-                    if res.endswith("Gi"):
-                        return float(res[:-2])
-                    if res.endswith("m"):
-                        return float(res[:-1]) / 1000
-                    try:
-                        return float(res)
-                    except ValueError:
-                        return 0.0
-
                 for node in nodes.items:
                     name = node.metadata.name
                     status = "Unknown"
@@ -81,92 +98,37 @@ class K8sClusterService(Service[K8sCluster]):
                     nodes_status[name] = status
 
                     # Resource totals
-                    cpu_total += _parse_res(node.status.capacity.get("cpu", "0"))
+                    capacity = node.status.capacity or {}
+                    cpu_total += parse_k8s_quantity(capacity.get("cpu"))
                     # Convert memory to GiB
-                    ram_total += _parse_res(node.status.capacity.get("memory", "0"))
-
-                # Check ArgoCD
-                argocd_installed = False
-                argocd_version = None
-                try:
-                    secrets = core_v1.list_secret_for_all_namespaces(
-                        label_selector="owner=helm"
-                    )
-                    for secret in secrets.items:
-                        if secret.metadata.name.startswith("sh.helm.release.v1.argocd"):
-                            argocd_installed = True
-                            break
+                    ram_total += parse_k8s_quantity(capacity.get("memory")) / GIB
 
-                    if not argocd_installed:
-                        svcs = core_v1.list_service_for_all_namespaces(
-                            label_selector="app.kubernetes.io/name=argocd-server"
-                        )
-                        if svcs.items:
-                            argocd_installed = True
-
-                    if argocd_installed:
-                        pods = core_v1.list_pod_for_all_namespaces(
-                            label_selector="app.kubernetes.io/name=argocd-server"
-                        )
-                        if pods.items:
-                            argocd_version = _get_version(pods.items[0])
-                except Exception as e:
-                    logger.warning(f"Failed to check ArgoCD presence: {e}")
+                    allocatable = node.status.allocatable or capacity
+                    nodes_allocatable[name] = {
+                        "cpu": parse_k8s_quantity(allocatable.get("cpu")),
+                        "ram": parse_k8s_quantity(allocatable.get("memory")) / GIB,
+                    }
 
-                # Check Cert Manager
-                cert_manager_installed = False
-                cert_manager_version = None
-                try:
-                    for secret in secrets.items:
-                        if secret.metadata.name.startswith(
-                            "sh.helm.release.v1.cert-manager"
-                        ):
-                            cert_manager_installed = True
-                            break
-                    if not cert_manager_installed:
-                        svcs = core_v1.list_service_for_all_namespaces(
-                            label_selector="app.kubernetes.io/name=cert-manager"
-                        )
-                        if svcs.items:
-                            cert_manager_installed = True
-
-                    if cert_manager_installed:
-                        pods = core_v1.list_pod_for_all_namespaces(
-                            label_selector="app.kubernetes.io/name=cert-manager"
-                        )
-                        if pods.items:
-                            cert_manager_version = _get_version(pods.items[0])
-                except Exception as e:
-                    logger.warning(f"Failed to check Cert Manager presence: {e}")
+                return {
+                    "k8s_version": k8s_version,
+                    "node_count": node_count,
+                    "nodes_status": nodes_status,
+                    "nodes_allocatable": nodes_allocatable,
+                    "cpu_total": cpu_total,
+                    "ram_total": ram_total,
+                }
 
-                # Check CNPG
-                cnpg_installed = False
-                cnpg_version = None
+            def _check_component(component: str):
                 try:
-                    for secret in secrets.items:
-                        if secret.metadata.name.startswith("sh.helm.release.v1.cnpg"):
-                            cnpg_installed = True
-                            break
-                    if not cnpg_installed:
-                        svcs = core_v1.list_service_for_all_namespaces(
-                            label_selector="app.kubernetes.io/name=cloudnative-pg"
-                        )
-                        if svcs.items:
-                            cnpg_installed = True
-
-                    if cnpg_installed:
-                        pods = core_v1.list_pod_for_all_namespaces(
-                            label_selector="app.kubernetes.io/name=cloudnative-pg"
-                        )
-                        if pods.items:
-                            cnpg_version = _get_version(pods.items[0])
+                    return check_component(core_v1, core_v1_meta, model.id, component)
                 except Exception as e:
-                    logger.warning(f"Failed to check CNPG presence: {e}")
+                    logger.warning(f"Failed to check {component} presence: {e}")
+                    return False, None
 
+            def _check_cluster_issuer():
                 # Check Mindweaver Cluster Issuer
-                cluster_issuer_installed = False
                 try:
-                    custom_api = client.CustomObjectsApi()
+                    custom_api = client.CustomObjectsApi(api_client)
                     issuers = custom_api.list_cluster_custom_object(
                         group="cert-manager.io",
                         version="v1",
@@ -174,27 +136,34 @@ class K8sClusterService(Service[K8sCluster]):
                     )
                     for issuer in issuers.get("items", []):
                         if issuer.get("metadata", {}).get("name") == "mindweaver-selfsigned-issuer":
-                            cluster_issuer_installed = True
-                            break
+                            return True
                 except Exception as e:
                     logger.warning(f"Failed to check Mindweaver Cluster Issuer presence: {e}")
+                return False
 
-                return {
-                    "k8s_version": k8s_version,
-                    "node_count": node_count,
-                    "nodes_status": nodes_status,
-                    "cpu_total": cpu_total,
-                    "ram_total": ram_total,
-                    "argocd_installed": argocd_installed,
-                    "argocd_version": argocd_version,
-                    "cert_manager_installed": cert_manager_installed,
-                    "cert_manager_version": cert_manager_version,
-                    "cnpg_installed": cnpg_installed,
-                    "cnpg_version": cnpg_version,
-                    "cluster_issuer_installed": cluster_issuer_installed,
-                }
+            def _compute_allocation():
+                try:
+                    return compute_allocation(core_v1)
+                except Exception as e:
+                    logger.warning(f"Failed to compute resource allocation: {e}")
+                    return None
 
-            info = await asyncio.to_thread(_get_k8s_info)
+            # Component checks are independent, run them concurrently
+            (
+                info,
+                allocation,
+                cluster_issuer_installed,
+                *components,
+            ) = await asyncio.gather(
+                asyncio.to_thread(_get_k8s_info),
+                asyncio.to_thread(_compute_allocation),
+                asyncio.to_thread(_check_cluster_issuer),
+                *(asyncio.to_thread(_check_component, c) for c in COMPONENTS),
+            )
+            info["cluster_issuer_installed"] = cluster_issuer_installed
+            for component, (installed, version) in zip(COMPONENTS, components):
+                info[f"{component}_installed"] = installed
+                info[f"{component}_version"] = version
 
             # Update database
             stmt = select(K8sClusterStatus).where(
@@ -220,6 +189,10 @@ class K8sClusterService(Service[K8sCluster]):
             status_model.cnpg_installed = info["cnpg_installed"]
             status_model.cnpg_version = info["cnpg_version"]
             status_model.cluster_issuer_installed = info["cluster_issuer_installed"]
+            if allocation is not None:
+                await self._update_allocation(
+                    model, status_model, allocation, info["nodes_allocatable"]
+                )
             status_model.last_update = ts_now()
             status_model.message = None
 
@@ -239,6 +212,49 @@ class K8sClusterService(Service[K8sCluster]):
 
         await self.session.flush()
 
+    async def _update_allocation(
+        self,
+        model: K8sCluster,
+        status_model: K8sClusterStatus,
+        allocation: dict[str, Any],
+        nodes_allocatable: dict[str, dict[str, float]],
+    ):
+        """
+        Stores pod request totals on the cluster status, attaching node
+        allocatable capacity and mapping namespaces to the projects that
+        deploy into them.
+        """
+        nodes = {}
+        for name, usage in allocation["nodes"].items():
+            nodes[name] = {
+                **usage,
+                "cpu_allocatable": nodes_allocatable.get(name, {}).get("cpu", 0.0),
+                "ram_allocatable": nodes_allocatable.get(name, {}).get("ram", 0.0),
+            }
+
+        namespaces = allocation["namespaces"]
+        result = await self.session.exec(
+            select(Project).where(Project.k8s_cluster_id == model.id)
+        )
+        projects = {}
+        for project in result.all():
+            namespace = project.k8s_namespace or project.name
+            projects[project.name] = {
+                "namespace": namespace,
+                **namespaces.get(namespace, {"cpu": 0.0, "ram": 0.0, "pods": 0}),
+            }
+
+        status_model.cpu_allocated = allocation["cpu_allocated"]
+        status_model.ram_allocated = allocation["ram_allocated"]
+        status_model.nodes_allocation = nodes
+        status_model.namespaces_allocation = namespaces
+        status_model.projects_allocation = projects
+
+    @after_delete
+    async def _invalidate_project_states(self, model: K8sCluster):
+        """Drops cached project states showing the deleted cluster"""
+        invalidate_cluster_state(model.id)
+
     @classmethod
     def widgets(cls) -> dict[str, Any]:
         return {
@@ -259,3 +275,26 @@ class K8sClusterService(Service[K8sCluster]):
                 "label": "Kubeconfig",
             },
         }
+
+
+@event_source(K8sClusterStatus)
+def _k8s_cluster_status_event(connection, status: K8sClusterStatus):
+    """Builds the status change event of a cluster for every project on it."""
+    project_ids = connection.execute(
+        select(Project.id).where(Project.k8s_cluster_id == status.k8s_cluster_id)
+    ).scalars()
+    return {
+        "entity": K8sClusterService.entity_type(),
+        "id": status.k8s_cluster_id,
+        "project_ids": list(project_ids),
+        "data": {
+            "status": status.status,
+            "message": status.message,
+            "node_count": status.node_count,
+            "cpu_total": status.cpu_total,
+            "cpu_allocated": status.cpu_allocated,
+            "ram_total": status.ram_total,
+            "ram_allocated": status.ram_allocated,
+            "last_update": status.last_update,
+        },
+    }
@@ -1,6 +1,8 @@
 # SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
+from typing import Any, Optional
+
 from sqlmodel import select
 from mindweaver.fw.state import BaseState
 from .model import K8sClusterStatus
@@ -11,19 +13,21 @@ class K8sClusterState(BaseState):
     Cluster state provides an overview of cluster health.
     """
 
-    async def get(self):
-        # Get cluster status
-        stmt_status = select(K8sClusterStatus).where(
-            K8sClusterStatus.k8s_cluster_id == self.model.id
-        )
-        result_status = await self.svc.session.exec(stmt_status)
-        status_model = result_status.one_or_none()
-
+    @classmethod
+    def serialize(cls, status_model: Optional[K8sClusterStatus]) -> dict[str, Any]:
+        """Converts a cluster status model into its API representation."""
         status_data = {}
         if status_model:
             status_data = status_model.model_dump(
                 exclude={"id", "k8s_cluster_id", "last_update"}
             )
             status_data["last_update"] = status_model.last_update.isoformat()
-
         return status_data
+
+    async def get(self):
+        # Get cluster status
+        stmt_status = select(K8sClusterStatus).where(
+            K8sClusterStatus.k8s_cluster_id == self.model.id
+        )
+        result_status = await self.svc.session.exec(stmt_status)
+        return self.serialize(result_status.one_or_none())
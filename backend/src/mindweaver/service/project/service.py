@@ -1,7 +1,7 @@
 import logging
 from typing import Any
 
-from mindweaver.service import Service, before_create, before_update
+from mindweaver.service import Service, after_delete, before_create, before_update
 
 from .model import Project
 
@@ -25,6 +25,13 @@ class ProjectService(Service[Project]):
         if hasattr(data, "k8s_namespace") and not data.k8s_namespace:
             data.k8s_namespace = model.name
 
+    @after_delete
+    async def _invalidate_state_on_delete(self, model: Project):
+        """Drops the cached dashboard state of the deleted project"""
+        from .state import invalidate_project_state
+
+        invalidate_project_state(model.id)
+
     @classmethod
     def widgets(cls) -> dict[str, Any]:
 
@@ -1,10 +1,63 @@
 # SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
-from sqlmodel import select, func
+import time
+from typing import Any, Optional
+
+from sqlalchemy import func, literal, select as sa_select, union_all
+from sqlmodel import select
+from mindweaver.fw.events import add_listener
+from mindweaver.fw.registry import SERVICE_REGISTRY
 from mindweaver.fw.state import BaseState
 from .service import ProjectService
 
+PLATFORM_STATUSES = ("online", "pending", "error", "offline")
+# Upper bound on staleness when a change was committed by another process
+# while this one was not listening for events
+PROJECT_STATE_CACHE_TTL = 30.0
+
+# (project_id, k8s_cluster_id) -> (expiry, state)
+_state_cache: dict[tuple[int, Optional[int]], tuple[float, dict[str, Any]]] = {}
+
+
+def clear_project_state_cache():
+    """Drops all cached project states."""
+    _state_cache.clear()
+
+
+def invalidate_project_state(project_id: int):
+    """Drops the cached state of a project."""
+    for key in [key for key in _state_cache if key[0] == project_id]:
+        _state_cache.pop(key, None)
+
+
+def invalidate_cluster_state(k8s_cluster_id: int):
+    """Drops the cached states of the projects deploying into a cluster."""
+    for key in [key for key in _state_cache if key[1] == k8s_cluster_id]:
+        _state_cache.pop(key, None)
+
+
+def _invalidate_on_event(message: dict[str, Any]):
+    for project_id in message.get("project_ids") or []:
+        invalidate_project_state(project_id)
+
+
+add_listener(_invalidate_on_event)
+
+
+def _platform_services() -> list[Any]:
+    from mindweaver.platform_service.base import PlatformService
+
+    services = {}
+    for svc_cls in SERVICE_REGISTRY.values():
+        if (
+            isinstance(svc_cls, type)
+            and issubclass(svc_cls, PlatformService)
+            and svc_cls.state_model is not None
+        ):
+            services[svc_cls.platform_type()] = svc_cls
+    return [services[key] for key in sorted(services)]
+
 
 @ProjectService.with_state()
 class ProjectState(BaseState):
@@ -12,47 +65,79 @@ class ProjectState(BaseState):
     Project state provides an overview of project resources and cluster health.
     """
 
-    async def get(self):
-        from mindweaver.platform_service.pgsql import (
-            PgSqlPlatform,
-            PgSqlPlatformState,
-        )
-        from mindweaver.service.k8s_cluster import K8sClusterStatus
+    async def platform_counts(self) -> dict[str, dict[str, int]]:
+        """
+        Counts the deployed platforms of the project per platform type and
+        status, in a single UNION ALL query across every platform service.
+        """
+        services = _platform_services()
+        counts = {
+            svc_cls.platform_type(): {
+                **{status: 0 for status in PLATFORM_STATUSES},
+                "active": 0,
+                "total": 0,
+            }
+            for svc_cls in services
+        }
+        if not services:
+            return counts
 
-        # Get service counts (legacy from views.py)
-        stmt = (
-            select(func.count(PgSqlPlatform.id))
-            .join(
-                PgSqlPlatformState,
-                PgSqlPlatform.id == PgSqlPlatformState.platform_id,
-                isouter=True,
+        queries = []
+        for svc_cls in services:
+            model_class = svc_cls.model_class()
+            state_model = svc_cls.state_model
+            queries.append(
+                sa_select(
+                    literal(svc_cls.platform_type()).label("platform_type"),
+                    state_model.status.label("status"),
+                    state_model.active.label("active"),
+                    func.count().label("count"),
+                )
+                .select_from(model_class)
+                .join(state_model, state_model.platform_id == model_class.id)
+                .where(model_class.project_id == self.model.id)
+                .group_by(state_model.status, state_model.active)
             )
-            .where(PgSqlPlatform.project_id == self.model.id)
-            .where(PgSqlPlatformState.active == True)
-        )
 
-        result = await self.svc.session.exec(stmt)
-        pgsql_count = result.one_or_none() or 0
+        result = await self.svc.session.exec(union_all(*queries))
+        for platform_type, status, active, count in result.all():
+            entry = counts[platform_type]
+            if status in PLATFORM_STATUSES:
+                entry[status] += count
+            entry["total"] += count
+            if active:
+                entry["active"] += count
+        return counts
 
-        # Get cluster status
-        status_data = {}
-        if self.model.k8s_cluster_id:
-            stmt_status = select(K8sClusterStatus).where(
-                K8sClusterStatus.k8s_cluster_id == self.model.k8s_cluster_id
-            )
-            result_status = await self.svc.session.exec(stmt_status)
-            status_model = result_status.one_or_none()
+    async def cluster_status(self) -> dict[str, Any]:
+        """Returns the status of the cluster the project deploys into."""
+        from mindweaver.service.k8s_cluster import K8sClusterStatus
+        from mindweaver.service.k8s_cluster.state import K8sClusterState
 
-            if status_model:
-                status_data = status_model.model_dump(
-                    exclude={"id", "k8s_cluster_id", "last_update"}
-                )
-                status_data["last_update"] = status_model.last_update.isoformat()
-
-        return {
-            "pgsql": pgsql_count,
-            "trino": 0,
-            "spark": 0,
-            "airflow": 0,
-            "cluster": status_data,
+        if not self.model.k8s_cluster_id:
+            return {}
+        stmt_status = select(K8sClusterStatus).where(
+            K8sClusterStatus.k8s_cluster_id == self.model.k8s_cluster_id
+        )
+        result_status = await self.svc.session.exec(stmt_status)
+        return K8sClusterState.serialize(result_status.one_or_none())
+
+    async def get(self):
+        cache_key = (self.model.id, self.model.k8s_cluster_id)
+        cached = _state_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        platforms = await self.platform_counts()
+        state = {
+            # Active platforms per type, kept at the top level for the
+            # existing dashboard cards
+            **{
+                platform_type: entry["active"]
+                for platform_type, entry in platforms.items()
+            },
+            "platforms": platforms,
+            "cluster": await self.cluster_status(),
         }
+        _state_cache[cache_key] = (time.monotonic() + PROJECT_STATE_CACHE_TTL, state)
+        return state
@@ -4,6 +4,7 @@
 from .service import S3StorageService
 from .model import S3Storage, S3Config
 import mindweaver.service.s3_storage.views
+import mindweaver.service.s3_storage.actions
 
 router = S3StorageService.router()
 
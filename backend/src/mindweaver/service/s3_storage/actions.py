@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+from mindweaver.fw.action import BaseAction, parse_parameters
+from .copy import CopySpec
+from .delete import DeleteSpec
+from .index import IndexSpec
+from .service import S3StorageService
+
+
+@S3StorageService.register_action("delete_objects")
+class DeleteObjectsAction(BaseAction):
+
+    async def __call__(self, **kwargs):
+        from mindweaver.tasks.s3_storage import delete_s3_objects_task
+
+        spec = parse_parameters(DeleteSpec, kwargs)
+        return await self.trigger(
+            delete_s3_objects_task,
+            f"Deletion of objects in '{spec.bucket}' triggered.",
+            spec.model_dump(),
+            pass_parameters=True,
+        )
+
+
+@S3StorageService.register_action("index_objects")
+class IndexObjectsAction(BaseAction):
+
+    async def __call__(self, **kwargs):
+        from mindweaver.tasks.s3_storage import index_s3_objects_task
+
+        spec = parse_parameters(IndexSpec, kwargs)
+        return await self.trigger(
+            index_s3_objects_task,
+            f"Indexing of '{spec.bucket}' triggered.",
+            spec.model_dump(),
+            pass_parameters=True,
+        )
+
+
+@S3StorageService.register_action("copy_objects")
+class CopyObjectsAction(BaseAction):
+
+    async def __call__(self, **kwargs):
+        from mindweaver.tasks.s3_storage import copy_s3_objects_task
+
+        if kwargs.get("dest_storage_id") == self.model.id:
+            kwargs = {**kwargs, "dest_storage_id": None}
+        spec = parse_parameters(CopySpec, kwargs)
+        if spec.dest_storage_id is not None:
+            # Only storages of the same project are valid destinations
+            await self.svc.get(spec.dest_storage_id)
+        verb = "Move" if spec.move else "Copy"
+        source = spec.key if spec.key is not None else spec.prefix
+        return await self.trigger(
+            copy_s3_objects_task,
+            f"{verb} of '{spec.bucket}/{source}' triggered.",
+            spec.model_dump(),
+            pass_parameters=True,
+        )
@@ -0,0 +1,381 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Copies and moves of S3 objects within and between storages.
+
+Storages on the same endpoint with the same credentials copy server-side:
+`CopyObject` up to 5 GiB, and `UploadPartCopy` of parallel byte ranges
+beyond that. Between endpoints the source body is piped into a multipart
+upload of the destination, holding at most a few parts in memory; the
+parts buffered by all the objects of a copy are bounded by
+`s3_copy_max_buffer_size`. Moves delete the sources once they are copied.
+"""
+
+import asyncio
+import math
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from mindweaver.config import settings
+from . import multipart
+from .delete import DELETE_BATCH_SIZE, MAX_REPORTED_ERRORS, PROGRESS_INTERVAL, delete_batch
+from .model import S3Storage
+
+# Largest object a single CopyObject request copies
+COPY_OBJECT_LIMIT = 5 * 1024 * 1024 * 1024
+
+
+class CopySpec(BaseModel):
+    """
+    Copy of the objects under `prefix` to `dest_prefix` of `dest_bucket`,
+    or of the single object `key` to `dest_key`, in `dest_storage_id` or
+    the same storage when unset.
+    """
+
+    bucket: str
+    prefix: str = ""
+    key: Optional[str] = None
+    dest_storage_id: Optional[int] = None
+    dest_bucket: str
+    dest_prefix: str = ""
+    dest_key: Optional[str] = None
+    move: bool = False
+    concurrency: int = Field(default=8, ge=1, le=32)
+    part_size: int = Field(
+        default=settings.s3_upload_part_size,
+        ge=multipart.MIN_PART_SIZE,
+        le=settings.s3_stream_max_part_size,
+    )
+
+    @model_validator(mode="after")
+    def _check_overlap(self):
+        if self.key is not None:
+            if not self.dest_key:
+                raise ValueError("dest_key is required to copy a key")
+            if self.dest_storage_id is None and (self.dest_bucket, self.dest_key) == (
+                self.bucket,
+                self.key,
+            ):
+                raise ValueError("Source and destination are the same")
+            return self
+        if (
+            self.dest_storage_id is None
+            and self.dest_bucket == self.bucket
+            and (
+                self.dest_prefix.startswith(self.prefix)
+                or self.prefix.startswith(self.dest_prefix)
+            )
+        ):
+            raise ValueError("Source and destination prefixes overlap")
+        return self
+
+
+def same_endpoint(source: S3Storage, dest: S3Storage) -> bool:
+    """Whether `dest` can read `source` objects, so copies stay server-side."""
+    return source.id == dest.id or (
+        (source.endpoint_url or None) == (dest.endpoint_url or None)
+        and source.access_key == dest.access_key
+    )
+
+
+def _part_size(size: int, part_size: int) -> int:
+    """Smallest part size from `part_size` up that fits `size` in 10,000 parts."""
+    return max(part_size, math.ceil(size / multipart.MAX_PARTS))
+
+
+def buffered_size(server_side: bool, size: int, part_size: int, concurrency: int) -> int:
+    """Bytes a copy of an object of `size` holds in memory at most."""
+    if server_side:
+        return 0
+    part_size = _part_size(size, part_size)
+    return min(size, part_size) * min(concurrency, max(math.ceil(size / part_size), 1))
+
+
+class ByteBudget:
+    """
+    Bytes that copies in flight may buffer. A copy larger than the whole
+    budget still runs, once nothing else holds any.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self._changed = asyncio.Condition()
+
+    async def acquire(self, size: int):
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: self.used == 0 or self.used + size <= self.limit
+            )
+            self.used += size
+
+    async def release(self, size: int):
+        async with self._changed:
+            self.used -= size
+            self._changed.notify_all()
+
+
+async def _copy_parts(
+    client,
+    bucket: str,
+    key: str,
+    size: int,
+    dest_bucket: str,
+    dest_key: str,
+    part_size: int,
+    concurrency: int,
+):
+    """Copies an object server-side as parallel `UploadPartCopy` ranges."""
+    part_size = _part_size(size, part_size)
+    upload_id = await asyncio.to_thread(
+        multipart.create_upload, client, dest_bucket, dest_key
+    )
+    slots = asyncio.Semaphore(concurrency)
+
+    async def copy_part(number: int, start: int) -> dict[str, Any]:
+        end = min(start + part_size, size) - 1
+        async with slots:
+            response = await asyncio.to_thread(
+                client.upload_part_copy,
+                Bucket=dest_bucket,
+                Key=dest_key,
+                UploadId=upload_id,
+                PartNumber=number,
+                CopySource={"Bucket": bucket, "Key": key},
+                CopySourceRange=f"bytes={start}-{end}",
+            )
+        return {"PartNumber": number, "ETag": response["CopyPartResult"]["ETag"]}
+
+    try:
+        parts = await asyncio.gather(
+            *(
+                copy_part(number, start)
+                for number, start in enumerate(range(0, size, part_size), 1)
+            )
+        )
+        await asyncio.to_thread(
+            client.complete_multipart_upload,
+            Bucket=dest_bucket,
+            Key=dest_key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except BaseException:
+        await asyncio.to_thread(
+            client.abort_multipart_upload,
+            Bucket=dest_bucket,
+            Key=dest_key,
+            UploadId=upload_id,
+        )
+        raise
+
+
+async def _stream_copy(
+    source_client,
+    bucket: str,
+    key: str,
+    dest_client,
+    dest_bucket: str,
+    dest_key: str,
+    part_size: int,
+    concurrency: int,
+) -> int:
+    """Pipes an object into a multipart upload of another endpoint."""
+    response = await asyncio.to_thread(source_client.get_object, Bucket=bucket, Key=key)
+    body = response["Body"]
+    part_size = _part_size(response.get("ContentLength", 0), part_size)
+
+    async def chunks():
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, part_size)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            body.close()
+
+    result = await multipart.stream_upload(
+        dest_client,
+        dest_bucket,
+        dest_key,
+        chunks(),
+        part_size=part_size,
+        concurrency=concurrency,
+        content_type=response.get("ContentType"),
+    )
+    return result["size"]
+
+
+async def copy_object(
+    source_client,
+    dest_client,
+    server_side: bool,
+    bucket: str,
+    key: str,
+    size: int,
+    dest_bucket: str,
+    dest_key: str,
+    part_size: int = settings.s3_upload_part_size,
+    concurrency: int = settings.s3_upload_concurrency,
+):
+    """Copies one object of `size` bytes, server-side when possible."""
+    if not server_side:
+        await _stream_copy(
+            source_client,
+            bucket,
+            key,
+            dest_client,
+            dest_bucket,
+            dest_key,
+            part_size,
+            concurrency,
+        )
+    elif size <= COPY_OBJECT_LIMIT:
+        await asyncio.to_thread(
+            dest_client.copy_object,
+            CopySource={"Bucket": bucket, "Key": key},
+            Bucket=dest_bucket,
+            Key=dest_key,
+        )
+    else:
+        await _copy_parts(
+            dest_client,
+            bucket,
+            key,
+            size,
+            dest_bucket,
+            dest_key,
+            part_size,
+            concurrency,
+        )
+
+
+def _list_objects(client, spec: CopySpec):
+    """Yields the pages of the objects to copy. Blocking."""
+    if spec.key is not None:
+        head = client.head_object(Bucket=spec.bucket, Key=spec.key)
+        yield [{"Key": spec.key, "Size": head["ContentLength"]}]
+        return
+    paginator = client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=spec.bucket, Prefix=spec.prefix):
+        yield page.get("Contents", [])
+
+
+def _dest_key(spec: CopySpec, key: str) -> str:
+    if spec.key is not None:
+        return spec.dest_key
+    return spec.dest_prefix + key[len(spec.prefix) :]
+
+
+async def run_copy(
+    source_client,
+    dest_client,
+    server_side: bool,
+    spec: CopySpec,
+    on_progress: Optional[Callable[[dict[str, Any]], Awaitable[None]]] = None,
+) -> dict[str, Any]:
+    """
+    Copies, or moves, the objects under `spec.prefix`, or `spec.key`, up to
+    `spec.concurrency` objects at once and within the memory budget of
+    `s3_copy_max_buffer_size`. Objects that fail are counted and the first
+    failures reported, the others carry on. Returns the copied objects and
+    bytes with the throughput, which `on_progress` receives at most once
+    per `PROGRESS_INTERVAL`.
+    """
+    summary: dict[str, Any] = {
+        "objects": 0,
+        "bytes": 0,
+        "failed": 0,
+        "deleted": 0,
+        "errors": [],
+    }
+    started = last_report = time.monotonic()
+    slots = asyncio.Semaphore(spec.concurrency)
+    budget = ByteBudget(settings.s3_copy_max_buffer_size)
+    tasks: list[asyncio.Task] = []
+    # Sources of a move, deleted in batches once copied
+    copied: list[str] = []
+
+    def counters() -> dict[str, Any]:
+        elapsed = max(time.monotonic() - started, 1e-6)
+        return {
+            **{k: summary[k] for k in ("objects", "bytes", "failed", "deleted")},
+            "elapsed": round(elapsed, 3),
+            "objects_per_sec": round(summary["objects"] / elapsed, 2),
+            "bytes_per_sec": round(summary["bytes"] / elapsed),
+        }
+
+    async def delete_copied(force: bool = False):
+        while copied and (force or len(copied) >= DELETE_BATCH_SIZE):
+            keys = copied[:DELETE_BATCH_SIZE]
+            del copied[:DELETE_BATCH_SIZE]
+            errors = await asyncio.to_thread(delete_batch, source_client, spec.bucket, keys)
+            summary["deleted"] += len(keys) - len(errors)
+            _record_errors(summary, errors)
+
+    async def copy(obj: dict[str, Any], buffered: int):
+        nonlocal last_report
+        key = obj["Key"]
+        try:
+            await copy_object(
+                source_client,
+                dest_client,
+                server_side,
+                spec.bucket,
+                key,
+                obj["Size"],
+                spec.dest_bucket,
+                _dest_key(spec, key),
+                spec.part_size,
+                settings.s3_upload_concurrency,
+            )
+        except Exception as e:
+            summary["failed"] += 1
+            _record_errors(summary, [{"key": key, "message": str(e)}])
+            return
+        finally:
+            await budget.release(buffered)
+            slots.release()
+        summary["objects"] += 1
+        summary["bytes"] += obj["Size"]
+        if spec.move:
+            copied.append(key)
+            await delete_copied()
+        if on_progress and time.monotonic() - last_report >= PROGRESS_INTERVAL:
+            last_report = time.monotonic()
+            await on_progress(counters())
+
+    pages = _list_objects(source_client, spec)
+    try:
+        while True:
+            objects = await asyncio.to_thread(next, pages, None)
+            if objects is None:
+                break
+            for obj in objects:
+                buffered = buffered_size(
+                    server_side, obj["Size"], spec.part_size, settings.s3_upload_concurrency
+                )
+                await slots.acquire()
+                await budget.acquire(buffered)
+                tasks = [task for task in tasks if not task.done()]
+                tasks.append(asyncio.create_task(copy(obj, buffered)))
+        await asyncio.gather(*tasks)
+        await delete_copied(force=True)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    result = counters()
+    if on_progress:
+        await on_progress(result)
+    return {**result, "errors": summary["errors"]}
+
+
+def _record_errors(summary: dict[str, Any], errors: list[dict[str, Any]]):
+    room = MAX_REPORTED_ERRORS - len(summary["errors"])
+    summary["errors"].extend(errors[:room])
@@ -0,0 +1,137 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Bulk and recursive deletes of S3 objects.
+
+Keys are deleted with `delete_objects` in batches of up to 1,000, the most
+one request accepts. Recursive deletes list the prefix page by page while
+the batches of earlier pages are deleted, up to `concurrency` at once.
+Listing continues after the last returned key, so deleting objects already
+listed does not disturb it.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+# Most keys one delete_objects request accepts
+DELETE_BATCH_SIZE = 1000
+# Keys of failed deletes included in the summary
+MAX_REPORTED_ERRORS = 100
+# Seconds between progress reports
+PROGRESS_INTERVAL = 1.0
+
+
+class DeleteSpec(BaseModel):
+    """Objects to delete: explicit `keys`, everything under `prefix`, or both."""
+
+    bucket: str
+    keys: list[str] = Field(default_factory=list)
+    prefix: Optional[str] = None
+    concurrency: int = Field(default=4, ge=1, le=32)
+
+    @model_validator(mode="after")
+    def _check_targets(self):
+        if self.prefix == "":
+            raise ValueError("An empty prefix would delete the whole bucket")
+        if not self.keys and self.prefix is None:
+            raise ValueError("Either keys or prefix is required")
+        return self
+
+    @property
+    def inline(self) -> bool:
+        """Whether the delete is small enough to run within a request."""
+        return self.prefix is None and len(self.keys) <= DELETE_BATCH_SIZE
+
+
+def iter_batches(client, spec: DeleteSpec) -> Iterator[list[str]]:
+    """Yields the keys to delete in batches. Blocking."""
+    for start in range(0, len(spec.keys), DELETE_BATCH_SIZE):
+        yield spec.keys[start : start + DELETE_BATCH_SIZE]
+    if spec.prefix is not None:
+        paginator = client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            Bucket=spec.bucket,
+            Prefix=spec.prefix,
+            PaginationConfig={"PageSize": DELETE_BATCH_SIZE},
+        )
+        for page in pages:
+            keys = [obj["Key"] for obj in page.get("Contents", [])]
+            if keys:
+                yield keys
+
+
+def delete_batch(client, bucket: str, keys: list[str]) -> list[dict[str, Any]]:
+    """Deletes up to 1,000 keys, returning the per-key errors. Blocking."""
+    response = client.delete_objects(
+        Bucket=bucket,
+        Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+    )
+    return [
+        {"key": e.get("Key"), "code": e.get("Code"), "message": e.get("Message")}
+        for e in response.get("Errors", [])
+    ]
+
+
+async def run_delete(
+    client,
+    spec: DeleteSpec,
+    on_progress: Optional[Callable[[dict[str, Any]], Awaitable[None]]] = None,
+) -> dict[str, Any]:
+    """
+    Deletes the objects of `spec`, running up to `spec.concurrency` batches
+    at once, and returns the number of deleted and failed keys with the
+    first failures. `on_progress` receives the running counters at most
+    once per `PROGRESS_INTERVAL`.
+    """
+    summary: dict[str, Any] = {"deleted": 0, "failed": 0, "batches": 0, "errors": []}
+    slots = asyncio.Semaphore(spec.concurrency)
+    tasks: list[asyncio.Task] = []
+    last_report = time.monotonic()
+
+    async def delete(keys: list[str]):
+        nonlocal last_report
+        try:
+            errors = await asyncio.to_thread(delete_batch, client, spec.bucket, keys)
+        finally:
+            slots.release()
+        summary["batches"] += 1
+        summary["deleted"] += len(keys) - len(errors)
+        summary["failed"] += len(errors)
+        room = MAX_REPORTED_ERRORS - len(summary["errors"])
+        summary["errors"].extend(errors[:room])
+        if on_progress and time.monotonic() - last_report >= PROGRESS_INTERVAL:
+            last_report = time.monotonic()
+            await on_progress(_counters(summary))
+
+    batches = iter_batches(client, spec)
+    try:
+        while True:
+            # Listing the next page overlaps with the deletes in flight
+            keys = await asyncio.to_thread(next, batches, None)
+            if keys is None:
+                break
+            await slots.acquire()
+            done = [task for task in tasks if task.done()]
+            tasks = [task for task in tasks if not task.done()]
+            for task in done:
+                if task.exception() is not None:
+                    slots.release()
+                    raise task.exception()
+            tasks.append(asyncio.create_task(delete(keys)))
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    if on_progress:
+        await on_progress(_counters(summary))
+    return summary
+
+
+def _counters(summary: dict[str, Any]) -> dict[str, Any]:
+    return {k: summary[k] for k in ("deleted", "failed", "batches")}
@@ -0,0 +1,74 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Downloads of S3 objects proxied through the API, for endpoints browsers
+cannot reach such as in-cluster MinIO services.
+
+A single byte range of the request is forwarded to `GetObject`, so readers
+of columnar files fetch only the parts they need. The body is read one
+chunk at a time as the client consumes the response, holding no more than
+one chunk in memory.
+"""
+
+import asyncio
+import re
+from datetime import timezone
+from email.utils import format_datetime
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import quote
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(value: Optional[str]) -> Optional[str]:
+    """
+    Returns the single byte range of a `Range` header in S3 form. Headers
+    with several ranges or invalid syntax are ignored, which serves the
+    whole object.
+    """
+    if not value:
+        return None
+    match = _RANGE.match(value.strip().replace(" ", ""))
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if start and end and int(end) < int(start):
+        return None
+    return f"bytes={start}-{end}"
+
+
+def object_headers(response: dict[str, Any], key: str) -> dict[str, str]:
+    """Response headers describing an object, or the range of it returned."""
+    filename = quote(key.split("/")[-1])
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(response["ContentLength"]),
+        "Content-Disposition": f"attachment; filename*=UTF-8''{filename}",
+    }
+    if response.get("ContentRange"):
+        headers["Content-Range"] = response["ContentRange"]
+    if response.get("ETag"):
+        headers["ETag"] = response["ETag"]
+    if response.get("LastModified"):
+        headers["Last-Modified"] = format_datetime(
+            response["LastModified"].astimezone(timezone.utc), usegmt=True
+        )
+    return headers
+
+
+async def iter_body(body, chunk_size: int) -> AsyncIterator[bytes]:
+    """
+    Yields an S3 body in chunks. The next chunk is only read once the
+    previous one is sent, so slow clients slow down the read from S3.
+    """
+    try:
+        while True:
+            chunk = await asyncio.to_thread(body.read, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        body.close()
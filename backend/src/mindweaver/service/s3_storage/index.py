@@ -0,0 +1,583 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Index of the objects of S3 buckets, for search and size rollups without
+crawling the bucket.
+
+A refresh splits the bucket into shards by prefix, `shard_depth` levels
+deep, and lists the shards in parallel. Each listed page is compared with
+the indexed keys in the same key range, so only new, changed and deleted
+objects are written and memory stays bounded by the page size. Index keys
+use byte-wise collation, which orders them like S3 does. Refreshing only
+some prefixes re-lists just those, and S3 event notifications keep the
+index fresh between refreshes; an event older than the last one applied
+to its key, by `sequencer`, is skipped.
+
+Every change also adjusts the objects and bytes of the folders holding the
+key in `S3IndexRollup`, so sizes are read per folder instead of summed
+over the objects. Refreshes apply their pages under a shared advisory lock
+of the index and events under an exclusive one, so events never race the
+pages reading the same keys.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import unquote_plus
+
+from pydantic import BaseModel, Field
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.fw.model import get_engine, ts_now
+from .model import S3IndexedObject, S3IndexRollup, S3ObjectIndex, S3Storage
+
+logger = logging.getLogger(__name__)
+
+# Keys per list_objects_v2 page, and so per compared key range
+LIST_PAGE_SIZE = 1000
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Rows per statement of rollup changes, well below the bind parameter limit
+ROLLUP_BATCH = 1000
+# Width that sequencers are zero padded to, so that they compare as strings
+SEQUENCER_WIDTH = 32
+
+
+class IndexSpec(BaseModel):
+    """
+    Parameters of an index refresh. Without `prefixes` the whole bucket is
+    listed, otherwise only the objects under them.
+    """
+
+    bucket: str
+    prefixes: list[str] = Field(default_factory=list)
+    shard_depth: int = Field(default=1, ge=0, le=4)
+    concurrency: int = Field(default=8, ge=1, le=32)
+
+
+@dataclass
+class Shard:
+    """Objects under `prefix`, or only those directly under it."""
+
+    prefix: str
+    recursive: bool
+
+
+def _like_prefix(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+def _under(prefix: str, recursive: bool = True) -> list:
+    """Filters of the indexed keys below `prefix`."""
+    filters = []
+    if prefix:
+        filters.append(S3IndexedObject.key.like(_like_prefix(prefix), escape="\\"))
+    if not recursive:
+        rest = func.substr(S3IndexedObject.key, len(prefix) + 1)
+        filters.append(func.strpos(rest, "/") == 0)
+    return filters
+
+
+def _list_page(
+    client,
+    bucket: str,
+    prefix: str,
+    delimiter: Optional[str],
+    token: Optional[str],
+) -> dict[str, Any]:
+    params = {"Bucket": bucket, "Prefix": prefix, "MaxKeys": LIST_PAGE_SIZE}
+    if delimiter:
+        params["Delimiter"] = delimiter
+    if token:
+        params["ContinuationToken"] = token
+    return client.list_objects_v2(**params)
+
+
+def discover_shards(
+    client, bucket: str, prefix: str, depth: int
+) -> tuple[list[Shard], dict[str, list[str]]]:
+    """
+    Splits the objects under `prefix` into shards `depth` folder levels
+    deep. Also returns the child folders found under each split prefix,
+    whose absence marks indexed folders that no longer exist. Blocking.
+    """
+    if depth == 0:
+        return [Shard(prefix, recursive=True)], {}
+
+    children = []
+    token = None
+    while True:
+        page = _list_page(client, bucket, prefix, "/", token)
+        children.extend(cp["Prefix"] for cp in page.get("CommonPrefixes", []))
+        if not page.get("IsTruncated"):
+            break
+        token = page["NextContinuationToken"]
+
+    shards = [Shard(prefix, recursive=False)]
+    folders = {prefix: children}
+    for child in children:
+        child_shards, child_folders = discover_shards(client, bucket, child, depth - 1)
+        shards.extend(child_shards)
+        folders.update(child_folders)
+    return shards, folders
+
+
+def _parent(key: str) -> str:
+    return key[: key.rfind("/") + 1]
+
+
+def _folders(key: str) -> list[str]:
+    """
+    The folders whose rollups count `key`, from the whole bucket down. A
+    folder marker object counts in its own folder.
+    """
+    return [""] + [key[: i + 1] for i, char in enumerate(key) if char == "/"]
+
+
+def _row(index_id: int, key: str, size: int, last_modified: datetime) -> dict[str, Any]:
+    return {
+        "index_id": index_id,
+        "key": key,
+        "parent": _parent(key),
+        "size": size,
+        "last_modified": last_modified,
+    }
+
+
+async def _lock(session: AsyncSession, index_id: int, exclusive: bool = False):
+    """Takes the advisory lock of an index until the transaction ends."""
+    if exclusive:
+        await session.exec(select(func.pg_advisory_xact_lock(index_id)))
+    else:
+        await session.exec(select(func.pg_advisory_xact_lock_shared(index_id)))
+
+
+def _count(
+    deltas: dict[str, list],
+    key: str,
+    objects: int,
+    size: int,
+    last_modified: Optional[datetime] = None,
+):
+    """Adds a change of `key` to the rollup changes of its folders."""
+    for prefix in _folders(key):
+        delta = deltas.setdefault(prefix, [0, 0, None])
+        delta[0] += objects
+        delta[1] += size
+        if last_modified is not None and (delta[2] is None or last_modified > delta[2]):
+            delta[2] = last_modified
+
+
+async def _apply_rollups(
+    session: AsyncSession, index_id: int, deltas: dict[str, list]
+):
+    """
+    Adds the changes to the folder rollups and drops the folders left
+    without objects. Rows are written in prefix order, so concurrent
+    refreshes lock them in the same order.
+    """
+    rows = [
+        {
+            "index_id": index_id,
+            "prefix": prefix,
+            "parent": _parent(prefix[:-1]) if prefix else None,
+            "objects": objects,
+            "size": size,
+            "last_modified": modified,
+        }
+        for prefix, (objects, size, modified) in sorted(deltas.items())
+        if objects or size or modified is not None
+    ]
+    for offset in range(0, len(rows), ROLLUP_BATCH):
+        batch = rows[offset : offset + ROLLUP_BATCH]
+        stmt = insert(S3IndexRollup).values(batch)
+        await session.exec(
+            stmt.on_conflict_do_update(
+                index_elements=["index_id", "prefix"],
+                set_={
+                    "objects": S3IndexRollup.objects + stmt.excluded.objects,
+                    "size": S3IndexRollup.size + stmt.excluded.size,
+                    "last_modified": func.greatest(
+                        S3IndexRollup.last_modified, stmt.excluded.last_modified
+                    ),
+                },
+            )
+        )
+        await session.exec(
+            delete(S3IndexRollup).where(
+                S3IndexRollup.index_id == index_id,
+                S3IndexRollup.prefix.in_([row["prefix"] for row in batch]),
+                S3IndexRollup.objects <= 0,
+            )
+        )
+
+
+async def _upsert(session: AsyncSession, rows: list[dict[str, Any]]):
+    if not rows:
+        return
+    stmt = insert(S3IndexedObject).values(rows)
+    excluded = {"size", "last_modified"}
+    if "sequencer" in rows[0]:
+        excluded.add("sequencer")
+    await session.exec(
+        stmt.on_conflict_do_update(
+            index_elements=["index_id", "key"],
+            set_={name: stmt.excluded[name] for name in excluded},
+        )
+    )
+
+
+async def _remove(session: AsyncSession, index_id: int, keys: list[str]):
+    if not keys:
+        return
+    await session.exec(
+        delete(S3IndexedObject).where(
+            S3IndexedObject.index_id == index_id, S3IndexedObject.key.in_(keys)
+        )
+    )
+
+
+async def _apply_page(
+    session: AsyncSession,
+    index_id: int,
+    shard: Shard,
+    lower: Optional[str],
+    upper: Optional[str],
+    contents: list[dict[str, Any]],
+    stats: dict[str, int],
+):
+    """
+    Brings the indexed keys of the shard in (`lower`, `upper`] in line with
+    the listed `contents` of that range.
+    """
+    filters = [S3IndexedObject.index_id == index_id, *_under(shard.prefix, shard.recursive)]
+    if lower is not None:
+        filters.append(S3IndexedObject.key > lower)
+    if upper is not None:
+        filters.append(S3IndexedObject.key <= upper)
+    result = await session.exec(
+        select(
+            S3IndexedObject.key, S3IndexedObject.size, S3IndexedObject.last_modified
+        ).where(*filters)
+    )
+    indexed = {key: (size, modified) for key, size, modified in result.all()}
+
+    changed = []
+    deltas: dict[str, list] = {}
+    for obj in contents:
+        key, size, modified = obj["Key"], obj["Size"], obj["LastModified"]
+        previous = indexed.get(key)
+        if previous == (size, modified):
+            continue
+        changed.append(_row(index_id, key, size, modified))
+        if previous is None:
+            _count(deltas, key, 1, size, modified)
+        else:
+            _count(deltas, key, 0, size - previous[0], modified)
+    listed = {obj["Key"] for obj in contents}
+    removed = [key for key in indexed if key not in listed]
+    for key in removed:
+        _count(deltas, key, -1, -indexed[key][0])
+    await _upsert(session, changed)
+    await _remove(session, index_id, removed)
+    await _apply_rollups(session, index_id, deltas)
+    stats["listed"] += len(contents)
+    stats["upserted"] += len(changed)
+    stats["removed"] += len(removed)
+
+
+async def sync_shard(
+    client, bucket: str, index_id: int, shard: Shard, stats: dict[str, int]
+):
+    """Lists a shard page by page, committing the changes of each page."""
+    delimiter = None if shard.recursive else "/"
+    token = None
+    lower = None
+    async with AsyncSession(get_engine()) as session:
+        while True:
+            page = await asyncio.to_thread(
+                _list_page, client, bucket, shard.prefix, delimiter, token
+            )
+            contents = page.get("Contents", [])
+            last = not page.get("IsTruncated")
+            # A page of only folders extends the range of the next one
+            if contents or last:
+                upper = None if last else contents[-1]["Key"]
+                await _lock(session, index_id)
+                await _apply_page(
+                    session, index_id, shard, lower, upper, contents, stats
+                )
+                await session.commit()
+                lower = upper
+            if last:
+                return
+            token = page["NextContinuationToken"]
+
+
+async def _remove_missing_folders(
+    session: AsyncSession,
+    index_id: int,
+    folders: dict[str, list[str]],
+    stats: dict[str, int],
+):
+    """Removes the indexed objects of folders that are no longer listed."""
+    await _lock(session, index_id)
+    for prefix, children in folders.items():
+        rest = func.substr(S3IndexedObject.key, len(prefix) + 1)
+        names = [child[len(prefix) : -1] for child in children]
+        result = await session.exec(
+            delete(S3IndexedObject)
+            .where(
+                S3IndexedObject.index_id == index_id,
+                *_under(prefix),
+                func.strpos(rest, "/") > 0,
+                func.split_part(rest, "/", 1).notin_(names),
+            )
+            .returning(S3IndexedObject.key, S3IndexedObject.size)
+        )
+        deltas: dict[str, list] = {}
+        for key, size in result.all():
+            _count(deltas, key, -1, -size)
+            stats["removed"] += 1
+        await _apply_rollups(session, index_id, deltas)
+
+
+async def get_index(
+    session: AsyncSession, storage_id: int, bucket: str, create: bool = False
+) -> Optional[S3ObjectIndex]:
+    """Returns the index of a bucket, optionally creating it."""
+    result = await session.exec(
+        select(S3ObjectIndex).where(
+            S3ObjectIndex.storage_id == storage_id, S3ObjectIndex.bucket == bucket
+        )
+    )
+    index = result.one_or_none()
+    if index is None and create:
+        index = S3ObjectIndex(storage_id=storage_id, bucket=bucket)
+        session.add(index)
+        await session.flush()
+    return index
+
+
+async def refresh_index(
+    session: AsyncSession,
+    client,
+    storage: S3Storage,
+    spec: IndexSpec,
+    on_progress: Optional[Callable[[dict[str, Any]], Awaitable[None]]] = None,
+) -> dict[str, int]:
+    """
+    Lists the bucket, or the prefixes, of `spec` in parallel shards and
+    applies the differences to the index. Returns counts of the listed,
+    upserted and removed objects.
+    """
+    storage_id = storage.id
+    index = await get_index(session, storage_id, spec.bucket, create=True)
+    index_id = index.id
+    await session.commit()
+
+    shards: list[Shard] = []
+    folders: dict[str, list[str]] = {}
+    for prefix in spec.prefixes or [""]:
+        found, found_folders = await asyncio.to_thread(
+            discover_shards, client, spec.bucket, prefix, spec.shard_depth
+        )
+        shards.extend(found)
+        folders.update(found_folders)
+
+    stats = {"shards": len(shards), "synced": 0, "listed": 0, "upserted": 0, "removed": 0}
+    slots = asyncio.Semaphore(spec.concurrency)
+
+    async def sync(shard: Shard):
+        async with slots:
+            await sync_shard(client, spec.bucket, index_id, shard, stats)
+        stats["synced"] += 1
+        if on_progress:
+            await on_progress(dict(stats))
+
+    await asyncio.gather(*(sync(shard) for shard in shards))
+    await _remove_missing_folders(session, index_id, folders, stats)
+
+    index = await session.get(S3ObjectIndex, index_id)
+    index.refreshed = index.modified = ts_now()
+    await session.commit()
+    logger.info(f"Refreshed index of s3://{spec.bucket} of storage {storage_id}: {stats}")
+    return stats
+
+
+def _sequencer(value: Optional[str]) -> Optional[str]:
+    """Pads an event sequencer, whose length varies, to compare as a string."""
+    return value.upper().rjust(SEQUENCER_WIDTH, "0") if value else None
+
+
+async def apply_events(
+    session: AsyncSession, storage_id: int, records: list[dict[str, Any]]
+) -> dict[str, int]:
+    """
+    Applies S3 event notification records to the indexes of a storage.
+    Records of buckets without an index are ignored, and records older than
+    the last event applied to their key are counted as stale. A delete
+    forgets the sequencer of its key, so a stale create arriving after it
+    indexes the object again until the next refresh. The caller commits.
+    """
+    indexes: dict[str, Optional[int]] = {}
+    # Per key the record with the highest sequencer, the last one without
+    latest: dict[int, dict[str, tuple[Optional[str], Optional[dict[str, Any]]]]] = {}
+    stats = {"upserted": 0, "removed": 0, "stale": 0, "ignored": 0}
+    for record in records:
+        s3 = record.get("s3", {})
+        bucket = s3.get("bucket", {}).get("name")
+        event = record.get("eventName", "")
+        if bucket not in indexes:
+            index = await get_index(session, storage_id, bucket) if bucket else None
+            indexes[bucket] = index.id if index else None
+        index_id = indexes[bucket]
+        if index_id is None or not event.startswith(("ObjectCreated", "ObjectRemoved")):
+            stats["ignored"] += 1
+            continue
+        obj = s3.get("object", {})
+        key = unquote_plus(obj.get("key", ""))
+        sequencer = _sequencer(obj.get("sequencer"))
+        row = None
+        if event.startswith("ObjectCreated"):
+            event_time = record.get("eventTime")
+            row = _row(
+                index_id,
+                key,
+                obj.get("size", 0),
+                datetime.fromisoformat(event_time) if event_time else ts_now(),
+            )
+            row["sequencer"] = sequencer
+        events = latest.setdefault(index_id, {})
+        current = events.get(key)
+        if current is None or (sequencer or "") >= (current[0] or ""):
+            events[key] = (sequencer, row)
+
+    for index_id, events in sorted(latest.items()):
+        await _lock(session, index_id, exclusive=True)
+        result = await session.exec(
+            select(
+                S3IndexedObject.key, S3IndexedObject.size, S3IndexedObject.sequencer
+            ).where(
+                S3IndexedObject.index_id == index_id,
+                S3IndexedObject.key.in_(list(events)),
+            )
+        )
+        indexed = {key: (size, sequencer) for key, size, sequencer in result.all()}
+        upserts, removed = [], []
+        deltas: dict[str, list] = {}
+        for key, (sequencer, row) in events.items():
+            previous = indexed.get(key)
+            if previous and previous[1] and sequencer and sequencer <= previous[1]:
+                stats["stale"] += 1
+            elif row is None:
+                if previous:
+                    removed.append(key)
+                    _count(deltas, key, -1, -previous[0])
+                stats["removed"] += 1
+            else:
+                upserts.append(row)
+                if previous is None:
+                    _count(deltas, key, 1, row["size"], row["last_modified"])
+                else:
+                    _count(deltas, key, 0, row["size"] - previous[0], row["last_modified"])
+                stats["upserted"] += 1
+        await _upsert(session, upserts)
+        await _remove(session, index_id, removed)
+        await _apply_rollups(session, index_id, deltas)
+    return stats
+
+
+async def search_index(
+    session: AsyncSession,
+    index_id: int,
+    prefix: str = "",
+    q: Optional[str] = None,
+    page_num: int = 1,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> tuple[list[S3IndexedObject], bool]:
+    """
+    Returns a page of the indexed objects under `prefix` whose key contains
+    `q`, ignoring case, ordered by key, and whether more pages follow.
+    Substring matches are served by the trigram index of the keys; the
+    total is not counted, as that reads every match.
+    """
+    filters = [S3IndexedObject.index_id == index_id, *_under(prefix)]
+    if q:
+        escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        filters.append(S3IndexedObject.key.ilike(f"%{escaped}%", escape="\\"))
+    result = await session.exec(
+        select(S3IndexedObject)
+        .where(*filters)
+        .order_by(S3IndexedObject.key)
+        .offset((page_num - 1) * page_size)
+        .limit(page_size + 1)
+    )
+    objects = list(result.all())
+    return objects[:page_size], len(objects) > page_size
+
+
+async def rollup_index(
+    session: AsyncSession, index_id: int, prefix: str = ""
+) -> list[dict[str, Any]]:
+    """
+    Sizes of the folders and files directly under the folder `prefix`: the
+    number of objects, total bytes and latest modification of each. Folder
+    sizes are read from their rollups.
+    """
+    folders = await session.exec(
+        select(S3IndexRollup)
+        .where(S3IndexRollup.index_id == index_id, S3IndexRollup.parent == prefix)
+        .order_by(S3IndexRollup.prefix)
+    )
+    # The folder marker object of the prefix itself is not a child
+    files = await session.exec(
+        select(S3IndexedObject)
+        .where(
+            S3IndexedObject.index_id == index_id,
+            S3IndexedObject.parent == prefix,
+            S3IndexedObject.key != prefix,
+        )
+        .order_by(S3IndexedObject.key)
+    )
+    items = [
+        {
+            "name": folder.prefix[len(prefix) :],
+            "path": folder.prefix,
+            "type": "directory",
+            "objects": folder.objects,
+            "size": folder.size,
+            "last_modified": (
+                folder.last_modified.isoformat() if folder.last_modified else None
+            ),
+        }
+        for folder in folders.all()
+    ]
+    items.extend(
+        {
+            "name": obj.key[len(prefix) :],
+            "path": obj.key,
+            "type": "file",
+            "objects": 1,
+            "size": obj.size,
+            "last_modified": obj.last_modified.isoformat(),
+        }
+        for obj in files.all()
+    )
+    return items
+
+
+def serialize_object(obj: S3IndexedObject) -> dict[str, Any]:
+    return {
+        "name": obj.key.split("/")[-1],
+        "path": obj.key,
+        "size": obj.size,
+        "last_modified": obj.last_modified.isoformat(),
+    }
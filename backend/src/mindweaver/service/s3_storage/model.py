@@ -1,8 +1,11 @@
 # SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
+from datetime import datetime
+from mindweaver.fw.model import Base
 from mindweaver.service.base import ProjectScopedNamedBase
-from sqlmodel import Field
+from sqlalchemy import BigInteger, DateTime, Index, String, Text, UniqueConstraint
+from sqlmodel import Field, SQLModel
 from typing import Optional
 from pydantic import BaseModel, field_validator
 
@@ -50,3 +53,66 @@ class S3Storage(ProjectScopedNamedBase, table=True):
     secret_key: Optional[str] = Field(default=None)
     endpoint_url: Optional[str] = Field(default=None)
     verify_ssl: bool = Field(default=True)
+
+
+class S3ObjectIndex(Base, table=True):
+    """An indexed bucket of an S3 storage, see `S3IndexedObject`."""
+
+    __tablename__ = "mw_s3_object_index"
+    __table_args__ = (UniqueConstraint("storage_id", "bucket"),)
+
+    storage_id: int = Field(index=True)
+    bucket: str = Field(sa_type=String(length=255))
+    refreshed: Optional[datetime] = Field(
+        default=None, sa_type=DateTime(timezone=True)
+    )
+
+
+class S3IndexedObject(SQLModel, table=True):
+    """
+    An object of an indexed bucket. Rows hold only what browsing needs,
+    without the ids and timestamps of `Base`, as buckets have millions.
+    """
+
+    __tablename__ = "mw_s3_indexed_object"
+    # Substring search is served by a pg_trgm index on `key` where the
+    # extension is available; the migration skips it otherwise
+    __table_args__ = (
+        Index("ix_mw_s3_indexed_object_parent", "index_id", "parent", "key"),
+    )
+
+    index_id: int = Field(primary_key=True)
+    # Byte-wise collation sorts keys like S3 and serves prefix matches
+    key: str = Field(primary_key=True, sa_type=Text(collation="C"))
+    # Folder of the key up to its last `/`, empty at the top of the bucket
+    parent: str = Field(sa_type=Text(collation="C"))
+    size: int = Field(sa_type=BigInteger)
+    last_modified: datetime = Field(sa_type=DateTime(timezone=True))
+    # Zero padded `sequencer` of the last S3 event applied to the object
+    sequencer: Optional[str] = Field(
+        default=None, sa_type=String(length=32, collation="C")
+    )
+
+
+class S3IndexRollup(SQLModel, table=True):
+    """
+    Objects and bytes under a folder of an indexed bucket, including
+    subfolders, kept up to date as objects are indexed. `last_modified` is
+    the latest modification seen, it is not lowered by deletions.
+    """
+
+    __tablename__ = "mw_s3_index_rollup"
+    __table_args__ = (
+        Index("ix_mw_s3_index_rollup_parent", "index_id", "parent"),
+    )
+
+    index_id: int = Field(primary_key=True)
+    # Ends with `/`, or is empty for the whole bucket
+    prefix: str = Field(primary_key=True, sa_type=Text(collation="C"))
+    # Folder holding `prefix`, None for the whole bucket
+    parent: Optional[str] = Field(default=None, sa_type=Text(collation="C"))
+    objects: int = Field(default=0, sa_type=BigInteger)
+    size: int = Field(default=0, sa_type=BigInteger)
+    last_modified: Optional[datetime] = Field(
+        default=None, sa_type=DateTime(timezone=True)
+    )
@@ -0,0 +1,278 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""
+Multipart uploads to S3 streamed from request bodies or presigned for
+browsers.
+
+A streamed upload cuts the body into parts of `part_size` bytes and uploads
+up to `concurrency` of them at once, so at most `concurrency + 1` parts are
+held in memory and nothing is spooled to disk. The upload id returned by
+`create_upload` makes an upload resumable: the parts already stored in S3
+are listed, and the body is resumed from the end of the last contiguous
+complete part.
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# S3 rejects multipart parts smaller than 5 MiB, except for the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_PART_SIZE = 5 * 1024 * 1024 * 1024
+MAX_PARTS = 10_000
+
+
+class UploadError(Exception):
+    """
+    A streamed upload failed. The parts of a resumable upload are kept,
+    `upload_id` is then set.
+    """
+
+    def __init__(self, message: str, upload_id: Optional[str] = None):
+        super().__init__(message)
+        self.upload_id = upload_id
+
+
+class ResumeOffsetError(ValueError):
+    """The body of a resumed upload does not start where the upload stopped."""
+
+    def __init__(self, expected: int, offset: int):
+        super().__init__(f"Upload resumes at byte {expected}, not {offset}")
+        self.expected = expected
+
+
+def create_upload(
+    client, bucket: str, key: str, content_type: Optional[str] = None
+) -> str:
+    """Starts a multipart upload and returns its id. Blocking."""
+    params = {"Bucket": bucket, "Key": key}
+    if content_type:
+        params["ContentType"] = content_type
+    return client.create_multipart_upload(**params)["UploadId"]
+
+
+def list_parts(client, bucket: str, key: str, upload_id: str) -> list[dict[str, Any]]:
+    """The parts stored so far of a multipart upload. Blocking."""
+    parts = []
+    paginator = client.get_paginator("list_parts")
+    for page in paginator.paginate(Bucket=bucket, Key=key, UploadId=upload_id):
+        parts.extend(page.get("Parts", []))
+    return sorted(parts, key=lambda p: p["PartNumber"])
+
+
+def resume_point(parts: list[dict[str, Any]], part_size: int) -> int:
+    """
+    Number of leading parts that are complete, parts after a gap or a short
+    part are uploaded again.
+    """
+    count = 0
+    for part in parts:
+        if part["PartNumber"] != count + 1 or part["Size"] != part_size:
+            break
+        count += 1
+    return count
+
+
+def complete_upload(
+    client, bucket: str, key: str, upload_id: str, last_part: Optional[int] = None
+) -> dict[str, Any]:
+    """
+    Completes a multipart upload from the parts stored in S3, ignoring parts
+    after `last_part` left by an earlier attempt. Blocking.
+    """
+    parts = list_parts(client, bucket, key, upload_id)
+    if last_part is not None:
+        parts = [p for p in parts if p["PartNumber"] <= last_part]
+    if not parts:
+        raise ValueError(f"Upload {upload_id} has no parts")
+    response = client.complete_multipart_upload(
+        Bucket=bucket,
+        Key=key,
+        UploadId=upload_id,
+        MultipartUpload={
+            "Parts": [{"PartNumber": p["PartNumber"], "ETag": p["ETag"]} for p in parts]
+        },
+    )
+    return {
+        "etag": response.get("ETag"),
+        "parts": len(parts),
+        "size": sum(p["Size"] for p in parts),
+    }
+
+
+def presign_parts(
+    client,
+    bucket: str,
+    key: str,
+    upload_id: str,
+    part_numbers: list[int],
+    expires_in: int = 3600,
+) -> list[dict[str, Any]]:
+    """Presigned `upload_part` URLs, for clients uploading parts directly."""
+    return [
+        {
+            "part_number": number,
+            "url": client.generate_presigned_url(
+                "upload_part",
+                Params={
+                    "Bucket": bucket,
+                    "Key": key,
+                    "UploadId": upload_id,
+                    "PartNumber": number,
+                },
+                ExpiresIn=expires_in,
+            ),
+        }
+        for number in part_numbers
+    ]
+
+
+class ParallelPartUploader:
+    """
+    Uploads the parts of a multipart upload from a stream of chunks, with
+    at most `concurrency` parts in flight.
+    """
+
+    def __init__(
+        self,
+        client,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        part_size: int,
+        concurrency: int,
+        first_part: int = 1,
+    ):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.upload_id = upload_id
+        self.part_size = part_size
+        self.next_part = first_part
+        self.size = 0
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tasks: list[asyncio.Task] = []
+        self._buffer = bytearray()
+
+    def _upload_part(self, part_number: int, body: bytes):
+        self.client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+
+    async def _run(self, part_number: int, body: bytes):
+        try:
+            await asyncio.to_thread(self._upload_part, part_number, body)
+        finally:
+            self._slots.release()
+
+    async def _submit(self, body: bytes):
+        if self.next_part > MAX_PARTS:
+            raise ValueError(
+                f"Object exceeds {MAX_PARTS} parts of {self.part_size} bytes, "
+                "use a larger part size"
+            )
+        # Waiting for a slot bounds the memory held by in-flight parts
+        await self._slots.acquire()
+        for task in self._tasks:
+            if task.done() and task.exception() is not None:
+                self._slots.release()
+                raise task.exception()
+        self._tasks.append(asyncio.create_task(self._run(self.next_part, body)))
+        self.next_part += 1
+
+    async def write(self, data: bytes):
+        self._buffer += data
+        self.size += len(data)
+        while len(self._buffer) >= self.part_size:
+            body = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            await self._submit(body)
+
+    async def finish(self):
+        """Uploads the remaining bytes as the last part and waits for all parts."""
+        # An empty object still needs one part
+        if self._buffer or self.next_part == 1:
+            body = bytes(self._buffer)
+            self._buffer.clear()
+            await self._submit(body)
+        await asyncio.gather(*self._tasks)
+
+    async def cancel(self, wait: bool = False):
+        """
+        Stops the parts in flight, or with `wait` lets them finish so a
+        resumed upload can keep them.
+        """
+        if not wait:
+            for task in self._tasks:
+                task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+async def stream_upload(
+    client,
+    bucket: str,
+    key: str,
+    body: AsyncIterable[bytes],
+    part_size: int,
+    concurrency: int,
+    upload_id: Optional[str] = None,
+    offset: int = 0,
+    content_type: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Uploads a stream to `bucket/key` as a multipart upload.
+
+    Without an `upload_id` the upload is created here and aborted when the
+    stream fails. With one, the upload resumes after its complete parts,
+    which must be where `body` starts at `offset`. A failure then keeps the
+    parts for another attempt. Failures raise `UploadError`.
+    """
+    resumable = upload_id is not None
+    first_part = 1
+    if resumable:
+        parts = await asyncio.to_thread(list_parts, client, bucket, key, upload_id)
+        first_part = resume_point(parts, part_size) + 1
+        if offset != (first_part - 1) * part_size:
+            raise ResumeOffsetError((first_part - 1) * part_size, offset)
+    elif offset:
+        raise ResumeOffsetError(0, offset)
+    else:
+        upload_id = await asyncio.to_thread(
+            create_upload, client, bucket, key, content_type
+        )
+
+    uploader = ParallelPartUploader(
+        client, bucket, key, upload_id, part_size, concurrency, first_part
+    )
+    try:
+        async for chunk in body:
+            await uploader.write(chunk)
+        await uploader.finish()
+        result = await asyncio.to_thread(
+            complete_upload, client, bucket, key, upload_id, uploader.next_part - 1
+        )
+    except BaseException as e:
+        await uploader.cancel(wait=resumable)
+        if not resumable:
+            try:
+                await asyncio.to_thread(
+                    client.abort_multipart_upload,
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                )
+            except Exception as abort_error:
+                logger.warning(
+                    f"Failed to abort upload of s3://{bucket}/{key}: {abort_error}"
+                )
+        if isinstance(e, Exception):
+            raise UploadError(str(e), upload_id if resumable else None) from e
+        raise
+    return {**result, "upload_id": upload_id, "offset": offset}
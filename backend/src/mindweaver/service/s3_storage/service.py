@@ -1,10 +1,16 @@
 # SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
+import collections
+import hashlib
+import json
+import threading
 from mindweaver.service import NamedBase, Base
 from mindweaver.service.base import ProjectScopedNamedBase, ProjectScopedService
 from mindweaver.config import settings
-from sqlmodel import Field
+from mindweaver.fw.service import after_delete, after_update, before_delete
+from sqlalchemy import delete
+from sqlmodel import Field, select
 from typing import Any, Optional
 from pydantic import BaseModel, field_validator, ValidationError
 from fastapi import HTTPException
@@ -12,7 +18,86 @@ from mindweaver.crypto import encrypt_password, decrypt_password, EncryptionErro
 from mindweaver.fw.exc import FieldValidationError
 
 
-from .model import S3Storage, S3Config
+from .model import S3Storage, S3Config, S3IndexedObject, S3IndexRollup, S3ObjectIndex
+
+# Clients are thread safe and each holds a connection pool, so they are
+# kept per storage and configuration for the lifetime of the process
+S3_CLIENT_CACHE_SIZE = 32
+
+_clients: "collections.OrderedDict[tuple[int, str], Any]" = collections.OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def s3_config_digest(storage: S3Storage, config: dict[str, Any]) -> str:
+    """
+    Digest of the connection settings of a storage. The secret key is
+    hashed encrypted, so a cache hit does not need to decrypt it.
+    """
+    encoded = json.dumps(
+        [
+            storage.region,
+            storage.access_key,
+            storage.secret_key,
+            storage.endpoint_url,
+            storage.verify_ssl,
+            config,
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def _create_s3_client(storage: S3Storage, config: dict[str, Any]):
+    import boto3
+    from botocore.config import Config
+
+    client_kwargs = {
+        "aws_access_key_id": storage.access_key,
+        "region_name": storage.region,
+        "verify": storage.verify_ssl,
+        "config": Config(**config),
+    }
+    if storage.secret_key:
+        try:
+            client_kwargs["aws_secret_access_key"] = decrypt_password(storage.secret_key)
+        except EncryptionError:
+            pass
+    if storage.endpoint_url:
+        client_kwargs["endpoint_url"] = storage.endpoint_url
+    # boto3.client() shares the default session and its loaded service models
+    return boto3.client("s3", **client_kwargs)
+
+
+def s3_client(storage: S3Storage, **config):
+    """
+    Returns the boto3 S3 client of a storage, decrypting its secret key.
+    Extra keyword arguments are passed to `botocore.config.Config`.
+
+    Clients of saved storages are cached by storage id and a digest of the
+    storage settings and `config`, so connections stay warm across calls.
+    """
+    config.setdefault("max_pool_connections", settings.s3_max_pool_connections)
+    if storage.id is None:
+        return _create_s3_client(storage, config)
+    key = (storage.id, s3_config_digest(storage, config))
+    # Creation is serialized too, boto3 sessions are not thread safe
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = _create_s3_client(storage, config)
+            while len(_clients) > S3_CLIENT_CACHE_SIZE:
+                _clients.popitem(last=False)
+        _clients.move_to_end(key)
+        return client
+
+
+def discard_s3_clients(storage_id: Optional[int] = None):
+    """Drops the cached clients of a storage, or of all storages."""
+    with _clients_lock:
+        for key in list(_clients):
+            if storage_id is None or key[0] == storage_id:
+                del _clients[key]
 
 
 class S3StorageService(ProjectScopedService[S3Storage]):
@@ -98,6 +183,30 @@ class S3StorageService(ProjectScopedService[S3Storage]):
         # Call parent update method which will handle encryption via RedactedServiceMixin
         return await super().update(model_id, data)
 
+    @after_update()
+    async def _discard_clients_on_update(self, model: S3Storage):
+        """Drops cached clients holding the previous settings"""
+        discard_s3_clients(model.id)
+
+    @before_delete()
+    async def _delete_indexes(self, model: S3Storage):
+        """Drops the object indexes of the storage being deleted"""
+        index_ids = select(S3ObjectIndex.id).where(S3ObjectIndex.storage_id == model.id)
+        await self.session.exec(
+            delete(S3IndexedObject).where(S3IndexedObject.index_id.in_(index_ids))
+        )
+        await self.session.exec(
+            delete(S3IndexRollup).where(S3IndexRollup.index_id.in_(index_ids))
+        )
+        await self.session.exec(
+            delete(S3ObjectIndex).where(S3ObjectIndex.storage_id == model.id)
+        )
+
+    @after_delete()
+    async def _discard_clients_on_delete(self, model: S3Storage):
+        """Drops cached clients of the deleted storage"""
+        discard_s3_clients(model.id)
+
     def verify_secret_key(self, model: S3Storage, secret_key: str) -> bool:
         """
         Verify if the provided secret key matches the encrypted one in the model.
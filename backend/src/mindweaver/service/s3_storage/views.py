@@ -3,16 +3,71 @@
 
 import fastapi
 from fastapi import HTTPException, Depends, File, UploadFile
-from typing import Any, Literal, Optional, Annotated
+from typing import Any, AsyncIterator, Literal, Optional, Annotated
 from pydantic import BaseModel
+from sqlmodel import select
 import asyncio
+import json
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError, NoCredentialsError
 
-from mindweaver.config import settings
+from mindweaver.config import logger, settings
 from mindweaver.crypto import decrypt_password, EncryptionError
 from mindweaver.fw.exc import FieldValidationError, MindWeaverError
-from .service import S3StorageService, S3Storage
+from .service import S3StorageService, S3Storage, s3_client as get_s3_client
+from . import multipart
+from .actions import CopyObjectsAction, DeleteObjectsAction
+from .copy import COPY_OBJECT_LIMIT, copy_object, same_endpoint
+from .delete import DeleteSpec, run_delete
+from .download import iter_body, object_headers, parse_range
+from .index import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE as MAX_INDEX_PAGE_SIZE,
+    apply_events,
+    get_index,
+    rollup_index,
+    search_index,
+    serialize_object,
+)
+from .model import S3ObjectIndex
+
+
+# Largest page list_objects_v2 returns
+MAX_PAGE_SIZE = 1000
+
+
+def _page_items(page: dict[str, Any], prefix: str) -> list[dict[str, Any]]:
+    """
+    Folders and files of one `list_objects_v2` page.
+    """
+    items = []
+    # Add folders (CommonPrefixes)
+    for cp in page.get("CommonPrefixes", []):
+        items.append(
+            {
+                "name": cp["Prefix"].split("/")[-2] + "/",
+                "path": cp["Prefix"],
+                "type": "directory",
+            }
+        )
+
+    # Add files (Contents)
+    for obj in page.get("Contents", []):
+        # Skip the prefix itself if it appears as an object (common in some S3 implementations for folders)
+        if obj["Key"] == prefix:
+            continue
+
+        items.append(
+            {
+                "name": obj["Key"].split("/")[-1],
+                "path": obj["Key"],
+                "type": "file",
+                "size": obj["Size"],
+                "last_modified": obj["LastModified"].isoformat(),
+            }
+        )
+    return items
 
 
 def _list_objects_sync(s3_client, bucket: str, prefix: str):
@@ -26,31 +81,7 @@ def _list_objects_sync(s3_client, bucket: str, prefix: str):
 
     items = []
     for page in pages:
-        # Add folders (CommonPrefixes)
-        for cp in page.get("CommonPrefixes", []):
-            items.append(
-                {
-                    "name": cp["Prefix"].split("/")[-2] + "/",
-                    "path": cp["Prefix"],
-                    "type": "directory",
-                }
-            )
-
-        # Add files (Contents)
-        for obj in page.get("Contents", []):
-            # Skip the prefix itself if it appears as an object (common in some S3 implementations for folders)
-            if obj["Key"] == prefix:
-                continue
-
-            items.append(
-                {
-                    "name": obj["Key"].split("/")[-1],
-                    "path": obj["Key"],
-                    "type": "file",
-                    "size": obj["Size"],
-                    "last_modified": obj["LastModified"].isoformat(),
-                }
-            )
+        items.extend(_page_items(page, prefix))
 
     return {
         "type": "objects",
@@ -60,6 +91,95 @@ def _list_objects_sync(s3_client, bucket: str, prefix: str):
     }
 
 
+def _list_objects_page(
+    s3_client,
+    bucket: str,
+    prefix: str,
+    page_size: int = MAX_PAGE_SIZE,
+    continuation_token: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Synchronously fetch one page of objects, see `_list_objects_sync`.
+    """
+    params = {
+        "Bucket": bucket,
+        "Prefix": prefix,
+        "Delimiter": "/",
+        "MaxKeys": page_size,
+    }
+    if continuation_token:
+        params["ContinuationToken"] = continuation_token
+    return s3_client.list_objects_v2(**params)
+
+
+async def _stream_objects(
+    s3_client,
+    bucket: str,
+    prefix: str,
+    page_size: int,
+    continuation_token: Optional[str],
+) -> AsyncIterator[str]:
+    """
+    Yields the objects under a prefix as NDJSON lines, fetching the next
+    page while the current one is sent. The last line is an `end` record,
+    or an `error` record when listing fails midway.
+    """
+    fetch = asyncio.ensure_future(
+        asyncio.to_thread(
+            _list_objects_page,
+            s3_client,
+            bucket,
+            prefix,
+            page_size,
+            continuation_token,
+        )
+    )
+    count = 0
+    try:
+        while fetch is not None:
+            try:
+                page = await fetch
+            except Exception as e:
+                # The response has started, errors can only be reported inline
+                if isinstance(e, ClientError):
+                    error_code = e.response.get("Error", {}).get("Code", "Unknown")
+                    detail = f"S3 Error ({error_code}): {str(e)}"
+                else:
+                    logger.exception(f"Listing s3://{bucket}/{prefix} failed")
+                    detail = f"Listing failed: {str(e)}"
+                yield json.dumps(
+                    {
+                        "type": "error",
+                        "detail": detail,
+                        "continuation_token": continuation_token,
+                    }
+                ) + "\n"
+                return
+            fetch = None
+            if page.get("IsTruncated"):
+                continuation_token = page["NextContinuationToken"]
+                fetch = asyncio.ensure_future(
+                    asyncio.to_thread(
+                        _list_objects_page,
+                        s3_client,
+                        bucket,
+                        prefix,
+                        page_size,
+                        continuation_token,
+                    )
+                )
+            items = _page_items(page, prefix)
+            count += len(items)
+            if items:
+                yield "".join(json.dumps(item) + "\n" for item in items)
+        end = {"type": "end", "bucket": bucket, "prefix": prefix, "count": count}
+        yield json.dumps(end) + "\n"
+    finally:
+        # The client may disconnect before the prefetched page is used
+        if fetch is not None:
+            fetch.cancel()
+
+
 class VerifyEncryptedRequest(BaseModel):
     secret_key: str
 
@@ -101,33 +221,22 @@ async def fs_ops(
     bucket: Optional[str] = None,
     prefix: str = "",
     key: Optional[str] = None,
+    page_size: Optional[int] = fastapi.Query(None, ge=1, le=MAX_PAGE_SIZE),
+    continuation_token: Optional[str] = None,
+    stream: bool = False,
+    proxy: bool = False,
 ):
-    region = model.region
-    access_key = model.access_key
-    secret_key = None
-    endpoint_url = model.endpoint_url
-    verify_ssl = model.verify_ssl
-
-    if model.secret_key:
-        try:
-            secret_key = decrypt_password(model.secret_key)
-        except EncryptionError:
-            pass
-
+    """
+    Browse a storage. Listing a bucket returns every object under `prefix`
+    unless `page_size` or `continuation_token` asks for one page, which then
+    includes the `next_continuation_token`. With `stream`, objects are sent
+    as NDJSON lines as their pages arrive. `get` points to a presigned URL,
+    or with `proxy` returns the URL of `_download`, for endpoints browsers
+    cannot reach, which the client fetches with its own credentials.
+    """
     try:
-        # Create S3 client
-        s3_config = {
-            "aws_access_key_id": access_key,
-            "region_name": region,
-        }
-
-        if secret_key:
-            s3_config["aws_secret_access_key"] = secret_key
-
-        if endpoint_url:
-            s3_config["endpoint_url"] = endpoint_url
-
-        s3_client = boto3.client("s3", verify=verify_ssl, **s3_config)
+        # Cached per storage, reusing its pooled connections
+        s3_client = get_s3_client(model)
 
         if action == "ls":
             if not bucket:
@@ -143,6 +252,34 @@ async def fs_ops(
                         for b in response.get("Buckets", [])
                     ],
                 }
+            elif stream:
+                return fastapi.responses.StreamingResponse(
+                    _stream_objects(
+                        s3_client,
+                        bucket,
+                        prefix,
+                        page_size or MAX_PAGE_SIZE,
+                        continuation_token,
+                    ),
+                    media_type="application/x-ndjson",
+                )
+            elif page_size or continuation_token:
+                # List one page of objects in bucket
+                page = await asyncio.to_thread(
+                    _list_objects_page,
+                    s3_client,
+                    bucket,
+                    prefix,
+                    page_size or MAX_PAGE_SIZE,
+                    continuation_token,
+                )
+                return {
+                    "type": "objects",
+                    "bucket": bucket,
+                    "prefix": prefix,
+                    "items": _page_items(page, prefix),
+                    "next_continuation_token": page.get("NextContinuationToken"),
+                }
             else:
                 # List objects in bucket
                 return await asyncio.to_thread(
@@ -156,6 +293,14 @@ async def fs_ops(
                     detail="Bucket and Key are required for 'get' action",
                 )
 
+            if proxy:
+                # A redirect would drop the Authorization header of the
+                # request, so the client fetches the URL with its token
+                download_url = request.url_for(
+                    f"mw-download-{S3StorageService.entity_type()}", id=model.id
+                ).include_query_params(bucket=bucket, key=key)
+                return {"url": str(download_url)}
+
             # Generate presigned URL for the user to download directly
             try:
                 presigned_url = await asyncio.to_thread(
@@ -190,6 +335,70 @@ async def fs_ops(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@S3StorageService.model_view(
+    method="GET",
+    path="/_download",
+    operation_id=f"mw-download-{S3StorageService.entity_type()}",
+    name=f"mw-download-{S3StorageService.entity_type()}",
+)
+@S3StorageService.model_view(
+    method="HEAD",
+    path="/_download",
+    operation_id=f"mw-download-head-{S3StorageService.entity_type()}",
+)
+async def download(
+    svc: Annotated[S3StorageService, Depends(S3StorageService.get_service)],
+    model: Annotated[S3Storage, Depends(S3StorageService.get_model)],
+    request: fastapi.Request,
+    bucket: str,
+    key: str,
+):
+    """
+    Stream an object through the API. A single `Range` of bytes is honoured
+    with a 206 response, and `If-None-Match` with a 304.
+    """
+    s3_client = get_s3_client(model)
+    params = {"Bucket": bucket, "Key": key}
+    if request.headers.get("if-none-match"):
+        params["IfNoneMatch"] = request.headers["if-none-match"]
+    head = request.method == "HEAD"
+    byte_range = None if head else parse_range(request.headers.get("range"))
+    if byte_range:
+        params["Range"] = byte_range
+
+    try:
+        response = await asyncio.to_thread(
+            s3_client.head_object if head else s3_client.get_object, **params
+        )
+    except ClientError as e:
+        error = e.response.get("Error", {})
+        status_code = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+        if status_code == 304:
+            return fastapi.Response(status_code=304)
+        if error.get("Code") == "InvalidRange" or status_code == 416:
+            headers = {}
+            if error.get("ActualObjectSize"):
+                headers["Content-Range"] = f"bytes */{error['ActualObjectSize']}"
+            return fastapi.Response(status_code=416, headers=headers)
+        if error.get("Code") in ("NoSuchKey", "404") or status_code == 404:
+            raise HTTPException(status_code=404, detail=f"'{bucket}/{key}' not found")
+        raise _s3_error(e)
+
+    headers = object_headers(response, key)
+    status_code = 206 if response.get("ContentRange") else 200
+    media_type = response.get("ContentType") or "application/octet-stream"
+    if head:
+        return fastapi.Response(
+            status_code=status_code, headers=headers, media_type=media_type
+        )
+    return fastapi.responses.StreamingResponse(
+        iter_body(response["Body"], settings.s3_proxy_chunk_size),
+        status_code=status_code,
+        headers=headers,
+        media_type=media_type,
+    )
+
+
 @S3StorageService.model_view(
     method="POST",
     path="/_fs",
@@ -199,37 +408,26 @@ async def fs_ops_post(
     svc: Annotated[S3StorageService, Depends(S3StorageService.get_service)],
     model: Annotated[S3Storage, Depends(S3StorageService.get_model)],
     bucket: str,
-    action: Literal["put", "rm"] = "put",
+    action: Literal["put", "rm", "cp", "mv"] = "put",
     prefix: str = "",
     key: Optional[str] = None,
     file: Optional[UploadFile] = File(None),
+    dest_storage_id: Optional[int] = None,
+    dest_bucket: Optional[str] = None,
+    dest_key: Optional[str] = None,
+    dest_prefix: str = "",
 ) -> dict[str, Any]:
-    region = model.region
-    access_key = model.access_key
-    secret_key = None
-    endpoint_url = model.endpoint_url
-    verify_ssl = model.verify_ssl
-
-    if model.secret_key:
-        try:
-            secret_key = decrypt_password(model.secret_key)
-        except EncryptionError:
-            pass
-
+    """
+    Change a storage. `cp` and `mv` copy or move `key` to `dest_key`, or
+    every object under `prefix` to `dest_prefix`, into `dest_bucket` of
+    `dest_storage_id` (by default the same bucket and storage). Only a
+    single object copied server-side in one request runs inline; copies
+    between endpoints, multipart copies and prefixes run as a
+    `copy_objects` job.
+    """
     try:
-        # Create S3 client
-        s3_config = {
-            "aws_access_key_id": access_key,
-            "region_name": region,
-        }
-
-        if secret_key:
-            s3_config["aws_secret_access_key"] = secret_key
-
-        if endpoint_url:
-            s3_config["endpoint_url"] = endpoint_url
-
-        s3_client = boto3.client("s3", verify=verify_ssl, **s3_config)
+        # Cached per storage, reusing its pooled connections
+        s3_client = get_s3_client(model)
 
         if action == "put":
             if not file:
@@ -244,7 +442,13 @@ async def fs_ops_post(
             key = f"{prefix}{file.filename}"
 
             # Upload to S3
-            await asyncio.to_thread(s3_client.upload_fileobj, file.file, bucket, key)
+            transfer = TransferConfig(
+                multipart_chunksize=settings.s3_upload_part_size,
+                max_concurrency=settings.s3_upload_concurrency,
+            )
+            await asyncio.to_thread(
+                s3_client.upload_fileobj, file.file, bucket, key, Config=transfer
+            )
 
             return {
                 "status": "success",
@@ -269,6 +473,65 @@ async def fs_ops_post(
                 "key": key,
             }
 
+        if action in ("cp", "mv"):
+            if dest_storage_id == model.id:
+                dest_storage_id = None
+            dest_bucket = dest_bucket or bucket
+
+            if not key:
+                # Prefixes can hold any number of objects
+                return await CopyObjectsAction(model, svc)(
+                    bucket=bucket,
+                    prefix=prefix,
+                    dest_storage_id=dest_storage_id,
+                    dest_bucket=dest_bucket,
+                    dest_prefix=dest_prefix,
+                    move=action == "mv",
+                )
+
+            dest_key = dest_key or f"{dest_prefix}{key.split('/')[-1]}"
+            if dest_storage_id is None and (dest_bucket, dest_key) == (bucket, key):
+                raise HTTPException(
+                    status_code=400, detail="Source and destination are the same"
+                )
+            dest = await svc.get(dest_storage_id) if dest_storage_id else model
+            server_side = same_endpoint(model, dest)
+            head = await asyncio.to_thread(s3_client.head_object, Bucket=bucket, Key=key)
+            if not server_side or head["ContentLength"] > COPY_OBJECT_LIMIT:
+                return await CopyObjectsAction(model, svc)(
+                    bucket=bucket,
+                    key=key,
+                    dest_storage_id=dest_storage_id,
+                    dest_bucket=dest_bucket,
+                    dest_key=dest_key,
+                    move=action == "mv",
+                )
+            await copy_object(
+                s3_client,
+                get_s3_client(dest),
+                server_side,
+                bucket,
+                key,
+                head["ContentLength"],
+                dest_bucket,
+                dest_key,
+            )
+            if action == "mv":
+                await asyncio.to_thread(s3_client.delete_object, Bucket=bucket, Key=key)
+
+            verb = "moved" if action == "mv" else "copied"
+            return {
+                "status": "success",
+                "message": f"Successfully {verb} '{bucket}/{key}' to '{dest_bucket}/{dest_key}'",
+                "bucket": bucket,
+                "key": key,
+                "dest_storage_id": dest.id,
+                "dest_bucket": dest_bucket,
+                "dest_key": dest_key,
+                "size": head["ContentLength"],
+                "server_side": server_side,
+            }
+
         raise HTTPException(status_code=400, detail=f"Unsupported action: {action}")
 
     except ClientError as e:
@@ -276,8 +539,329 @@ async def fs_ops_post(
         raise HTTPException(
             status_code=400, detail=f"S3 Error ({error_code}): {str(e)}"
         )
+    except HTTPException:
+        raise
+    except multipart.UploadError as e:
+        status_code = 400 if isinstance(e.__cause__, ClientError) else 500
+        raise HTTPException(status_code=status_code, detail=str(e))
     except Exception as e:
-        raise HTTPException(status=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _s3_error(e: ClientError) -> HTTPException:
+    error_code = e.response.get("Error", {}).get("Code", "Unknown")
+    return HTTPException(status_code=400, detail=f"S3 Error ({error_code}): {str(e)}")
+
+
+@S3StorageService.model_view(
+    method="PUT",
+    path="/_upload",
+    operation_id=f"mw-upload-{S3StorageService.entity_type()}",
+)
+async def upload_stream(
+    svc: Annotated[S3StorageService, Depends(S3StorageService.get_service)],
+    model: Annotated[S3Storage, Depends(S3StorageService.get_model)],
+    request: fastapi.Request,
+    bucket: str,
+    key: str,
+    part_size: int = fastapi.Query(
+        settings.s3_upload_part_size,
+        ge=multipart.MIN_PART_SIZE,
+        le=settings.s3_stream_max_part_size,
+    ),
+    concurrency: int = fastapi.Query(
+        settings.s3_upload_concurrency, ge=1, le=settings.s3_upload_concurrency
+    ),
+    upload_id: Optional[str] = None,
+    offset: int = fastapi.Query(0, ge=0),
+) -> dict[str, Any]:
+    """
+    Upload the raw request body to `bucket/key`, piped into multipart upload
+    parts without spooling. Passing the `upload_id` of `_multipart?action=create`
+    makes the upload resumable: after a failure, send the body again from
+    the `offset` reported by `_multipart?action=status`.
+    """
+    s3_client = get_s3_client(model)
+    try:
+        result = await multipart.stream_upload(
+            s3_client,
+            bucket,
+            key,
+            request.stream(),
+            part_size=part_size,
+            concurrency=concurrency,
+            upload_id=upload_id,
+            offset=offset,
+        )
+    except multipart.ResumeOffsetError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ClientError as e:
+        raise _s3_error(e)
+    except multipart.UploadError as e:
+        detail = str(e)
+        if e.upload_id:
+            detail += f" (upload {e.upload_id} can be resumed)"
+        status_code = 400 if isinstance(e.__cause__, ClientError) else 500
+        raise HTTPException(status_code=status_code, detail=detail)
+    return {"status": "success", "bucket": bucket, "key": key, **result}
+
+
+@S3StorageService.model_view(
+    method="GET",
+    path="/_multipart",
+    operation_id=f"mw-multipart-{S3StorageService.entity_type()}",
+)
+async def multipart_ops(
+    svc: Annotated[S3StorageService, Depends(S3StorageService.get_service)],
+    model: Annotated[S3Storage, Depends(S3StorageService.get_model)],
+    bucket: str,
+    action: Literal["status", "ls"] = "status",
+    key: Optional[str] = None,
+    upload_id: Optional[str] = None,
+    part_size: int = fastapi.Query(
+        settings.s3_upload_part_size,
+        ge=multipart.MIN_PART_SIZE,
+        le=settings.s3_stream_max_part_size,
+    ),
+    prefix: str = "",
+    key_marker: Optional[str] = None,
+    upload_id_marker: Optional[str] = None,
+) -> dict[str, Any]:
+    """
+    Inspect multipart uploads. `status` reports the parts of an upload and
+    the `offset` a streamed upload resumes from, `ls` lists the unfinished
+    uploads under `prefix` a page at a time: pass the returned
+    `next_key_marker` and `next_upload_id_marker` to get the next page.
+    """
+    s3_client = get_s3_client(model)
+    try:
+        if action == "status":
+            if not key or not upload_id:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Key and upload_id are required for 'status' action",
+                )
+            parts = await asyncio.to_thread(
+                multipart.list_parts, s3_client, bucket, key, upload_id
+            )
+            return {
+                "bucket": bucket,
+                "key": key,
+                "upload_id": upload_id,
+                "parts": [
+                    {"part_number": p["PartNumber"], "size": p["Size"]} for p in parts
+                ],
+                "size": sum(p["Size"] for p in parts),
+                "offset": multipart.resume_point(parts, part_size) * part_size,
+            }
+
+        params = {"Bucket": bucket, "Prefix": prefix}
+        if key_marker:
+            params["KeyMarker"] = key_marker
+            if upload_id_marker:
+                params["UploadIdMarker"] = upload_id_marker
+        response = await asyncio.to_thread(s3_client.list_multipart_uploads, **params)
+        truncated = response.get("IsTruncated", False)
+        return {
+            "bucket": bucket,
+            "prefix": prefix,
+            "items": [
+                {
+                    "key": u["Key"],
+                    "upload_id": u["UploadId"],
+                    "initiated": u["Initiated"].isoformat(),
+                }
+                for u in response.get("Uploads", [])
+            ],
+            "next_key_marker": response.get("NextKeyMarker") if truncated else None,
+            "next_upload_id_marker": (
+                response.get("NextUploadIdMarker") if truncated else None
+            ),
+        }
+    except ClientError as e:
+        raise _s3_error(e)
+
+
+@S3StorageService.model_view(
+    method="POST",
+    path="/_multipart",
+    operation_id=f"mw-multipart-post-{S3StorageService.entity_type()}",
+)
+async def multipart_ops_post(
+    svc: Annotated[S3StorageService, Depends(S3StorageService.get_service)],
+    model: Annotated[S3Storage, Depends(S3StorageService.get_model)],
+    bucket: str,
+    key: str,
+    action: Literal["create", "presign", "complete", "abort"] = "create",
+    upload_id: Optional[str] = None,
+    first_part: int = fastapi.Query(1, ge=1, le=multipart.MAX_PARTS),
+    part_count: int = fastapi.Query(1, ge=1, le=multipart.MAX_PARTS),
+    expires_in: int = fastapi.Query(3600, ge=1, le=7 * 24 * 3600),
+) -> dict[str, Any]:
+    """
+    Manage multipart uploads. `presign` returns presigned URLs of parts
+    `first_part` to `first_part + part_count - 1`, creating the upload when
+    no `upload_id` is given, so browsers upload parts directly to S3 in
+    parallel. `complete` assembles the parts stored in S3 into the object.
+    """
+    s3_client = get_s3_client(model)
+    try:
+        if action in ("create", "presign") and not upload_id:
+            upload_id = await asyncio.to_thread(
+                multipart.create_upload, s3_client, bucket, key
+            )
+        if not upload_id:
+            raise HTTPException(
+                status_code=400,
+                detail=f"upload_id is required for '{action}' action",
+            )
+        result = {"bucket": bucket, "key": key, "upload_id": upload_id}
+
+        if action == "presign":
+            last_part = min(first_part + part_count - 1, multipart.MAX_PARTS)
+            result["parts"] = await asyncio.to_thread(
+                multipart.presign_parts,
+                s3_client,
+                bucket,
+                key,
+                upload_id,
+                list(range(first_part, last_part + 1)),
+                expires_in,
+            )
+        elif action == "complete":
+            try:
+                result.update(
+                    await asyncio.to_thread(
+                        multipart.complete_upload, s3_client, bucket, key, upload_id
+                    )
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        elif action == "abort":
+            await asyncio.to_thread(
+                s3_client.abort_multipart_upload,
+                Bucket=bucket,
+                Key=key,
+                UploadId=upload_id,
+            )
+        return {"status": "success", **result}
+    except ClientError as e:
+        raise _s3_error(e)
+
+
+@S3StorageService.model_view(
+    method="POST",
+    path="/_rm",
+    operation_id=f"mw-rm-{S3StorageService.entity_type()}",
+)
+async def bulk_delete(
+    svc: Annotated[S3StorageService, Depends(S3StorageService.get_service)],
+    model: Annotated[S3Storage, Depends(S3StorageService.get_model)],
+    data: DeleteSpec,
+) -> dict[str, Any]:
+    """
+    Delete a list of keys and/or every object under a prefix, in batches of
+    1,000 keys. Up to 1,000 listed keys are deleted within the request.
+    Prefix deletes and longer lists run as a `delete_objects` job, whose
+    status and progress are listed by `_jobs`.
+    """
+    if not data.inline:
+        return await DeleteObjectsAction(model, svc)(**data.model_dump())
+
+    try:
+        summary = await run_delete(get_s3_client(model), data)
+    except ClientError as e:
+        raise _s3_error(e)
+    return {"status": "success", "bucket": data.bucket, **summary}
+
+
+@S3StorageService.model_view(
+    method="GET",
+    path="/_index",
+    operation_id=f"mw-index-{S3StorageService.entity_type()}",
+)
+async def index_ops(
+    svc: Annotated[S3StorageService, Depends(S3StorageService.get_service)],
+    model: Annotated[S3Storage, Depends(S3StorageService.get_model)],
+    action: Literal["status", "search", "du"] = "status",
+    bucket: Optional[str] = None,
+    prefix: str = "",
+    q: Optional[str] = None,
+    page_num: int = fastapi.Query(default=1, ge=1),
+    page_size: int = fastapi.Query(
+        default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_INDEX_PAGE_SIZE
+    ),
+) -> dict[str, Any]:
+    """
+    Query the object indexes of the storage, which are built by the
+    `index_objects` action. `status` lists the indexed buckets, `search`
+    finds objects under `prefix` whose key contains `q`, a page at a time
+    without a total, and `du` reports the objects and bytes of each folder
+    and file directly under `prefix`.
+    """
+    if action == "status":
+        result = await svc.session.exec(
+            select(S3ObjectIndex)
+            .where(S3ObjectIndex.storage_id == model.id)
+            .order_by(S3ObjectIndex.bucket)
+        )
+        return {
+            "data": [
+                {"bucket": index.bucket, "refreshed": index.refreshed}
+                for index in result.all()
+            ]
+        }
+
+    if not bucket:
+        raise HTTPException(
+            status_code=400, detail=f"Bucket is required for '{action}' action"
+        )
+    index = await get_index(svc.session, model.id, bucket)
+    if index is None:
+        raise HTTPException(status_code=404, detail=f"Bucket '{bucket}' is not indexed")
+
+    if action == "search":
+        objects, has_more = await search_index(
+            svc.session, index.id, prefix, q, page_num, page_size
+        )
+        return {
+            "data": [serialize_object(obj) for obj in objects],
+            "meta": {
+                "page_num": page_num,
+                "page_size": page_size,
+                "has_more": has_more,
+                "refreshed": index.refreshed,
+            },
+        }
+
+    items = await rollup_index(svc.session, index.id, prefix)
+    return {
+        "bucket": bucket,
+        "prefix": prefix,
+        "items": items,
+        "objects": sum(item["objects"] for item in items),
+        "size": sum(item["size"] for item in items),
+        "refreshed": index.refreshed,
+    }
+
+
+@S3StorageService.model_view(
+    method="POST",
+    path="/_index/events",
+    operation_id=f"mw-index-events-{S3StorageService.entity_type()}",
+)
+async def index_events(
+    svc: Annotated[S3StorageService, Depends(S3StorageService.get_service)],
+    model: Annotated[S3Storage, Depends(S3StorageService.get_model)],
+    data: dict[str, Any],
+) -> dict[str, Any]:
+    """
+    Apply S3 event notifications (`{"Records": [...]}`, as sent by S3 and
+    MinIO webhooks) to the object indexes of the storage.
+    """
+    stats = await apply_events(svc.session, model.id, data.get("Records", []))
+    await svc.session.commit()
+    return {"status": "success", **stats}
 
 
 @S3StorageService.service_view(
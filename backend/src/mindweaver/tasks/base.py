@@ -2,12 +2,143 @@
 # SPDX-License-Identifier: AGPLv3+
 
 import asyncio
+import concurrent.futures
+import functools
+import os
+import threading
+from typing import Any, Awaitable, Callable, Optional, TypeVar
 
+from celery import signals
 
-def run_async(coro):
-    """Utility to run async coroutines in a sync context."""
-    loop = asyncio.get_event_loop()
-    if loop.is_running():
-        return loop.create_task(coro)
-    else:
-        return loop.run_until_complete(coro)
+from mindweaver.celery_app import app
+from mindweaver.config import settings, logger
+from mindweaver.fw.model import clear_engine, get_engine
+
+R = TypeVar("R")
+
+
+class AsyncRuntime:
+    """
+    Persistent event loop running in a background thread of the worker
+    process. Celery pool threads submit coroutines to it and block until
+    they complete, so tasks are always awaited while their I/O overlaps on
+    one loop and one shared database engine.
+    """
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None and self._pid == os.getpid()
+
+    def start(self):
+        """Starts the loop thread, once per process."""
+        with self._lock:
+            if self.running:
+                return
+            # A forked child inherits the parent's state but not its thread
+            self._loop = asyncio.new_event_loop()
+            self._loop.set_default_executor(
+                concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max(32, self.concurrency * 4),
+                    thread_name_prefix="mindweaver-io",
+                )
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._pid = os.getpid()
+            ready = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run_loop,
+                args=(self._loop, ready),
+                name="mindweaver-async-runtime",
+                daemon=True,
+            )
+            self._thread.start()
+            ready.wait()
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, ready: threading.Event):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def stop(self, timeout: float = 30.0):
+        """Disposes the shared engine and stops the loop thread."""
+        with self._lock:
+            if not self.running:
+                return
+            loop = self._loop
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self._shutdown(), loop
+                ).result(timeout)
+            except Exception as e:
+                logger.warning(f"Async runtime did not shut down cleanly: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout)
+            loop.close()
+            self._loop = self._thread = self._semaphore = self._pid = None
+
+    @staticmethod
+    async def _shutdown():
+        await get_engine().dispose()
+        clear_engine()
+        await asyncio.get_running_loop().shutdown_default_executor()
+
+    async def _guarded(self, coro: Awaitable[R]) -> R:
+        async with self._semaphore:
+            return await coro
+
+    def run(self, coro: Awaitable[R], timeout: Optional[float] = None) -> R:
+        """
+        Runs a coroutine on the runtime loop and blocks until it finishes,
+        returning its result or raising its exception.
+        """
+        self.start()
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            coro.close()
+            raise RuntimeError("AsyncRuntime.run() called from its own event loop")
+        future = asyncio.run_coroutine_threadsafe(self._guarded(coro), self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+
+runtime = AsyncRuntime(settings.worker_concurrency)
+
+
+@signals.worker_process_shutdown.connect
+def _stop_runtime(**kwargs):
+    runtime.stop()
+
+
+def async_task(*task_args, **task_kwargs) -> Callable:
+    """
+    Registers a coroutine function as a Celery task executed on the worker's
+    async runtime. Accepts the same arguments as `app.task`; the task name
+    defaults to the coroutine's module and name.
+    """
+
+    def decorator(fn: Callable[..., Awaitable[Any]]):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return runtime.run(fn(*args, **kwargs))
+
+        return app.task(*task_args, **task_kwargs)(wrapper)
+
+    if len(task_args) == 1 and callable(task_args[0]) and not task_kwargs:
+        fn, task_args = task_args[0], ()
+        return decorator(fn)
+    return decorator
@@ -0,0 +1,30 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.config import logger, settings
+from mindweaver.datasource_service.health import projects_with_sources, sweep_project
+from mindweaver.fw.model import get_engine
+from .base import async_task
+
+
+@async_task
+async def sweep_data_source_health():
+    """Record reachability of the data sources of every project."""
+    if not settings.experimental_data_source:
+        return
+    async with AsyncSession(get_engine()) as session:
+        for project_id in await projects_with_sources(session):
+            try:
+                results = await sweep_project(session, project_id)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Error sweeping data sources of project {project_id}: {e}")
+                continue
+            unreachable = sum(1 for r in results if not r["reachable"])
+            logger.info(
+                f"Swept {len(results)} data sources of project {project_id}, "
+                f"{unreachable} unreachable"
+            )
@@ -0,0 +1,24 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+from mindweaver.config import logger
+from mindweaver.datasource_service.database_source import DatabaseSourceService
+from mindweaver.datasource_service.database_source.catalog import refresh_catalog
+from mindweaver.fw.context import service_context
+from mindweaver.fw.job import execute_job
+from .base import async_task
+
+
+@async_task
+async def refresh_database_catalog_task(source_id: int, job_id: int | None = None):
+    """Refresh the cached catalog of a database source."""
+    async with service_context(DatabaseSourceService) as svc:
+
+        async def refresh():
+            model = await svc.get(source_id)
+            stats = await refresh_catalog(svc.session, model)
+            await svc.session.commit()
+            return stats
+
+        stats = await execute_job(job_id, refresh)
+        logger.info(f"Refreshed catalog of database source {source_id}: {stats}")
@@ -0,0 +1,152 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+from typing import Any
+
+from mindweaver.config import logger
+from mindweaver.datasource_service.api_source import APISourceService
+from mindweaver.datasource_service.database_source import DatabaseSourceService
+from mindweaver.datasource_service.streaming_source import StreamingSourceService
+from mindweaver.datasource_service.web_source import WebSourceService
+from mindweaver.fw.context import service_context
+from mindweaver.fw.job import execute_job, touch_job
+from mindweaver.ingestion import (
+    ApiExtractionSpec,
+    CrawlSpec,
+    ExtractionSpec,
+    IncrementalSpec,
+    StreamSpec,
+    run_api_extraction,
+    run_crawl,
+    run_extraction,
+    run_incremental,
+    run_stream_ingestion,
+)
+from mindweaver.service.s3_storage import S3Storage
+from .base import async_task
+
+
+@async_task
+async def extract_database_table_task(
+    source_id: int,
+    job_id: int | None = None,
+    parameters: dict[str, Any] | None = None,
+):
+    """Extract a database source table to Parquet on S3."""
+    spec = ExtractionSpec(**(parameters or {}))
+    async with service_context(DatabaseSourceService) as svc:
+
+        async def extract():
+            source = await svc.get(source_id)
+            storage = await svc.session.get(S3Storage, spec.storage_id)
+            return await run_extraction(
+                svc.session, source, storage, spec, on_progress=lambda: touch_job(job_id)
+            )
+
+        summary = await execute_job(job_id, extract)
+        if summary:
+            logger.info(
+                f"Extracted {summary['rows']} rows of {spec.table} from database "
+                f"source {source_id} in {summary['chunks']} chunks"
+            )
+
+
+@async_task
+async def ingest_database_table_task(
+    source_id: int,
+    job_id: int | None = None,
+    parameters: dict[str, Any] | None = None,
+):
+    """Ingest the rows changed since the previous run of a database source table."""
+    spec = IncrementalSpec(**(parameters or {}))
+    async with service_context(DatabaseSourceService) as svc:
+
+        async def ingest():
+            source = await svc.get(source_id)
+            storage = await svc.session.get(S3Storage, spec.storage_id)
+            return await run_incremental(
+                svc.session, source, storage, spec, on_progress=lambda: touch_job(job_id)
+            )
+
+        summary = await execute_job(job_id, ingest)
+        if summary:
+            logger.info(
+                f"Ingested {summary['rows']} rows and {summary['deleted']} deletes of "
+                f"{spec.table} from database source {source_id} "
+                f"({summary['rows_per_sec']} rows/s, {summary['bytes']} bytes)"
+            )
+
+
+@async_task
+async def crawl_web_source_task(
+    source_id: int,
+    job_id: int | None = None,
+    parameters: dict[str, Any] | None = None,
+):
+    """Crawl a web source into content-addressed storage on S3."""
+    spec = CrawlSpec(**(parameters or {}))
+    async with service_context(WebSourceService) as svc:
+
+        async def crawl():
+            source = await svc.get(source_id)
+            storage = await svc.session.get(S3Storage, spec.storage_id)
+            return await run_crawl(
+                svc.session, source, storage, spec, on_progress=lambda: touch_job(job_id)
+            )
+
+        summary = await execute_job(job_id, crawl)
+        if summary:
+            logger.info(
+                f"Crawled {summary['fetched']} pages of web source {source_id}, "
+                f"{summary['stored']} stored, {summary['queued']} left in the frontier"
+            )
+
+
+@async_task
+async def extract_api_source_task(
+    source_id: int,
+    job_id: int | None = None,
+    parameters: dict[str, Any] | None = None,
+):
+    """Extract the records of an API source endpoint to S3."""
+    spec = ApiExtractionSpec(**(parameters or {}))
+    async with service_context(APISourceService) as svc:
+
+        async def extract():
+            source = await svc.get(source_id)
+            storage = await svc.session.get(S3Storage, spec.storage_id)
+            return await run_api_extraction(
+                source, storage, spec, on_progress=lambda: touch_job(job_id)
+            )
+
+        summary = await execute_job(job_id, extract)
+        if summary:
+            logger.info(
+                f"Extracted {summary['records']} records of {spec.name} from API "
+                f"source {source_id} in {summary['pages']} pages"
+            )
+
+
+@async_task
+async def consume_streaming_source_task(
+    source_id: int,
+    job_id: int | None = None,
+    parameters: dict[str, Any] | None = None,
+):
+    """Consume the topic of a streaming source into micro-batches on S3."""
+    spec = StreamSpec(**(parameters or {}))
+    async with service_context(StreamingSourceService) as svc:
+
+        async def consume():
+            source = await svc.get(source_id)
+            storage = await svc.session.get(S3Storage, spec.storage_id)
+            return await run_stream_ingestion(
+                svc.session, source, storage, spec, on_progress=lambda: touch_job(job_id)
+            )
+
+        summary = await execute_job(job_id, consume)
+        if summary:
+            logger.info(
+                f"Consumed {summary['records']} records of {summary['topic']} from "
+                f"streaming source {source_id} in {summary['batches']} batches"
+            )
@@ -1,86 +1,59 @@
 # SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
-from mindweaver.celery_app import app
-from mindweaver.fw.model import get_engine
-from sqlmodel.ext.asyncio.session import AsyncSession
+from mindweaver.fw.context import service_context
+from mindweaver.fw.registry import SERVICE_REGISTRY
 from mindweaver.platform_service.base import PlatformService
-from mindweaver.platform_service.pgsql import PgSqlPlatformService
-from mindweaver.platform_service.hive_metastore import HiveMetastorePlatformService
-from mindweaver.platform_service.trino import TrinoPlatformService
-from mindweaver.platform_service.superset import SupersetPlatformService
-from mindweaver.config import logger
-from typing import Type
-from .base import run_async
-
-
-@app.task
-def poll_all_platforms():
-    """Discovers all platform services and triggers polling tasks."""
-    logger.info("Starting polling of all platforms")
 
-    # We need to discover all subclasses of PlatformService
-    # and for each, find active platforms.
+# Import platform packages so their services are registered
+import mindweaver.platform_service.pgsql
+import mindweaver.platform_service.hive_metastore
+import mindweaver.platform_service.trino
+import mindweaver.platform_service.superset
+import mindweaver.platform_service.ranger
+from mindweaver.config import logger
+from .base import async_task
 
-    services = [
-        PgSqlPlatformService,
-        HiveMetastorePlatformService,
-        TrinoPlatformService,
-        SupersetPlatformService,
-    ]
 
-    for svc_cls in services:
-        run_async(_trigger_service_polling(svc_cls))
+def platform_services() -> dict[str, type[PlatformService]]:
+    """Returns all registered platform services keyed by class name."""
+    return {
+        svc_cls.__name__: svc_cls
+        for svc_cls in SERVICE_REGISTRY.values()
+        if isinstance(svc_cls, type)
+        and issubclass(svc_cls, PlatformService)
+        and svc_cls.state_model is not None
+    }
 
 
-async def _trigger_service_polling(svc_cls: Type[PlatformService]):
-    engine = get_engine()
-    async with AsyncSession(engine) as session:
-        # Mock request since some service methods might expect it
-        # In a worker, we don't have a real request.
-        class MockRequest:
-            headers = {}
+@async_task
+async def poll_all_platforms():
+    """Discovers all platform services and triggers polling tasks."""
+    logger.info("Starting polling of all platforms")
 
-        svc = svc_cls(MockRequest(), session)
-        platforms = await svc.list_active_platforms()
+    for svc_cls in platform_services().values():
+        async with service_context(svc_cls) as svc:
+            platforms = await svc.list_active_platforms()
 
         for platform in platforms:
             poll_platform_status.delay(svc_cls.__name__, platform.id)
 
 
-@app.task
-def poll_platform_status(service_class_name: str, platform_id: int):
+@async_task
+async def poll_platform_status(service_class_name: str, platform_id: int):
     """Poll status for a specific platform instance."""
     logger.info(f"Polling status for {service_class_name} instance {platform_id}")
-    run_async(_poll_platform_status(service_class_name, platform_id))
-
 
-async def _poll_platform_status(service_class_name: str, platform_id: int):
-    # Dynamically find the service class
-
-    mapping = {
-        "PgSqlPlatformService": PgSqlPlatformService,
-        "HiveMetastorePlatformService": HiveMetastorePlatformService,
-        "TrinoPlatformService": TrinoPlatformService,
-        "SupersetPlatformService": SupersetPlatformService,
-    }
-
-    svc_cls = mapping.get(service_class_name)
+    svc_cls = platform_services().get(service_class_name)
     if not svc_cls:
         logger.error(f"Service class {service_class_name} not found")
         return
 
-    engine = get_engine()
-    async with AsyncSession(engine) as session:
-
-        class MockRequest:
-            headers = {}
-
-        svc = svc_cls(MockRequest(), session)
+    async with service_context(svc_cls) as svc:
         try:
             model = await svc.get(platform_id)
             await svc.poll_status(model)
-            await session.commit()
+            await svc.session.commit()
             logger.info(
                 f"Successfully polled {service_class_name} instance {platform_id}"
             )
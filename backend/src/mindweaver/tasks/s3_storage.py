@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+from typing import Any
+
+from mindweaver.config import logger
+from mindweaver.fw.context import service_context
+from mindweaver.fw.job import execute_job, report_progress
+from mindweaver.service.s3_storage import S3StorageService
+from mindweaver.service.s3_storage.copy import CopySpec, run_copy, same_endpoint
+from mindweaver.service.s3_storage.delete import DeleteSpec, run_delete
+from mindweaver.service.s3_storage.index import IndexSpec, refresh_index
+from mindweaver.service.s3_storage.service import s3_client
+from .base import async_task
+
+
+@async_task
+async def delete_s3_objects_task(
+    storage_id: int,
+    job_id: int | None = None,
+    parameters: dict[str, Any] | None = None,
+):
+    """Delete a list of keys or a prefix of an S3 storage in batches."""
+    spec = DeleteSpec(**(parameters or {}))
+    async with service_context(S3StorageService) as svc:
+
+        async def delete():
+            storage = await svc.get(storage_id)
+            return await run_delete(
+                s3_client(storage),
+                spec,
+                on_progress=lambda progress: report_progress(job_id, progress),
+            )
+
+        summary = await execute_job(job_id, delete)
+        if summary:
+            logger.info(
+                f"Deleted {summary['deleted']} objects of s3 storage {storage_id} "
+                f"in {summary['batches']} batches, {summary['failed']} failed"
+            )
+
+
+@async_task
+async def index_s3_objects_task(
+    storage_id: int,
+    job_id: int | None = None,
+    parameters: dict[str, Any] | None = None,
+):
+    """Refresh the object index of a bucket of an S3 storage."""
+    spec = IndexSpec(**(parameters or {}))
+    async with service_context(S3StorageService) as svc:
+
+        async def index():
+            storage = await svc.get(storage_id)
+            return await refresh_index(
+                svc.session,
+                s3_client(storage),
+                storage,
+                spec,
+                on_progress=lambda progress: report_progress(job_id, progress),
+            )
+
+        summary = await execute_job(job_id, index)
+        if summary:
+            logger.info(
+                f"Indexed {summary['listed']} objects of s3://{spec.bucket} in "
+                f"{summary['shards']} shards, {summary['upserted']} upserted, "
+                f"{summary['removed']} removed"
+            )
+
+
+@async_task
+async def copy_s3_objects_task(
+    storage_id: int,
+    job_id: int | None = None,
+    parameters: dict[str, Any] | None = None,
+):
+    """Copy or move the objects under a prefix, or one object, possibly to another S3 storage."""
+    spec = CopySpec(**(parameters or {}))
+    async with service_context(S3StorageService) as svc:
+
+        async def copy():
+            storage = await svc.get(storage_id)
+            dest = storage
+            if spec.dest_storage_id is not None:
+                dest = await svc.get(spec.dest_storage_id)
+            return await run_copy(
+                s3_client(storage),
+                s3_client(dest),
+                same_endpoint(storage, dest),
+                spec,
+                on_progress=lambda progress: report_progress(job_id, progress),
+            )
+
+        summary = await execute_job(job_id, copy)
+        if summary:
+            logger.info(
+                f"Copied {summary['objects']} objects ({summary['bytes']} bytes) of "
+                f"s3 storage {storage_id} at {summary['bytes_per_sec']} bytes/s, "
+                f"{summary['failed']} failed"
+            )
@@ -12,20 +12,28 @@ os.environ["MINDWEAVER_EXPERIMENTAL_CHAT"] = "true"
 os.environ["MINDWEAVER_ENABLE_TEST_VIEWS"] = "true"
 os.environ["MINDWEAVER_ENABLE_AUTH"] = "false"
 
+import boto3
 import pytest
 import pytest_postgresql
+from moto import mock_aws
 from pytest_postgresql.executor import PostgreSQLExecutor
 from psycopg.connection import Connection
 from fastapi.testclient import TestClient
 from mindweaver.fw.service import Service
 from mindweaver.fw.model import NamedBase, clear_engine
 from mindweaver.service.base import ProjectScopedNamedBase, ProjectScopedService
+from sqlalchemy import text
 from sqlmodel import SQLModel, create_engine, Field
 from mindweaver.config import settings
 
 
 from mindweaver.app import app
 from mindweaver.service.project import ProjectService
+from mindweaver.service.project.state import clear_project_state_cache
+from mindweaver.service.s3_storage.service import discard_s3_clients
+
+# The services import the ingestion models lazily, load them for create_all
+import mindweaver.ingestion.model  # noqa: F401
 
 
 class Model(NamedBase, table=True):
@@ -59,6 +67,7 @@ app.include_router(ProjectScopedModelService.router(), prefix="/api/v1")
 @pytest.fixture(scope="function")
 def client(postgresql_proc: PostgreSQLExecutor, postgresql: Connection):
     clear_engine()
+    clear_project_state_cache()
     settings.db_host = postgresql_proc.host
     settings.db_port = postgresql_proc.port
     settings.db_name = postgresql_proc.dbname
@@ -139,3 +148,35 @@ def project_scoped_crud_client(
     SQLModel.metadata.create_all(engine)
     yield TestClient(app=app)
     SQLModel.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def execute_sql():
+    """Run SQL statements in one transaction on the test database."""
+
+    def execute(*statements):
+        engine = create_engine(settings.db_uri)
+        with engine.begin() as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+        engine.dispose()
+
+    return execute
+
+
+@pytest.fixture
+def s3_buckets():
+    """Buckets created by the `s3` fixture, overridden by modules needing others."""
+    return ["lake"]
+
+
+@pytest.fixture
+def s3(s3_buckets):
+    """A mocked S3 endpoint, with the cached clients of storages discarded."""
+    discard_s3_clients()
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        for bucket in s3_buckets:
+            client.create_bucket(Bucket=bucket)
+        yield client
+    discard_s3_clients()
@@ -0,0 +1,162 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.config import settings
+from mindweaver.datasource_service.database_source import (
+    DatabaseCatalogTable,
+    DatabaseSource,
+)
+from mindweaver.datasource_service.database_source.catalog import refresh_catalog
+from mindweaver.fw.model import get_engine
+
+
+async def _refresh(source_id: int) -> dict:
+    async with AsyncSession(get_engine()) as session:
+        source = await session.get(DatabaseSource, source_id)
+        stats = await refresh_catalog(session, source)
+        await session.commit()
+        return stats
+
+
+@pytest.mark.asyncio
+async def test_catalog_refresh_is_incremental(
+    client: TestClient, test_project, execute_sql
+):
+    headers = {"X-Project-Id": str(test_project["id"])}
+    execute_sql(
+        "CREATE SCHEMA catalog_test",
+        "CREATE TABLE catalog_test.customers (id serial PRIMARY KEY, email text NOT NULL)",
+        "CREATE TABLE catalog_test.orders (id serial PRIMARY KEY, customer_id int, total numeric)",
+        "CREATE VIEW catalog_test.big_orders AS SELECT * FROM catalog_test.orders WHERE total > 100",
+        *(f"CREATE TABLE catalog_test.log_{i:02d} (entry text)" for i in range(5)),
+    )
+    try:
+        resp = client.post(
+            "/api/v1/database-sources",
+            headers=headers,
+            json={
+                "name": "catalog-pg",
+                "title": "Catalog",
+                "engine": "postgresql",
+                "host": settings.db_host,
+                "port": settings.db_port,
+                "database": settings.db_name,
+                "login": settings.db_user,
+                "password": settings.db_pass or None,
+                "schema_name": "catalog_test",
+                "project_id": test_project["id"],
+            },
+        )
+        resp.raise_for_status()
+        source = resp.json()["data"]
+
+        with patch(
+            "mindweaver.tasks.database_catalog.refresh_database_catalog_task.delay"
+        ) as mock_delay:
+            resp = client.post(
+                f"/api/v1/database-sources/{source['id']}/_actions",
+                headers=headers,
+                json={"action": "refresh_catalog"},
+            )
+        resp.raise_for_status()
+        job_id = resp.json()["job_id"]
+        mock_delay.assert_called_once_with(source["id"], job_id=job_id)
+
+        stats = await _refresh(source["id"])
+        assert stats == {
+            "tables": 8,
+            "added": 8,
+            "updated": 0,
+            "removed": 0,
+            "unchanged": 0,
+        }
+
+        catalog = client.get(
+            f"/api/v1/database-sources/{source['id']}/_catalog",
+            headers=headers,
+            params={"q": "orders"},
+        ).json()
+        tables = {t["table_name"]: t for t in catalog["data"]}
+        assert list(tables) == ["big_orders", "orders"]
+        assert tables["big_orders"]["table_type"] == "view"
+        assert tables["orders"]["columns"][0] == {
+            "name": "id",
+            "type": "INTEGER",
+            "nullable": False,
+            "primary_key": True,
+        }
+        assert catalog["meta"]["total"] == 2
+        assert catalog["meta"]["refreshed"] is not None
+
+        # Column names are searchable too
+        catalog = client.get(
+            f"/api/v1/database-sources/{source['id']}/_catalog",
+            headers=headers,
+            params={"q": "EMAIL"},
+        ).json()
+        assert [t["table_name"] for t in catalog["data"]] == ["customers"]
+
+        page = client.get(
+            f"/api/v1/database-sources/{source['id']}/_catalog",
+            headers=headers,
+            params={"q": "log_0", "page_num": 2, "page_size": 2},
+        ).json()
+        assert [t["table_name"] for t in page["data"]] == ["log_02", "log_03"]
+        assert page["meta"] == {
+            "page_num": 2,
+            "page_size": 2,
+            "total": 5,
+            "refreshed": page["meta"]["refreshed"],
+        }
+
+        async with AsyncSession(get_engine()) as session:
+            result = await session.exec(
+                select(DatabaseCatalogTable.table_name, DatabaseCatalogTable.modified)
+            )
+            modified = dict(result.all())
+
+        execute_sql(
+            "ALTER TABLE catalog_test.customers ADD COLUMN name varchar(100)",
+            "DROP TABLE catalog_test.log_04",
+        )
+        refreshed = page["meta"]["refreshed"]
+        stats = await _refresh(source["id"])
+        assert stats == {
+            "tables": 7,
+            "added": 0,
+            "updated": 1,
+            "removed": 1,
+            "unchanged": 6,
+        }
+        async with AsyncSession(get_engine()) as session:
+            result = await session.exec(
+                select(DatabaseCatalogTable.table_name, DatabaseCatalogTable.modified)
+            )
+            after = dict(result.all())
+        assert "log_04" not in after
+        assert after["customers"] > modified["customers"]
+        assert after["orders"] == modified["orders"]
+        # Refreshing without changes still advances the refresh time
+        catalog = client.get(
+            f"/api/v1/database-sources/{source['id']}/_catalog",
+            headers=headers,
+            params={"q": "orders"},
+        ).json()
+        assert catalog["meta"]["refreshed"] > refreshed
+
+        client.delete(
+            f"/api/v1/database-sources/{source['id']}",
+            headers={**headers, "X-RESOURCE-NAME": "catalog-pg"},
+        ).raise_for_status()
+        async with AsyncSession(get_engine()) as session:
+            result = await session.exec(select(DatabaseCatalogTable))
+            assert result.all() == []
+    finally:
+        execute_sql("DROP SCHEMA catalog_test CASCADE")
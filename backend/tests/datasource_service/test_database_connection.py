@@ -0,0 +1,161 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mindweaver.config import settings
+from mindweaver.datasource_service.database_source import service as db_service
+
+
+def _create_source(client: TestClient, project_id: int, name: str, **overrides):
+    payload = {
+        "name": name,
+        "title": name,
+        "engine": "postgresql",
+        "host": settings.db_host,
+        "port": settings.db_port,
+        "database": settings.db_name,
+        "login": settings.db_user,
+        "password": settings.db_pass or None,
+        "project_id": project_id,
+        **overrides,
+    }
+    resp = client.post(
+        "/api/v1/database-sources",
+        headers={"X-Project-Id": str(project_id)},
+        json=payload,
+    )
+    resp.raise_for_status()
+    return resp.json()["data"]
+
+
+def test_database_connection_against_postgres(client: TestClient, test_project):
+    source = _create_source(client, test_project["id"], "conn-pg")
+    resp = client.post(
+        f"/api/v1/database-sources/{source['id']}/_test-connection",
+        headers={"X-Project-Id": str(test_project["id"])},
+        json={},
+    )
+    resp.raise_for_status()
+    data = resp.json()
+    assert data["status"] == "success"
+    assert data["latency_ms"] > 0
+
+    resp = client.post(
+        f"/api/v1/database-sources/{source['id']}/_test-connection",
+        headers={"X-Project-Id": str(test_project["id"])},
+        json={"port": 1},
+    )
+    assert resp.status_code == 422
+    assert "Connection failed" in resp.json()["detail"]
+
+
+def test_bulk_database_connection_test(client: TestClient, test_project):
+    headers = {"X-Project-Id": str(test_project["id"])}
+    good = _create_source(client, test_project["id"], "bulk-good")
+    bad = _create_source(client, test_project["id"], "bulk-bad", port=1)
+
+    resp = client.post("/api/v1/database-sources/_test-connection?ids=all", headers=headers)
+    resp.raise_for_status()
+    results = resp.json()["data"]
+    assert set(results) == {str(good["id"]), str(bad["id"])}
+    assert results[str(good["id"])]["status"] == "success"
+    assert results[str(good["id"])]["latency_ms"] > 0
+    assert results[str(bad["id"])]["status"] == "error"
+    assert results[str(bad["id"])]["latency_ms"] is None
+
+    resp = client.post(
+        f"/api/v1/database-sources/_test-connection?ids={good['id']}", headers=headers
+    )
+    assert list(resp.json()["data"]) == [str(good["id"])]
+
+    resp = client.post(
+        "/api/v1/database-sources/_test-connection?ids=x", headers=headers
+    )
+    assert resp.status_code == 422
+
+
+def test_connection_test_disposes_engine_and_sets_timeouts():
+    engine = MagicMock()
+    with patch.object(db_service, "create_engine", return_value=engine) as mock_create:
+        result = asyncio.run(
+            db_service.check_connection(
+                {"engine": "postgresql", "host": "db", "port": 5432}
+            )
+        )
+
+    assert result["status"] == "success"
+    connect_args = mock_create.call_args.kwargs["connect_args"]
+    assert connect_args["connect_timeout"] == db_service.CONNECT_TIMEOUT
+    assert "statement_timeout" in connect_args["options"]
+    engine.dispose.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_connection_tests_run_off_the_event_loop():
+    def slow_query(url, connect_args):
+        time.sleep(0.2)
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    config = {"engine": "postgresql", "host": "db"}
+    with patch.object(db_service, "_run_test_query", slow_query):
+        tick_task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(db_service.check_connection(config) for _ in range(4))
+        )
+        elapsed = time.perf_counter() - started
+        tick_task.cancel()
+
+    assert all(r["status"] == "success" for r in results)
+    assert all(r["latency_ms"] >= 200 for r in results)
+    assert elapsed < 0.6
+    # The loop kept running while the connections were pending
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_connection_test_times_out():
+    def hanging_query(url, connect_args):
+        time.sleep(0.5)
+
+    with patch.object(db_service, "_run_test_query", hanging_query), patch.object(
+        db_service, "CONNECT_TIMEOUT", 0.05
+    ), patch.object(db_service, "STATEMENT_TIMEOUT", 0.05):
+        result = await db_service.check_connection({"engine": "mysql", "host": "db"})
+
+    assert result["status"] == "error"
+    assert "Timed out" in result["message"]
+
+
+@pytest.mark.asyncio
+async def test_queued_connection_tests_do_not_time_out():
+    # Each test fits its timeout, but not twice over while queued
+    def slow_query(url, connect_args):
+        time.sleep(0.3)
+
+    config = {"engine": "postgresql", "host": "db"}
+    with patch.object(db_service, "_run_test_query", slow_query), patch.object(
+        db_service, "CONNECT_TIMEOUT", 0.25
+    ), patch.object(db_service, "STATEMENT_TIMEOUT", 0.25):
+        # Twice as many tests as threads, the second half waits for a thread
+        results = await asyncio.gather(
+            *(
+                db_service.check_connection(config)
+                for _ in range(2 * db_service.MAX_CONCURRENT_TESTS)
+            )
+        )
+
+    assert all(r["status"] == "success" for r in results), results
@@ -0,0 +1,172 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from mindweaver.config import settings
+from mindweaver.datasource_service.database_source import preview
+
+
+def _config(**overrides):
+    return {
+        "engine": "postgresql",
+        "host": settings.db_host,
+        "port": settings.db_port,
+        "database": settings.db_name,
+        "login": settings.db_user,
+        "password": settings.db_pass or None,
+        **overrides,
+    }
+
+
+@pytest.fixture
+def preview_table(client: TestClient, execute_sql):
+    execute_sql(
+        "CREATE SCHEMA preview_test",
+        "CREATE TABLE preview_test.items AS "
+        "SELECT i AS id, md5(i::text) AS label, now() AS seen "
+        "FROM generate_series(1, 2000) AS i",
+    )
+    yield "items"
+    execute_sql("DROP SCHEMA preview_test CASCADE")
+
+
+def test_preview_streams_ndjson(client: TestClient, test_project, preview_table):
+    headers = {"X-Project-Id": str(test_project["id"])}
+    resp = client.post(
+        "/api/v1/database-sources",
+        headers=headers,
+        json={
+            "name": "preview-pg",
+            "title": "Preview",
+            "schema_name": "preview_test",
+            "project_id": test_project["id"],
+            **_config(),
+        },
+    )
+    resp.raise_for_status()
+    source = resp.json()["data"]
+    url = f"/api/v1/database-sources/{source['id']}/_preview"
+
+    resp = client.get(url, headers=headers, params={"table": "items", "limit": 250})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(rows) == 250
+    assert rows[0]["id"] == 1
+    assert set(rows[0]) == {"id", "label", "seen"}
+
+    # The byte budget cuts the stream at a row boundary
+    with patch.object(preview, "PREVIEW_MAX_BYTES", 1000):
+        resp = client.get(url, headers=headers, params={"table": "items", "limit": 500})
+    assert 0 < len(resp.content) <= 1000
+    assert all(json.loads(line) for line in resp.text.splitlines())
+
+    resp = client.get(url, headers=headers, params={"table": "missing"})
+    assert resp.status_code == 422
+    assert "Preview failed" in resp.json()["detail"]
+
+    resp = client.get(url, headers=headers, params={"table": "items", "limit": 0})
+    assert resp.status_code == 422
+
+    # Identifiers are quoted rather than interpolated
+    resp = client.get(
+        url, headers=headers, params={"table": "items; DROP TABLE preview_test.items"}
+    )
+    assert resp.status_code == 422
+    resp = client.get(url, headers=headers, params={"table": "items", "limit": 1})
+    assert resp.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_preview_fetches_in_batches(preview_table):
+    batches = []
+
+    class RecordingEncoder(preview.NdjsonEncoder):
+        def encode(self, rows, budget):
+            batches.append(len(rows))
+            return super().encode(rows, budget)
+
+    pool = preview.PreviewEnginePool()
+    engine = await pool.acquire(1, _config())
+    stream = preview.stream_preview(
+        engine,
+        preview.preview_statement("items", "preview_test", 1500),
+        RecordingEncoder(),
+        batch_rows=100,
+    )
+    lines = b"".join([chunk async for chunk in stream]).splitlines()
+    assert len(lines) == 1500
+    assert batches == [100] * 15
+
+    # Engines are reused per source until the configuration changes
+    assert await pool.acquire(1, _config()) is engine
+    assert await pool.acquire(1, _config(database="other")) is not engine
+    assert len(pool) == 1
+
+    pool.idle_timeout = 0
+    await pool.evict_idle()
+    assert len(pool) == 0
+
+
+@pytest.mark.asyncio
+async def test_preview_statement_timeout(client: TestClient):
+    pool = preview.PreviewEnginePool()
+    with patch.object(preview, "PREVIEW_STATEMENT_TIMEOUT", 0.1):
+        engine = await pool.acquire(1, _config())
+    stream = preview.stream_preview(
+        engine, text("SELECT pg_sleep(5)"), preview.NdjsonEncoder()
+    )
+    with pytest.raises(Exception, match="statement timeout"):
+        await anext(stream)
+    await pool.dispose_all()
+
+
+@pytest.mark.asyncio
+async def test_preview_rejects_unsupported_engines():
+    pool = preview.PreviewEnginePool()
+    with pytest.raises(preview.FieldValidationError):
+        await pool.acquire(1, {"engine": "mongodb", "host": "db"})
+
+
+@pytest.mark.asyncio
+async def test_preview_arrow_schema_from_cursor(preview_table):
+    import pyarrow as pa
+
+    pool = preview.PreviewEnginePool()
+    engine = await pool.acquire(1, _config())
+
+    async def read(statement, batch_rows=2):
+        chunks = [
+            chunk
+            async for chunk in preview.stream_preview(
+                engine, text(statement), preview.ArrowEncoder(), batch_rows=batch_rows
+            )
+        ]
+        return pa.ipc.open_stream(b"".join(chunks)).read_all()
+
+    # Types come from the columns, not from the values of the first batch
+    table = await read(
+        "SELECT id, CASE WHEN id > 2 THEN label END AS label, "
+        "CASE WHEN id > 2 THEN id * 1.5 END AS ratio, seen, "
+        "CASE WHEN id > 2 THEN (id * 0.25)::numeric(6, 2) END AS share "
+        "FROM preview_test.items ORDER BY id LIMIT 5"
+    )
+    assert table.schema.field("id").type == pa.int32()
+    assert table.schema.field("label").type == pa.string()
+    assert table.schema.field("seen").type == pa.timestamp("us", tz="UTC")
+    # Numeric values are sent as text rather than rounded
+    assert table.schema.field("share").type == pa.string()
+    assert table.column("share").to_pylist() == [None, None, "0.75", "1.00", "1.25"]
+    assert table.num_rows == 5
+
+    # An empty result still carries the schema
+    table = await read("SELECT id, label FROM preview_test.items WHERE false")
+    assert table.num_rows == 0
+    assert table.schema.names == ["id", "label"]
+    await pool.dispose_all()
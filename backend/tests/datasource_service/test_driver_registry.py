@@ -0,0 +1,127 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import asyncio
+import subprocess
+import sys
+import textwrap
+
+import httpx
+import pytest
+
+from mindweaver.ext.data_source import (
+    DriverRegistry,
+    get_driver,
+    get_driver_options,
+)
+from mindweaver.ext.data_source.base import DataSourceDriver
+
+
+class FakeDriver(DataSourceDriver):
+    closed = False
+
+    def connection_uri(self) -> str:
+        return f"fake://{self.config.get('host')}"
+
+    async def test_connection(self):
+        return {"status": "success"}
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_driver(monkeypatch):
+    monkeypatch.setattr(DriverRegistry, "_drivers", dict(DriverRegistry._drivers))
+    DriverRegistry.register_lazy(
+        "fake", f"{__name__}:FakeDriver", title="Fake", description="For tests"
+    )
+    yield
+    DriverRegistry.discard_instances()
+
+
+def test_import_does_not_load_drivers():
+    code = textwrap.dedent(
+        """
+        import sys
+        import mindweaver.ext.data_source as ds
+        assert "web" in ds.DriverRegistry.list_drivers()
+        assert "mindweaver.ext.data_source.web" not in sys.modules
+        ds.get_driver("web", {"host": "example.com"})
+        assert "mindweaver.ext.data_source.web" in sys.modules
+        """
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_driver_listed_without_import(fake_driver):
+    assert {"label": "Fake", "value": "fake"} in get_driver_options()
+    assert "class" not in DriverRegistry._drivers["fake"]
+
+    driver = get_driver("fake", {"host": "a"})
+    assert isinstance(driver, FakeDriver)
+    assert driver.connection_uri() == "fake://a"
+    assert DriverRegistry._drivers["fake"]["class"] is FakeDriver
+
+
+def test_driver_instances_reused_per_config(fake_driver):
+    first = get_driver("fake", {"host": "a", "port": 1})
+    # Key order does not change the configuration
+    assert get_driver("fake", {"port": 1, "host": "a"}) is first
+    assert get_driver("FAKE", {"host": "a", "port": 1}) is first
+
+    other = get_driver("fake", {"host": "b", "port": 1})
+    assert other is not first
+
+    DriverRegistry.discard_instances("fake")
+    assert first.closed and other.closed
+    assert get_driver("fake", {"host": "a", "port": 1}) is not first
+
+
+def test_driver_instances_bounded(fake_driver, monkeypatch):
+    monkeypatch.setattr("mindweaver.ext.data_source.MAX_CACHED_DRIVERS", 2)
+    first = get_driver("fake", {"host": "1"})
+    get_driver("fake", {"host": "2"})
+    get_driver("fake", {"host": "3"})
+    assert len(DriverRegistry._instances) == 2
+    # Evicted drivers release their connections
+    assert first.closed
+    assert get_driver("fake", {"host": "1"}) is not first
+
+
+@pytest.mark.asyncio
+async def test_driver_closed_in_background(fake_driver):
+    driver = get_driver("fake", {"host": "a"})
+    DriverRegistry.discard_instances()
+    assert not driver.closed
+    await asyncio.gather(*DriverRegistry._closing)
+    assert driver.closed
+
+
+@pytest.mark.asyncio
+async def test_web_driver_reuses_client():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(204)
+
+    driver = get_driver("web", {"host": "http://example.test/health"})
+    driver._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = driver.client()
+
+    for _ in range(2):
+        result = await driver.test_connection()
+        assert result["status"] == "success"
+    assert driver.client() is client
+    assert [str(r.url) for r in requests] == ["http://example.test/health"] * 2
+
+    DriverRegistry.discard_instances("web")
+    await asyncio.gather(*DriverRegistry._closing)
+    assert client.is_closed
+
+
+def test_unknown_or_broken_driver(fake_driver):
+    assert get_driver("missing", {}) is None
+    DriverRegistry.register_lazy("broken", "mindweaver.ext.data_source:Missing")
+    assert get_driver("broken", {}) is None
@@ -0,0 +1,179 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.config import settings
+from mindweaver.datasource_service import health
+from mindweaver.datasource_service.base import url_target
+from mindweaver.datasource_service.streaming_source import (
+    StreamingSource,
+    StreamingSourceService,
+)
+from mindweaver.ext.data_source.base import DataSourceDriver, tcp_probe
+from mindweaver.fw.model import get_engine
+
+
+class _TcpDriver(DataSourceDriver):
+    async def test_connection(self):
+        return await self.default_test_connection()
+
+    def connection_uri(self) -> str:
+        return ""
+
+
+@pytest.mark.asyncio
+async def test_tcp_probe():
+    server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        latency = await tcp_probe("localhost", port)
+        assert 0 < latency < 1
+
+        result = await _TcpDriver({"host": "127.0.0.1", "port": port}).test_connection()
+        assert result["status"] == "success"
+
+    with pytest.raises(OSError):
+        await tcp_probe("127.0.0.1", port)
+    result = await _TcpDriver({"host": "127.0.0.1", "port": port}).test_connection()
+    assert result["status"] == "error"
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    with patch("asyncio.open_connection", hang):
+        with pytest.raises(TimeoutError):
+            await tcp_probe("127.0.0.1", port, timeout=0.05)
+
+
+def test_probe_targets():
+    assert url_target("https://example.com/api") == [("example.com", 443)]
+    assert url_target("http://example.com:8080") == [("example.com", 8080)]
+    assert url_target("example.com") == [("example.com", 80)]
+    assert url_target(None) == []
+
+    source = StreamingSource(
+        name="s",
+        title="s",
+        project_id=1,
+        broker_type="kafka",
+        bootstrap_servers="kafka-0:9092, [::1]:9093,bad",
+    )
+    assert StreamingSourceService.probe_targets(source) == [
+        ("kafka-0", 9092),
+        ("::1", 9093),
+    ]
+
+
+def test_health_sweep(client: TestClient, test_project):
+    headers = {"X-Project-Id": str(test_project["id"])}
+
+    def create(path, **payload):
+        resp = client.post(
+            f"/api/v1/{path}",
+            headers=headers,
+            json={"project_id": test_project["id"], **payload},
+        )
+        resp.raise_for_status()
+        return resp.json()["data"]
+
+    db = create(
+        "database-sources",
+        name="health-db",
+        title="Health DB",
+        engine="postgresql",
+        host=settings.db_host,
+        port=settings.db_port,
+    )
+    web = create("web-sources", name="health-web", title="Web", url="http://127.0.0.1:1")
+    stream = create(
+        "streaming-sources",
+        name="health-stream",
+        title="Stream",
+        broker_type="kafka",
+        bootstrap_servers=f"127.0.0.1:1,{settings.db_host}:{settings.db_port}",
+    )
+
+    resp = client.post("/api/v1/data-sources/_health", headers=headers)
+    resp.raise_for_status()
+    results = {(r["source_type"], r["source_id"]): r for r in resp.json()["data"]}
+    assert results[("database_source", db["id"])]["reachable"] is True
+    assert results[("database_source", db["id"])]["latency_ms"] >= 0
+    assert results[("web_source", web["id"])]["reachable"] is False
+    assert "127.0.0.1:1" in results[("web_source", web["id"])]["error"]
+    # One reachable bootstrap server is enough
+    assert results[("streaming_source", stream["id"])]["reachable"] is True
+
+    client.post("/api/v1/data-sources/_health", headers=headers).raise_for_status()
+    history = client.get(
+        "/api/v1/data-sources/_health",
+        headers=headers,
+        params={"source_type": "web_source", "source_id": web["id"]},
+    ).json()["data"]
+    assert len(history) == 2
+    assert all(not h["reachable"] for h in history)
+    assert len(client.get("/api/v1/data-sources/_health", headers=headers).json()["data"]) == 6
+
+    # Deleting a source drops its history, not that of the others
+    client.delete(
+        f"/api/v1/web-sources/{web['id']}",
+        headers={**headers, "X-RESOURCE-NAME": web["name"]},
+    ).raise_for_status()
+    history = client.get("/api/v1/data-sources/_health", headers=headers).json()["data"]
+    assert len(history) == 4
+    assert all(h["source_type"] != "web_source" for h in history)
+
+    # Other projects see nothing
+    resp = client.get("/api/v1/data-sources/_health", headers={"X-Project-Id": "999"})
+    assert resp.json()["data"] == []
+    assert client.get("/api/v1/data-sources/_health").status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_health_sweep_concurrency_cap(client: TestClient, test_project):
+    for i in range(6):
+        client.post(
+            "/api/v1/web-sources",
+            headers={"X-Project-Id": str(test_project["id"])},
+            json={
+                "name": f"cap-{i}",
+                "title": "Cap",
+                "url": f"http://host-{i}",
+                "project_id": test_project["id"],
+            },
+        ).raise_for_status()
+
+    running = peak = 0
+
+    async def fake_probe(targets):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+        return {"reachable": True, "latency_ms": 1.0, "error": None}
+
+    with patch.object(health, "probe_endpoints", fake_probe):
+        async with AsyncSession(get_engine()) as session:
+            assert await health.projects_with_sources(session) == [test_project["id"]]
+            results = await health.sweep_project(session, test_project["id"], concurrency=2)
+            await session.commit()
+
+    assert len(results) == 6
+    assert peak == 2
+
+
+def test_health_sweep_task_respects_feature_flag(monkeypatch):
+    from mindweaver.tasks.data_source_health import sweep_data_source_health
+
+    monkeypatch.setattr(settings, "experimental_data_source", False)
+    with patch(
+        "mindweaver.tasks.data_source_health.projects_with_sources"
+    ) as mock_projects:
+        sweep_data_source_health()
+    mock_projects.assert_not_called()
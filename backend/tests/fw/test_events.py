@@ -0,0 +1,157 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.fw.events import EventBroker, event_stream, format_sse
+from mindweaver.fw.model import get_engine
+from mindweaver.service.k8s_cluster.model import K8sClusterStatus
+
+
+async def _next_event(queue: asyncio.Queue, timeout: float = 5.0):
+    return await asyncio.wait_for(queue.get(), timeout=timeout)
+
+
+async def _set_cluster_status(k8s_cluster_id: int, status: str, commit=True):
+    async with AsyncSession(get_engine()) as session:
+        result = await session.exec(
+            select(K8sClusterStatus).where(
+                K8sClusterStatus.k8s_cluster_id == k8s_cluster_id
+            )
+        )
+        status_model = result.one_or_none()
+        if not status_model:
+            status_model = K8sClusterStatus(k8s_cluster_id=k8s_cluster_id)
+            session.add(status_model)
+        status_model.status = status
+        if commit:
+            await session.commit()
+        else:
+            await session.flush()
+            await session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_cluster_status_events_fan_out_by_project(
+    client: TestClient, test_project
+):
+    other_cluster = client.post(
+        "/api/v1/k8s_clusters",
+        json={"name": "other-cluster", "title": "Other", "type": "in-cluster"},
+    ).json()["data"]
+
+    # Two brokers stand in for two API replicas
+    replica_a, replica_b = EventBroker(), EventBroker()
+    async with replica_a.subscribe(test_project["id"]) as scoped, replica_b.subscribe(
+        None
+    ) as unscoped:
+        await _set_cluster_status(test_project["k8s_cluster_id"], "online")
+
+        for queue in (scoped, unscoped):
+            message = await _next_event(queue)
+            assert message["event"] == "state"
+            assert message["entity"] == "k8s_cluster"
+            assert message["id"] == test_project["k8s_cluster_id"]
+            assert message["project_ids"] == [test_project["id"]]
+            assert message["data"]["status"] == "online"
+
+        # Cluster without projects only reaches unscoped subscribers
+        await _set_cluster_status(other_cluster["id"], "error")
+        message = await _next_event(unscoped)
+        assert message["id"] == other_cluster["id"]
+        assert scoped.empty()
+
+        # Rolled back writes are never announced
+        await _set_cluster_status(test_project["k8s_cluster_id"], "offline", commit=False)
+        with pytest.raises(asyncio.TimeoutError):
+            await _next_event(unscoped, timeout=0.5)
+
+    assert not replica_a.listening
+    assert not replica_b.listening
+
+
+@pytest.mark.asyncio
+async def test_platform_state_event(client: TestClient, test_project):
+    headers = {"X-Project-Id": str(test_project["id"])}
+    with patch(
+        "mindweaver.platform_service.base.PlatformService.deploy", return_value=None
+    ), patch(
+        "mindweaver.platform_service.base.PlatformService.decommission",
+        return_value=None,
+    ):
+        resp = client.post(
+            "/api/v1/platform/pgsql",
+            json={
+                "name": "event-pg",
+                "title": "Event Postgres",
+                "project_id": test_project["id"],
+                "instances": 1,
+                "storage_size": "1Gi",
+            },
+            headers=headers,
+        )
+        resp.raise_for_status()
+        platform_id = resp.json()["data"]["id"]
+
+        broker = EventBroker()
+        async with broker.subscribe(test_project["id"]) as queue:
+            resp = client.post(
+                f"/api/v1/platform/pgsql/{platform_id}/_state",
+                json={"status": "online", "message": "ready"},
+                headers=headers,
+            )
+            resp.raise_for_status()
+
+            message = await _next_event(queue)
+            assert message["id"] == platform_id
+            assert message["project_ids"] == [test_project["id"]]
+            assert message["data"]["status"] == "online"
+            assert message["data"]["message"] == "ready"
+            assert "db_pass" not in message["data"]
+
+
+class _Request:
+    """Minimal request exposing the disconnect check used by event_stream"""
+
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+@pytest.mark.asyncio
+async def test_event_stream_formats_sse(client: TestClient, test_project):
+    broker = EventBroker()
+    request = _Request()
+    stream = event_stream(request, test_project["id"], event_broker=broker)
+
+    assert (await anext(stream)).startswith("retry:")
+    await _set_cluster_status(test_project["k8s_cluster_id"], "online")
+    frame = await asyncio.wait_for(anext(stream), timeout=5.0)
+    assert frame.startswith("event: state\ndata: ")
+    assert frame.endswith("\n\n")
+    assert json.loads(frame.split("data: ", 1)[1])["data"]["status"] == "online"
+
+    request.disconnected = True
+    await stream.aclose()
+    assert not broker.listening
+
+
+def test_events_require_project(client: TestClient):
+    resp = client.get("/api/v1/_events")
+    assert resp.status_code == 422
+    resp = client.get("/api/v1/_events", headers={"X-Project-ID": "all"})
+    assert resp.status_code == 422
+
+
+def test_format_sse():
+    frame = format_sse({"event": "state", "id": 1})
+    assert frame == 'event: state\ndata: {"event": "state", "id": 1}\n\n'
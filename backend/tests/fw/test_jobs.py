@@ -0,0 +1,157 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.fw.job import (
+    Job,
+    JobStatus,
+    execute_job,
+    find_active_job,
+    idempotency_key,
+    report_progress,
+    submit_job,
+)
+from mindweaver.fw.model import get_engine, ts_now
+
+
+async def _get_job(job_id: int) -> Job:
+    async with AsyncSession(get_engine()) as session:
+        return await session.get(Job, job_id)
+
+
+async def _submit(parameters=None, model_id=1) -> tuple[int, bool]:
+    async with AsyncSession(get_engine()) as session:
+        job, created = await submit_job(
+            session, "test_entity", model_id, "do_thing", parameters
+        )
+        job_id = job.id
+        await session.commit()
+    return job_id, created
+
+
+def test_idempotency_key_ignores_parameter_order():
+    a = idempotency_key("k8s_cluster", 1, "install", {"a": 1, "b": [1, 2]})
+    b = idempotency_key("k8s_cluster", 1, "install", {"b": [1, 2], "a": 1})
+    assert a == b
+    assert a != idempotency_key("k8s_cluster", 2, "install", {"a": 1, "b": [1, 2]})
+    assert a != idempotency_key("k8s_cluster", 1, "install", {"a": 2, "b": [1, 2]})
+
+
+def test_duplicate_action_returns_running_job(client: TestClient):
+    cluster = client.post(
+        "/api/v1/k8s_clusters",
+        json={"name": "job-test", "title": "Job Test", "type": "in-cluster"},
+    ).json()["data"]
+
+    with patch(
+        "mindweaver.tasks.k8s_cluster_status.install_argocd_task.delay"
+    ) as mock_delay:
+        first = client.post(
+            f"/api/v1/k8s_clusters/{cluster['id']}/_actions",
+            json={"action": "install_argocd"},
+        )
+        first.raise_for_status()
+        second = client.post(
+            f"/api/v1/k8s_clusters/{cluster['id']}/_actions",
+            json={"action": "install_argocd"},
+        )
+        second.raise_for_status()
+
+    job_id = first.json()["job_id"]
+    assert second.json()["status"] == "running"
+    assert second.json()["job_id"] == job_id
+    mock_delay.assert_called_once_with(cluster["id"], job_id=job_id)
+
+    jobs = client.get(f"/api/v1/k8s_clusters/{cluster['id']}/_jobs").json()["data"]
+    assert [(j["id"], j["action"], j["status"]) for j in jobs] == [
+        (job_id, "install_argocd", "queued")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_execute_job_records_outcome(client: TestClient):
+    job_id, created = await _submit({"x": 1})
+    assert created
+    # Identical submissions share the active job, others get their own
+    assert await _submit({"x": 1}) == (job_id, False)
+    other_id, created = await _submit({"x": 2})
+    assert created and other_id != job_id
+
+    async def work():
+        job = await _get_job(job_id)
+        assert job.status == JobStatus.RUNNING
+        await asyncio.sleep(0.05)
+        return "done"
+
+    assert await execute_job(job_id, work) == "done"
+    job = await _get_job(job_id)
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.active_key is None
+    assert job.duration >= 0.05
+    assert job.error is None
+
+    # Redelivered messages do not run a finished job again
+    fn = AsyncMock()
+    assert await execute_job(job_id, fn) is None
+    fn.assert_not_awaited()
+
+    # Finished jobs no longer block identical submissions
+    new_id, created = await _submit({"x": 1})
+    assert created and new_id != job_id
+
+
+@pytest.mark.asyncio
+async def test_execute_job_records_failure(client: TestClient):
+    job_id, _ = await _submit()
+
+    async def fail():
+        raise RuntimeError("helm exploded")
+
+    with pytest.raises(RuntimeError):
+        await execute_job(job_id, fail)
+
+    job = await _get_job(job_id)
+    assert job.status == JobStatus.FAILED
+    assert job.error == "helm exploded"
+    assert job.active_key is None
+    assert job.finished is not None
+
+
+@pytest.mark.asyncio
+async def test_report_progress(client: TestClient):
+    job_id, _ = await _submit()
+    # Only running jobs record progress
+    await report_progress(job_id, {"done": 1})
+    assert (await _get_job(job_id)).progress == {}
+
+    async def work():
+        await report_progress(job_id, {"done": 5})
+        job = await _get_job(job_id)
+        assert job.progress == {"done": 5}
+
+    await execute_job(job_id, work)
+    assert (await _get_job(job_id)).progress == {"done": 5}
+
+
+@pytest.mark.asyncio
+async def test_stale_job_is_released(client: TestClient):
+    job_id, _ = await _submit()
+    async with AsyncSession(get_engine()) as session:
+        job = await session.get(Job, job_id)
+        job.modified = ts_now() - timedelta(days=1)
+        await session.commit()
+
+    async with AsyncSession(get_engine()) as session:
+        assert await find_active_job(session, "test_entity", 1, "do_thing", {}) is None
+        await session.commit()
+
+    job = await _get_job(job_id)
+    assert job.status == JobStatus.FAILED
+    assert await _submit() != (job_id, False)
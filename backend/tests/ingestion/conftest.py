@@ -0,0 +1,103 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import asyncio
+import time
+import uuid
+from typing import Optional
+
+import pytest
+
+from mindweaver.ingestion import BrokerConsumer, Message, register_broker
+
+
+class MemoryBroker:
+    """In-process broker with partitioned topics and group offsets."""
+
+    def __init__(self):
+        self.topics: dict[str, list[list[Message]]] = {}
+        self.committed: dict[tuple[str, str, int], int] = {}
+
+    def create_topic(self, topic: str, partitions: int = 1):
+        self.topics.setdefault(topic, [[] for _ in range(partitions)])
+
+    def produce(
+        self,
+        topic: str,
+        value: bytes,
+        key: Optional[bytes] = None,
+        partition: Optional[int] = None,
+    ) -> Message:
+        self.create_topic(topic)
+        partitions = self.topics[topic]
+        if partition is None:
+            partition = hash(key) % len(partitions) if key is not None else 0
+        log = partitions[partition]
+        message = Message(
+            partition=partition,
+            offset=len(log),
+            value=value,
+            key=key,
+            timestamp=int(time.time() * 1000),
+        )
+        log.append(message)
+        return message
+
+
+# Brokers by the `bootstrap_servers` of the sources consuming them
+memory_brokers: dict[str, MemoryBroker] = {}
+
+
+@register_broker("memory")
+class MemoryConsumer(BrokerConsumer):
+    """Consumer of a `MemoryBroker`, resuming from the committed offsets."""
+
+    async def start(self):
+        self.broker = memory_brokers.setdefault(
+            self.config["bootstrap_servers"], MemoryBroker()
+        )
+        self.broker.create_topic(self.topic)
+        self.positions = {
+            p: self.broker.committed.get((self.group_id, self.topic, p), 0)
+            for p in range(len(self.broker.topics[self.topic]))
+        }
+
+    def _take(self, max_records: int) -> list[Message]:
+        messages = []
+        for partition, log in enumerate(self.broker.topics[self.topic]):
+            start = self.positions[partition]
+            available = log[start : start + max_records - len(messages)]
+            messages.extend(available)
+            self.positions[partition] = start + len(available)
+            if len(messages) >= max_records:
+                break
+        return messages
+
+    async def poll(self, max_records: int, timeout: float) -> list[Message]:
+        deadline = time.monotonic() + timeout
+        while True:
+            messages = self._take(max_records)
+            if messages or time.monotonic() >= deadline:
+                return messages
+            await asyncio.sleep(min(0.01, timeout))
+
+    async def commit(self, offsets: dict[int, int]):
+        for partition, offset in offsets.items():
+            self.broker.committed[(self.group_id, self.topic, partition)] = offset
+
+    async def offsets(self) -> dict[int, tuple[Optional[int], Optional[int]]]:
+        return {
+            p: (self.broker.committed.get((self.group_id, self.topic, p)), len(log))
+            for p, log in enumerate(self.broker.topics[self.topic])
+        }
+
+
+@pytest.fixture
+def broker():
+    """A `memory` broker with a two partition `events` topic."""
+    name = f"broker-{uuid.uuid4().hex}"
+    broker = memory_brokers.setdefault(name, MemoryBroker())
+    broker.name = name
+    broker.create_topic("events", partitions=2)
+    yield broker
+    memory_brokers.pop(name, None)
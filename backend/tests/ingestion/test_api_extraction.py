@@ -0,0 +1,298 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.datasource_service.api_source import APISource
+from mindweaver.fw.model import get_engine
+from mindweaver.ingestion import ApiExtractionSpec, run_api_extraction
+from mindweaver.service.s3_storage import S3Storage
+
+BUCKET = "lake"
+TOTAL = 250
+
+
+class Api:
+    """Records served by the local API fixture."""
+
+    def __init__(self):
+        self.records = [{"id": i, "name": f"item {i}"} for i in range(TOTAL)]
+        self.throttle = {"/items"}
+        self.requests: list[str] = []
+        self.headers: list[dict] = []
+        self.lock = threading.Lock()
+
+    def respond(self, path: str, query: dict, body: dict):
+        def arg(name, default):
+            return int(query.get(name, [default])[0])
+
+        if path == "/items":
+            offset, limit = arg("offset", 0), arg("limit", 10)
+            page = self.records[offset : offset + limit]
+            return {"data": {"items": page}, "meta": {"total": TOTAL}}, {}
+        if path == "/pages":
+            number, size = arg("page", 1), arg("per_page", 10)
+            return {"results": self.records[(number - 1) * size : number * size]}, {}
+        if path == "/cursor":
+            start, limit = arg("cursor", 0), arg("limit", 10)
+            end = start + limit
+            return {
+                "items": self.records[start:end],
+                "next_cursor": str(end) if end < TOTAL else None,
+            }, {}
+        if path == "/links":
+            start, limit = arg("start", 0), arg("limit", 10)
+            end = start + limit
+            headers = {}
+            if end < TOTAL:
+                headers["Link"] = f'</links?start={end}&limit={limit}>; rel="next"'
+            return self.records[start:end], headers
+        if path == "/graphql":
+            variables = body["variables"]
+            start = int(variables["after"] or 0)
+            end = start + variables["first"]
+            return {
+                "data": {
+                    "users": {
+                        "edges": [{"node": r, "cursor": str(r["id"])} for r in self.records[start:end]],
+                        "pageInfo": {"hasNextPage": end < TOTAL, "endCursor": str(end)},
+                    }
+                }
+            }, {}
+        return None, {}
+
+
+@pytest.fixture
+def api():
+    api = Api()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _handle(self, body: dict):
+            parts = urlsplit(self.path)
+            with api.lock:
+                api.requests.append(self.path)
+                api.headers.append(dict(self.headers))
+                throttled = parts.path in api.throttle
+                api.throttle.discard(parts.path)
+            if throttled or parts.path == "/broken":
+                self.send_response(429 if throttled else 503)
+                self.send_header("Retry-After", "0")
+                self.end_headers()
+                return
+            data, headers = api.respond(parts.path, parse_qs(parts.query), body)
+            if data is None:
+                self.send_error(404)
+                return
+            payload = json.dumps(data).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self._handle({})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self._handle(json.loads(self.rfile.read(length) or b"{}"))
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    api.url = f"http://127.0.0.1:{server.server_port}"
+    yield api
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def api_setup(client: TestClient, test_project, api, s3):
+    headers = {"X-Project-Id": str(test_project["id"])}
+    source = client.post(
+        "/api/v1/api-sources",
+        headers=headers,
+        json={
+            "name": "extract-api",
+            "title": "API",
+            "base_url": api.url,
+            "auth_type": "bearer",
+            "password": "s3cret",
+            "headers": {"X-Tenant": "acme"},
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+    storage = client.post(
+        "/api/v1/s3_storages",
+        headers=headers,
+        json={
+            "name": "api-s3",
+            "title": "Lake",
+            "region": "us-east-1",
+            "access_key": "testing",
+            "secret_key": "testing",
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+    return source, storage
+
+
+async def _extract(
+    source_id: int, storage_id: int, spec: ApiExtractionSpec, on_progress=None
+) -> dict:
+    async with AsyncSession(get_engine()) as session:
+        source = await session.get(APISource, source_id)
+        storage = await session.get(S3Storage, storage_id)
+        return await run_api_extraction(source, storage, spec, on_progress=on_progress)
+
+
+def _jsonl_ids(s3, summary) -> list[int]:
+    ids = []
+    for uri in summary["objects"]:
+        key = uri.split("/", 3)[3]
+        body = s3.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+        ids.extend(json.loads(line)["id"] for line in body.splitlines())
+    return ids
+
+
+PAGINATIONS = [
+    ({"path": "/items", "pagination": "offset", "records_path": "data.items",
+      "total_path": "meta.total"}, 5),
+    ({"path": "/pages", "pagination": "page", "records_path": "results",
+      "page_size_param": "per_page"}, 6),
+    ({"path": "/cursor", "pagination": "cursor", "records_path": "items"}, 5),
+    ({"path": "/links", "pagination": "next_link"}, 5),
+    ({"path": "/graphql", "pagination": "graphql", "records_path": "data.users",
+      "query": "query($first: Int, $after: String) { users(first: $first, after: $after) "
+      "{ edges { node { id name } } pageInfo { hasNextPage endCursor } } }"}, 5),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("options,pages", PAGINATIONS)
+async def test_paginated_extraction(api_setup, api, s3, options, pages):
+    source, storage = api_setup
+    spec = ApiExtractionSpec(
+        storage_id=storage["id"],
+        bucket=BUCKET,
+        prefix="raw",
+        name="items",
+        page_size=50,
+        batch_records=100,
+        backoff_base=0,
+        **options,
+    )
+    summary = await _extract(source["id"], storage["id"], spec)
+    assert summary["records"] == TOTAL
+    assert summary["pages"] >= pages
+    assert len(summary["objects"]) == 3
+    assert summary["objects"][0] == f"s3://{BUCKET}/raw/items/run={summary['run']}/part-00000.jsonl"
+    assert _jsonl_ids(s3, summary) == list(range(TOTAL))
+    assert api.headers[0]["Authorization"] == "Bearer s3cret"
+    assert api.headers[0]["X-Tenant"] == "acme"
+    if options["pagination"] == "offset":
+        # The throttled first request was retried, the total bounds the pages
+        assert summary["retries"] == 1
+        assert summary["pages"] == pages
+
+
+@pytest.mark.asyncio
+async def test_parquet_output_and_page_limit(api_setup, api, s3):
+    source, storage = api_setup
+    # Later records fill a column that is empty at first and add a field
+    for record in api.records[:60]:
+        record["note"] = None
+    for record in api.records[60:]:
+        record.update(note={"seen": True}, extra=1)
+    spec = ApiExtractionSpec(
+        storage_id=storage["id"],
+        bucket=BUCKET,
+        name="items",
+        path="/pages",
+        pagination="page",
+        records_path="results",
+        page_size_param="per_page",
+        page_size=40,
+        max_pages=3,
+        format="parquet",
+        batch_records=50,
+    )
+    pages = []
+
+    async def on_progress():
+        pages.append(1)
+
+    summary = await _extract(source["id"], storage["id"], spec, on_progress)
+    assert summary["records"] == 120
+    assert summary["pages"] == len(pages) == 3
+    keys = [uri.split("/", 3)[3] for uri in summary["objects"]]
+    assert keys[0].endswith("part-00000.parquet")
+    tables = [
+        pq.read_table(io.BytesIO(s3.get_object(Bucket=BUCKET, Key=key)["Body"].read()))
+        for key in keys
+    ]
+    # Every object has the schema of the first
+    assert len({t.schema for t in tables}) == 1
+    assert tables[0].schema.names == ["id", "name", "note"]
+    assert sum((t.column("id").to_pylist() for t in tables), []) == list(range(120))
+    assert tables[-1].column("note").to_pylist()[-1] == '{"seen": true}'
+
+
+@pytest.mark.asyncio
+async def test_retries_exhausted(api_setup, api, s3):
+    source, storage = api_setup
+    spec = ApiExtractionSpec(
+        storage_id=storage["id"],
+        bucket=BUCKET,
+        name="broken",
+        path="/broken",
+        max_retries=2,
+        backoff_base=0,
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        await _extract(source["id"], storage["id"], spec)
+    assert api.requests.count("/broken") == 3
+    assert "Contents" not in s3.list_objects_v2(Bucket=BUCKET)
+
+
+def test_extract_action(client: TestClient, test_project, api_setup):
+    source, storage = api_setup
+    headers = {"X-Project-Id": str(test_project["id"])}
+    url = f"/api/v1/api-sources/{source['id']}/_actions"
+    parameters = {"storage_id": storage["id"], "bucket": BUCKET, "name": "items"}
+
+    with patch("mindweaver.tasks.ingestion.extract_api_source_task.delay") as mock_delay:
+        resp = client.post(
+            url,
+            headers=headers,
+            json={
+                "action": "extract_to_s3",
+                "parameters": {**parameters, "pagination": "graphql"},
+            },
+        )
+        assert resp.status_code == 422
+        mock_delay.assert_not_called()
+
+        resp = client.post(
+            url, headers=headers, json={"action": "extract_to_s3", "parameters": parameters}
+        )
+        resp.raise_for_status()
+        job_id = resp.json()["job_id"]
+        expected = ApiExtractionSpec(**parameters).model_dump()
+        mock_delay.assert_called_once_with(source["id"], job_id=job_id, parameters=expected)
@@ -0,0 +1,255 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.datasource_service.web_source import WebSource
+from mindweaver.fw.model import get_engine
+from mindweaver.ingestion import CrawlPage, CrawlSpec, PageStatus, run_crawl
+from mindweaver.ingestion.crawl import _queue_pages, extract_links
+from mindweaver.ingestion.http import retry_after
+from mindweaver.service.s3_storage import S3Storage
+
+BUCKET = "lake"
+
+
+class Site:
+    """Pages served by the local HTTP server fixture."""
+
+    def __init__(self):
+        self.pages = {
+            "/robots.txt": ("text/plain", "User-agent: *\nDisallow: /private\n"),
+            "/": (
+                "text/html",
+                '<a href="/a">a</a> <a href="b">b</a> <a href="/dup#top">dup</a>'
+                '<a href="/private/x">private</a> <a href="/flaky">flaky</a>'
+                '<a href="http://elsewhere.example/">external</a>'
+                '<a href="/hidden" rel="nofollow">hidden</a>',
+            ),
+            "/a": ("text/html", '<a href="/c">c</a> <a href="/">home</a>'),
+            "/b": ("text/plain", "same content"),
+            "/dup": ("text/plain", "same content"),
+            "/c": ("text/html", "<p>leaf</p>"),
+            "/flaky": ("text/plain", "eventually"),
+            "/private/x": ("text/plain", "secret"),
+        }
+        self.requests: list[str] = []
+        self.throttle = {"/flaky"}
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+
+@pytest.fixture
+def site():
+    site = Site()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with site.lock:
+                site.requests.append(self.path)
+                site.active += 1
+                site.max_active = max(site.max_active, site.active)
+            try:
+                time.sleep(0.02)
+                if self.path in site.throttle:
+                    site.throttle.discard(self.path)
+                    self.send_response(429)
+                    self.send_header("Retry-After", "0")
+                    self.end_headers()
+                    return
+                if self.path not in site.pages:
+                    self.send_error(404)
+                    return
+                content_type, body = site.pages[self.path]
+                body = body.encode()
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with site.lock:
+                    site.active -= 1
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    site.url = f"http://127.0.0.1:{server.server_port}/"
+    yield site
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def crawl_setup(client: TestClient, test_project, site, s3):
+    headers = {"X-Project-Id": str(test_project["id"])}
+    source = client.post(
+        "/api/v1/web-sources",
+        headers=headers,
+        json={
+            "name": "crawl-site",
+            "title": "Site",
+            "url": site.url,
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+    storage = client.post(
+        "/api/v1/s3_storages",
+        headers=headers,
+        json={
+            "name": "crawl-s3",
+            "title": "Lake",
+            "region": "us-east-1",
+            "access_key": "testing",
+            "secret_key": "testing",
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+    return source, storage
+
+
+async def _crawl(source_id: int, storage_id: int, spec: CrawlSpec) -> dict:
+    async with AsyncSession(get_engine()) as session:
+        source = await session.get(WebSource, source_id)
+        storage = await session.get(S3Storage, storage_id)
+        return await run_crawl(session, source, storage, spec)
+
+
+async def _pages() -> dict[str, CrawlPage]:
+    async with AsyncSession(get_engine()) as session:
+        result = await session.exec(select(CrawlPage))
+        return {p.url.split("/", 3)[3]: p for p in result.all()}
+
+
+@pytest.mark.asyncio
+async def test_crawl_and_recrawl(crawl_setup, site, s3):
+    source, storage = crawl_setup
+    spec = CrawlSpec(
+        storage_id=storage["id"],
+        bucket=BUCKET,
+        prefix="web",
+        delay_seconds=0,
+        per_host_concurrency=2,
+        concurrency=8,
+    )
+    summary = await _crawl(source["id"], storage["id"], spec)
+    assert summary["fetched"] == 7
+    assert summary["stored"] == 5
+    assert summary["deduplicated"] == 1
+    assert summary["skipped"] == 1
+    assert summary["retried"] == 1
+    assert summary["queued"] == 0
+    assert site.max_active <= 2
+    assert "/private/x" not in site.requests
+    assert "/hidden" not in site.requests
+
+    pages = await _pages()
+    assert set(pages) == {"", "a", "b", "dup", "c", "flaky", "private/x"}
+    assert pages["private/x"].status == PageStatus.SKIPPED
+    assert pages["c"].depth == 2
+    assert pages["b"].object_key == pages["dup"].object_key
+    digest = hashlib.sha256(b"same content").hexdigest()
+    assert pages["b"].object_key == f"web/objects/{digest[:2]}/{digest}"
+    listing = s3.list_objects_v2(Bucket=BUCKET, Prefix="web/objects/")
+    assert listing["KeyCount"] == 5
+    body = s3.get_object(Bucket=BUCKET, Key=pages["c"].object_key)["Body"].read()
+    assert body == b"<p>leaf</p>"
+
+    # A recrawl revalidates every page and only downloads what changed
+    site.pages["/c"] = ("text/html", "<p>leaf, edited</p>")
+    site.requests.clear()
+    summary = await _crawl(source["id"], storage["id"], spec)
+    assert summary["resumed"] is False
+    assert summary["not_modified"] == 5
+    assert summary["stored"] == 1
+    assert summary["skipped"] == 1
+    assert s3.list_objects_v2(Bucket=BUCKET, Prefix="web/objects/")["KeyCount"] == 6
+
+
+@pytest.mark.asyncio
+async def test_crawl_resumes_frontier(crawl_setup, site, s3):
+    source, storage = crawl_setup
+    spec = CrawlSpec(
+        storage_id=storage["id"], bucket=BUCKET, delay_seconds=0, max_pages=2
+    )
+    summary = await _crawl(source["id"], storage["id"], spec)
+    assert summary["fetched"] == 2
+    assert summary["queued"] > 0
+
+    spec = spec.model_copy(update={"max_pages": 100})
+    summary = await _crawl(source["id"], storage["id"], spec)
+    assert summary["resumed"] is True
+    assert summary["queued"] == 0
+    pages = await _pages()
+    assert all(p.status != PageStatus.QUEUED for p in pages.values())
+    # Pages of the first run are not fetched again
+    assert site.requests.count("/") == 1
+
+
+@pytest.mark.asyncio
+async def test_queue_large_frontier(client: TestClient):
+    # More pages than fit the bind parameters of a single insert
+    urls = [f"https://example.com/page-{i}" for i in range(6000)]
+    async with AsyncSession(get_engine()) as session:
+        assert await _queue_pages(session, "k" * 64, 1, urls + urls[:10], 1) == 6000
+        assert await _queue_pages(session, "k" * 64, 1, urls[-10:], 1) == 0
+        await session.commit()
+    pages = await _pages()
+    assert len(pages) == 6000
+    page = pages["page-0"]
+    assert (page.status, page.depth) == (PageStatus.QUEUED, 1)
+    assert page.created is not None
+    assert len({p.uuid for p in pages.values()}) == 6000
+
+
+def test_link_extraction():
+    html = (
+        '<base href="https://example.com/docs/">'
+        '<a href="intro">x</a><a href="/faq" rel="nofollow">y</a>'
+    )
+    assert extract_links(html, "https://example.com/") == ["https://example.com/docs/intro"]
+    nofollow = '<meta name="robots" content="noindex, nofollow"><a href="/x">x</a>'
+    assert extract_links(nofollow, "https://example.com/") == []
+    assert retry_after("7") == 7
+    assert retry_after("garbage") == 0
+
+
+def test_crawl_action(client: TestClient, test_project, crawl_setup):
+    source, storage = crawl_setup
+    headers = {"X-Project-Id": str(test_project["id"])}
+    url = f"/api/v1/web-sources/{source['id']}/_actions"
+    parameters = {"storage_id": storage["id"], "bucket": BUCKET}
+
+    with patch("mindweaver.tasks.ingestion.crawl_web_source_task.delay") as mock_delay:
+        resp = client.post(
+            url,
+            headers=headers,
+            json={"action": "crawl", "parameters": {**parameters, "concurrency": 0}},
+        )
+        assert resp.status_code == 422
+        mock_delay.assert_not_called()
+
+        resp = client.post(url, headers=headers, json={"action": "crawl", "parameters": parameters})
+        resp.raise_for_status()
+        job_id = resp.json()["job_id"]
+        expected = CrawlSpec(**parameters).model_dump()
+        mock_delay.assert_called_once_with(source["id"], job_id=job_id, parameters=expected)
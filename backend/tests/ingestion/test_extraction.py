@@ -0,0 +1,262 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import io
+from unittest.mock import patch
+
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.config import settings
+from mindweaver.datasource_service.database_source import DatabaseSource
+from mindweaver.fw.model import get_engine
+from mindweaver.ingestion import (
+    ChunkStatus,
+    ExtractionCheckpoint,
+    ExtractionSpec,
+    S3MultipartWriter,
+    extract,
+    run_extraction,
+)
+from mindweaver.ingestion.s3 import MIN_PART_SIZE
+from mindweaver.service.s3_storage import S3Storage
+
+BUCKET = "lake"
+
+
+@pytest.fixture
+def extraction_setup(client: TestClient, test_project, s3, execute_sql):
+    headers = {"X-Project-Id": str(test_project["id"])}
+    execute_sql(
+        "CREATE SCHEMA extract_test",
+        "CREATE TABLE extract_test.events ("
+        "id bigint, name text, amount numeric(10, 2), payload jsonb, "
+        "happened timestamptz)",
+        "INSERT INTO extract_test.events "
+        "SELECT i, 'event ' || i, i / 100.0, jsonb_build_object('n', i), "
+        "'2026-01-01'::timestamptz + i * interval '1 minute' "
+        "FROM generate_series(1, 5000) AS i",
+        "INSERT INTO extract_test.events (id, name) VALUES (NULL, 'orphan')",
+        "CREATE TABLE extract_test.metrics (day date, value int) PARTITION BY RANGE (day)",
+        "CREATE TABLE extract_test.metrics_jan PARTITION OF extract_test.metrics "
+        "FOR VALUES FROM ('2026-01-01') TO ('2026-02-01')",
+        "CREATE TABLE extract_test.metrics_feb PARTITION OF extract_test.metrics "
+        "FOR VALUES FROM ('2026-02-01') TO ('2026-03-01')",
+        "INSERT INTO extract_test.metrics "
+        "SELECT '2026-01-01'::date + i, i FROM generate_series(0, 49) AS i",
+    )
+    source = client.post(
+        "/api/v1/database-sources",
+        headers=headers,
+        json={
+            "name": "extract-pg",
+            "title": "Extract",
+            "engine": "postgresql",
+            "host": settings.db_host,
+            "port": settings.db_port,
+            "database": settings.db_name,
+            "login": settings.db_user,
+            "password": settings.db_pass or None,
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+    storage = client.post(
+        "/api/v1/s3_storages",
+        headers=headers,
+        json={
+            "name": "extract-s3",
+            "title": "Lake",
+            "region": "us-east-1",
+            "access_key": "testing",
+            "secret_key": "testing",
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+    yield source, storage
+    execute_sql("DROP SCHEMA extract_test CASCADE")
+
+
+async def _extract(source_id: int, storage_id: int, spec: ExtractionSpec) -> dict:
+    async with AsyncSession(get_engine()) as session:
+        source = await session.get(DatabaseSource, source_id)
+        storage = await session.get(S3Storage, storage_id)
+        return await run_extraction(session, source, storage, spec)
+
+
+def _read_parquet(s3, key: str):
+    body = s3.get_object(Bucket=BUCKET, Key=key)["Body"].read()
+    return pq.ParquetFile(io.BytesIO(body))
+
+
+@pytest.mark.asyncio
+async def test_extraction_by_key_range(extraction_setup, s3):
+    source, storage = extraction_setup
+    spec = ExtractionSpec(
+        table="events",
+        schema_name="extract_test",
+        storage_id=storage["id"],
+        bucket=BUCKET,
+        prefix="raw/",
+        key_column="id",
+        chunks=4,
+        parallelism=2,
+        row_group_rows=500,
+    )
+    summary = await _extract(source["id"], storage["id"], spec)
+    assert summary["chunks"] == 4
+    assert summary["extracted"] == 4
+    assert summary["rows"] == 5001
+    assert summary["objects"][0] == (
+        f"s3://{BUCKET}/raw/extract_test.events/part-00000.parquet"
+    )
+
+    ids = []
+    for index in range(4):
+        parquet = _read_parquet(s3, f"raw/extract_test.events/part-{index:05d}.parquet")
+        # Rows were written in row group sized batches
+        assert parquet.metadata.num_row_groups == 3
+        assert max(
+            parquet.metadata.row_group(i).num_rows for i in range(3)
+        ) == 500
+        ids.extend(parquet.read(columns=["id"]).column("id").to_pylist())
+    assert sorted(i for i in ids if i is not None) == list(range(1, 5001))
+    assert ids.count(None) == 1
+
+    rows = _read_parquet(s3, "raw/extract_test.events/part-00001.parquet").read()
+    assert str(rows.schema.field("amount").type) == "decimal128(10, 2)"
+    assert str(rows.schema.field("happened").type) == "timestamp[us, tz=UTC]"
+    first = rows.slice(0, 1).to_pylist()[0]
+    assert first["id"] == 1251
+    assert first["payload"] == '{"n": 1251}'
+
+
+@pytest.mark.asyncio
+async def test_extraction_by_partition(extraction_setup, s3):
+    source, storage = extraction_setup
+    spec = ExtractionSpec(
+        table="metrics",
+        schema_name="extract_test",
+        storage_id=storage["id"],
+        bucket=BUCKET,
+    )
+    summary = await _extract(source["id"], storage["id"], spec)
+    assert summary["chunks"] == 2
+    assert summary["rows"] == 50
+
+    async with AsyncSession(get_engine()) as session:
+        result = await session.exec(
+            select(ExtractionCheckpoint).order_by(ExtractionCheckpoint.chunk_index)
+        )
+        checkpoints = result.all()
+    assert [c.chunk["relation"] for c in checkpoints] == [
+        ["extract_test", "metrics_feb"],
+        ["extract_test", "metrics_jan"],
+    ]
+    assert [c.rows for c in checkpoints] == [19, 31]
+
+
+@pytest.mark.asyncio
+async def test_failed_extraction_resumes(extraction_setup, s3, execute_sql):
+    source, storage = extraction_setup
+    spec = ExtractionSpec(
+        table="events",
+        schema_name="extract_test",
+        storage_id=storage["id"],
+        bucket=BUCKET,
+        key_column="id",
+        chunks=4,
+    )
+    real_extract = extract.extract_chunk
+
+    def flaky_extract(engine, client, spec, chunk, columns, object_key):
+        if chunk["lower"] == 2501:
+            raise ConnectionError("connection reset")
+        return real_extract(engine, client, spec, chunk, columns, object_key)
+
+    with patch.object(extract, "extract_chunk", flaky_extract):
+        with pytest.raises(RuntimeError, match="1 of 4 chunks failed"):
+            await _extract(source["id"], storage["id"], spec)
+
+    async with AsyncSession(get_engine()) as session:
+        result = await session.exec(select(ExtractionCheckpoint))
+        statuses = {c.chunk["lower"]: (c.status, c.error) for c in result.all()}
+    assert statuses[2501] == (ChunkStatus.FAILED, "connection reset")
+    assert sum(1 for status, _ in statuses.values() if status == ChunkStatus.DONE) == 3
+
+    # Rows added meanwhile do not change the chunk layout of the resumed run
+    execute_sql("INSERT INTO extract_test.events (id) VALUES (9999)")
+    summary = await _extract(source["id"], storage["id"], spec)
+    assert summary["extracted"] == 1
+    assert summary["skipped"] == 3
+    assert summary["rows"] == 5001
+
+    # A completed extraction starts over as a new snapshot
+    summary = await _extract(source["id"], storage["id"], spec)
+    assert summary["extracted"] == 4
+    assert summary["rows"] == 5002
+
+
+def test_multipart_writer(s3):
+    payload = bytes(range(256)) * (MIN_PART_SIZE // 256) * 2 + b"tail"
+    with S3MultipartWriter(s3, BUCKET, "big.bin", part_size=MIN_PART_SIZE) as writer:
+        for offset in range(0, len(payload), 1024 * 1024):
+            writer.write(payload[offset : offset + 1024 * 1024])
+    assert [p["PartNumber"] for p in writer.parts] == [1, 2, 3]
+    assert s3.get_object(Bucket=BUCKET, Key="big.bin")["Body"].read() == payload
+
+    with S3MultipartWriter(s3, BUCKET, "small.bin", part_size=MIN_PART_SIZE) as writer:
+        writer.write(b"hello")
+    assert writer.upload_id is None
+    assert s3.get_object(Bucket=BUCKET, Key="small.bin")["Body"].read() == b"hello"
+
+    with pytest.raises(RuntimeError):
+        with S3MultipartWriter(s3, BUCKET, "broken.bin", part_size=MIN_PART_SIZE) as writer:
+            writer.write(payload)
+            raise RuntimeError("source failed")
+    assert s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads", []) == []
+    assert "Contents" not in s3.list_objects_v2(Bucket=BUCKET, Prefix="broken")
+
+    with pytest.raises(ValueError):
+        S3MultipartWriter(s3, BUCKET, "x", part_size=1024)
+
+
+def test_extract_action(client: TestClient, test_project, extraction_setup):
+    source, storage = extraction_setup
+    headers = {"X-Project-Id": str(test_project["id"])}
+    url = f"/api/v1/database-sources/{source['id']}/_actions"
+    parameters = {
+        "table": "events",
+        "schema_name": "extract_test",
+        "storage_id": storage["id"],
+        "bucket": BUCKET,
+        "key_column": "id",
+    }
+
+    with patch("mindweaver.tasks.ingestion.extract_database_table_task.delay") as mock_delay:
+        resp = client.post(
+            url,
+            headers=headers,
+            json={"action": "extract_to_s3", "parameters": {**parameters, "chunks": 0}},
+        )
+        assert resp.status_code == 422
+        resp = client.post(
+            url,
+            headers=headers,
+            json={
+                "action": "extract_to_s3",
+                "parameters": {**parameters, "storage_id": storage["id"] + 100},
+            },
+        )
+        assert resp.status_code == 422
+        mock_delay.assert_not_called()
+
+        resp = client.post(
+            url, headers=headers, json={"action": "extract_to_s3", "parameters": parameters}
+        )
+        resp.raise_for_status()
+        job_id = resp.json()["job_id"]
+        expected = ExtractionSpec(**parameters).model_dump()
+        mock_delay.assert_called_once_with(source["id"], job_id=job_id, parameters=expected)
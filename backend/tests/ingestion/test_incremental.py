@@ -0,0 +1,223 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import io
+from unittest.mock import patch
+
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.config import settings
+from mindweaver.datasource_service.database_source import DatabaseSource
+from mindweaver.fw.model import get_engine
+from mindweaver.ingestion import IncrementalSpec, IngestionState, run_incremental
+from mindweaver.service.s3_storage import S3Storage
+
+BUCKET = "lake"
+
+
+@pytest.fixture
+def ingestion_setup(client: TestClient, test_project, s3, execute_sql):
+    headers = {"X-Project-Id": str(test_project["id"])}
+    execute_sql(
+        "CREATE SCHEMA ingest_test",
+        "CREATE TABLE ingest_test.orders ("
+        "id bigint PRIMARY KEY, status text, updated timestamptz)",
+        "INSERT INTO ingest_test.orders "
+        "SELECT i, 'new', '2026-01-01'::timestamptz + i * interval '1 minute' "
+        "FROM generate_series(1, 1000) AS i",
+    )
+    source = client.post(
+        "/api/v1/database-sources",
+        headers=headers,
+        json={
+            "name": "ingest-pg",
+            "title": "Ingest",
+            "engine": "postgresql",
+            "host": settings.db_host,
+            "port": settings.db_port,
+            "database": settings.db_name,
+            "login": settings.db_user,
+            "password": settings.db_pass or None,
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+    storage = client.post(
+        "/api/v1/s3_storages",
+        headers=headers,
+        json={
+            "name": "ingest-s3",
+            "title": "Lake",
+            "region": "us-east-1",
+            "access_key": "testing",
+            "secret_key": "testing",
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+    yield source, storage
+    execute_sql("DROP SCHEMA ingest_test CASCADE")
+
+
+async def _ingest(
+    source_id: int, storage_id: int, spec: IncrementalSpec, on_progress=None
+) -> dict:
+    async with AsyncSession(get_engine()) as session:
+        source = await session.get(DatabaseSource, source_id)
+        storage = await session.get(S3Storage, storage_id)
+        return await run_incremental(
+            session, source, storage, spec, on_progress=on_progress
+        )
+
+
+def _changelog(s3, prefix: str) -> list[dict]:
+    listing = s3.list_objects_v2(Bucket=BUCKET, Prefix=prefix)
+    rows = []
+    for obj in sorted(listing.get("Contents", []), key=lambda o: o["Key"]):
+        body = s3.get_object(Bucket=BUCKET, Key=obj["Key"])["Body"].read()
+        rows.extend(pq.read_table(io.BytesIO(body)).to_pylist())
+    return rows
+
+
+@pytest.mark.asyncio
+async def test_ingestion_by_key(ingestion_setup, s3, execute_sql):
+    source, storage = ingestion_setup
+    spec = IncrementalSpec(
+        table="orders",
+        schema_name="ingest_test",
+        storage_id=storage["id"],
+        bucket=BUCKET,
+        prefix="cdc",
+        watermark_column="id",
+        row_group_rows=300,
+    )
+    ticks = []
+
+    async def on_progress():
+        ticks.append(1)
+
+    summary = await _ingest(source["id"], storage["id"], spec, on_progress)
+    # Long runs report progress from the batches written in the thread
+    assert ticks
+    assert summary["run"] == 1
+    assert summary["rows"] == 1000
+    assert summary["bytes"] > 0
+    assert summary["rows_per_sec"] > 0
+    assert summary["watermark"] == {"type": "int", "value": 1000}
+
+    rows = _changelog(s3, "cdc/ingest_test.orders/_ingest_date=")
+    assert len(rows) == 1000
+    assert {r["_op"] for r in rows} == {"upsert"}
+
+    # Nothing new, no object is written
+    summary = await _ingest(source["id"], storage["id"], spec)
+    assert summary["rows"] == 0
+    assert summary["bytes"] == 0
+
+    execute_sql("INSERT INTO ingest_test.orders VALUES (1001, 'new', now()), (1002, 'new', now())")
+    summary = await _ingest(source["id"], storage["id"], spec)
+    assert summary["run"] == 3
+    assert summary["rows"] == 2
+    rows = _changelog(s3, "cdc/ingest_test.orders/_ingest_date=")
+    assert sorted(r["id"] for r in rows)[-3:] == [1000, 1001, 1002]
+    assert len(rows) == 1002
+
+    async with AsyncSession(get_engine()) as session:
+        state = (await session.exec(select(IngestionState))).one()
+    assert state.runs == 3
+    assert state.watermark == {"type": "int", "value": 1002}
+    assert state.total_rows == 1002
+    assert state.last_rows == 2
+
+
+@pytest.mark.asyncio
+async def test_ingestion_by_timestamp_with_deletes(ingestion_setup, s3, execute_sql):
+    source, storage = ingestion_setup
+    spec = IncrementalSpec(
+        table="orders",
+        schema_name="ingest_test",
+        storage_id=storage["id"],
+        bucket=BUCKET,
+        mode="updated_at",
+        watermark_column="updated",
+        primary_key=["id"],
+        detect_deletes=True,
+    )
+    summary = await _ingest(source["id"], storage["id"], spec)
+    assert summary["rows"] == 1000
+    assert summary["deleted"] == 0
+
+    execute_sql(
+        "UPDATE ingest_test.orders SET status = 'paid', updated = '2027-01-01' "
+        "WHERE id IN (10, 20)",
+        "DELETE FROM ingest_test.orders WHERE id IN (5, 500)",
+    )
+    summary = await _ingest(source["id"], storage["id"], spec)
+    assert summary["rows"] == 2
+    assert summary["deleted"] == 2
+    assert summary["watermark"]["type"] == "datetime"
+
+    rows = _changelog(s3, "ingest_test.orders/_ingest_date=")
+    assert sorted(r["id"] for r in rows if r["_op"] == "delete") == [5, 500]
+    updates = [r for r in rows if r["_op"] == "upsert" and r["status"] == "paid"]
+    assert sorted(r["id"] for r in updates) == [10, 20]
+
+    # Unchanged keys leave the snapshots and the changelog alone
+    summary = await _ingest(source["id"], storage["id"], spec)
+    assert summary["rows"] == 0
+    assert summary["deleted"] == 0
+
+    # Re-inserting and deleting again is noticed from the new snapshots
+    execute_sql(
+        "INSERT INTO ingest_test.orders VALUES (5, 'new', '2027-02-01')",
+        "DELETE FROM ingest_test.orders WHERE id = 1000",
+    )
+    summary = await _ingest(source["id"], storage["id"], spec)
+    assert summary["rows"] == 1
+    assert summary["deleted"] == 1
+    snapshots = s3.list_objects_v2(Bucket=BUCKET, Prefix="ingest_test.orders/_keys/")
+    keys = [o["Key"] for o in snapshots["Contents"]]
+    # Rewritten snapshots replace the ones of earlier runs
+    assert len(keys) == len({k.rsplit("/", 1)[1] for k in keys})
+    assert sum(len(_changelog(s3, k)) for k in keys) == 998
+
+
+def test_ingest_action(client: TestClient, test_project, ingestion_setup):
+    source, storage = ingestion_setup
+    headers = {"X-Project-Id": str(test_project["id"])}
+    url = f"/api/v1/database-sources/{source['id']}/_actions"
+    parameters = {
+        "table": "orders",
+        "schema_name": "ingest_test",
+        "storage_id": storage["id"],
+        "bucket": BUCKET,
+        "watermark_column": "id",
+    }
+
+    with patch("mindweaver.tasks.ingestion.ingest_database_table_task.delay") as mock_delay:
+        resp = client.post(
+            url,
+            headers=headers,
+            json={
+                "action": "ingest_incremental",
+                "parameters": {**parameters, "detect_deletes": True},
+            },
+        )
+        assert resp.status_code == 422
+        mock_delay.assert_not_called()
+
+        resp = client.post(
+            url,
+            headers=headers,
+            json={"action": "ingest_incremental", "parameters": parameters},
+        )
+        resp.raise_for_status()
+        job_id = resp.json()["job_id"]
+        expected = IncrementalSpec(**parameters).model_dump()
+        mock_delay.assert_called_once_with(source["id"], job_id=job_id, parameters=expected)
+
+    resp = client.get(f"/api/v1/database-sources/{source['id']}/_ingestions", headers=headers)
+    resp.raise_for_status()
+    assert resp.json()["data"] == []
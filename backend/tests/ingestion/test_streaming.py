@@ -0,0 +1,303 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import gzip
+import io
+import json
+from unittest.mock import patch
+
+import pyarrow.parquet as pq
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.datasource_service.streaming_source import StreamingSource
+from mindweaver.fw.model import get_engine
+from mindweaver.ingestion import (
+    StreamOffset,
+    StreamSpec,
+    run_stream_ingestion,
+    streaming,
+)
+from mindweaver.service.s3_storage import S3Storage
+
+BUCKET = "lake"
+
+
+@pytest.fixture
+def stream_setup(client: TestClient, test_project, broker, s3):
+    headers = {"X-Project-Id": str(test_project["id"])}
+    source = client.post(
+        "/api/v1/streaming-sources",
+        headers=headers,
+        json={
+            "name": "events-stream",
+            "title": "Events",
+            "broker_type": "memory",
+            "bootstrap_servers": broker.name,
+            "topic": "events",
+            "group_id": "lake-loader",
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+    storage = client.post(
+        "/api/v1/s3_storages",
+        headers=headers,
+        json={
+            "name": "stream-s3",
+            "title": "Lake",
+            "region": "us-east-1",
+            "access_key": "testing",
+            "secret_key": "testing",
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+    return source, storage
+
+
+def _produce(broker, start: int, count: int):
+    for i in range(start, start + count):
+        broker.produce("events", json.dumps({"n": i}).encode(), partition=i % 2)
+
+
+async def _consume(
+    source_id: int, storage_id: int, spec: StreamSpec, on_progress=None
+) -> dict:
+    async with AsyncSession(get_engine()) as session:
+        source = await session.get(StreamingSource, source_id)
+        storage = await session.get(S3Storage, storage_id)
+        return await run_stream_ingestion(
+            session, source, storage, spec, on_progress=on_progress
+        )
+
+
+def _objects(s3, prefix: str) -> list[str]:
+    listing = s3.list_objects_v2(Bucket=BUCKET, Prefix=prefix)
+    return sorted(o["Key"] for o in listing.get("Contents", []))
+
+
+def _jsonl(s3, key: str) -> list[dict]:
+    body = gzip.decompress(s3.get_object(Bucket=BUCKET, Key=key)["Body"].read())
+    return [json.loads(line) for line in body.splitlines()]
+
+
+async def _offsets() -> dict[int, StreamOffset]:
+    async with AsyncSession(get_engine()) as session:
+        result = await session.exec(select(StreamOffset))
+        return {row.partition: row for row in result.all()}
+
+
+@pytest.mark.asyncio
+async def test_micro_batches_commit_after_write(stream_setup, broker, s3):
+    source, storage = stream_setup
+    _produce(broker, 0, 250)
+    spec = StreamSpec(
+        storage_id=storage["id"],
+        bucket=BUCKET,
+        prefix="stream",
+        batch_max_records=100,
+        poll_records=40,
+        poll_timeout_seconds=0.02,
+        idle_seconds=0.2,
+    )
+    summary = await _consume(source["id"], storage["id"], spec)
+    assert summary["batches"] == 3
+    assert summary["records"] == 250
+
+    keys = _objects(s3, "stream/events/date=")
+    assert len(keys) == 3
+    assert all(key.endswith(".jsonl.gz") for key in keys)
+    records = [r for key in keys for r in _jsonl(s3, key)]
+    assert sorted(r["value"]["n"] for r in records) == list(range(250))
+    assert records[0]["topic"] == "events"
+
+    assert broker.committed[("lake-loader", "events", 0)] == 125
+    assert broker.committed[("lake-loader", "events", 1)] == 125
+    offsets = await _offsets()
+    assert offsets[0].committed_offset == 125
+    assert offsets[0].lag == 0
+    assert offsets[0].records + offsets[1].records == 250
+    assert offsets[0].bytes > 0
+
+    # The next run only reads what was produced since
+    _produce(broker, 250, 30)
+    summary = await _consume(source["id"], storage["id"], spec)
+    assert summary["records"] == 30
+    assert offsets[0].batches + 1 == (await _offsets())[0].batches
+
+
+@pytest.mark.asyncio
+async def test_failed_write_is_redelivered(stream_setup, broker, s3):
+    source, storage = stream_setup
+    _produce(broker, 0, 20)
+    spec = StreamSpec(
+        storage_id=storage["id"],
+        bucket=BUCKET,
+        poll_timeout_seconds=0.02,
+        idle_seconds=0.1,
+    )
+    with patch.object(streaming, "write_batch", side_effect=ConnectionError("S3 down")):
+        with pytest.raises(ConnectionError):
+            await _consume(source["id"], storage["id"], spec)
+    assert ("lake-loader", "events", 0) not in broker.committed
+    assert _objects(s3, "events/") == []
+
+    summary = await _consume(source["id"], storage["id"], spec)
+    assert summary["records"] == 20
+    assert broker.committed[("lake-loader", "events", 1)] == 10
+
+
+@pytest.mark.asyncio
+async def test_time_based_parquet_batches(stream_setup, broker, s3):
+    source, storage = stream_setup
+    _produce(broker, 0, 5)
+    spec = StreamSpec(
+        storage_id=storage["id"],
+        bucket=BUCKET,
+        format="parquet",
+        compression="zstd",
+        batch_max_seconds=0.05,
+        poll_timeout_seconds=0.02,
+        max_batches=1,
+    )
+    summary = await _consume(source["id"], storage["id"], spec)
+    assert summary["batches"] == 1
+    key = _objects(s3, "events/")[0]
+    assert key.endswith(".parquet")
+    table = pq.read_table(io.BytesIO(s3.get_object(Bucket=BUCKET, Key=key)["Body"].read()))
+    assert table.num_rows == 5
+    assert json.loads(table.column("value")[0].as_py()) == {"n": 0}
+
+
+@pytest.mark.asyncio
+async def test_idle_consumer_reports_progress(stream_setup, s3, monkeypatch):
+    source, storage = stream_setup
+    monkeypatch.setattr(streaming, "PROGRESS_INTERVAL", 0.05)
+    reports = []
+
+    async def on_progress():
+        reports.append(1)
+
+    spec = StreamSpec(
+        storage_id=storage["id"], bucket=BUCKET, poll_timeout_seconds=0.02, run_seconds=0.5
+    )
+    summary = await _consume(source["id"], storage["id"], spec, on_progress)
+    # Nothing was flushed, the job is still kept alive
+    assert summary["batches"] == 0
+    assert 3 <= len(reports) <= 11
+
+
+def test_consume_action_and_offsets(client: TestClient, test_project, stream_setup):
+    source, storage = stream_setup
+    headers = {"X-Project-Id": str(test_project["id"])}
+    url = f"/api/v1/streaming-sources/{source['id']}"
+    parameters = {"storage_id": storage["id"], "bucket": BUCKET}
+
+    with patch("mindweaver.tasks.ingestion.consume_streaming_source_task.delay") as mock_delay:
+        resp = client.post(
+            f"{url}/_actions",
+            headers=headers,
+            json={
+                "action": "consume_to_s3",
+                "parameters": {**parameters, "compression": "zstd"},
+            },
+        )
+        assert resp.status_code == 422
+        resp = client.post(
+            f"{url}/_actions",
+            headers=headers,
+            json={"action": "consume_to_s3", "parameters": parameters},
+        )
+        resp.raise_for_status()
+        job_id = resp.json()["job_id"]
+        expected = StreamSpec(**parameters).model_dump()
+        mock_delay.assert_called_once_with(source["id"], job_id=job_id, parameters=expected)
+
+    resp = client.get(f"{url}/_offsets", headers=headers)
+    resp.raise_for_status()
+    assert resp.json() == {"data": [], "meta": {"lag": 0, "records": 0, "bytes": 0}}
+
+
+@pytest.mark.asyncio
+async def test_kafka_consumer(monkeypatch):
+    aiokafka = pytest.importorskip("aiokafka")
+    from aiokafka import TopicPartition
+    from aiokafka.structs import ConsumerRecord
+
+    from mindweaver.ingestion.brokers import KafkaConsumer, open_consumer
+
+    class FakeConsumer:
+        def __init__(self, topic, **options):
+            self.topic, self.options = topic, options
+            self.committed_offsets = {}
+
+        async def start(self):
+            pass
+
+        async def stop(self):
+            pass
+
+        async def getmany(self, timeout_ms, max_records):
+            tp = TopicPartition(self.topic, 1)
+            return {
+                tp: [ConsumerRecord(self.topic, 1, 7, 1000, 0, b"k", b"v", None, 1, 1, [])]
+            }
+
+        async def commit(self, offsets):
+            self.committed_offsets.update(offsets)
+
+        def assignment(self):
+            return {TopicPartition(self.topic, 0), TopicPartition(self.topic, 1)}
+
+        async def end_offsets(self, partitions):
+            return {tp: 10 for tp in partitions}
+
+        async def committed(self, tp):
+            return self.committed_offsets.get(tp)
+
+    monkeypatch.setattr(aiokafka, "AIOKafkaConsumer", FakeConsumer)
+    config = {
+        "broker_type": "kafka",
+        "bootstrap_servers": "kafka-0:9092",
+        "login": "loader",
+        "password": "secret",
+        "enable_ssl": True,
+        "extra_config": {"sasl_mechanism": "SCRAM-SHA-512", "max_poll_records": 50},
+    }
+    consumer = open_consumer(config, "events", "lake-loader")
+    assert isinstance(consumer, KafkaConsumer)
+    await consumer.start()
+    assert consumer.consumer.topic == "events"
+    assert consumer.consumer.options == {
+        "bootstrap_servers": "kafka-0:9092",
+        "group_id": "lake-loader",
+        "enable_auto_commit": False,
+        "auto_offset_reset": "earliest",
+        "security_protocol": "SASL_SSL",
+        # extra_config overrides the defaults
+        "sasl_mechanism": "SCRAM-SHA-512",
+        "sasl_plain_username": "loader",
+        "sasl_plain_password": "secret",
+        "max_poll_records": 50,
+    }
+
+    messages = await consumer.poll(10, 0.1)
+    assert [(m.partition, m.offset, m.key, m.value, m.timestamp) for m in messages] == [
+        (1, 7, b"k", b"v", 1000)
+    ]
+
+    await consumer.commit({1: 8})
+    assert consumer.consumer.committed_offsets == {TopicPartition("events", 1): 8}
+    assert await consumer.offsets() == {0: (None, 10), 1: (8, 10)}
+    await consumer.close()
+
+    # Without credentials SSL alone selects the protocol
+    consumer = open_consumer(
+        {"broker_type": "kafka", "bootstrap_servers": "kafka-0:9093", "enable_ssl": True},
+        "events",
+        "lake-loader",
+    )
+    await consumer.start()
+    assert consumer.consumer.options["security_protocol"] == "SSL"
+    assert "sasl_mechanism" not in consumer.consumer.options
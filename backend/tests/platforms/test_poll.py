@@ -7,6 +7,7 @@ from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine
 from mindweaver.config import settings
+from mindweaver.fw.context import system_request
 from mindweaver.platform_service.pgsql import (
     PgSqlPlatformService,
     PgSqlPlatform,
@@ -85,10 +86,7 @@ async def test_pgsql_poll_status(postgresql_proc, test_project):
             ]
 
             # 4. Execute poll_status
-            class MockRequest:
-                headers = {}
-
-            svc = PgSqlPlatformService(MockRequest(), session)
+            svc = PgSqlPlatformService(system_request(), session)
             await svc.poll_status(platform)
 
             # 5. Verify database update
@@ -104,3 +104,97 @@ def test_platform_state_api(client: TestClient, test_project):
         assert state["active"] is True  # Should remain unchanged
         assert state["message"] == "Something went wrong"
         assert state["extra_data"] == {"nodes": 3}  # Should remain unchanged
+
+
+def _create_pgsql(client: TestClient, project: dict, name: str) -> int:
+    resp = client.post(
+        "/api/v1/platform/pgsql",
+        json={
+            "name": name,
+            "title": name,
+            "project_id": project["id"],
+            "instances": 1,
+            "storage_size": "1Gi",
+        },
+        headers={"X-Project-Id": str(project["id"])},
+    )
+    resp.raise_for_status()
+    return resp.json()["data"]["id"]
+
+
+def test_platform_bulk_states(client: TestClient, test_project, test_cluster):
+    from sqlmodel import Session, create_engine
+    from mindweaver.config import settings
+    from mindweaver.crypto import encrypt_password
+    from mindweaver.platform_service.pgsql.model import PgSqlPlatformState
+
+    other_project = client.post(
+        "/api/v1/projects",
+        json={
+            "name": "other-project",
+            "title": "Other Project",
+            "k8s_cluster_id": test_cluster["id"],
+        },
+    ).json()["data"]
+    headers = {"X-Project-Id": str(test_project["id"])}
+
+    with patch(
+        "mindweaver.platform_service.base.PlatformService.deploy", return_value=None
+    ), patch(
+        "mindweaver.platform_service.base.PlatformService.decommission",
+        return_value=None,
+    ):
+        with_state = _create_pgsql(client, test_project, "bulk-pg-1")
+        without_state = _create_pgsql(client, test_project, "bulk-pg-2")
+        other = _create_pgsql(client, other_project, "bulk-pg-3")
+
+    engine = create_engine(settings.db_uri)
+    with Session(engine) as session:
+        session.add(
+            PgSqlPlatformState(
+                platform_id=with_state,
+                status="online",
+                db_pass=encrypt_password("s3cret"),
+            )
+        )
+        session.commit()
+
+    # Explicit ids, secrets stay redacted by default
+    resp = client.get(
+        "/api/v1/platform/pgsql/_states",
+        params={"ids": f"{with_state},{without_state}"},
+        headers=headers,
+    )
+    resp.raise_for_status()
+    data = resp.json()["data"]
+    assert set(data) == {str(with_state), str(without_state)}
+    assert data[str(with_state)]["status"] == "online"
+    assert data[str(with_state)]["db_pass"] == "__REDACTED__"
+    assert data[str(without_state)] == {}
+
+    resp = client.get(
+        "/api/v1/platform/pgsql/_states",
+        params={"ids": str(with_state), "include_secrets": "true"},
+        headers=headers,
+    )
+    resp.raise_for_status()
+    assert resp.json()["data"][str(with_state)]["db_pass"] == "s3cret"
+
+    # ids=all is limited to the current project
+    resp = client.get(
+        "/api/v1/platform/pgsql/_states", params={"ids": "all"}, headers=headers
+    )
+    resp.raise_for_status()
+    assert set(resp.json()["data"]) == {str(with_state), str(without_state)}
+
+    # Platforms of other projects are not reachable by id either
+    resp = client.get(
+        "/api/v1/platform/pgsql/_states", params={"ids": str(other)}, headers=headers
+    )
+    resp.raise_for_status()
+    assert resp.json()["data"] == {}
+
+    resp = client.get(
+        "/api/v1/platform/pgsql/_states", params={"ids": "1,abc"}, headers=headers
+    )
+    assert resp.status_code == 422
@@ -1,8 +1,11 @@
 # SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
 # SPDX-License-Identifier: AGPLv3+
 
+import asyncio
+import hashlib
+import json
 import pytest
-from unittest.mock import MagicMock, patch, call
+from unittest.mock import AsyncMock, MagicMock, patch, call
 from fastapi.testclient import TestClient
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine
@@ -12,10 +15,64 @@ from mindweaver.service.k8s_cluster.model import (
     K8sCluster,
 )
 from mindweaver.config import settings
+from mindweaver.service.k8s_cluster.discovery import (
+    clear_version_cache,
+    latest_helm_release,
+)
+from mindweaver.service.k8s_cluster.allocation import pod_requests
+from mindweaver.fw.util import parse_k8s_quantity
+
+
+def _metadata_response(items: list[dict], continue_token: str | None = None):
+    """Builds a raw PartialObjectMetadataList response as returned by the API"""
+    resp = MagicMock()
+    resp.data = json.dumps(
+        {
+            "kind": "PartialObjectMetadataList",
+            "apiVersion": "meta.k8s.io/v1",
+            "metadata": {"continue": continue_token} if continue_token else {},
+            "items": [
+                {
+                    "kind": "PartialObjectMetadata",
+                    "apiVersion": "meta.k8s.io/v1",
+                    "metadata": item,
+                }
+                for item in items
+            ],
+        }
+    ).encode()
+    return resp
+
+
+def _pod_list_response(pods: list[dict], continue_token: str | None = None):
+    """Builds a raw PodList response as returned by the API"""
+    resp = MagicMock()
+    resp.data = json.dumps(
+        {
+            "kind": "PodList",
+            "apiVersion": "v1",
+            "metadata": {"continue": continue_token} if continue_token else {},
+            "items": pods,
+        }
+    ).encode()
+    return resp
+
+
+def _pod(name, namespace, node, cpu, memory):
+    return {
+        "metadata": {"name": name, "namespace": namespace},
+        "spec": {
+            "nodeName": node,
+            "containers": [
+                {"name": "main", "resources": {"requests": {"cpu": cpu, "memory": memory}}}
+            ],
+        },
+    }
 
 
 @pytest.fixture
 def mock_k8s():
+    clear_version_cache()
     with patch(
         "mindweaver.service.k8s_cluster.service.config.load_incluster_config"
     ), patch(
@@ -34,18 +91,17 @@ def mock_k8s():
         mock_node.metadata.name = "node-1"
         mock_node.status.conditions = [MagicMock(type="Ready", status="True")]
         mock_node.status.capacity = {"cpu": "2", "memory": "4Gi"}
+        mock_node.status.allocatable = {"cpu": "1900m", "memory": "3584Mi"}
 
         mock_nodes_list = MagicMock()
         mock_nodes_list.items = [mock_node]
         mock_core.return_value.list_node.return_value = mock_nodes_list
 
-        # Mock Services (ArgoCD)
-        mock_svc = MagicMock()
-        mock_svc.metadata.name = "argocd-server"
-        mock_svc_list = MagicMock()
-        mock_svc_list.items = [mock_svc]
-        mock_core.return_value.list_service_for_all_namespaces.return_value = (
-            mock_svc_list
+        # Mock Services (ArgoCD), metadata-only listing
+        mock_core.return_value.list_service_for_all_namespaces.side_effect = (
+            lambda **kwargs: _metadata_response(
+                [{"name": "argocd-server", "namespace": "argocd"}]
+            )
         )
 
         # Mock Pods (ArgoCD version)
@@ -65,7 +121,16 @@ def mock_k8s():
             MagicMock(image="ghcr.io/cloudnative-pg/cloudnative-pg:1.28.1")
         ]
 
-        def _mock_list_pod_for_all_namespaces(label_selector=None):
+        # Mock Pods (allocation), raw listing of scheduled pods
+        pods = [
+            _pod("web-1", "test-project", "node-1", "500m", "1Gi"),
+            _pod("web-2", "test-project", "node-1", "250m", "512Mi"),
+            _pod("argocd-server", "argocd", "node-1", "0.1", "256Mi"),
+        ]
+
+        def _mock_list_pod_for_all_namespaces(label_selector=None, **kwargs):
+            if kwargs.get("field_selector"):
+                return _pod_list_response(pods)
             m_list = MagicMock()
             if "argocd-server" in label_selector:
                 m_list.items = [mock_pod_argo]
@@ -81,21 +146,42 @@ def mock_k8s():
             _mock_list_pod_for_all_namespaces
         )
 
-        # Mock Secrets (Helm Release)
-        mock_secret_argo = MagicMock()
-        mock_secret_argo.metadata.name = "sh.helm.release.v1.argocd.v1"
-        mock_secret_cm = MagicMock()
-        mock_secret_cm.metadata.name = "sh.helm.release.v1.cert-manager.v1"
-        mock_secret_cnpg = MagicMock()
-        mock_secret_cnpg.metadata.name = "sh.helm.release.v1.cnpg.v1"
-
-        mock_secret_list = MagicMock()
-        mock_secret_list.items = [mock_secret_argo, mock_secret_cm, mock_secret_cnpg]
-        mock_core.return_value.list_secret_for_all_namespaces.return_value = (
-            mock_secret_list
+        # Mock Secrets (Helm Release), metadata-only listing
+        releases = {
+            "argocd": {"namespace": "argocd", "version": "1"},
+            "cert-manager": {"namespace": "cert-manager", "version": "1"},
+            "cnpg": {"namespace": "cnpg-system", "version": "1"},
+        }
+
+        def _mock_list_secret_for_all_namespaces(label_selector=None, **kwargs):
+            for name, release in releases.items():
+                if label_selector == f"owner=helm,name={name}":
+                    return _metadata_response(
+                        [
+                            {
+                                "name": f"sh.helm.release.v1.{name}.v{release['version']}",
+                                "namespace": release["namespace"],
+                                "labels": {
+                                    "owner": "helm",
+                                    "name": name,
+                                    "version": release["version"],
+                                    "status": "deployed",
+                                },
+                            }
+                        ]
+                    )
+            return _metadata_response([])
+
+        mock_core.return_value.list_secret_for_all_namespaces.side_effect = (
+            _mock_list_secret_for_all_namespaces
         )
 
-        yield {"core": mock_core, "version": mock_version}
+        yield {
+            "core": mock_core,
+            "version": mock_version,
+            "releases": releases,
+            "pods": pods,
+        }
 
 
 def test_poll_k8s_cluster_status(client: TestClient, mock_k8s):
@@ -131,139 +217,493 @@ def test_poll_k8s_cluster_status(client: TestClient, mock_k8s):
     assert data["cnpg_version"] == "1.28.1"
 
 
-@pytest.mark.asyncio
-async def test_install_argocd():
-    from mindweaver.service.k8s_cluster.service import K8sClusterService
+def test_poll_k8s_cluster_uses_metadata_only_listing(client: TestClient, mock_k8s):
+    p1 = client.post(
+        "/api/v1/k8s_clusters",
+        json={"name": "meta-test", "title": "Meta Test", "type": "in-cluster"},
+    ).json()["data"]
 
-    cluster = K8sCluster(
-        name="test-cluster-argo",
-        title="Test Cluster Argo",
-        type=K8sClusterType.REMOTE,
-        kubeconfig="fake-kubeconfig",
-    )
+    resp = client.post(f"/api/v1/k8s_clusters/{p1['id']}/_refresh")
+    assert resp.status_code == 200
 
-    mock_svc = MagicMock()
-    mock_svc.kubeconfig = pytest.importorskip("unittest.mock").AsyncMock(
-        return_value="fake-kubeconfig"
-    )
+    secret_calls = mock_k8s[
+        "core"
+    ].return_value.list_secret_for_all_namespaces.call_args_list
+    selectors = sorted(c.kwargs["label_selector"] for c in secret_calls)
+    assert selectors == [
+        "owner=helm,name=argocd",
+        "owner=helm,name=cert-manager",
+        "owner=helm,name=cnpg",
+    ]
+    for c in secret_calls:
+        assert c.kwargs["limit"] > 0
+        assert c.kwargs["_preload_content"] is False
+
+
+def test_poll_k8s_cluster_caches_version_until_revision_changes(
+    client: TestClient, mock_k8s
+):
+    p1 = client.post(
+        "/api/v1/k8s_clusters",
+        json={"name": "cache-test", "title": "Cache Test", "type": "in-cluster"},
+    ).json()["data"]
+    list_pods = mock_k8s["core"].return_value.list_pod_for_all_namespaces
 
-    from mindweaver.service.k8s_cluster.actions import InstallArgoCDAction
+    def _version_lookups():
+        return [
+            c.kwargs["label_selector"]
+            for c in list_pods.call_args_list
+            if c.kwargs.get("label_selector")
+        ]
+
+    client.post(f"/api/v1/k8s_clusters/{p1['id']}/_refresh")
+    assert len(_version_lookups()) == 3
+
+    # Same release revisions, versions come from cache
+    client.post(f"/api/v1/k8s_clusters/{p1['id']}/_refresh")
+    assert len(_version_lookups()) == 3
 
-    with patch("asyncio.create_subprocess_exec") as mock_exec:
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0
-        mock_proc.communicate = pytest.importorskip("unittest.mock").AsyncMock(
-            return_value=(b"success", b"")
+    # ArgoCD upgraded, only its version is looked up again
+    mock_k8s["releases"]["argocd"]["version"] = "2"
+    client.post(f"/api/v1/k8s_clusters/{p1['id']}/_refresh")
+    assert len(_version_lookups()) == 4
+    assert "argocd-server" in _version_lookups()[-1]
+
+    data = client.get(f"/api/v1/k8s_clusters/{p1['id']}/_state").json()
+    assert data["argocd_version"] == "v2.8.0"
+
+
+def test_poll_k8s_cluster_release_not_installed(client: TestClient, mock_k8s):
+    mock_k8s["releases"].pop("cnpg")
+    mock_k8s["core"].return_value.list_service_for_all_namespaces.side_effect = (
+        lambda label_selector=None, **kwargs: _metadata_response(
+            [{"name": "argocd-server", "namespace": "argocd"}]
+            if "argocd-server" in label_selector
+            else []
         )
-        mock_exec.return_value = mock_proc
+    )
+    p1 = client.post(
+        "/api/v1/k8s_clusters",
+        json={"name": "missing-test", "title": "Missing Test", "type": "in-cluster"},
+    ).json()["data"]
+
+    client.post(f"/api/v1/k8s_clusters/{p1['id']}/_refresh")
 
-        action = InstallArgoCDAction(cluster, mock_svc)
-        await action.run()
+    data = client.get(f"/api/v1/k8s_clusters/{p1['id']}/_state").json()
+    assert data["cnpg_installed"] is False
+    assert data["cnpg_version"] is None
+    assert data["argocd_installed"] is True
 
-        # Verify helm repo add
-        # Verify helm upgrade --install
-        assert mock_exec.call_count >= 3  # add, update, upgrade
 
-        calls = [call[0] for call in mock_exec.call_args_list]
-        found_upgrade = False
-        for call_args in calls:
-            if "upgrade" in call_args and "--install" in call_args:
-                found_upgrade = True
-                assert "argo/argo-cd" in call_args
-                assert "--kubeconfig" in call_args
+def test_latest_helm_release_follows_continue_token():
+    pages = [
+        _metadata_response(
+            [
+                {
+                    "name": "sh.helm.release.v1.argocd.v1",
+                    "namespace": "argocd",
+                    "labels": {"version": "1", "status": "superseded"},
+                }
+            ],
+            continue_token="next-page",
+        ),
+        _metadata_response(
+            [
+                {
+                    "name": "sh.helm.release.v1.argocd.v2",
+                    "namespace": "argocd",
+                    "labels": {"version": "2", "status": "deployed"},
+                }
+            ]
+        ),
+    ]
+    core_v1_meta = MagicMock()
+    core_v1_meta.list_secret_for_all_namespaces.side_effect = pages
+
+    release = latest_helm_release(core_v1_meta, "argocd")
+
+    assert release == {"namespace": "argocd", "revision": 2, "status": "deployed"}
+    calls = core_v1_meta.list_secret_for_all_namespaces.call_args_list
+    assert len(calls) == 2
+    assert calls[0].kwargs["_continue"] is None
+    assert calls[1].kwargs["_continue"] == "next-page"
+
+
+def test_parse_k8s_quantity():
+    assert parse_k8s_quantity("100m") == pytest.approx(0.1)
+    assert parse_k8s_quantity("2") == 2.0
+    assert parse_k8s_quantity("1.5Gi") == 1.5 * 2**30
+    assert parse_k8s_quantity("128974848") == 128974848.0
+    assert parse_k8s_quantity("129e6") == 129e6
+    assert parse_k8s_quantity("129M") == 129e6
+    assert parse_k8s_quantity("123Mi") == 123 * 2**20
+    assert parse_k8s_quantity("1Ki") == 1024.0
+    assert parse_k8s_quantity("500n") == pytest.approx(5e-7)
+    assert parse_k8s_quantity("1E") == 1e18
+    assert parse_k8s_quantity(None) == 0.0
+    assert parse_k8s_quantity("") == 0.0
+    with pytest.raises(ValueError):
+        parse_k8s_quantity("12Xi")
+
+
+def test_pod_requests_accounts_for_init_containers():
+    spec = {
+        "initContainers": [
+            # Sidecar keeps running next to the app containers
+            {
+                "name": "proxy",
+                "restartPolicy": "Always",
+                "resources": {"requests": {"cpu": "100m", "memory": "64Mi"}},
+            },
+            # Regular init container only runs before the app starts
+            {
+                "name": "migrate",
+                "resources": {"requests": {"cpu": "2", "memory": "128Mi"}},
+            },
+        ],
+        "containers": [
+            {"name": "app", "resources": {"requests": {"cpu": "500m", "memory": "1Gi"}}},
+            {"name": "no-requests"},
+        ],
+        "overhead": {"cpu": "10m", "memory": "1Mi"},
+    }
+    cpu, memory = pod_requests(spec)
+    # init phase dominates CPU: 100m sidecar + 2 cores migrate
+    assert cpu == pytest.approx(2.1 + 0.01)
+    # app phase dominates memory: 64Mi sidecar + 1Gi app
+    assert memory == (64 + 1024 + 1) * 2**20
+
+
+def test_poll_k8s_cluster_allocation(client: TestClient, mock_k8s):
+    p1 = client.post(
+        "/api/v1/k8s_clusters",
+        json={"name": "alloc-test", "title": "Alloc Test", "type": "in-cluster"},
+    ).json()["data"]
+    resp = client.post(
+        "/api/v1/projects",
+        json={"name": "test-project", "title": "Test Project", "k8s_cluster_id": p1["id"]},
+    )
+    assert resp.status_code == 200, resp.json()
+
+    client.post(f"/api/v1/k8s_clusters/{p1['id']}/_refresh")
+
+    list_pods = mock_k8s["core"].return_value.list_pod_for_all_namespaces
+    alloc_calls = [
+        c for c in list_pods.call_args_list if c.kwargs.get("field_selector")
+    ]
+    assert len(alloc_calls) == 1
+    assert "status.phase!=Succeeded" in alloc_calls[0].kwargs["field_selector"]
+    assert "status.phase!=Failed" in alloc_calls[0].kwargs["field_selector"]
+    assert alloc_calls[0].kwargs["_preload_content"] is False
+
+    data = client.get(f"/api/v1/k8s_clusters/{p1['id']}/_state").json()
+    assert data["cpu_allocated"] == pytest.approx(0.85)
+    assert data["ram_allocated"] == pytest.approx(1.75)
+    assert data["nodes_allocation"]["node-1"]["pods"] == 3
+    assert data["nodes_allocation"]["node-1"]["cpu_allocatable"] == pytest.approx(1.9)
+    assert data["nodes_allocation"]["node-1"]["ram_allocatable"] == pytest.approx(3.5)
+    assert data["namespaces_allocation"]["argocd"]["cpu"] == pytest.approx(0.1)
+    project = data["projects_allocation"]["test-project"]
+    assert project["namespace"] == "test-project"
+    assert project["cpu"] == pytest.approx(0.75)
+    assert project["ram"] == pytest.approx(1.5)
+    assert project["pods"] == 2
+
+
+def test_poll_k8s_cluster_allocation_paginates(client: TestClient, mock_k8s):
+    pages = [
+        _pod_list_response(
+            [_pod("a", "ns-a", "node-1", "1", "1Gi")], continue_token="next-page"
+        ),
+        _pod_list_response([_pod("b", "ns-b", "node-2", "1", "1Gi")]),
+    ]
+
+    def _list_pods(label_selector=None, **kwargs):
+        if kwargs.get("field_selector"):
+            return pages.pop(0)
+        return MagicMock(items=[])
+
+    mock_k8s["core"].return_value.list_pod_for_all_namespaces.side_effect = _list_pods
+    p1 = client.post(
+        "/api/v1/k8s_clusters",
+        json={"name": "page-test", "title": "Page Test", "type": "in-cluster"},
+    ).json()["data"]
 
-        assert found_upgrade
+    client.post(f"/api/v1/k8s_clusters/{p1['id']}/_refresh")
 
+    data = client.get(f"/api/v1/k8s_clusters/{p1['id']}/_state").json()
+    assert data["cpu_allocated"] == 2.0
+    assert set(data["nodes_allocation"]) == {"node-1", "node-2"}
+    assert set(data["namespaces_allocation"]) == {"ns-a", "ns-b"}
 
-@pytest.mark.asyncio
-async def test_install_cert_manager():
-    from mindweaver.service.k8s_cluster.model import K8sCluster, K8sClusterType
 
-    cluster = K8sCluster(
-        name="test-cluster-cm",
-        title="Test Cluster CM",
+@pytest.fixture
+def helm_exec(tmp_path, monkeypatch):
+    """
+    Fakes helm/kubectl subprocesses with an empty chart cache. `helm pull`
+    writes an archive into its destination like the real command does.
+    """
+    monkeypatch.setattr(settings, "helm_chart_cache_dir", str(tmp_path / "helm"))
+
+    async def fake_exec(*args, **kwargs):
+        if "pull" in args:
+            name = args[args.index("pull") + 1]
+            version = args[args.index("--version") + 1]
+            destination = args[args.index("--destination") + 1]
+            with open(f"{destination}/{name}-{version}.tgz", "wb") as f:
+                f.write(f"{name}-{version}".encode())
+        proc = MagicMock()
+        proc.returncode = 0
+        proc.communicate = AsyncMock(return_value=(b"success", b""))
+        return proc
+
+    with patch("asyncio.create_subprocess_exec", side_effect=fake_exec) as mock_exec, patch(
+        "mindweaver.service.k8s_cluster.actions.wait_for_release", new=AsyncMock()
+    ) as mock_wait:
+        mock_exec.wait_for_release = mock_wait
+        yield mock_exec
+
+
+def _remote_cluster(name: str) -> K8sCluster:
+    return K8sCluster(
+        name=name,
+        title=name,
         type=K8sClusterType.REMOTE,
         kubeconfig="fake-kubeconfig",
     )
 
-    mock_svc = MagicMock()
-    mock_svc.kubeconfig = pytest.importorskip("unittest.mock").AsyncMock(
-        return_value="fake-kubeconfig"
-    )
 
-    from mindweaver.service.k8s_cluster.actions import InstallCertManagerAction
+def _helm_upgrades(mock_exec) -> list[tuple]:
+    return [
+        c.args
+        for c in mock_exec.call_args_list
+        if "upgrade" in c.args and "--install" in c.args
+    ]
 
-    with patch("asyncio.create_subprocess_exec") as mock_exec:
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0
-        mock_proc.communicate = pytest.importorskip("unittest.mock").AsyncMock(
-            return_value=(b"success", b"")
-        )
-        mock_exec.return_value = mock_proc
 
-        action = InstallCertManagerAction(cluster, mock_svc)
-        await action.run()
+@pytest.mark.asyncio
+async def test_install_argocd(helm_exec):
+    from mindweaver.service.k8s_cluster.actions import InstallArgoCDAction
 
-        # Verify helm repo add
-        # Verify helm upgrade --install
-        assert mock_exec.call_count >= 3  # add, update, upgrade
+    action = InstallArgoCDAction(_remote_cluster("test-cluster-argo"), MagicMock())
+    await action.run()
 
-        calls = [call[0] for call in mock_exec.call_args_list]
-        found_upgrade = False
-        for call_args in calls:
-            if "upgrade" in call_args and "--install" in call_args:
-                if "cert-manager" in call_args:
-                    found_upgrade = True
-                    assert "jetstack/cert-manager" in call_args
-                    assert "--kubeconfig" in call_args
-                    assert "installCRDs=true" in " ".join(call_args)
+    calls = [c.args for c in helm_exec.call_args_list]
+    # Charts are pulled by version, without touching the local repo list
+    assert not any("repo" in c for c in calls)
+    pulls = [c for c in calls if "pull" in c]
+    assert len(pulls) == 1
+    assert "argo-cd" in pulls[0]
+    assert "https://argoproj.github.io/argo-helm" in pulls[0]
 
-        assert found_upgrade
+    (upgrade,) = _helm_upgrades(helm_exec)
+    assert upgrade[upgrade.index("--install") + 1] == "argocd"
+    chart_path = upgrade[upgrade.index("--install") + 2]
+    assert chart_path.endswith(".tgz") and "/blobs/" in chart_path
+    assert "--kubeconfig" in upgrade
+    assert "--wait" not in upgrade
+    helm_exec.wait_for_release.assert_awaited_once()
+    assert helm_exec.wait_for_release.await_args.args[1:] == ("argocd", "argocd")
 
 
 @pytest.mark.asyncio
-async def test_install_cnpg():
-    from mindweaver.service.k8s_cluster.model import K8sCluster, K8sClusterType
+async def test_install_cert_manager(helm_exec):
+    from mindweaver.service.k8s_cluster.actions import InstallCertManagerAction
 
-    cluster = K8sCluster(
-        name="test-cluster-cnpg",
-        title="Test Cluster CNPG",
-        type=K8sClusterType.REMOTE,
-        kubeconfig="fake-kubeconfig",
-    )
+    action = InstallCertManagerAction(_remote_cluster("test-cluster-cm"), MagicMock())
+    await action.run()
+
+    (upgrade,) = _helm_upgrades(helm_exec)
+    assert "cert-manager" in upgrade
+    assert "--kubeconfig" in upgrade
+    assert "installCRDs=true" in " ".join(upgrade)
 
-    mock_svc = MagicMock()
-    mock_svc.kubeconfig = pytest.importorskip("unittest.mock").AsyncMock(
-        return_value="fake-kubeconfig"
-    )
 
+@pytest.mark.asyncio
+async def test_install_cnpg(helm_exec):
     from mindweaver.service.k8s_cluster.actions import InstallCNPGAction
 
-    with patch("asyncio.create_subprocess_exec") as mock_exec:
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0
-        mock_proc.communicate = pytest.importorskip("unittest.mock").AsyncMock(
-            return_value=(b"success", b"")
+    action = InstallCNPGAction(_remote_cluster("test-cluster-cnpg"), MagicMock())
+    await action.run()
+
+    (upgrade,) = _helm_upgrades(helm_exec)
+    assert "cnpg" in upgrade
+    assert "--kubeconfig" in upgrade
+    assert "cloudnative-pg" in [c for c in helm_exec.call_args_list if "pull" in c.args][
+        0
+    ].args
+
+
+@pytest.mark.asyncio
+async def test_install_uses_chart_version_setting(helm_exec, monkeypatch):
+    from mindweaver.service.k8s_cluster.actions import InstallArgoCDAction
+
+    monkeypatch.setattr(settings, "argocd_chart_version", "9.9.9")
+    await InstallArgoCDAction(_remote_cluster("test-cluster-pin"), MagicMock()).run()
+
+    (pull,) = [c.args for c in helm_exec.call_args_list if "pull" in c.args]
+    assert pull[pull.index("--version") + 1] == "9.9.9"
+
+
+@pytest.mark.asyncio
+async def test_helm_chart_cache_pulls_once(helm_exec, tmp_path):
+    from mindweaver.service.k8s_cluster.helm import HelmChart, HelmChartCache
+
+    cache = HelmChartCache(str(tmp_path / "cache"))
+    chart = HelmChart(repo_url="https://example.com/charts", name="demo", version="1.0.0")
+
+    paths = await asyncio.gather(*(cache.fetch(chart) for _ in range(5)))
+    assert len(set(paths)) == 1
+    assert helm_exec.call_count == 1
+    # Blobs are addressed by the archive digest
+    digest = hashlib.sha256(b"demo-1.0.0").hexdigest()
+    assert paths[0] == str(tmp_path / "cache" / "blobs" / f"{digest}.tgz")
+
+    # A new cache instance over the same directory reuses the archive
+    assert await HelmChartCache(str(tmp_path / "cache")).fetch(chart) == paths[0]
+    assert helm_exec.call_count == 1
+
+    other = HelmChart(repo_url="https://example.com/charts", name="demo", version="1.1.0")
+    assert await cache.fetch(other) != paths[0]
+    assert helm_exec.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_cluster_orders_installs(helm_exec):
+    from mindweaver.service.k8s_cluster import actions
+
+    started, finished = [], []
+    release_gate = asyncio.Event()
+
+    async def fake_wait(api_client, namespace, release_name):
+        started.append(release_name)
+        await release_gate.wait()
+        finished.append(release_name)
+
+    async def fake_apply(self, manifest):
+        # The issuer is only applied once cert-manager is ready
+        assert "cert-manager" in finished
+        started.append("issuer")
+
+    helm_exec.wait_for_release.side_effect = fake_wait
+    with patch.object(actions.InstallSelfSignedIssuerAction, "_apply_yaml", fake_apply):
+        action = actions.BootstrapClusterAction(
+            _remote_cluster("test-cluster-bootstrap"), MagicMock()
         )
-        mock_exec.return_value = mock_proc
+        run = asyncio.create_task(action.run())
+        for _ in range(50):
+            if len(started) == 3:
+                break
+            await asyncio.sleep(0.01)
+        # Independent charts roll out concurrently
+        assert set(started) == {"cert-manager", "cnpg", "argocd"}
+        release_gate.set()
+        await run
+
+    assert started[-1] == "issuer"
+    assert len(_helm_upgrades(helm_exec)) == 3
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_cluster_skips_dependents_of_failed_step(helm_exec):
+    from mindweaver.service.k8s_cluster import actions
+
+    async def fake_wait(api_client, namespace, release_name):
+        if release_name == "cert-manager":
+            raise TimeoutError("cert-manager not ready")
+
+    helm_exec.wait_for_release.side_effect = fake_wait
+    with patch.object(
+        actions.InstallSelfSignedIssuerAction, "_apply_yaml", AsyncMock()
+    ) as mock_apply:
+        action = actions.BootstrapClusterAction(
+            _remote_cluster("test-cluster-bootstrap-fail"), MagicMock()
+        )
+        with pytest.raises(RuntimeError) as exc:
+            await action.run()
+
+    mock_apply.assert_not_awaited()
+    assert "cert_manager: cert-manager not ready" in str(exc.value)
+    assert "cluster_issuer: skipped" in str(exc.value)
+    # The other installs still went ahead
+    assert len(_helm_upgrades(helm_exec)) == 3
+
+
+def test_workload_ready():
+    from mindweaver.service.k8s_cluster.helm import workload_ready
+
+    deployment = {
+        "metadata": {"name": "d", "generation": 2},
+        "spec": {"replicas": 2},
+        "status": {"observedGeneration": 2, "updatedReplicas": 2, "availableReplicas": 2},
+    }
+    assert workload_ready("Deployment", deployment)
+    stale = {**deployment, "status": {**deployment["status"], "observedGeneration": 1}}
+    assert not workload_ready("Deployment", stale)
+    rolling = {**deployment, "status": {**deployment["status"], "availableReplicas": 1}}
+    assert not workload_ready("Deployment", rolling)
+
+    daemonset = {
+        "metadata": {"name": "ds", "generation": 1},
+        "status": {
+            "observedGeneration": 1,
+            "desiredNumberScheduled": 3,
+            "updatedNumberScheduled": 3,
+            "numberReady": 2,
+        },
+    }
+    assert not workload_ready("DaemonSet", daemonset)
 
-        action = InstallCNPGAction(cluster, mock_svc)
-        await action.run()
 
-        # Verify helm repo add
-        # Verify helm upgrade --install
-        assert mock_exec.call_count >= 3  # add, update, upgrade
+@pytest.mark.asyncio
+async def test_wait_for_release_polls_until_ready():
+    from mindweaver.service.k8s_cluster import helm
+
+    responses = [["Deployment/argocd-server"], []]
+    with patch.object(
+        helm, "pending_workloads", side_effect=lambda *a: responses.pop(0)
+    ) as mock_pending, patch.object(helm, "READINESS_INTERVAL", 0.01):
+        await helm.wait_for_release(MagicMock(), "argocd", "argocd")
+    assert mock_pending.call_count == 2
 
-        calls = [call[0] for call in mock_exec.call_args_list]
-        found_upgrade = False
-        for call_args in calls:
-            if "upgrade" in call_args and "--install" in call_args:
-                if "cnpg" in call_args:
-                    found_upgrade = True
-                    assert "cnpg/cloudnative-pg" in call_args
-                    assert "--kubeconfig" in call_args
+    with patch.object(
+        helm, "pending_workloads", return_value=["Deployment/argocd-server"]
+    ), patch.object(helm, "READINESS_INTERVAL", 0.01):
+        with pytest.raises(TimeoutError, match="argocd-server"):
+            await helm.wait_for_release(MagicMock(), "argocd", "argocd", timeout=0.05)
 
-        assert found_upgrade
+
+@pytest.mark.asyncio
+async def test_install_readiness_timeout_fails_job(client: TestClient):
+    from mindweaver.fw.job import Job, JobStatus, submit_job
+    from mindweaver.fw.model import get_engine
+    from mindweaver.tasks.k8s_cluster_status import _run_install_action
+
+    cluster = client.post(
+        "/api/v1/k8s_clusters",
+        json={"name": "timeout-test", "title": "Timeout Test", "type": "in-cluster"},
+    ).json()["data"]
+    async with AsyncSession(get_engine()) as session:
+        job, _ = await submit_job(
+            session, "k8s_cluster", cluster["id"], "install_argocd", {}
+        )
+        job_id = job.id
+        await session.commit()
+
+    with patch(
+        "mindweaver.service.k8s_cluster.actions.InstallArgoCDAction.run",
+        new=AsyncMock(side_effect=TimeoutError("Release argocd not ready")),
+    ), patch(
+        "mindweaver.service.k8s_cluster.service.K8sClusterService.poll_status",
+        new=AsyncMock(),
+    ) as mock_poll:
+        await _run_install_action(cluster["id"], "InstallArgoCDAction", "ArgoCD", job_id)
+
+    mock_poll.assert_awaited_once()
+    async with AsyncSession(get_engine()) as session:
+        job = await session.get(Job, job_id)
+    assert job.status == JobStatus.FAILED
+    assert "not ready" in job.error
 
 
 def test_poll_k8s_cluster_error(client: TestClient):
@@ -315,8 +755,57 @@ def test_install_argocd_action_triggers_task(client: TestClient):
             resp.json()["message"]
             == "ArgoCD installation triggered and status being refreshed."
         )
-        mock_delay.assert_called_once_with(p1["id"])
+        job_id = resp.json()["job_id"]
+        mock_delay.assert_called_once_with(p1["id"], job_id=job_id)
 
         # Verify status updated immediately in DB
         resp_state = client.get(f"/api/v1/k8s_clusters/{p1['id']}/_state")
         assert resp_state.json()["argocd_installed"] is True
+
+
+def test_bootstrap_cluster_action_triggers_task(client: TestClient):
+    p1 = client.post(
+        "/api/v1/k8s_clusters",
+        json={"name": "bootstrap-test", "title": "Bootstrap Test", "type": "in-cluster"},
+    ).json()["data"]
+
+    with patch(
+        "mindweaver.tasks.k8s_cluster_status.bootstrap_cluster_task.delay"
+    ) as mock_delay:
+        resp = client.post(
+            f"/api/v1/k8s_clusters/{p1['id']}/_actions",
+            json={"action": "bootstrap_cluster"},
+        )
+        assert resp.status_code == 200
+        mock_delay.assert_called_once_with(p1["id"], job_id=resp.json()["job_id"])
+
+    state = client.get(f"/api/v1/k8s_clusters/{p1['id']}/_state").json()
+    assert state["cert_manager_installed"] is True
+    assert state["cluster_issuer_installed"] is True
+    assert state["cnpg_installed"] is True
+    assert state["argocd_installed"] is True
+
+
+def test_k8s_cluster_bulk_states(client: TestClient, mock_k8s):
+    polled = client.post(
+        "/api/v1/k8s_clusters",
+        json={"name": "bulk-1", "title": "Bulk 1", "type": "in-cluster"},
+    ).json()["data"]
+    unpolled = client.post(
+        "/api/v1/k8s_clusters",
+        json={"name": "bulk-2", "title": "Bulk 2", "type": "in-cluster"},
+    ).json()["data"]
+    client.post(f"/api/v1/k8s_clusters/{polled['id']}/_refresh")
+
+    resp = client.get("/api/v1/k8s_clusters/_states", params={"ids": "all"})
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert data[str(unpolled["id"])] == {}
+    assert data[str(polled["id"])] == client.get(
+        f"/api/v1/k8s_clusters/{polled['id']}/_state"
+    ).json()
+
+    resp = client.get(
+        "/api/v1/k8s_clusters/_states", params={"ids": str(unpolled["id"])}
+    )
+    assert set(resp.json()["data"]) == {str(unpolled["id"])}
@@ -237,6 +237,86 @@ def test_project_state(
     resp = client.get(f"/api/v1/projects/{p1['id']}/_state")
     assert resp.json()["pgsql"] == 0
 
+def test_project_state_counts_per_platform_type(
+    client: TestClient, test_project: dict
+):
+    from sqlalchemy import text
+    from sqlmodel import Session, create_engine, select
+    from mindweaver.config import settings
+    from mindweaver.platform_service.pgsql.model import PgSqlPlatform, PgSqlPlatformState
+
+    engine = create_engine(settings.db_uri)
+    with Session(engine) as session:
+        for name, status, active in [
+            ("pg-online", "online", True),
+            ("pg-error", "error", True),
+            ("pg-offline", "offline", False),
+            ("pg-undeployed", None, None),
+        ]:
+            platform = PgSqlPlatform(
+                name=name, title=name, project_id=test_project["id"]
+            )
+            session.add(platform)
+            session.flush()
+            if status:
+                session.add(
+                    PgSqlPlatformState(
+                        platform_id=platform.id, status=status, active=active
+                    )
+                )
+        session.commit()
+
+    resp = client.get(f"/api/v1/projects/{test_project['id']}/_state")
+    assert resp.status_code == 200
+    state = resp.json()
+    assert state["pgsql"] == 2
+    assert state["platforms"]["pgsql"] == {
+        "online": 1,
+        "pending": 0,
+        "error": 1,
+        "offline": 1,
+        "active": 2,
+        "total": 3,
+    }
+    for platform_type in ["hive_metastore", "ranger", "superset", "trino"]:
+        assert state["platforms"][platform_type]["total"] == 0
+        assert state[platform_type] == 0
+
+    # Writes bypassing the ORM are not seen while the cached state is fresh
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE mw_pgsql_platform_state SET status = 'online'")
+        )
+    state = client.get(f"/api/v1/projects/{test_project['id']}/_state").json()
+    assert state["platforms"]["pgsql"]["online"] == 1
+
+    # State changes committed through the ORM invalidate the cache
+    with Session(engine) as session:
+        db_state = session.exec(
+            select(PgSqlPlatformState).where(PgSqlPlatformState.status == "online")
+        ).first()
+        db_state.status = "pending"
+        session.commit()
+
+    state = client.get(f"/api/v1/projects/{test_project['id']}/_state").json()
+    assert state["platforms"]["pgsql"]["online"] == 2
+    assert state["platforms"]["pgsql"]["pending"] == 1
+
+
+def test_deleted_project_state_is_not_cached(client: TestClient, test_cluster: dict):
+    from mindweaver.service.project.state import _state_cache
+
+    project_id = client.post(
+        "/api/v1/projects",
+        json={"name": "p1", "title": "P1", "k8s_cluster_id": test_cluster["id"]},
+    ).json()["data"]["id"]
+    assert client.get(f"/api/v1/projects/{project_id}/_state").status_code == 200
+    assert (project_id, test_cluster["id"]) in _state_cache
+
+    client.delete(f"/api/v1/projects/{project_id}", headers={"X-RESOURCE-NAME": "p1"})
+    assert not any(key[0] == project_id for key in _state_cache)
+
+
 def test_project_with_ldap(client: TestClient, test_cluster: dict):
     # 1. Create global LDAP config
     ldap_resp = client.post(
@@ -0,0 +1,135 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""Tests for the per-storage cache of S3 clients."""
+
+from datetime import datetime
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+import pytest
+
+from mindweaver.config import settings
+from mindweaver.crypto import encrypt_password
+from mindweaver.service.s3_storage.model import S3Storage
+from mindweaver.service.s3_storage import service as s3_service
+from mindweaver.service.s3_storage.service import discard_s3_clients, s3_client
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(
+        settings, "fernet_key", "EFw4cCjDgHhGuZAGlwXmQhXg134ZdHjb9SeqcszWeSU="
+    )
+    discard_s3_clients()
+    yield
+    discard_s3_clients()
+
+
+@pytest.fixture
+def storage():
+    # Encrypting is salted, the factory shares one ciphertext
+    secret_key = encrypt_password("secret")
+    values = {
+        "id": 1,
+        "name": "lake",
+        "title": "Lake",
+        "project_id": 1,
+        "region": "us-east-1",
+        "access_key": "AKIA",
+        "endpoint_url": "http://localhost:9000",
+    }
+
+    def factory(**kwargs) -> S3Storage:
+        return S3Storage(**{**values, "secret_key": secret_key, **kwargs})
+
+    return factory
+
+
+def test_client_reused_per_storage_and_config(storage):
+    client = s3_client(storage())
+    assert s3_client(storage()) is client
+    assert client.meta.config.max_pool_connections == 32
+
+    # Another configuration or other settings get their own client
+    tuned = s3_client(storage(), max_pool_connections=64)
+    assert tuned is not client
+    assert tuned.meta.config.max_pool_connections == 64
+    assert s3_client(storage(endpoint_url="http://other:9000")) is not client
+    assert s3_client(storage(id=2)) is not client
+
+    discard_s3_clients(1)
+    assert s3_client(storage()) is not client
+
+
+def test_unsaved_storage_not_cached(storage):
+    assert s3_client(storage(id=None)) is not s3_client(storage(id=None))
+
+
+def test_cache_bounded(storage, monkeypatch):
+    monkeypatch.setattr(s3_service, "S3_CLIENT_CACHE_SIZE", 2)
+    first = s3_client(storage(id=1))
+    s3_client(storage(id=2))
+    s3_client(storage(id=3))
+    assert len(s3_service._clients) == 2
+    assert s3_client(storage(id=1)) is not first
+
+
+def _createstorage(client: TestClient, test_project) -> int:
+    resp = client.post(
+        "/api/v1/s3_storages",
+        headers={"X-Project-Id": str(test_project["id"])},
+        json={
+            "name": "cached-storage",
+            "title": "Cached Storage",
+            "region": "us-east-1",
+            "access_key": "AKIA...",
+            "secret_key": "secret",
+            "project_id": test_project["id"],
+        },
+    )
+    assert resp.status_code == 200
+    return resp.json()["data"]["id"]
+
+
+def test_fs_views_reuse_client(client: TestClient, test_project):
+    storage_id = _createstorage(client, test_project)
+    headers = {"X-Project-Id": str(test_project["id"])}
+
+    with patch("boto3.client") as mock_s3:
+        mock_s3.return_value.list_buckets.return_value = {
+            "Buckets": [{"Name": "bucket1", "CreationDate": datetime.now()}]
+        }
+        for _ in range(3):
+            resp = client.get(
+                f"/api/v1/s3_storages/{storage_id}/_fs?action=ls", headers=headers
+            )
+            assert resp.status_code == 200
+        resp = client.post(
+            f"/api/v1/s3_storages/{storage_id}/_fs?action=rm&bucket=b&key=k",
+            headers=headers,
+        )
+        assert resp.status_code == 200
+        assert mock_s3.call_count == 1
+        assert mock_s3.call_args[1]["aws_secret_access_key"] == "secret"
+
+        # Updating the storage drops the client with the old settings
+        resp = client.put(
+            f"/api/v1/s3_storages/{storage_id}",
+            headers=headers,
+            json={"region": "eu-west-1"},
+        )
+        assert resp.status_code == 200
+        resp = client.get(
+            f"/api/v1/s3_storages/{storage_id}/_fs?action=ls", headers=headers
+        )
+        assert resp.status_code == 200
+        assert mock_s3.call_count == 2
+        assert mock_s3.call_args[1]["region_name"] == "eu-west-1"
+
+    resp = client.delete(
+        f"/api/v1/s3_storages/{storage_id}",
+        headers={**headers, "X-RESOURCE-NAME": "cached-storage"},
+    )
+    assert resp.status_code == 200
+    assert not [key for key in s3_service._clients if key[0] == storage_id]
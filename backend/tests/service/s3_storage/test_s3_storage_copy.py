@@ -0,0 +1,253 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""Tests for copies and moves within and between S3 storages."""
+
+import asyncio
+import os
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+import pytest
+
+from mindweaver.service.s3_storage import copy as s3_copy
+from mindweaver.service.s3_storage.copy import CopySpec, copy_object, run_copy
+from mindweaver.service.s3_storage.multipart import MIN_PART_SIZE
+
+SOURCE = "staging"
+DEST = "lake"
+
+
+@pytest.fixture
+def s3_buckets():
+    return [SOURCE, DEST]
+
+
+def _create_storage(client: TestClient, project, name: str, access_key: str):
+    return client.post(
+        "/api/v1/s3_storages",
+        json={
+            "name": name,
+            "title": name,
+            "region": "us-east-1",
+            "access_key": access_key,
+            "secret_key": "testing",
+            "project_id": project["id"],
+        },
+    ).json()["data"]
+
+
+@pytest.fixture
+def storages(client: TestClient, test_project, s3):
+    client.headers.update({"X-Project-Id": str(test_project["id"])})
+    # Different credentials make the second storage another endpoint
+    return (
+        _create_storage(client, test_project, "copy-src", "testing"),
+        _create_storage(client, test_project, "copy-dst", "other"),
+    )
+
+
+def _read(s3, bucket: str, key: str) -> bytes:
+    return s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+
+
+def _exists(s3, bucket: str, key: str) -> bool:
+    return s3.list_objects_v2(Bucket=bucket, Prefix=key).get("KeyCount", 0) > 0
+
+
+def test_copy_and_move_object(client: TestClient, storages, s3):
+    source, _ = storages
+    s3.put_object(Bucket=SOURCE, Key="in/a.csv", Body=b"a,b\n")
+    url = f"/api/v1/s3_storages/{source['id']}/_fs"
+
+    resp = client.post(
+        url,
+        params={"action": "cp", "bucket": SOURCE, "key": "in/a.csv", "dest_bucket": DEST, "dest_prefix": "raw/"},
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["dest_key"] == "raw/a.csv"
+    assert resp.json()["server_side"] is True
+    assert _read(s3, DEST, "raw/a.csv") == b"a,b\n"
+
+    resp = client.post(
+        url,
+        params={"action": "mv", "bucket": SOURCE, "key": "in/a.csv", "dest_key": "out/a.csv"},
+    )
+    assert resp.status_code == 200, resp.text
+    assert _read(s3, SOURCE, "out/a.csv") == b"a,b\n"
+    assert not _exists(s3, SOURCE, "in/a.csv")
+
+    resp = client.post(
+        url,
+        params={"action": "cp", "bucket": SOURCE, "key": "out/a.csv", "dest_key": "out/a.csv"},
+    )
+    assert resp.status_code == 400
+
+
+def test_copy_object_between_endpoints(client: TestClient, storages, s3):
+    source, dest = storages
+    s3.put_object(Bucket=SOURCE, Key="big.bin", Body=b"x" * 10)
+
+    # Streamed copies run as jobs rather than within the request
+    with patch("mindweaver.tasks.s3_storage.copy_s3_objects_task.delay") as mock_delay:
+        resp = client.post(
+            f"/api/v1/s3_storages/{source['id']}/_fs",
+            params={
+                "action": "mv",
+                "bucket": SOURCE,
+                "key": "big.bin",
+                "dest_storage_id": dest["id"],
+                "dest_bucket": DEST,
+                "dest_key": "copied.bin",
+            },
+        )
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["job_id"]
+    parameters = mock_delay.call_args.kwargs["parameters"]
+    assert (parameters["key"], parameters["dest_key"]) == ("big.bin", "copied.bin")
+    assert parameters["move"] is True
+    assert _exists(s3, SOURCE, "big.bin")
+
+
+def test_multipart_object_copy_runs_as_job(client: TestClient, storages, s3, monkeypatch):
+    source, _ = storages
+    monkeypatch.setattr("mindweaver.service.s3_storage.views.COPY_OBJECT_LIMIT", 5)
+    s3.put_object(Bucket=SOURCE, Key="big.bin", Body=b"x" * 10)
+
+    with patch("mindweaver.tasks.s3_storage.copy_s3_objects_task.delay") as mock_delay:
+        resp = client.post(
+            f"/api/v1/s3_storages/{source['id']}/_fs",
+            params={"action": "cp", "bucket": SOURCE, "key": "big.bin", "dest_key": "copy.bin"},
+        )
+    assert resp.status_code == 200, resp.text
+    assert mock_delay.call_args.kwargs["parameters"]["key"] == "big.bin"
+
+
+def test_object_copy_between_endpoints(s3):
+    data = os.urandom(2 * MIN_PART_SIZE + 10)
+    s3.put_object(Bucket=SOURCE, Key="big.bin", Body=data, ContentType="application/x-test")
+
+    spec = CopySpec(
+        bucket=SOURCE, key="big.bin", dest_bucket=DEST, dest_key="copied.bin", move=True
+    )
+    summary = asyncio.run(run_copy(s3, s3, False, spec))
+
+    assert (summary["objects"], summary["bytes"], summary["deleted"]) == (1, len(data), 1)
+    copied = s3.get_object(Bucket=DEST, Key="copied.bin")
+    assert copied["Body"].read() == data
+    assert copied["ContentType"] == "application/x-test"
+    assert not _exists(s3, SOURCE, "big.bin")
+
+
+def test_copy_buffers_bounded(s3, monkeypatch):
+    monkeypatch.setattr(s3_copy.settings, "s3_copy_max_buffer_size", 2 * MIN_PART_SIZE)
+    for i in range(6):
+        s3.put_object(Bucket=SOURCE, Key=f"in/{i}", Body=b"x" * MIN_PART_SIZE)
+
+    in_flight = peak = 0
+    copy = s3_copy.copy_object
+
+    async def tracking_copy(*args):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        try:
+            return await copy(*args)
+        finally:
+            in_flight -= 1
+
+    monkeypatch.setattr(s3_copy, "copy_object", tracking_copy)
+    spec = CopySpec(
+        bucket=SOURCE, prefix="in/", dest_bucket=DEST, part_size=MIN_PART_SIZE, concurrency=8
+    )
+    summary = asyncio.run(run_copy(s3, s3, False, spec))
+
+    # Two objects of one part each fill the budget, whatever the concurrency
+    assert summary["objects"] == 6
+    assert peak == 2
+
+    # Server-side copies buffer nothing
+    assert s3_copy.buffered_size(True, 10 * MIN_PART_SIZE, MIN_PART_SIZE, 4) == 0
+    assert s3_copy.buffered_size(False, 10 * MIN_PART_SIZE, MIN_PART_SIZE, 4) == 4 * MIN_PART_SIZE
+    assert s3_copy.buffered_size(False, 10, MIN_PART_SIZE, 4) == 10
+
+
+def test_copy_spec_limits():
+    with pytest.raises(ValueError):
+        CopySpec(
+            bucket=SOURCE,
+            dest_bucket=DEST,
+            part_size=s3_copy.settings.s3_stream_max_part_size + 1,
+        )
+    with pytest.raises(ValueError):
+        CopySpec(bucket=SOURCE, key="a", dest_bucket=DEST)
+    with pytest.raises(ValueError):
+        CopySpec(bucket=SOURCE, key="a", dest_bucket=SOURCE, dest_key="a")
+
+
+def test_prefix_copy_runs_as_job(client: TestClient, storages):
+    source, dest = storages
+    with patch("mindweaver.tasks.s3_storage.copy_s3_objects_task.delay") as mock_delay:
+        resp = client.post(
+            f"/api/v1/s3_storages/{source['id']}/_fs",
+            params={
+                "action": "mv",
+                "bucket": SOURCE,
+                "prefix": "in/",
+                "dest_storage_id": dest["id"],
+                "dest_bucket": DEST,
+                "dest_prefix": "raw/",
+            },
+        )
+    assert resp.status_code == 200, resp.text
+    parameters = mock_delay.call_args.kwargs["parameters"]
+    assert parameters["move"] is True
+    assert parameters["dest_storage_id"] == dest["id"]
+
+    # Copying a prefix into itself is refused
+    resp = client.post(
+        f"/api/v1/s3_storages/{source['id']}/_fs",
+        params={"action": "cp", "bucket": SOURCE, "prefix": "in/", "dest_prefix": "in/copy/"},
+    )
+    assert resp.status_code == 422
+
+
+def test_server_side_multipart_copy(s3, monkeypatch):
+    monkeypatch.setattr(s3_copy, "COPY_OBJECT_LIMIT", MIN_PART_SIZE)
+    data = os.urandom(2 * MIN_PART_SIZE + 10)
+    s3.put_object(Bucket=SOURCE, Key="big.bin", Body=data)
+
+    asyncio.run(
+        copy_object(
+            s3, s3, True, SOURCE, "big.bin", len(data), DEST, "big.bin", MIN_PART_SIZE, 3
+        )
+    )
+    assert _read(s3, DEST, "big.bin") == data
+    assert not s3.list_multipart_uploads(Bucket=DEST).get("Uploads")
+
+
+@pytest.mark.parametrize("server_side", [True, False])
+def test_prefix_move(s3, server_side):
+    for i in range(12):
+        s3.put_object(Bucket=SOURCE, Key=f"in/part-{i:02d}", Body=b"x" * (i + 1))
+    s3.put_object(Bucket=SOURCE, Key="other/keep", Body=b"x")
+
+    reports = []
+
+    async def on_progress(progress):
+        reports.append(progress)
+
+    spec = CopySpec(
+        bucket=SOURCE, prefix="in/", dest_bucket=DEST, dest_prefix="raw/", move=True, concurrency=4
+    )
+    summary = asyncio.run(run_copy(s3, s3, server_side, spec, on_progress))
+
+    assert (summary["objects"], summary["bytes"], summary["failed"]) == (12, 78, 0)
+    assert summary["deleted"] == 12
+    assert summary["bytes_per_sec"] >= 0
+    assert reports[-1]["objects"] == 12
+    for i in range(12):
+        assert _read(s3, DEST, f"raw/part-{i:02d}") == b"x" * (i + 1)
+    assert not _exists(s3, SOURCE, "in/")
+    assert _exists(s3, SOURCE, "other/keep")
@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""Tests for bulk and recursive deletes of S3 objects."""
+
+import asyncio
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+import pytest
+
+from mindweaver.service.s3_storage import delete
+from mindweaver.service.s3_storage.delete import DeleteSpec, run_delete
+
+BUCKET = "lake"
+
+
+@pytest.fixture
+def storage(client: TestClient, test_project, s3):
+    client.headers.update({"X-Project-Id": str(test_project["id"])})
+    return client.post(
+        "/api/v1/s3_storages",
+        json={
+            "name": "delete-s3",
+            "title": "Lake",
+            "region": "us-east-1",
+            "access_key": "testing",
+            "secret_key": "testing",
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+
+
+def _keys(s3, prefix=""):
+    paginator = s3.get_paginator("list_objects_v2")
+    return sorted(
+        obj["Key"]
+        for page in paginator.paginate(Bucket=BUCKET, Prefix=prefix)
+        for obj in page.get("Contents", [])
+    )
+
+
+def test_bulk_delete_inline(client: TestClient, storage, s3):
+    for key in ("a.txt", "b.txt", "c.txt"):
+        s3.put_object(Bucket=BUCKET, Key=key, Body=b"x")
+
+    resp = client.post(
+        f"/api/v1/s3_storages/{storage['id']}/_rm",
+        json={"bucket": BUCKET, "keys": ["a.txt", "b.txt"]},
+    )
+    assert resp.status_code == 200, resp.text
+    result = resp.json()
+    assert (result["deleted"], result["failed"], result["batches"]) == (2, 0, 1)
+    assert _keys(s3) == ["c.txt"]
+
+
+def test_delete_requires_target(client: TestClient, storage):
+    url = f"/api/v1/s3_storages/{storage['id']}/_rm"
+    assert client.post(url, json={"bucket": BUCKET}).status_code == 422
+    # An empty prefix would wipe the bucket
+    assert client.post(url, json={"bucket": BUCKET, "prefix": ""}).status_code == 422
+
+
+def test_prefix_delete_runs_as_job(client: TestClient, storage):
+    with patch(
+        "mindweaver.tasks.s3_storage.delete_s3_objects_task.delay"
+    ) as mock_delay:
+        resp = client.post(
+            f"/api/v1/s3_storages/{storage['id']}/_rm",
+            json={"bucket": BUCKET, "prefix": "raw/"},
+        )
+    assert resp.status_code == 200, resp.text
+    job_id = resp.json()["job_id"]
+    mock_delay.assert_called_once()
+    assert mock_delay.call_args.kwargs["job_id"] == job_id
+    assert mock_delay.call_args.kwargs["parameters"]["prefix"] == "raw/"
+
+    # The same request through _actions finds the job despite the defaults
+    # the action adds to the parameters
+    with patch(
+        "mindweaver.tasks.s3_storage.delete_s3_objects_task.delay"
+    ) as mock_delay:
+        resp = client.post(
+            f"/api/v1/s3_storages/{storage['id']}/_actions",
+            json={
+                "action": "delete_objects",
+                "parameters": {"bucket": BUCKET, "prefix": "raw/"},
+            },
+        )
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["status"] == "running"
+    assert resp.json()["job_id"] == job_id
+    mock_delay.assert_not_called()
+
+    jobs = client.get(f"/api/v1/s3_storages/{storage['id']}/_jobs").json()["data"]
+    assert [(j["id"], j["action"], j["status"]) for j in jobs] == [
+        (job_id, "delete_objects", "queued")
+    ]
+
+
+def test_recursive_delete_in_concurrent_batches(s3, monkeypatch):
+    monkeypatch.setattr(delete, "DELETE_BATCH_SIZE", 10)
+    monkeypatch.setattr(delete, "PROGRESS_INTERVAL", 0)
+    for i in range(45):
+        s3.put_object(Bucket=BUCKET, Key=f"raw/part-{i:03d}", Body=b"x")
+    s3.put_object(Bucket=BUCKET, Key="keep/data", Body=b"x")
+    s3.put_object(Bucket=BUCKET, Key="extra.txt", Body=b"x")
+
+    reports = []
+
+    async def on_progress(progress):
+        reports.append(progress)
+
+    spec = DeleteSpec(bucket=BUCKET, prefix="raw/", keys=["extra.txt"], concurrency=3)
+    summary = asyncio.run(run_delete(s3, spec, on_progress))
+
+    assert summary["deleted"] == 46
+    assert summary["failed"] == 0
+    assert summary["batches"] == 6
+    assert _keys(s3) == ["keep/data"]
+    assert reports[-1] == {"deleted": 46, "failed": 0, "batches": 6}
+    assert [r["deleted"] for r in reports] == sorted(r["deleted"] for r in reports)
@@ -5,6 +5,8 @@ from fastapi.testclient import TestClient
 import pytest
 from unittest.mock import patch, Mock
 
+from mindweaver.service.s3_storage.download import parse_range
+
 
 def test_s3_storage_get_file(client: TestClient, test_project):
     """Test getting a file from s3 using _fs endpoint with action=get."""
@@ -55,3 +57,92 @@ def test_s3_storage_get_file(client: TestClient, test_project):
             Params={"Bucket": "test-bucket", "Key": "folder/test.txt"},
             ExpiresIn=3600,
         )
+
+
+@pytest.fixture
+def storage_url(client: TestClient, test_project, s3):
+    client.headers.update({"X-Project-Id": str(test_project["id"])})
+    storage = client.post(
+        "/api/v1/s3_storages",
+        json={
+            "name": "proxy-test-storage",
+            "title": "Proxy Test Storage",
+            "region": "us-east-1",
+            "access_key": "testing",
+            "secret_key": "testing",
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+    return f"/api/v1/s3_storages/{storage['id']}"
+
+
+def test_parse_range():
+    assert parse_range("bytes=0-99") == "bytes=0-99"
+    assert parse_range("bytes=100-") == "bytes=100-"
+    assert parse_range("bytes=-8") == "bytes=-8"
+    # Several ranges and invalid ones serve the whole object
+    assert parse_range("bytes=0-1,5-6") is None
+    assert parse_range("bytes=9-1") is None
+    assert parse_range("items=0-1") is None
+    assert parse_range(None) is None
+
+
+def test_s3_storage_proxy_download(client: TestClient, storage_url, s3):
+    data = bytes(range(256)) * 8192
+    s3.put_object(
+        Bucket="lake", Key="data/part.parquet", Body=data, ContentType="application/x-parquet"
+    )
+    params = {"bucket": "lake", "key": "data/part.parquet"}
+
+    # action=get returns the URL of the proxy, never a redirect to it
+    resp = client.get(
+        f"{storage_url}/_fs",
+        params={"action": "get", "proxy": True, **params},
+        follow_redirects=False,
+    )
+    assert resp.status_code == 200
+    assert resp.json()["url"].endswith(
+        f"{storage_url}/_download?bucket=lake&key=data%2Fpart.parquet"
+    )
+
+    resp = client.get(f"{storage_url}/_download", params=params)
+    assert resp.status_code == 200
+    assert resp.content == data
+    assert resp.headers["content-type"] == "application/x-parquet"
+    assert resp.headers["accept-ranges"] == "bytes"
+    assert resp.headers["content-length"] == str(len(data))
+    etag = resp.headers["etag"]
+
+    # Parquet readers fetch the footer with a suffix range
+    resp = client.get(
+        f"{storage_url}/_download", params=params, headers={"Range": "bytes=-8"}
+    )
+    assert resp.status_code == 206
+    assert resp.content == data[-8:]
+    assert resp.headers["content-range"] == f"bytes {len(data) - 8}-{len(data) - 1}/{len(data)}"
+
+    resp = client.get(
+        f"{storage_url}/_download", params=params, headers={"Range": "bytes=100-199"}
+    )
+    assert resp.status_code == 206
+    assert resp.content == data[100:200]
+
+    resp = client.head(f"{storage_url}/_download", params=params)
+    assert resp.status_code == 200
+    assert resp.headers["content-length"] == str(len(data))
+    assert resp.content == b""
+
+    resp = client.get(
+        f"{storage_url}/_download", params=params, headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+
+    resp = client.get(
+        f"{storage_url}/_download",
+        params=params,
+        headers={"Range": f"bytes={len(data) + 10}-"},
+    )
+    assert resp.status_code == 416
+
+    resp = client.get(f"{storage_url}/_download", params={"bucket": "lake", "key": "missing"})
+    assert resp.status_code == 404
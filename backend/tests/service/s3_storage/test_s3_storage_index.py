@@ -0,0 +1,233 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""Tests for the object index of S3 storages."""
+
+from fastapi.testclient import TestClient
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from mindweaver.fw.model import get_engine
+from mindweaver.service.s3_storage import index as s3_index
+from mindweaver.service.s3_storage.index import IndexSpec, refresh_index
+from mindweaver.service.s3_storage.model import S3Storage
+from mindweaver.service.s3_storage.service import s3_client
+
+BUCKET = "lake"
+
+
+@pytest.fixture
+def storage(client: TestClient, test_project, s3):
+    client.headers.update({"X-Project-Id": str(test_project["id"])})
+    return client.post(
+        "/api/v1/s3_storages",
+        json={
+            "name": "index-s3",
+            "title": "Lake",
+            "region": "us-east-1",
+            "access_key": "testing",
+            "secret_key": "testing",
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+
+
+async def _refresh(storage_id: int, **kwargs) -> dict[str, int]:
+    async with AsyncSession(get_engine()) as session:
+        model = await session.get(S3Storage, storage_id)
+        return await refresh_index(
+            session, s3_client(model), model, IndexSpec(bucket=BUCKET, **kwargs)
+        )
+
+
+def _indexed(client: TestClient, storage, **params) -> dict[str, int]:
+    resp = client.get(
+        f"/api/v1/s3_storages/{storage['id']}/_index",
+        params={"action": "search", "bucket": BUCKET, "page_size": 500, **params},
+    )
+    assert resp.status_code == 200, resp.text
+    return {obj["path"]: obj["size"] for obj in resp.json()["data"]}
+
+
+def _listed(s3) -> dict[str, int]:
+    paginator = s3.get_paginator("list_objects_v2")
+    return {
+        obj["Key"]: obj["Size"]
+        for page in paginator.paginate(Bucket=BUCKET)
+        for obj in page.get("Contents", [])
+    }
+
+
+def _du(client: TestClient, storage, prefix: str = "") -> dict[str, tuple[int, int]]:
+    resp = client.get(
+        f"/api/v1/s3_storages/{storage['id']}/_index",
+        params={"action": "du", "bucket": BUCKET, "prefix": prefix},
+    )
+    assert resp.status_code == 200, resp.text
+    return {i["path"]: (i["objects"], i["size"]) for i in resp.json()["items"]}
+
+
+def _summed(s3, prefix: str = "") -> dict[str, tuple[int, int]]:
+    """What `du` reports, summed from a listing of the bucket."""
+    sums: dict[str, tuple[int, int]] = {}
+    for key, size in _listed(s3).items():
+        if not key.startswith(prefix) or key == prefix:
+            continue
+        name, slash, _ = key[len(prefix) :].partition("/")
+        path = prefix + name + slash
+        objects, total = sums.get(path, (0, 0))
+        sums[path] = (objects + 1, total + size)
+    return sums
+
+
+def _put(s3, key: str, size: int = 1):
+    s3.put_object(Bucket=BUCKET, Key=key, Body=b"x" * size)
+
+
+@pytest.mark.asyncio
+async def test_refresh_search_and_rollup(client: TestClient, storage, s3, monkeypatch):
+    # Small pages make each shard sync several key ranges
+    monkeypatch.setattr(s3_index, "LIST_PAGE_SIZE", 3)
+    for i in range(7):
+        _put(s3, f"raw/orders/part-{i}.csv", 10)
+    _put(s3, "raw/customers.parquet", 100)
+    _put(s3, "curated/orders.parquet", 50)
+    _put(s3, "README.md", 5)
+
+    stats = await _refresh(storage["id"], concurrency=2)
+    assert stats["shards"] == 3
+    assert stats["listed"] == stats["upserted"] == 10
+    assert _indexed(client, storage) == _listed(s3)
+
+    url = f"/api/v1/s3_storages/{storage['id']}/_index"
+    status = client.get(url).json()["data"]
+    assert [i["bucket"] for i in status] == [BUCKET]
+    assert status[0]["refreshed"] is not None
+
+    # Substring search ignores case and treats `_` literally
+    resp = client.get(
+        url, params={"action": "search", "bucket": BUCKET, "q": "part-", "page_size": 5}
+    )
+    assert len(resp.json()["data"]) == 5 and resp.json()["meta"]["has_more"] is True
+    resp = client.get(
+        url,
+        params={"action": "search", "bucket": BUCKET, "q": "part-", "page_size": 5, "page_num": 2},
+    )
+    assert len(resp.json()["data"]) == 2 and resp.json()["meta"]["has_more"] is False
+    assert set(_indexed(client, storage, q="ORDERS")) == {
+        *(f"raw/orders/part-{i}.csv" for i in range(7)),
+        "curated/orders.parquet",
+    }
+    assert _indexed(client, storage, q="part_") == {}
+    assert set(_indexed(client, storage, prefix="raw/", q="parquet")) == {
+        "raw/customers.parquet"
+    }
+
+    rollup = client.get(url, params={"action": "du", "bucket": BUCKET}).json()
+    assert rollup["objects"] == 10 and rollup["size"] == 225
+    assert [(i["path"], i["type"], i["objects"], i["size"]) for i in rollup["items"]] == [
+        ("curated/", "directory", 1, 50),
+        ("raw/", "directory", 8, 170),
+        ("README.md", "file", 1, 5),
+    ]
+    rollup = client.get(
+        url, params={"action": "du", "bucket": BUCKET, "prefix": "raw/"}
+    ).json()
+    assert [(i["name"], i["objects"]) for i in rollup["items"]] == [
+        ("orders/", 7),
+        ("customers.parquet", 1),
+    ]
+
+    assert client.get(url, params={"action": "search", "bucket": "other"}).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_incremental_refresh(client: TestClient, storage, s3, monkeypatch):
+    monkeypatch.setattr(s3_index, "LIST_PAGE_SIZE", 2)
+    for i in range(5):
+        _put(s3, f"raw/part-{i}", 1)
+    _put(s3, "tmp/scratch", 1)
+    _put(s3, "top.txt", 1)
+    await _refresh(storage["id"])
+
+    s3.delete_object(Bucket=BUCKET, Key="raw/part-1")
+    s3.delete_object(Bucket=BUCKET, Key="tmp/scratch")
+    _put(s3, "raw/part-3", 42)
+    _put(s3, "raw/part-9", 1)
+
+    stats = await _refresh(storage["id"])
+    assert stats["listed"] == 6
+    assert stats["upserted"] == 2
+    assert stats["removed"] == 2
+    assert _indexed(client, storage) == _listed(s3)
+    # Folder sizes follow the changes, the emptied folder is gone
+    assert _du(client, storage) == _summed(s3)
+    assert "tmp/" not in _du(client, storage)
+    assert _du(client, storage, "raw/") == _summed(s3, "raw/")
+
+    # Refreshing a prefix only re-lists that prefix
+    s3.delete_object(Bucket=BUCKET, Key="top.txt")
+    _put(s3, "raw/part-10", 1)
+    stats = await _refresh(storage["id"], prefixes=["raw/"])
+    assert (stats["listed"], stats["upserted"], stats["removed"]) == (6, 1, 0)
+    assert "top.txt" in _indexed(client, storage)
+    assert _du(client, storage, "raw/") == _summed(s3, "raw/")
+
+
+@pytest.mark.asyncio
+async def test_event_notifications(client: TestClient, storage, s3):
+    _put(s3, "raw/a.csv", 1)
+    await _refresh(storage["id"])
+
+    def record(event: str, key: str, size: int = 0, sequencer: str = None):
+        obj = {"key": key, "size": size}
+        if sequencer:
+            obj["sequencer"] = sequencer
+        return {
+            "eventName": event,
+            "eventTime": "2026-06-19T10:00:00.000Z",
+            "s3": {"bucket": {"name": BUCKET}, "object": obj},
+        }
+
+    resp = client.post(
+        f"/api/v1/s3_storages/{storage['id']}/_index/events",
+        json={
+            "Records": [
+                record("ObjectCreated:Put", "raw/new+file.csv", 12),
+                record("ObjectCreated:Put", "raw/gone.csv", 1),
+                record("ObjectRemoved:Delete", "raw/gone.csv"),
+                record("ObjectRemoved:Delete", "raw/a.csv"),
+                {**record("ObjectCreated:Put", "x"), "s3": {"bucket": {"name": "other"}}},
+            ]
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["ignored"] == 1
+    assert _indexed(client, storage) == {"raw/new file.csv": 12}
+    assert _du(client, storage) == {"raw/": (1, 12)}
+
+    # Events apply in sequencer order, late deliveries of older ones are skipped
+    url = f"/api/v1/s3_storages/{storage['id']}/_index/events"
+    resp = client.post(
+        url,
+        json={
+            "Records": [
+                record("ObjectCreated:Put", "raw/seq.csv", 30, "0055AED6DCD90281E6"),
+                record("ObjectCreated:Put", "raw/seq.csv", 20, "0055AED6DCD90281E5"),
+            ]
+        },
+    )
+    assert resp.json()["upserted"] == 1
+    resp = client.post(
+        url,
+        json={"Records": [record("ObjectCreated:Put", "raw/seq.csv", 10, "55AED6DCD90281E4")]},
+    )
+    assert resp.json()["stale"] == 1
+    assert _indexed(client, storage)["raw/seq.csv"] == 30
+    resp = client.post(
+        url,
+        json={"Records": [record("ObjectRemoved:Delete", "raw/seq.csv", 0, "55AED6DCD90281F0")]},
+    )
+    assert resp.json()["removed"] == 1
+    assert "raw/seq.csv" not in _indexed(client, storage)
+    assert _du(client, storage) == {"raw/": (1, 12)}
@@ -0,0 +1,130 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""Tests for paginated and streamed object listing of the _fs endpoint."""
+
+import json
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+import pytest
+
+
+BUCKET = "lake"
+
+
+@pytest.fixture
+def s3(s3):
+    for i in range(25):
+        s3.put_object(Bucket=BUCKET, Key=f"data/part-{i:03d}.txt", Body=b"x" * i)
+    for name in ("a", "b"):
+        s3.put_object(Bucket=BUCKET, Key=f"data/{name}/nested.txt", Body=b"")
+    return s3
+
+
+@pytest.fixture
+def storage_url(client: TestClient, test_project, s3):
+    headers = {"X-Project-Id": str(test_project["id"])}
+    client.headers.update(headers)
+    storage = client.post(
+        "/api/v1/s3_storages",
+        json={
+            "name": "listing-s3",
+            "title": "Lake",
+            "region": "us-east-1",
+            "access_key": "testing",
+            "secret_key": "testing",
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+    return f"/api/v1/s3_storages/{storage['id']}/_fs"
+
+
+def test_ls_without_page_size_lists_everything(client: TestClient, storage_url):
+    resp = client.get(storage_url, params={"bucket": BUCKET, "prefix": "data/"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data["items"]) == 27
+    assert "next_continuation_token" not in data
+
+
+def test_ls_paginated(client: TestClient, storage_url):
+    paths = []
+    token = None
+    pages = 0
+    while True:
+        params = {"bucket": BUCKET, "prefix": "data/", "page_size": 10}
+        if token:
+            params["continuation_token"] = token
+        resp = client.get(storage_url, params=params)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert len(data["items"]) <= 10
+        paths.extend(item["path"] for item in data["items"])
+        pages += 1
+        token = data["next_continuation_token"]
+        if not token:
+            break
+
+    assert pages == 3
+    assert len(paths) == len(set(paths)) == 27
+    assert "data/a/" in paths
+    assert "data/part-024.txt" in paths
+
+
+def test_ls_page_size_bounds(client: TestClient, storage_url):
+    for page_size in (0, 1001):
+        resp = client.get(
+            storage_url, params={"bucket": BUCKET, "page_size": page_size}
+        )
+        assert resp.status_code == 422
+
+
+def test_ls_stream_ndjson(client: TestClient, storage_url):
+    with client.stream(
+        "GET",
+        storage_url,
+        params={"bucket": BUCKET, "prefix": "data/", "page_size": 4, "stream": True},
+    ) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in resp.iter_lines() if line]
+
+    *items, end = lines
+    assert end == {"type": "end", "bucket": BUCKET, "prefix": "data/", "count": 27}
+    assert {item["type"] for item in items} == {"file", "directory"}
+    assert len({item["path"] for item in items}) == 27
+    sizes = {item["path"]: item.get("size") for item in items}
+    assert sizes["data/part-007.txt"] == 7
+
+
+def test_ls_stream_reports_errors(client: TestClient, storage_url):
+    with client.stream(
+        "GET", storage_url, params={"bucket": "missing", "stream": True}
+    ) as resp:
+        assert resp.status_code == 200
+        lines = [json.loads(line) for line in resp.iter_lines() if line]
+
+    assert len(lines) == 1
+    assert lines[0]["type"] == "error"
+    assert "NoSuchBucket" in lines[0]["detail"]
+
+
+def test_ls_stream_reports_unexpected_errors(client: TestClient, storage_url):
+    with patch(
+        "mindweaver.service.s3_storage.views._list_objects_page",
+        side_effect=ConnectionResetError("connection reset"),
+    ):
+        with client.stream(
+            "GET", storage_url, params={"bucket": BUCKET, "stream": True}
+        ) as resp:
+            assert resp.status_code == 200
+            lines = [json.loads(line) for line in resp.iter_lines() if line]
+
+    assert lines == [
+        {
+            "type": "error",
+            "detail": "Listing failed: connection reset",
+            "continuation_token": None,
+        }
+    ]
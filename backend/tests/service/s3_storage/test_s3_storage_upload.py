@@ -0,0 +1,239 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+"""Tests for streamed, resumable and presigned multipart uploads."""
+
+import asyncio
+import datetime
+import os
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+import pytest
+import requests
+
+from mindweaver.config import settings
+from mindweaver.service.s3_storage import multipart
+
+BUCKET = "lake"
+PART_SIZE = multipart.MIN_PART_SIZE
+
+
+@pytest.fixture
+def storage_url(client: TestClient, test_project, s3):
+    client.headers.update({"X-Project-Id": str(test_project["id"])})
+    storage = client.post(
+        "/api/v1/s3_storages",
+        json={
+            "name": "upload-s3",
+            "title": "Lake",
+            "region": "us-east-1",
+            "access_key": "testing",
+            "secret_key": "testing",
+            "project_id": test_project["id"],
+        },
+    ).json()["data"]
+    return f"/api/v1/s3_storages/{storage['id']}"
+
+
+def _chunks(data: bytes, size: int = 1024 * 1024):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def test_streamed_upload(client: TestClient, storage_url, s3):
+    data = os.urandom(2 * PART_SIZE + 12345)
+    resp = client.put(
+        f"{storage_url}/_upload",
+        params={"bucket": BUCKET, "key": "big.bin", "part_size": PART_SIZE, "concurrency": 3},
+        content=_chunks(data),
+    )
+    assert resp.status_code == 200, resp.text
+    result = resp.json()
+    assert result["status"] == "success"
+    assert result["parts"] == 3
+    assert result["size"] == len(data)
+    assert s3.get_object(Bucket=BUCKET, Key="big.bin")["Body"].read() == data
+    assert not s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads")
+
+
+def test_streamed_upload_small_and_empty(client: TestClient, storage_url, s3):
+    for key, data in (("small.txt", b"hello"), ("empty.txt", b"")):
+        resp = client.put(
+            f"{storage_url}/_upload",
+            params={"bucket": BUCKET, "key": key},
+            content=data,
+        )
+        assert resp.status_code == 200, resp.text
+        assert s3.get_object(Bucket=BUCKET, Key=key)["Body"].read() == data
+
+
+def test_streamed_upload_validates_part_size(client: TestClient, storage_url):
+    resp = client.put(
+        f"{storage_url}/_upload",
+        params={"bucket": BUCKET, "key": "x", "part_size": 1024},
+        content=b"x",
+    )
+    assert resp.status_code == 422
+
+    # Parts are held in memory, their size and number are bounded
+    for params in (
+        {"part_size": settings.s3_stream_max_part_size + 1},
+        {"concurrency": settings.s3_upload_concurrency + 1},
+    ):
+        resp = client.put(
+            f"{storage_url}/_upload",
+            params={"bucket": BUCKET, "key": "x", **params},
+            content=b"x",
+        )
+        assert resp.status_code == 422
+    resp = client.get(
+        f"{storage_url}/_multipart",
+        params={
+            "bucket": BUCKET,
+            "key": "x",
+            "upload_id": "u",
+            "part_size": settings.s3_stream_max_part_size + 1,
+        },
+    )
+    assert resp.status_code == 422
+
+
+def test_streamed_upload_aborted_on_error(client: TestClient, storage_url, s3):
+    resp = client.put(
+        f"{storage_url}/_upload",
+        params={"bucket": "missing", "key": "x"},
+        content=b"x",
+    )
+    assert resp.status_code == 400
+    assert "NoSuchBucket" in resp.json()["detail"]
+
+
+def test_resumable_upload(client: TestClient, storage_url, s3):
+    data = os.urandom(3 * PART_SIZE + 100)
+    resp = client.post(
+        f"{storage_url}/_multipart",
+        params={"action": "create", "bucket": BUCKET, "key": "resumed.bin"},
+    )
+    assert resp.status_code == 200
+    upload_id = resp.json()["upload_id"]
+
+    # The first attempt breaks off in the middle of the third part
+    async def broken_body():
+        for chunk in _chunks(data[: 2 * PART_SIZE + 1000]):
+            yield chunk
+        raise ConnectionError("client went away")
+
+    with pytest.raises(multipart.UploadError) as error:
+        asyncio.run(
+            multipart.stream_upload(
+                s3, BUCKET, "resumed.bin", broken_body(), PART_SIZE, 2, upload_id
+            )
+        )
+    assert error.value.upload_id == upload_id
+
+    status = client.get(
+        f"{storage_url}/_multipart",
+        params={
+            "bucket": BUCKET,
+            "key": "resumed.bin",
+            "upload_id": upload_id,
+            "part_size": PART_SIZE,
+        },
+    ).json()
+    assert status["offset"] == 2 * PART_SIZE
+    listed = client.get(
+        f"{storage_url}/_multipart", params={"action": "ls", "bucket": BUCKET}
+    ).json()
+    assert [u["upload_id"] for u in listed["items"]] == [upload_id]
+
+    params = {
+        "bucket": BUCKET,
+        "key": "resumed.bin",
+        "part_size": PART_SIZE,
+        "upload_id": upload_id,
+    }
+    # Resuming from anywhere but the reported offset is refused
+    resp = client.put(f"{storage_url}/_upload", params={**params, "offset": 0}, content=data)
+    assert resp.status_code == 409
+
+    offset = status["offset"]
+    resp = client.put(
+        f"{storage_url}/_upload",
+        params={**params, "offset": offset},
+        content=_chunks(data[offset:]),
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["offset"] == offset
+    assert s3.get_object(Bucket=BUCKET, Key="resumed.bin")["Body"].read() == data
+
+
+def test_list_uploads_pages(client: TestClient, storage_url):
+    page = {
+        "Uploads": [
+            {"Key": "b.bin", "UploadId": "u2", "Initiated": datetime.datetime(2026, 1, 1)}
+        ],
+        "IsTruncated": True,
+        "NextKeyMarker": "b.bin",
+        "NextUploadIdMarker": "u2",
+    }
+    with patch("mindweaver.service.s3_storage.views.get_s3_client") as get_client:
+        list_uploads = get_client.return_value.list_multipart_uploads
+        list_uploads.return_value = page
+        resp = client.get(
+            f"{storage_url}/_multipart",
+            params={
+                "action": "ls",
+                "bucket": BUCKET,
+                "key_marker": "a.bin",
+                "upload_id_marker": "u1",
+            },
+        )
+    assert resp.status_code == 200, resp.text
+    list_uploads.assert_called_once_with(
+        Bucket=BUCKET, Prefix="", KeyMarker="a.bin", UploadIdMarker="u1"
+    )
+    listed = resp.json()
+    assert [u["upload_id"] for u in listed["items"]] == ["u2"]
+    assert (listed["next_key_marker"], listed["next_upload_id_marker"]) == ("b.bin", "u2")
+
+
+def test_presigned_multipart(client: TestClient, storage_url, s3):
+    data = os.urandom(PART_SIZE + 10)
+    resp = client.post(
+        f"{storage_url}/_multipart",
+        params={"action": "presign", "bucket": BUCKET, "key": "direct.bin", "part_count": 2},
+    )
+    assert resp.status_code == 200
+    presigned = resp.json()
+    assert [p["part_number"] for p in presigned["parts"]] == [1, 2]
+
+    # The browser uploads the parts straight to S3
+    for part, body in zip(presigned["parts"], (data[:PART_SIZE], data[PART_SIZE:])):
+        assert requests.put(part["url"], data=body).status_code == 200
+
+    resp = client.post(
+        f"{storage_url}/_multipart",
+        params={
+            "action": "complete",
+            "bucket": BUCKET,
+            "key": "direct.bin",
+            "upload_id": presigned["upload_id"],
+        },
+    )
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["size"] == len(data)
+    assert s3.get_object(Bucket=BUCKET, Key="direct.bin")["Body"].read() == data
+
+
+def test_abort_multipart(client: TestClient, storage_url, s3):
+    upload_id = client.post(
+        f"{storage_url}/_multipart",
+        params={"action": "create", "bucket": BUCKET, "key": "gone.bin"},
+    ).json()["upload_id"]
+    resp = client.post(
+        f"{storage_url}/_multipart",
+        params={"action": "abort", "bucket": BUCKET, "key": "gone.bin", "upload_id": upload_id},
+    )
+    assert resp.status_code == 200
+    assert not s3.list_multipart_uploads(Bucket=BUCKET).get("Uploads")
@@ -0,0 +1,130 @@
+# SPDX-FileCopyrightText: Copyright © 2026 Mohd Izhar Firdaus Bin Ismail
+# SPDX-License-Identifier: AGPLv3+
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mindweaver.fw.context import service_context, system_request
+from mindweaver.service.k8s_cluster import K8sClusterService
+from mindweaver.tasks.base import AsyncRuntime, async_task
+
+
+@pytest.fixture
+def runtime():
+    rt = AsyncRuntime(concurrency=2)
+    yield rt
+    rt.stop()
+
+
+def test_runtime_awaits_result_and_reuses_loop(runtime: AsyncRuntime):
+    async def _loop_id():
+        await asyncio.sleep(0)
+        return id(asyncio.get_running_loop())
+
+    first = runtime.run(_loop_id())
+    second = runtime.run(_loop_id())
+    assert first == second
+
+
+def test_runtime_propagates_exceptions(runtime: AsyncRuntime):
+    async def _fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        runtime.run(_fail())
+
+
+def test_runtime_limits_concurrency(runtime: AsyncRuntime):
+    lock = threading.Lock()
+    current = peak = 0
+
+    async def _work():
+        nonlocal current, peak
+        with lock:
+            current += 1
+            peak = max(peak, current)
+        await asyncio.sleep(0.1)
+        with lock:
+            current -= 1
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: runtime.run(_work()), range(4)))
+    elapsed = time.monotonic() - started
+
+    assert peak == 2
+    # Two batches of two overlapping tasks, not four sequential sleeps
+    assert elapsed < 0.35
+
+
+def test_runtime_rejects_reentrant_calls(runtime: AsyncRuntime):
+    async def _nested():
+        runtime.run(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError):
+        runtime.run(_nested())
+
+
+def test_async_task_keeps_task_name():
+    async def sample_task(value: int):
+        await asyncio.sleep(0)
+        return value * 2
+
+    task = async_task(sample_task)
+    assert task.name == f"{__name__}.sample_task"
+    assert task(21) == 42
+
+
+def test_system_request_scopes_services():
+    request = system_request(project_id=7, headers={"X-Custom": "yes"})
+    assert request.headers["X-Project-ID"] == "7"
+    assert request.headers["x-custom"] == "yes"
+    request.state.user = "worker"
+    assert request.state.user == "worker"
+
+    svc = K8sClusterService(request, None)
+    assert svc.get_project_id() == 7
+    assert K8sClusterService(system_request(), None).get_project_id() is None
+
+
+def test_poll_task_awaits_service_call(client: TestClient):
+    from mindweaver.tasks.k8s_cluster_status import poll_k8s_cluster_status
+
+    cluster = client.post(
+        "/api/v1/k8s_clusters",
+        json={"name": "task-cluster", "title": "Task Cluster", "type": "in-cluster"},
+    ).json()["data"]
+
+    polled = []
+
+    async def _poll_status(model):
+        await asyncio.sleep(0.05)
+        polled.append(model.id)
+
+    with patch.object(
+        K8sClusterService, "poll_status", new_callable=AsyncMock
+    ) as poll_status:
+        poll_status.side_effect = _poll_status
+        poll_k8s_cluster_status(cluster["id"])
+
+    # The task returns only once the coroutine has run to completion
+    poll_status.assert_awaited_once()
+    assert polled == [cluster["id"]]
+
+
+@pytest.mark.asyncio
+async def test_service_context(client: TestClient):
+    cluster = client.post(
+        "/api/v1/k8s_clusters",
+        json={"name": "ctx-cluster", "title": "Ctx Cluster", "type": "in-cluster"},
+    ).json()["data"]
+
+    async with service_context(K8sClusterService) as svc:
+        model = await svc.get(cluster["id"])
+        assert model.name == "ctx-cluster"
@@ -200,7 +200,20 @@ const ServiceView = ({
 
                     {/* Integration Services */}
                     <div className="space-y-4 bg-slate-50/50 dark:bg-slate-900/50 p-6 rounded-2xl border border-slate-200/50 dark:border-slate-800/50">
-                        <p className="text-xs font-bold uppercase tracking-widest text-slate-400 mb-4">Core Integrations</p>
+                        <div className="flex items-center justify-between mb-4">
+                            <p className="text-xs font-bold uppercase tracking-widest text-slate-400">Core Integrations</p>
+                            {!(clusterState.argocd_installed && clusterState.cert_manager_installed && clusterState.cnpg_installed && clusterState.cluster_issuer_installed) && (
+                                <button
+                                    id="bootstrap-cluster-btn"
+                                    onClick={() => handleInstallAction('bootstrap_cluster')}
+                                    disabled={installingActions['bootstrap_cluster']}
+                                    className="mw-btn-primary py-1 px-3 text-[10px] flex items-center gap-2"
+                                >
+                                    {installingActions['bootstrap_cluster'] && <RefreshCw size={10} className="animate-spin" />}
+                                    {installingActions['bootstrap_cluster'] ? 'INSTALLING' : 'INSTALL ALL'}
+                                </button>
+                            )}
+                        </div>
                         
                         {/* ArgoCD */}
                         <div className="flex items-center justify-between p-3 bg-white dark:bg-slate-800 rounded-xl border border-slate-200 dark:border-slate-700">